@@ -0,0 +1,46 @@
+"""Gzip CPU cost vs bytes saved for `GET /api/products` responses at realistic catalog sizes.
+
+For every catalog size, the `ListProductsOutput` body is serialized like `handle_list_products` does and gzipped at
+the levels a gateway (6) and the Powertools resolver (9) would use. Bodies gzipped inside the Lambda also need base64
+encoding to cross the Lambda proxy integration, which is reported as `b64 bytes`.
+
+Run with `make benchmark` or `python -m benchmarks.compression_benchmark`.
+"""
+
+import base64
+import gzip
+
+from benchmarks.utils import generate_product_dict, measure_ms, print_table
+from product.crud.models.output import ListProductsOutput
+
+CATALOG_SIZES = [1, 10, 100, 1_000, 10_000]
+GZIP_LEVELS = [1, 6, 9]
+
+
+def main() -> None:
+    rows = []
+    for size in CATALOG_SIZES:
+        output = ListProductsOutput.model_validate({'products': [generate_product_dict() for _ in range(size)]})
+        serialize_ms = measure_ms(lambda: output.model_dump_json(exclude_none=True))  # noqa: B023
+        body = output.model_dump_json(exclude_none=True).encode()
+        for level in GZIP_LEVELS:
+            compressed = gzip.compress(body, compresslevel=level)
+            gzip_ms = measure_ms(lambda: gzip.compress(body, compresslevel=level))  # noqa: B023
+            rows.append(
+                [
+                    size,
+                    level,
+                    len(body),
+                    len(compressed),
+                    len(base64.b64encode(compressed)),
+                    f'{100 * (1 - len(compressed) / len(body)):.1f}%',
+                    f'{serialize_ms:.3f}',
+                    f'{gzip_ms:.3f}',
+                ]
+            )
+
+    print_table(['products', 'level', 'json bytes', 'gzip bytes', 'b64 bytes', 'saved', 'serialize ms', 'gzip ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
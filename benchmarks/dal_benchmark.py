@@ -0,0 +1,56 @@
+"""DAL overhead of the local `DbHandler` backends, per operation.
+
+`memory` is a dict behind a lock, so its numbers are the cost of the DAL itself (models, validation, logging).
+`sqlite` adds a real storage engine (WAL journal, B-tree indexes) on a local file, without network.
+
+Run with `make benchmark` or `python -m benchmarks.dal_benchmark`.
+"""
+
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.utils import generate_product_dict, print_table
+from product.crud.integration.db_handler import DbHandler
+from product.crud.integration.in_memory_db_handler import InMemoryDbHandler
+from product.crud.integration.sqlite_db_handler import SqliteDbHandler
+from product.crud.models.product import Product, ProductFilter, ProductUpdate
+from product.observability import logger
+
+TABLE_NAME = 'products'
+PRODUCTS = 2_000
+LIST_REPEAT = 10
+
+
+def _us_per_op(func: Callable[[], object], operations: int) -> str:
+    start = time.perf_counter()
+    func()
+    return f'{(time.perf_counter() - start) * 1_000_000 / operations:.1f}'
+
+
+def _run(backend: str, db_handler: DbHandler) -> list[object]:
+    products = [Product(**generate_product_dict()) for _ in range(PRODUCTS)]
+    create = _us_per_op(lambda: [db_handler.create_product(product) for product in products], PRODUCTS)
+    get = _us_per_op(lambda: [db_handler.get_product(product.id) for product in products], PRODUCTS)
+    update = _us_per_op(lambda: [db_handler.update_product(product.id, ProductUpdate(price=1, version=1)) for product in products], PRODUCTS)
+    # list and query costs are reported per returned item
+    list_all = _us_per_op(lambda: [db_handler.list_products() for _ in range(LIST_REPEAT)], PRODUCTS * LIST_REPEAT)
+    query = _us_per_op(lambda: [db_handler.query_products(ProductFilter(max_price=1)) for _ in range(LIST_REPEAT)], PRODUCTS * LIST_REPEAT)
+    delete = _us_per_op(lambda: [db_handler.delete_product(product.id) for product in products], PRODUCTS)
+    return [backend, create, get, update, list_all, query, delete]
+
+
+def main() -> None:
+    logger.setLevel(logging.ERROR)  # the DAL logs every operation at INFO level
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rows = [
+            _run('memory', InMemoryDbHandler(TABLE_NAME)),
+            _run('sqlite', SqliteDbHandler(TABLE_NAME, db_path=str(Path(tmp_dir) / 'products.db'))),
+        ]
+    print_table(['backend', 'create us', 'get us', 'update us', 'list us/item', 'query us/item', 'delete us'], rows)
+
+
+if __name__ == '__main__':
+    main()
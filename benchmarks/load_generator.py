@@ -0,0 +1,276 @@
+"""Open-loop load generator for the CRUD API, with latency percentiles and throughput per operation.
+
+Requests are a weighted mix of create, get, list and delete. Get and delete pick their product from a fixed key
+space, uniformly or Zipf distributed (a few hot products get most of the traffic), creates use new products.
+The key space is created before the measured run, so gets hit existing products until they are deleted.
+
+Requests are sent open-loop: request `i` is due at `start + i / rate` whether or not earlier requests have completed,
+and its latency is measured from that due time. A slow target therefore shows up as queueing in the percentiles,
+instead of silently lowering the offered rate (coordinated omission).
+
+Targets:
+- `inprocess` resolves API Gateway events with the Lambda handlers' resolver in this process, with a local DAL backend.
+- `http` sends the requests to a running `benchmarks.local_server`, or anything else serving the CRUD API.
+
+A generated run can be written with `--record` and sent again, identically, with `--replay`.
+
+Run with `make benchmark` or `python -m benchmarks.load_generator --rate 500 --distribution zipf`.
+"""
+
+import argparse
+import bisect
+import http.client
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+import warnings
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from benchmarks.local_server import build_lambda_context, build_rest_api_event, clear_metrics, configure_environment, load_app
+from benchmarks.utils import generate_product_name, percentile, print_table
+
+OPERATIONS = ['create', 'get', 'list', 'delete']
+DEFAULT_MIX = 'create=10,get=70,list=10,delete=10'
+PERCENTILES = [('p50', 0.5), ('p95', 0.95), ('p99', 0.99), ('p999', 0.999)]
+
+
+@dataclass(frozen=True)
+class ApiRequest:
+    operation: str
+    method: str
+    path: str
+    body: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Sample:
+    operation: str
+    status_code: int
+    latency_ms: float
+
+
+class KeySampler:
+    """Picks product ids from a fixed key space.
+
+    Parameters
+    ----------
+    keys : list[str]
+        Product ids of the key space, the first ones are the hottest with the Zipf distribution
+    distribution : str
+        'uniform' or 'zipf'
+    zipf_exponent : float
+        Skew of the Zipf distribution, the k-th key is picked with a probability proportional to 1 / k^exponent
+    rng : random.Random
+        Random generator, seeded for reproducible runs
+    """
+
+    def __init__(self, keys: list[str], distribution: str, zipf_exponent: float, rng: random.Random):
+        self.keys = keys
+        self.distribution = distribution
+        self.rng = rng
+        self._cumulative_weights = list(itertools.accumulate(1 / rank**zipf_exponent for rank in range(1, len(keys) + 1)))
+
+    def sample(self) -> str:
+        if self.distribution == 'uniform':
+            return self.rng.choice(self.keys)
+        point = self.rng.random() * self._cumulative_weights[-1]
+        return self.keys[bisect.bisect_left(self._cumulative_weights, point)]
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse an operation mix like 'create=10,get=70,list=10,delete=10', weights don't need to add up to 100."""
+    weights: dict[str, float] = {}
+    for part in mix.split(','):
+        operation, _, weight = part.partition('=')
+        if operation not in OPERATIONS:
+            raise ValueError(f'unknown operation {operation!r}, expected one of {OPERATIONS}')
+        weights[operation] = float(weight)
+    return weights
+
+
+def create_request(product_id: str, rng: random.Random) -> ApiRequest:
+    body = json.dumps({'name': generate_product_name(rng), 'price': rng.randint(1, 10000)})
+    return ApiRequest('create', 'PUT', f'/api/product/{product_id}', body)
+
+
+def generate_requests(count: int, mix: dict[str, float], sampler: KeySampler, rng: random.Random) -> list[ApiRequest]:
+    operations = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    requests = []
+    for operation in operations:
+        if operation == 'create':
+            requests.append(create_request(str(uuid.UUID(int=rng.getrandbits(128), version=4)), rng))
+        elif operation == 'get':
+            requests.append(ApiRequest('get', 'GET', f'/api/product/{sampler.sample()}'))
+        elif operation == 'delete':
+            requests.append(ApiRequest('delete', 'DELETE', f'/api/product/{sampler.sample()}'))
+        else:
+            requests.append(ApiRequest('list', 'GET', '/api/products'))
+    return requests
+
+
+class InProcessTarget:
+    """Resolves requests with the CRUD API resolver in this process, one at a time like a Lambda execution environment."""
+
+    def __init__(self, backend: str):
+        configure_environment(backend)
+        warnings.filterwarnings('ignore', message='Disabling idempotency')
+        self.app = load_app()
+        # the resolver keeps the current event on the app instance
+        self._lock = threading.Lock()
+
+    def __call__(self, request: ApiRequest) -> int:
+        event = build_rest_api_event(request.method, request.path, {'Content-Type': ['application/json']}, request.body)
+        with self._lock:
+            response = self.app.resolve(event, build_lambda_context())
+            clear_metrics()
+        return int(response['statusCode'])
+
+
+class HttpTarget:
+    """Sends requests over HTTP/1.1, every thread keeps its own persistent connection."""
+
+    def __init__(self, url: str, timeout_seconds: float = 10):
+        parsed_url = urlsplit(url)
+        self.host = parsed_url.hostname or '127.0.0.1'
+        self.port = parsed_url.port or 80
+        self.timeout_seconds = timeout_seconds
+        self._local = threading.local()
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout_seconds)
+            self._local.connection = connection
+        return connection
+
+    def _send(self, connection: http.client.HTTPConnection, request: ApiRequest) -> int:
+        headers = {'Content-Type': 'application/json'} if request.body is not None else {}
+        try:
+            connection.request(request.method, request.path, body=request.body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except BaseException:
+            # the connection is in an unknown state, the next request opens a new one
+            connection.close()
+            raise
+        return response.status
+
+    def __call__(self, request: ApiRequest) -> int:
+        connection = self._get_connection()
+        reused = connection.sock is not None
+        try:
+            return self._send(connection, request)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # the server closed the idle connection before reading the request, which is sent again on a new one.
+            # Any other failure, a timeout above all, may come after the server handled the request and is not retried
+            if not reused:
+                raise
+            return self._send(connection, request)
+
+
+def run_open_loop(requests: list[ApiRequest], target: Callable[[ApiRequest], int], rate: float, concurrency: int) -> tuple[list[Sample], float]:
+    """Send `requests` at `rate` requests per second from `concurrency` threads.
+
+    Returns
+    -------
+    tuple[list[Sample], float]
+        One sample per request, and the duration of the run in seconds
+    """
+    samples: list[Sample] = []
+    next_index = itertools.count()
+    start = time.perf_counter()
+
+    def worker() -> None:
+        while (index := next(next_index)) < len(requests):
+            due = start + index / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                status_code = target(requests[index])
+            except Exception:
+                status_code = 0  # connection errors, reported with the server errors
+            samples.append(Sample(requests[index].operation, status_code, (time.perf_counter() - due) * 1000))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples: list[Sample], duration_seconds: float) -> list[list[Any]]:
+    rows = []
+    for operation in [*OPERATIONS, 'all']:
+        latencies = sorted(sample.latency_ms for sample in samples if operation in (sample.operation, 'all'))
+        if not latencies:
+            continue
+        statuses = [sample.status_code for sample in samples if operation in (sample.operation, 'all')]
+        rows.append(
+            [
+                operation,
+                len(latencies),
+                sum(1 for status in statuses if 400 <= status < 500),
+                sum(1 for status in statuses if status >= 500 or status == 0),
+                *(f'{percentile(latencies, fraction):.2f}' for _, fraction in PERCENTILES),
+                f'{len(latencies) / duration_seconds:.0f}',
+            ]
+        )
+    return rows
+
+
+def write_requests(path: str, requests: list[ApiRequest]) -> None:
+    with open(path, 'w') as requests_file:
+        for request in requests:
+            requests_file.write(json.dumps(asdict(request)) + '\n')
+
+
+def read_requests(path: str) -> list[ApiRequest]:
+    with open(path) as requests_file:
+        return [ApiRequest(**json.loads(line)) for line in requests_file if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=['inprocess', 'http'], default='inprocess')
+    parser.add_argument('--url', default='http://127.0.0.1:8080', help='CRUD API base url of the http target')
+    parser.add_argument('--backend', choices=['memory', 'sqlite'], default='memory', help='DAL backend of the inprocess target')
+    parser.add_argument('--rate', type=float, default=500, help='offered requests per second')
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--concurrency', type=int, default=16, help='maximum requests in flight')
+    parser.add_argument('--keys', type=int, default=1_000, help='size of the key space of get and delete')
+    parser.add_argument('--distribution', choices=['uniform', 'zipf'], default='uniform')
+    parser.add_argument('--zipf-exponent', type=float, default=1.1)
+    parser.add_argument('--mix', default=DEFAULT_MIX)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--record', help='write the generated requests to this NDJSON file')
+    parser.add_argument('--replay', help='send the requests of this NDJSON file instead of generating them')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(args.keys)]
+    if args.replay:
+        requests = read_requests(args.replay)
+    else:
+        requests = generate_requests(args.requests, parse_mix(args.mix), KeySampler(keys, args.distribution, args.zipf_exponent, rng), rng)
+    if args.record:
+        write_requests(args.record, requests)
+
+    target: Callable[[ApiRequest], int] = InProcessTarget(args.backend) if args.target == 'inprocess' else HttpTarget(args.url)
+    # the key space is loaded before the measured run, products that already exist are left as they are
+    for key in keys:
+        target(create_request(key, rng))
+
+    samples, duration_seconds = run_open_loop(requests, target, args.rate, args.concurrency)
+    print(f'offered {args.rate:.0f} req/s, achieved {len(samples) / duration_seconds:.0f} req/s over {duration_seconds:.1f}s')
+    print_table(['operation', 'requests', '4xx', '5xx', *(f'{name} ms' for name, _ in PERCENTILES), 'req/s'], summarize(samples, duration_seconds))
+
+
+if __name__ == '__main__':
+    main()
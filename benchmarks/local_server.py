@@ -0,0 +1,246 @@
+"""Local HTTP server for the CRUD API, to load test routing, validation and serialization with standard HTTP tools.
+
+Every HTTP request is turned into an API Gateway REST proxy event and resolved by `rest_api_resolver.app`, the same
+resolver the Lambda handlers use, with a local stand-in DAL (`DB_BACKEND`) instead of DynamoDB.
+
+The resolver keeps the current event on the `app` instance, so each worker process resolves one request at a time,
+threads only handle socket IO. Like in a Lambda container, a worker's reads never overlap and are not coalesced.
+Workers share one listening socket. The default `sqlite` backend is shared by all workers, the `memory` backend is per
+worker and only consistent with a single worker.
+
+Run with `python -m benchmarks.local_server --workers 4 --port 8080`, then e.g.
+`curl -X PUT localhost:8080/api/product/<uuid> -d '{"name": "a", "price": 1}'`.
+"""
+
+import argparse
+import base64
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+import warnings
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+HANDLER_MODULES = [
+    'product.crud.handlers.handle_create_product',
+    'product.crud.handlers.handle_get_product',
+    'product.crud.handlers.handle_update_product',
+    'product.crud.handlers.handle_delete_product',
+    'product.crud.handlers.handle_list_products',
+    'product.crud.handlers.handle_search_products',
+    'product.crud.handlers.handle_get_product_stats',
+]
+# API Gateway resources of the CRUD API, path parameters are extracted like API Gateway does
+RESOURCES = [
+    ('/api/product/{product}', re.compile(r'^/api/product/(?P<product>[^/]+)/?$')),
+    ('/api/products/search', re.compile(r'^/api/products/search/?$')),
+    ('/api/products/stats', re.compile(r'^/api/products/stats/?$')),
+    ('/api/products', re.compile(r'^/api/products/?$')),
+]
+
+
+def configure_environment(backend: str, log_level: str = 'CRITICAL') -> None:
+    """Set the environment variables the handlers expect, existing values are kept.
+
+    Must run before the handler modules are imported, the create handler reads its environment at import time.
+    """
+    defaults = {
+        'POWERTOOLS_SERVICE_NAME': 'Product',
+        'LOG_LEVEL': log_level,
+        'POWERTOOLS_TRACE_DISABLED': 'true',
+        # there is no idempotency table offline, the stand-in DAL still rejects duplicate products
+        'POWERTOOLS_IDEMPOTENCY_DISABLED': 'true',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'TABLE_NAME': 'products',
+        'IDEMPOTENCY_TABLE_NAME': 'idempotency',
+        'DB_BACKEND': backend,
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+
+def load_app() -> Any:
+    """Import every CRUD handler module so their routes are registered, and return the shared resolver."""
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+    return importlib.import_module('product.crud.handlers.utils.rest_api_resolver').app
+
+
+def build_lambda_context() -> LambdaContext:
+    context = LambdaContext()
+    context._aws_request_id = str(uuid.uuid4())
+    context._function_name = 'local'
+    context._memory_limit_in_mb = 128
+    context._invoked_function_arn = 'arn:aws:lambda:us-east-1:123456789012:function:local'
+    return context
+
+
+def build_rest_api_event(method: str, raw_path: str, headers: dict[str, list[str]], body: Optional[str]) -> dict[str, Any]:
+    """Build an API Gateway REST proxy event, shaped like `tests/crud_utils.generate_product_api_gw_event`.
+
+    Parameters
+    ----------
+    method : str
+        HTTP method
+    raw_path : str
+        Request path, with the query string if any
+    headers : dict[str, list[str]]
+        Request headers, every header may have several values
+    body : Optional[str]
+        Request body, None if the request has no body
+
+    Returns
+    -------
+    dict[str, Any]
+        API Gateway REST proxy event
+    """
+    url = urlsplit(raw_path)
+    resource, path_params = url.path, None
+    for resource_template, pattern in RESOURCES:
+        match = pattern.match(url.path)
+        if match:
+            resource, path_params = resource_template, match.groupdict() or None
+            break
+    query = parse_qs(url.query, keep_blank_values=True)
+    request_time = time.time()
+    return {
+        'version': '1.0',
+        'resource': resource,
+        'path': url.path,
+        'httpMethod': method,
+        'headers': {name: values[-1] for name, values in headers.items()},
+        'multiValueHeaders': headers,
+        'queryStringParameters': {name: values[-1] for name, values in query.items()} or None,
+        'multiValueQueryStringParameters': query or None,
+        'requestContext': {
+            'accountId': '123456789012',
+            'apiId': 'local',
+            'domainName': 'localhost',
+            'domainPrefix': 'localhost',
+            'extendedRequestId': str(uuid.uuid4()),
+            'httpMethod': method,
+            'identity': {'sourceIp': '127.0.0.1', 'userAgent': headers.get('User-Agent', [''])[-1]},
+            'path': url.path,
+            'protocol': 'HTTP/1.1',
+            'requestId': str(uuid.uuid4()),
+            'requestTime': time.strftime('%d/%b/%Y:%H:%M:%S +0000', time.gmtime(request_time)),
+            'requestTimeEpoch': int(request_time * 1000),
+            'resourceId': 'local',
+            'resourcePath': resource,
+            'stage': 'local',
+        },
+        'pathParameters': path_params,
+        'stageVariables': None,
+        'body': body,
+        'isBase64Encoded': False,
+    }
+
+
+class _ApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, load generators reuse connections
+    app: Any = None
+    resolve_lock = threading.Lock()
+
+    def _handle(self) -> None:
+        content_length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(content_length).decode() if content_length else None
+        headers: dict[str, list[str]] = {}
+        for name, value in self.headers.items():
+            headers.setdefault(name, []).append(value)
+        event = build_rest_api_event(self.command, self.path, headers, body)
+
+        with self.resolve_lock:
+            response = self.app.resolve(event, build_lambda_context())
+            clear_metrics()
+
+        response_body = response.get('body') or ''
+        payload = base64.b64decode(response_body) if response.get('isBase64Encoded') else response_body.encode()
+        status_code = int(response['statusCode'])
+        if status_code in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+            # clients don't read a body after these statuses, it would corrupt the next response on the connection
+            payload = b''
+        self.send_response(status_code)
+        for name, values in (response.get('multiValueHeaders') or {}).items():
+            for value in values:
+                self.send_header(name, value)
+        for name, value in (response.get('headers') or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_PUT = do_PATCH = do_DELETE = do_POST = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # access logs would dominate the measured latency
+
+
+def clear_metrics() -> None:
+    """Drop the metrics and stage durations of the last request.
+
+    Handlers add them on every request, they are flushed by the Lambda handler decorators, which are not used here.
+    """
+    observability = importlib.import_module('product.observability')
+    observability.metrics.clear_metrics()
+    observability.stage_timer.durations_ms.clear()
+
+
+def _run_worker(listen_socket: socket.socket, backend: str, log_level: str) -> None:
+    configure_environment(backend, log_level)
+    warnings.filterwarnings('ignore', message='Disabling idempotency')
+    _ApiRequestHandler.app = load_app()
+    server = ThreadingHTTPServer(listen_socket.getsockname(), _ApiRequestHandler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = listen_socket
+    server.serve_forever()
+
+
+def serve(host: str, port: int, workers: int, backend: str, log_level: str = 'CRITICAL') -> None:
+    listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listen_socket.bind((host, port))
+    listen_socket.listen(1024)
+
+    # workers inherit the listening socket, the kernel spreads new connections between them
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_run_worker, args=(listen_socket, backend, log_level), daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    print(json.dumps({'listening': f'http://{host}:{port}', 'workers': workers, 'backend': backend}))
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+    finally:
+        listen_socket.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--backend', choices=['sqlite', 'memory'], default='sqlite')
+    # 4xx responses are logged with a stack trace at ERROR level, which would dominate the measured latency
+    parser.add_argument('--log-level', default='CRITICAL', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'])
+    args = parser.parse_args()
+    if args.backend == 'memory' and args.workers > 1:
+        logging.warning('memory backend is per worker, products created on one worker are not visible to the others')
+    serve(args.host, args.port, args.workers, args.backend, args.log_level)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Client side cost per item of the boto3 DynamoDB resource layer vs the low level client used by `DynamoDbHandler`.
+
+Both paths use their own botocore client that answers the call in memory right before it would be sent, so only
+parameter validation, request serialization and item (de)serialization are measured, no network or signing.
+
+- `resource`: `Table.put_item` / `Table.scan`, the resource layer walks the operation model and converts every attribute.
+- `client`: `put_item` / `scan` on the low level client, items converted with boto3 `TypeSerializer` / `TypeDeserializer`.
+- `codec`: `put_item` / `scan` on the low level client, items converted with the `ProductEntry` codec used by `DynamoDbHandler`.
+
+Run with `make benchmark` or `python -m benchmarks.marshalling_benchmark`.
+"""
+
+import copy
+import os
+from typing import Any, Iterator
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.awsrequest import AWSResponse
+
+from benchmarks.utils import generate_product_dict, measure_ms, print_table
+from product.crud.integration.product_codec import decode_product_item, encode_product_entry
+from product.models.products.product import ProductEntry
+
+TABLE_NAME = 'products'
+SCAN_SIZES = [1, 100, 1_000]
+PUT_REPEAT = 200
+SCAN_REPEAT = 20
+
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _generate_entry() -> ProductEntry:
+    return ProductEntry(created_at=1700000000, **generate_product_dict())
+
+
+def _serialize(item: dict[str, Any]) -> dict[str, Any]:
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+
+def _deserialize(item: dict[str, Any]) -> dict[str, Any]:
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+
+def _answer_in_memory(client: Any, operation: str, responses: Iterator[dict]) -> None:
+    # returning a response from 'before-call' short-circuits the HTTP request, 'after-call' handlers still run
+    def handler(**kwargs) -> tuple[AWSResponse, dict]:
+        return AWSResponse(None, 200, {}, None), next(responses)
+
+    client.meta.events.register(f'before-call.dynamodb.{operation}', handler)
+
+
+def _scan_responses(entries: list[ProductEntry], count: int) -> Iterator[dict]:
+    # the resource layer converts the parsed response in place, so every call gets its own copy, made up front
+    wire_response = {'Items': [encode_product_entry(entry) for entry in entries], 'Count': len(entries)}
+    return iter([copy.deepcopy(wire_response) for _ in range(count)])
+
+
+def _put_responses(count: int) -> Iterator[dict]:
+    return iter([{} for _ in range(count)])
+
+
+def _format_row(operation: str, items: int, timings_ms: list[float]) -> list[object]:
+    resource_ms, client_ms, codec_ms = timings_ms
+    return [
+        operation,
+        items,
+        *(f'{timing * 1000 / items:.1f}' for timing in timings_ms),
+        f'{resource_ms / codec_ms:.2f}x',
+        f'{client_ms / codec_ms:.2f}x',
+    ]
+
+
+def main() -> None:
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')  # clients are never connected, any region will do
+    rows: list[list[object]] = []
+
+    table = boto3.resource('dynamodb').Table(TABLE_NAME)
+    client = boto3.client('dynamodb')
+    codec_client = boto3.client('dynamodb')
+    entry = _generate_entry()
+    entry_dict = entry.model_dump()
+    for put_client in (table.meta.client, client, codec_client):
+        _answer_in_memory(put_client, 'PutItem', _put_responses(PUT_REPEAT))
+    put_timings = [
+        measure_ms(lambda: table.put_item(Item=entry_dict), repeat=PUT_REPEAT),
+        measure_ms(lambda: client.put_item(TableName=TABLE_NAME, Item=_serialize(entry_dict)), repeat=PUT_REPEAT),
+        measure_ms(lambda: codec_client.put_item(TableName=TABLE_NAME, Item=encode_product_entry(entry)), repeat=PUT_REPEAT),
+    ]
+    rows.append(_format_row('put_item', 1, put_timings))
+
+    for size in SCAN_SIZES:
+        # fresh clients per size, each answers exactly SCAN_REPEAT scans
+        table = boto3.resource('dynamodb').Table(TABLE_NAME)
+        client = boto3.client('dynamodb')
+        codec_client = boto3.client('dynamodb')
+        entries = [_generate_entry() for _ in range(size)]
+        for scan_client in (table.meta.client, client, codec_client):
+            _answer_in_memory(scan_client, 'Scan', _scan_responses(entries, SCAN_REPEAT))
+
+        def client_scan() -> None:
+            response = client.scan(TableName=TABLE_NAME)  # noqa: B023
+            [_deserialize(item) for item in response['Items']]
+
+        def codec_scan() -> None:
+            response = codec_client.scan(TableName=TABLE_NAME)  # noqa: B023
+            [decode_product_item(item) for item in response['Items']]
+
+        scan_timings = [
+            measure_ms(lambda: table.scan(), repeat=SCAN_REPEAT),  # noqa: B023
+            measure_ms(client_scan, repeat=SCAN_REPEAT),
+            measure_ms(codec_scan, repeat=SCAN_REPEAT),
+        ]
+        rows.append(_format_row('scan', size, scan_timings))
+
+    print_table(['operation', 'items', 'resource us/item', 'client us/item', 'codec us/item', 'codec vs resource', 'codec vs client'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""Name search index build, persistence and query latency, up to 1M products.
+
+The benchmark product names (two words of a 14 word vocabulary) would make every query match a seventh of the
+catalog, so names here get a third word from a vocabulary of a few thousand made up model names, Zipf distributed like
+words in real catalogs. Queries are a mix of a common word, a model name, a two letter prefix and two words.
+
+For every catalog size the index is built in stream batches of `BATCH_SIZE` products, then measured:
+- update: applying one more stream batch of inserts, updates and removals, what `process_stream` does per batch
+- encode/decode: what the stream processor writes and the search handler reads back, with the stored size
+- query: latency percentiles of `SearchIndex.search` per query kind
+
+Run with `make benchmark` or `python -m benchmarks.search_benchmark --products 1000000`.
+"""
+
+import argparse
+import itertools
+import random
+import resource
+import string
+import time
+import uuid
+
+from benchmarks.utils import generate_product_name, measure_ms, percentile, print_table
+from product.catalog.models import CatalogChange, CatalogProduct
+from product.catalog.search_index import SearchIndex, decode_search_index, encode_search_index
+
+CATALOG_SIZES = [10_000, 100_000, 1_000_000]
+BATCH_SIZE = 1_000
+MODEL_NAMES = 5_000
+QUERIES_PER_KIND = 200
+LIMIT = 10
+
+
+def generate_model_names(rng: random.Random) -> list[str]:
+    syllables = [consonant + vowel for consonant in 'bdfgklmnprstvz' for vowel in 'aeiou']
+    names = {''.join(rng.choices(syllables, k=rng.randint(2, 3))) for _ in range(MODEL_NAMES * 2)}
+    return sorted(names)[:MODEL_NAMES]
+
+
+class NameGenerator:
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.model_names = generate_model_names(rng)
+        self._cumulative_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(self.model_names) + 1)))
+
+    def model_name(self) -> str:
+        return self.rng.choices(self.model_names, cum_weights=self._cumulative_weights)[0]
+
+    def __call__(self) -> str:
+        return f'{generate_product_name(self.rng)} {self.model_name()}'
+
+
+def _new_product(names: NameGenerator, rng: random.Random) -> CatalogProduct:
+    return CatalogProduct(id=str(uuid.UUID(int=rng.getrandbits(128), version=4)), name=names(), price=rng.randint(1, 10_000))
+
+
+def build_index(size: int, names: NameGenerator, rng: random.Random) -> tuple[SearchIndex, float]:
+    """Index `size` new products in stream batches, returns the index and the build time in seconds."""
+    index = SearchIndex()
+    elapsed = 0.0
+    for start in range(0, size, BATCH_SIZE):
+        changes = [
+            CatalogChange(product_id=product.id, product=product)
+            for product in (_new_product(names, rng) for _ in range(min(BATCH_SIZE, size - start)))
+        ]
+        batch_start = time.perf_counter()
+        index.apply_changes(changes)
+        elapsed += time.perf_counter() - batch_start
+    return index, elapsed
+
+
+def generate_mixed_batch(index: SearchIndex, names: NameGenerator, rng: random.Random) -> list[CatalogChange]:
+    changes = []
+    for product_id in rng.sample(index.ids, k=BATCH_SIZE // 2):
+        if rng.random() < 0.5:
+            changes.append(CatalogChange(product_id=product_id))
+        else:
+            changes.append(CatalogChange(product_id=product_id, product=CatalogProduct(id=product_id, name=names(), price=1, version=2)))
+    changes.extend(CatalogChange(product_id=product.id, product=product) for product in (_new_product(names, rng) for _ in range(BATCH_SIZE // 2)))
+    return changes
+
+
+def generate_queries(names: NameGenerator, rng: random.Random) -> dict[str, list[str]]:
+    return {
+        'common word': [generate_product_name(rng).split()[0] for _ in range(QUERIES_PER_KIND)],
+        'model name': [names.model_name() for _ in range(QUERIES_PER_KIND)],
+        'prefix': [''.join(rng.choices(string.ascii_lowercase, k=2)) for _ in range(QUERIES_PER_KIND)],
+        'two words': [' '.join(names().split()[1:]) for _ in range(QUERIES_PER_KIND)],
+    }
+
+
+def _peak_memory_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=CATALOG_SIZES[-1], help='largest catalog size')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    names = NameGenerator(rng)
+    queries = generate_queries(names, rng)
+    index_rows, query_rows = [], []
+    for size in [size for size in CATALOG_SIZES if size < args.products] + [args.products]:
+        index, build_seconds = build_index(size, names, rng)
+        update_ms = measure_ms(lambda: index.apply_changes(generate_mixed_batch(index, names, rng)), repeat=5)  # noqa: B023
+        body = encode_search_index(index)
+        encode_ms = measure_ms(lambda: encode_search_index(index), repeat=3)  # noqa: B023
+        decode_ms = measure_ms(lambda: decode_search_index(body), repeat=3)  # noqa: B023
+        index_rows.append(
+            [
+                size,
+                f'{build_seconds:.1f}',
+                f'{size / build_seconds:.0f}',
+                f'{update_ms:.1f}',
+                f'{len(body) / 1024 / 1024:.1f}',
+                f'{encode_ms:.0f}',
+                f'{decode_ms:.0f}',
+                len(index.terms),
+                f'{_peak_memory_mb():.0f}',
+            ]
+        )
+
+        for kind, kind_queries in queries.items():
+            latencies, hits = [], 0
+            for query in kind_queries:
+                start = time.perf_counter()
+                hits += len(index.search(query, LIMIT))
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+            query_rows.append(
+                [size, kind, f'{hits / len(kind_queries):.1f}', *(f'{percentile(latencies, fraction):.2f}' for fraction in (0.5, 0.95, 0.99))]
+            )
+
+    print_table(
+        ['products', 'build s', 'products/s', f'{BATCH_SIZE} changes ms', 'stored MB', 'encode ms', 'decode ms', 'terms', 'peak RSS MB'],
+        index_rows,
+    )
+    print()
+    print_table(['products', 'query', 'hits', 'p50 ms', 'p95 ms', 'p99 ms'], query_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Backend calls saved by coalescing concurrent reads of the same product, with hot keys.
+
+Threads get products from a fixed key space through `DynamoDbHandler`, as a multi-threaded host would, with reads
+uncoalesced and coalesced. Neither a Lambda container nor a local server worker makes concurrent reads, they resolve one
+request at a time, so the saving only applies to hosts sharing a handler between threads, which turn it on with
+DYNAMODB_COALESCE_READS. DynamoDB is stood in by a hook of the boto3 client answering every get_item after
+`--latency-ms`, the client still builds, validates and parses every call, without network.
+
+With Zipf distributed keys most reads hit a few hot products, concurrent reads of the same product share one call and
+the backend sees fewer calls than there are reads. With uniform keys concurrent reads rarely share a product.
+
+Run with `make benchmark` or `python -m benchmarks.single_flight_benchmark --threads 32 --zipf-exponent 1.1`.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import boto3
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
+
+from benchmarks.load_generator import KeySampler
+from benchmarks.utils import generate_product_dict, percentile, print_table
+from product.crud.integration.circuit_breaker import CircuitBreaker
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.integration.hedged_reader import HedgedReader
+from product.observability import logger
+
+TABLE_NAME = 'products'
+
+
+class StubTable:
+    """Answers the get_item calls of a boto3 client after a fixed latency, and counts them."""
+
+    def __init__(self, products: list[dict[str, Any]], latency_ms: float):
+        self.items = {product['id']: product for product in products}
+        self.latency_seconds = latency_ms / 1000
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_item(self, params: dict[str, Any], **kwargs: Any) -> tuple[AWSResponse, dict[str, Any]]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency_seconds)
+        # params is the serialized request, the client validated and built it like for the real table
+        product = self.items[json.loads(params['body'])['Key']['id']['S']]
+        item = {'id': {'S': product['id']}, 'name': {'S': product['name']}, 'price': {'N': str(product['price'])}, 'created_at': {'N': '1700000000'}}
+        return AWSResponse(None, 200, {}, None), {'Item': item, 'ResponseMetadata': {'HTTPStatusCode': 200}}
+
+
+def _run(products: list[dict[str, Any]], sampler: KeySampler, args: argparse.Namespace, coalesce_reads: bool) -> list[object]:
+    table = StubTable(products, args.latency_ms)
+    client = boto3.client('dynamodb', config=Config(max_pool_connections=args.threads))
+    client.meta.events.register('before-call.dynamodb.GetItem', table.get_item)
+    db_handler = DynamoDbHandler(
+        TABLE_NAME,
+        client=client,
+        hedged_reader=HedgedReader(hedge_reads=False, hedge_delay_ms=1, max_workers=1),
+        # throttling is not simulated, the breaker stays closed
+        circuit_breaker=CircuitBreaker(failure_rate=1, min_calls=1, window_seconds=1, open_seconds=1, half_open_calls=1),
+        coalesce_reads=coalesce_reads,
+    )
+    keys = [sampler.sample() for _ in range(args.reads)]
+
+    def get(product_id: str) -> float:
+        start = time.perf_counter()
+        db_handler.get_product(product_id)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    # the coalesced reads add a metric each, flushed to stdout every 100 values
+    with ThreadPoolExecutor(max_workers=args.threads) as executor, contextlib.redirect_stdout(io.StringIO()):
+        latencies_ms = sorted(executor.map(get, keys))
+    elapsed = time.perf_counter() - start
+    return [
+        sampler.distribution,
+        'on' if coalesce_reads else 'off',
+        args.reads,
+        table.calls,
+        f'{table.calls / args.reads:.2f}',
+        f'{args.reads / elapsed:.0f}',
+        f'{percentile(latencies_ms, 0.5):.1f}',
+        f'{percentile(latencies_ms, 0.99):.1f}',
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=1_000, help='size of the key space')
+    parser.add_argument('--reads', type=int, default=5_000, help='product reads per run')
+    parser.add_argument('--threads', type=int, default=32, help='concurrent readers')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='latency of a get_item call')
+    parser.add_argument('--zipf-exponent', type=float, default=1.1, help='skew of the Zipf distribution')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the key sampler')
+    args = parser.parse_args()
+
+    logger.setLevel(logging.ERROR)  # the DAL logs every operation at INFO level
+    products = [generate_product_dict() for _ in range(args.products)]
+    rows = []
+    for distribution in ('zipf', 'uniform'):
+        for coalesce_reads in (False, True):
+            # every run reads the same keys in the same order
+            sampler = KeySampler([product['id'] for product in products], distribution, args.zipf_exponent, random.Random(args.seed))
+            rows.append(_run(products, sampler, args, coalesce_reads))
+    print_table(['keys', 'coalesced', 'reads', 'backend calls', 'calls/read', 'reads/s', 'p50 ms', 'p99 ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
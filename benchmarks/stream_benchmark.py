@@ -0,0 +1,143 @@
+"""Stream processor throughput and memory per DynamoDB stream batch size.
+
+Batches from `StreamSimulator` go through the `process_stream` Lambda handler with the real `EventHandler` and
+EventBridge provider, whose client is a stub that accepts every entry without network calls, so the numbers cover
+record parsing, notifications, event building and PutEvents serialization.
+Memory is the peak traced allocation while processing a batch, measured in a separate run since tracing slows it down.
+
+The per-stage durations of the largest batch are read back from the handler's EMF metrics, along with the cost of
+the stage timers themselves.
+
+Run with `make benchmark` or `python -m benchmarks.stream_benchmark --oversized-ratio 0.01`.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import time
+import tracemalloc
+import uuid
+from typing import Any, Callable
+
+from benchmarks.local_server import build_lambda_context
+from benchmarks.stream_simulator import StreamSimulator
+from benchmarks.utils import print_table
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000]
+REPEAT = 3
+
+
+class StubEventBridgeClient:
+    """Accepts every PutEvents entry, and counts them."""
+
+    def __init__(self) -> None:
+        self.entries = 0
+
+    def put_events(self, Entries: list[dict[str, Any]]) -> dict[str, Any]:  # noqa: N803 boto3 parameter name
+        self.entries += len(Entries)
+        return {'FailedEntryCount': 0, 'Entries': [{'EventId': str(uuid.uuid4())} for _ in Entries]}
+
+
+def configure_environment(log_level: str) -> None:
+    defaults = {
+        'POWERTOOLS_SERVICE_NAME': 'Product',
+        'LOG_LEVEL': log_level,
+        'POWERTOOLS_TRACE_DISABLED': 'true',
+        'POWERTOOLS_METRICS_NAMESPACE': 'ProductService',
+        'EVENT_BUS': 'products',
+        'EVENT_SOURCE': 'myorg.product.product_notification',
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+
+def build_processor() -> tuple[Callable[[dict[str, Any]], dict[str, float]], StubEventBridgeClient]:
+    """Return a function processing one stream batch like the Lambda handler, and the stub client it publishes to.
+
+    The function returns the stage durations in milliseconds, from the EMF metrics of the invocation.
+    """
+    # imported after the environment is configured, the observability objects read it at import time
+    process_stream = importlib.import_module('product.stream_processor.handlers.process_stream').process_stream
+    event_handler_module = importlib.import_module('product.stream_processor.integrations.events.event_handler')
+    provider_module = importlib.import_module('product.stream_processor.integrations.events.providers.eventbridge')
+
+    client = StubEventBridgeClient()
+    event_handler = event_handler_module.EventHandler(
+        event_source=os.environ['EVENT_SOURCE'],
+        event_bus=os.environ['EVENT_BUS'],
+        provider=provider_module.EventBridge(bus_name=os.environ['EVENT_BUS'], client=client),
+    )
+
+    def process(batch: dict[str, Any]) -> dict[str, float]:
+        # the metrics decorator prints the EMF blob of every invocation
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            process_stream(batch, build_lambda_context(), event_handler=event_handler)
+        emf_blob = json.loads(output.getvalue().splitlines()[-1])
+        # a metric added once per invocation is a single value list
+        return {name.removesuffix('Duration'): sum(values) for name, values in emf_blob.items() if name.endswith('Duration')}
+
+    return process, client
+
+
+def _stage_timer_overhead_us(stages: int) -> float:
+    """Cost of timing `stages` stages and publishing them as metrics, once per invocation, in microseconds."""
+    stage_timer = importlib.import_module('product.observability').stage_timer
+    metrics = importlib.import_module('product.observability').metrics
+    repeat = 10_000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for idx in range(stages):
+            with stage_timer.stage(f'Stage{idx}'):
+                pass
+        stage_timer.add_metrics()
+        metrics.clear_metrics()
+    return (time.perf_counter() - start) * 1_000_000 / repeat
+
+
+def _peak_memory_mb(process: Callable[[dict[str, Any]], dict[str, float]], batch: dict[str, Any]) -> float:
+    tracemalloc.start()
+    try:
+        process(batch)
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duplicate-ratio', type=float, default=0.1, help='fraction of records changing a product already in the batch')
+    parser.add_argument('--oversized-ratio', type=float, default=0, help='fraction of records with a ~350 KB image')
+    # the handler logs the whole event and every record at INFO level
+    parser.add_argument('--log-level', default='CRITICAL', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'])
+    args = parser.parse_args()
+
+    configure_environment(args.log_level)
+    simulator = StreamSimulator(duplicate_ratio=args.duplicate_ratio, oversized_ratio=args.oversized_ratio, seed=42)
+    process, client = build_processor()
+    process(simulator.generate_batch(10))  # warm up imports and lazily built validators
+
+    rows = []
+    stage_durations: dict[str, float] = {}
+    for size in BATCH_SIZES:
+        batches = [simulator.generate_batch(size) for _ in range(REPEAT)]
+        events_before = client.entries
+        start = time.perf_counter()
+        for batch in batches:
+            stage_durations = process(batch)
+        elapsed = time.perf_counter() - start
+        events = client.entries - events_before
+        peak_mb = _peak_memory_mb(process, simulator.generate_batch(size))
+        rows.append([size, f'{elapsed * 1000 / REPEAT:.1f}', f'{size * REPEAT / elapsed:.0f}', f'{events / elapsed:.0f}', f'{peak_mb:.1f}'])
+    print_table(['batch size', 'ms/batch', 'records/s', 'events/s', 'peak MB'], rows)
+
+    batch_ms = sum(stage_durations.values())
+    overhead_us = _stage_timer_overhead_us(len(stage_durations))
+    print(f'\nstages of the last {BATCH_SIZES[-1]} records batch, timers cost {overhead_us:.1f} us ({overhead_us / 10 / batch_ms:.4f}% of the batch)')
+    print_table(['stage', 'ms', 'share'], [[name, f'{ms:.1f}', f'{100 * ms / batch_ms:.1f}%'] for name, ms in stage_durations.items()])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""DynamoDB stream batch generator, shaped like the events Lambda receives from the products table stream.
+
+`StreamSimulator` keeps its state between batches, like a shard does: sequence numbers only grow, and MODIFY and
+REMOVE records refer to products inserted earlier. Batches can repeat keys (several changes of one product in a batch)
+and carry oversized images, to size the stream processor's parsing and memory cost.
+"""
+
+import random
+import time
+import uuid
+from typing import Any, Optional
+
+from benchmarks.utils import generate_product_name
+from product.models.products.product import PRODUCT_CATALOG
+
+EVENT_SOURCE_ARN = 'arn:aws:dynamodb:us-east-1:123456789012:table/products/stream/2023-09-29T09:00:01.491'
+# DynamoDB items are at most 400 KB, oversized images carry a large attribute just under that limit
+OVERSIZED_ATTRIBUTE_BYTES = 350_000
+
+
+class StreamSimulator:
+    """Builds DynamoDB stream events with monotonic sequence numbers.
+
+    Parameters
+    ----------
+    insert_weight : float
+        Relative weight of INSERT records, by default 0.5
+    modify_weight : float
+        Relative weight of MODIFY records, by default 0.3
+    remove_weight : float
+        Relative weight of REMOVE records, by default 0.2
+    duplicate_ratio : float
+        Fraction of records that change a product already changed earlier in the same batch, by default 0
+    oversized_ratio : float
+        Fraction of records with an image of about `OVERSIZED_ATTRIBUTE_BYTES`, by default 0
+    seed : Optional[int]
+        Seed for reproducible batches, by default None
+    """
+
+    def __init__(
+        self,
+        insert_weight: float = 0.5,
+        modify_weight: float = 0.3,
+        remove_weight: float = 0.2,
+        duplicate_ratio: float = 0,
+        oversized_ratio: float = 0,
+        seed: Optional[int] = None,
+    ):
+        self.weights = {'INSERT': insert_weight, 'MODIFY': modify_weight, 'REMOVE': remove_weight}
+        self.duplicate_ratio = duplicate_ratio
+        self.oversized_ratio = oversized_ratio
+        self.rng = random.Random(seed)
+        self.sequence_number = 10**20
+        self._products: dict[str, dict[str, Any]] = {}  # product id -> latest image of the products in the table
+        self._product_ids: list[str] = []  # same ids, to pick one at random in constant time
+        self._positions: dict[str, int] = {}  # product id -> index in _product_ids
+
+    def _next_sequence_number(self) -> str:
+        self.sequence_number += self.rng.randint(1, 1_000)
+        return str(self.sequence_number)
+
+    def _new_image(self, product_id: str, version: int) -> dict[str, Any]:
+        image = {
+            'id': {'S': product_id},
+            'name': {'S': generate_product_name(self.rng)},
+            'price': {'N': str(self.rng.randint(1, 10_000))},
+            'created_at': {'N': str(int(time.time()))},
+            'catalog': {'S': PRODUCT_CATALOG},
+            'version': {'N': str(version)},
+        }
+        if self.rng.random() < self.oversized_ratio:
+            image['description'] = {'S': 'x' * OVERSIZED_ATTRIBUTE_BYTES}
+        return image
+
+    def _pick_event_name(self) -> str:
+        event_name = self.rng.choices(list(self.weights), weights=list(self.weights.values()))[0]
+        # there is nothing to modify or remove in an empty table
+        return event_name if self._products else 'INSERT'
+
+    def _pick_product_id(self, event_name: str, batch_product_ids: list[str]) -> str:
+        if batch_product_ids and self.rng.random() < self.duplicate_ratio:
+            product_id = self.rng.choice(batch_product_ids)
+            if event_name != 'INSERT' or product_id not in self._products:
+                return product_id
+        if event_name == 'INSERT':
+            return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+        return self.rng.choice(self._product_ids)
+
+    def _store(self, product_id: str, image: dict[str, Any]) -> None:
+        if product_id not in self._products:
+            self._positions[product_id] = len(self._product_ids)
+            self._product_ids.append(product_id)
+        self._products[product_id] = image
+
+    def _remove(self, product_id: str) -> None:
+        del self._products[product_id]
+        # swap with the last id so removal is constant time
+        position, last_id = self._positions.pop(product_id), self._product_ids.pop()
+        if last_id != product_id:
+            self._product_ids[position] = last_id
+            self._positions[last_id] = position
+
+    def _record(self, event_name: str, product_id: str) -> dict[str, Any]:
+        old_image = self._products.get(product_id)
+        if event_name == 'INSERT' or old_image is None:
+            event_name, new_image = 'INSERT', self._new_image(product_id, version=1)
+        elif event_name == 'MODIFY':
+            new_image = {**self._new_image(product_id, version=int(old_image['version']['N']) + 1), 'created_at': old_image['created_at']}
+        else:
+            new_image = None
+
+        stream_record: dict[str, Any] = {
+            'ApproximateCreationDateTime': time.time(),
+            'Keys': {'id': {'S': product_id}},
+            'SequenceNumber': self._next_sequence_number(),
+            'StreamViewType': 'NEW_AND_OLD_IMAGES',
+        }
+        if new_image is not None:
+            stream_record['NewImage'] = new_image
+            self._store(product_id, new_image)
+        else:
+            self._remove(product_id)
+        if old_image is not None:
+            stream_record['OldImage'] = old_image
+        stream_record['SizeBytes'] = sum(len(str(image)) for image in (new_image, old_image) if image is not None)
+
+        return {
+            'eventID': uuid.UUID(int=self.rng.getrandbits(128)).hex,
+            'eventName': event_name,
+            'eventVersion': '1.1',
+            'eventSource': 'aws:dynamodb',
+            'awsRegion': 'us-east-1',
+            'dynamodb': stream_record,
+            'eventSourceARN': EVENT_SOURCE_ARN,
+        }
+
+    def generate_batch(self, size: int) -> dict[str, Any]:
+        """Build a DynamoDB stream event of `size` records, following the records of the previous batches.
+
+        Parameters
+        ----------
+        size : int
+            Number of records in the batch, Lambda delivers at most 10,000
+
+        Returns
+        -------
+        dict[str, Any]
+            DynamoDB stream event
+        """
+        records = []
+        batch_product_ids: list[str] = []
+        for _ in range(size):
+            event_name = self._pick_event_name()
+            product_id = self._pick_product_id(event_name, batch_product_ids)
+            records.append(self._record(event_name, product_id))
+            batch_product_ids.append(product_id)
+        return {'Records': records}
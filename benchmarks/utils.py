@@ -0,0 +1,42 @@
+import math
+import random
+import statistics
+import time
+import uuid
+from typing import Callable, Optional
+
+# product names in real catalogs are made of a small vocabulary, which matters for compression ratios
+_NAME_WORDS = ['red', 'blue', 'large', 'small', 'cotton', 'steel', 'lamp', 'chair', 'shirt', 'mug', 'desk', 'pro', 'mini', 'eco']
+
+
+def generate_product_name(rng: Optional[random.Random] = None) -> str:
+    return ' '.join((rng or random).sample(_NAME_WORDS, k=2))[:20]
+
+
+def generate_product_dict(product_id: str = '') -> dict:
+    return {'id': product_id or str(uuid.uuid4()), 'name': generate_product_name(), 'price': random.randint(1, 10000)}
+
+
+def measure_ms(func: Callable[[], object], repeat: int = 20) -> float:
+    """Returns the median wall time of `func` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def print_table(headers: list[str], rows: list[list[object]]) -> None:
+    widths = [max(len(str(value)) for value in [header, *(row[idx] for row in rows)]) for idx, header in enumerate(headers)]
+    print('  '.join(header.rjust(width) for header, width in zip(headers, widths, strict=True)))
+    for row in rows:
+        print('  '.join(str(value).rjust(width) for value, width in zip(row, widths, strict=True)))
+
+
+def percentile(sorted_samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples, e.g. `fraction=0.999` for p999."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_samples)))
+    return sorted_samples[rank - 1]
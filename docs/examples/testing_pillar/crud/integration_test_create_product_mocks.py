@@ -3,6 +3,7 @@ from http import HTTPMethod, HTTPStatus
 from botocore.stub import Stubber
 
 from product.crud.handlers.handle_create_product import handle_create_product
+from product.crud.integration import get_db_handler_registry
 from product.crud.integration.dynamo_db_handler import DynamoDbHandler
 from tests.crud_utils import generate_create_product_request_body, generate_product_api_gw_event, generate_product_id
 from tests.utils import generate_context
@@ -10,8 +11,7 @@ from tests.utils import generate_context
 
 def test_internal_server_error(table_name: str) -> None:
     db_handler: DynamoDbHandler = DynamoDbHandler('table')
-    table = db_handler._get_table(table_name)
-    stubber = Stubber(table.meta.client)
+    stubber = Stubber(db_handler.client)
     stubber.add_client_error(method='put_item', service_error_code='ValidationException')
     stubber.activate()
     body = generate_create_product_request_body()
@@ -28,4 +28,4 @@ def test_internal_server_error(table_name: str) -> None:
 
     assert response['statusCode'] == HTTPStatus.INTERNAL_SERVER_ERROR
     stubber.deactivate()
-    DynamoDbHandler._instances = {}
+    get_db_handler_registry.cache_clear()
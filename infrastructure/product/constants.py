@@ -4,25 +4,44 @@ CREATE_PRODUCT_ROLE = 'ServiceRole'
 DELETE_PRODUCT_ROLE = 'DeleteRole'
 LIST_PRODUCTS_ROLE = 'ListRole'
 GET_PRODUCT_ROLE = 'GetRole'
+UPDATE_PRODUCT_ROLE = 'UpdateRole'
+SEARCH_PRODUCTS_ROLE = 'SearchRole'
+PRODUCT_STATS_ROLE = 'StatsRole'
 CREATE_LAMBDA = 'CreateProduct'
 DELETE_LAMBDA = 'DeleteProduct'
 GET_LAMBDA = 'GetProduct'
 LIST_LAMBDA = 'ListProducts'
+UPDATE_LAMBDA = 'UpdateProduct'
+SEARCH_LAMBDA = 'SearchProducts'
+STATS_LAMBDA = 'ProductStats'
 TABLE_NAME = 'products'
 IDEMPOTENCY_TABLE_NAME = 'IdempotencyTable'
+CATALOG_STATS_TABLE_NAME = 'CatalogStatsTable'
+CATALOG_INDEX_PARTITION_KEY = 'catalog'
+PRICE_INDEX_NAME = 'price_index'  # must match product/crud/integration/constants.py
+NAME_INDEX_NAME = 'name_index'  # must match product/crud/integration/constants.py
 TABLE_NAME_OUTPUT = 'DbOutput'
 IDEMPOTENCY_TABLE_NAME_OUTPUT = 'IdempotencyDbOutput'
+CATALOG_BUCKET_NAME = 'CatalogBucket'
+CATALOG_SNAPSHOT_KEY = 'catalog/products.json.gz'  # must match the default of product/catalog/models.py
+CATALOG_SEARCH_INDEX_KEY = 'catalog/search_index.bin.gz'  # must match the default of product/catalog/models.py
 APIGATEWAY = 'Apigateway'
 PRODUCT_RESOURCE = 'product'
 MONITORING_TOPIC = 'MonitoringTopic'
 PRODUCTS_RESOURCE = 'products'
+SEARCH_RESOURCE = 'search'
+STATS_RESOURCE = 'stats'
 LAMBDA_LAYER_NAME = 'common'
 API_HANDLER_LAMBDA_MEMORY_SIZE = 128  # MB
 API_HANDLER_LAMBDA_TIMEOUT = 10  # seconds
+SEARCH_LAMBDA_MEMORY_SIZE = 1024  # MB, the search index is held in memory, see benchmarks/search_benchmark.py
+API_MIN_COMPRESSION_SIZE_BYTES = 1024  # smaller responses are not gzipped, see benchmarks/compression_benchmark.py
 POWERTOOLS_SERVICE_NAME = 'POWERTOOLS_SERVICE_NAME'
 SERVICE_NAME_TAG = 'service'
 METRICS_DIMENSION_KEY = 'service'
 METRICS_NAMESPACE = 'products_kpi'
+# stages timed by the CRUD handlers, published as '<lambda name><stage>Duration' metrics in milliseconds
+ROUTE_LATENCY_STAGES = ['Total', 'Validation', 'DomainLogic', 'DynamoDb', 'Serialization']
 SERVICE_NAME = 'Product'
 POWERTOOLS_TRACE_DISABLED = 'POWERTOOLS_TRACE_DISABLED'
 POWER_TOOLS_LOG_LEVEL = 'LOG_LEVEL'
@@ -44,7 +63,7 @@ STREAM_PROCESSOR_CONSTRUCT_NAME = 'StreamProc'
 STREAM_PROCESSOR_EVENT_BUS_NAME = 'events'
 STREAM_PROCESSOR_EVENT_SOURCE_NAME = 'myorg.product.product_notification'
 STREAM_PROCESSOR_LAMBDA = 'StreamProcessor'
-STREAM_PROCESSOR_LAMBDA_MEMORY_SIZE = 128  # MB
+STREAM_PROCESSOR_LAMBDA_MEMORY_SIZE = 1024  # MB, the catalog snapshot and search index are updated in memory
 STREAM_PROCESSOR_LAMBDA_TIMEOUT = 120  # seconds
 STREAM_PROCESSOR_LAMBDA_SERVICE_ROLE_ARN = 'StreamRoleArn'
 
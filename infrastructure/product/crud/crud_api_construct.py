@@ -1,7 +1,8 @@
-from aws_cdk import CfnOutput, Duration, aws_apigateway
+from aws_cdk import CfnOutput, Duration, Size, aws_apigateway
 from aws_cdk import aws_dynamodb as dynamodb
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as _lambda
+from aws_cdk import aws_s3 as s3
 from aws_cdk.aws_lambda_python_alpha import PythonLayerVersion
 from aws_cdk.aws_logs import RetentionDays
 from constructs import Construct
@@ -26,8 +27,13 @@ class CrudApiConstruct(Construct):
         self.create_prod_func = self._add_put_product_lambda_integration(product_resource, self.api_db.db, self.api_db.idempotency_db, authorizer)
         self.delete_prod_func = self._add_delete_product_lambda_integration(product_resource, self.api_db.db, authorizer)
         self.get_prod_func = self._add_get_product_lambda_integration(product_resource, self.api_db.db, authorizer)
+        self.update_prod_func = self._add_update_product_lambda_integration(product_resource, self.api_db.db, authorizer)
         products_resource: aws_apigateway.Resource = api_resource.add_resource(constants.PRODUCTS_RESOURCE)
-        self.list_prods_func = self._add_list_products_lambda_integration(products_resource, self.api_db.db, authorizer)
+        self.list_prods_func = self._add_list_products_lambda_integration(products_resource, self.api_db.db, self.api_db.catalog_bucket, authorizer)
+        search_resource = products_resource.add_resource(constants.SEARCH_RESOURCE)
+        self.search_prods_func = self._add_search_products_lambda_integration(search_resource, self.api_db.db, self.api_db.catalog_bucket, authorizer)
+        stats_resource = products_resource.add_resource(constants.STATS_RESOURCE)
+        self.prod_stats_func = self._add_product_stats_lambda_integration(stats_resource, self.api_db.db, self.api_db.catalog_stats_db, authorizer)
         # add CW dashboards
         self.dashboard = CrudMonitoring(
             self,
@@ -35,7 +41,15 @@ class CrudApiConstruct(Construct):
             crud_api=self.rest_api,
             db=self.api_db.db,
             idempotency_table=self.api_db.idempotency_db,
-            functions=[self.create_prod_func, self.delete_prod_func, self.get_prod_func, self.list_prods_func],
+            functions=[
+                self.create_prod_func,
+                self.delete_prod_func,
+                self.get_prod_func,
+                self.update_prod_func,
+                self.list_prods_func,
+                self.search_prods_func,
+                self.prod_stats_func,
+            ],
         )
         if is_production:
             # add WAF
@@ -49,6 +63,8 @@ class CrudApiConstruct(Construct):
             description='This service handles /api/product requests',
             deploy_options=aws_apigateway.StageOptions(throttling_rate_limit=2, throttling_burst_limit=10),
             cloud_watch_role=False,
+            # gzip is negotiated by API Gateway on Accept-Encoding, keeping the CPU cost and base64 overhead out of the Lambda handlers
+            min_compression_size=Size.bytes(constants.API_MIN_COMPRESSION_SIZE_BYTES),
         )
 
         CfnOutput(self, id=constants.APIGATEWAY, value=rest_api.url).override_logical_id(constants.APIGATEWAY)
@@ -126,7 +142,28 @@ class CrudApiConstruct(Construct):
             ],
         )
 
-    def _build_list_products_lambda_role(self, db: dynamodb.Table) -> iam.Role:
+    def _build_update_product_lambda_role(self, db: dynamodb.Table) -> iam.Role:
+        return iam.Role(
+            self,
+            constants.UPDATE_PRODUCT_ROLE,
+            assumed_by=iam.ServicePrincipal('lambda.amazonaws.com'),
+            inline_policies={
+                'dynamodb_db': iam.PolicyDocument(
+                    statements=[
+                        iam.PolicyStatement(
+                            actions=['dynamodb:UpdateItem'],
+                            resources=[db.table_arn],
+                            effect=iam.Effect.ALLOW,
+                        )
+                    ]
+                ),
+            },
+            managed_policies=[
+                iam.ManagedPolicy.from_aws_managed_policy_name(managed_policy_name=(f'service-role/{constants.LAMBDA_BASIC_EXECUTION_ROLE}'))
+            ],
+        )
+
+    def _build_list_products_lambda_role(self, db: dynamodb.Table, catalog_bucket: s3.Bucket) -> iam.Role:
         return iam.Role(
             self,
             constants.LIST_PRODUCTS_ROLE,
@@ -138,7 +175,91 @@ class CrudApiConstruct(Construct):
                             actions=['dynamodb:Scan'],
                             resources=[db.table_arn],
                             effect=iam.Effect.ALLOW,
-                        )
+                        ),
+                        iam.PolicyStatement(
+                            actions=['dynamodb:Query'],
+                            resources=[f'{db.table_arn}/index/*'],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                    ]
+                ),
+                'catalog_snapshot': iam.PolicyDocument(
+                    statements=[
+                        iam.PolicyStatement(
+                            actions=['s3:GetObject'],
+                            resources=[catalog_bucket.arn_for_objects(constants.CATALOG_SNAPSHOT_KEY)],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                        # without it, a snapshot that was not written yet is reported as access denied instead of missing
+                        iam.PolicyStatement(
+                            actions=['s3:ListBucket'],
+                            resources=[catalog_bucket.bucket_arn],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                    ]
+                ),
+            },
+            managed_policies=[
+                iam.ManagedPolicy.from_aws_managed_policy_name(managed_policy_name=(f'service-role/{constants.LAMBDA_BASIC_EXECUTION_ROLE}'))
+            ],
+        )
+
+    def _build_search_products_lambda_role(self, db: dynamodb.Table, catalog_bucket: s3.Bucket) -> iam.Role:
+        return iam.Role(
+            self,
+            constants.SEARCH_PRODUCTS_ROLE,
+            assumed_by=iam.ServicePrincipal('lambda.amazonaws.com'),
+            inline_policies={
+                'dynamodb_db': iam.PolicyDocument(
+                    statements=[
+                        # name index fallback when the search index is not available
+                        iam.PolicyStatement(
+                            actions=['dynamodb:Query'],
+                            resources=[f'{db.table_arn}/index/*'],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                    ]
+                ),
+                'catalog_search_index': iam.PolicyDocument(
+                    statements=[
+                        iam.PolicyStatement(
+                            actions=['s3:GetObject'],
+                            resources=[catalog_bucket.arn_for_objects(constants.CATALOG_SEARCH_INDEX_KEY)],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                        # without it, an index that was not written yet is reported as access denied instead of missing
+                        iam.PolicyStatement(
+                            actions=['s3:ListBucket'],
+                            resources=[catalog_bucket.bucket_arn],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                    ]
+                ),
+            },
+            managed_policies=[
+                iam.ManagedPolicy.from_aws_managed_policy_name(managed_policy_name=(f'service-role/{constants.LAMBDA_BASIC_EXECUTION_ROLE}'))
+            ],
+        )
+
+    def _build_product_stats_lambda_role(self, db: dynamodb.Table, catalog_stats_table: dynamodb.Table) -> iam.Role:
+        return iam.Role(
+            self,
+            constants.PRODUCT_STATS_ROLE,
+            assumed_by=iam.ServicePrincipal('lambda.amazonaws.com'),
+            inline_policies={
+                'dynamodb_db': iam.PolicyDocument(
+                    statements=[
+                        iam.PolicyStatement(
+                            actions=['dynamodb:GetItem'],
+                            resources=[catalog_stats_table.table_arn],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                        # the aggregates are computed from the products table when they can't be read
+                        iam.PolicyStatement(
+                            actions=['dynamodb:Scan'],
+                            resources=[db.table_arn],
+                            effect=iam.Effect.ALLOW,
+                        ),
                     ]
                 ),
             },
@@ -263,13 +384,52 @@ class CrudApiConstruct(Construct):
         )
         return lambda_function
 
+    def _add_update_product_lambda_integration(
+        self,
+        resource: aws_apigateway.Resource,
+        db: dynamodb.Table,
+        auth: aws_apigateway.CognitoUserPoolsAuthorizer,
+    ) -> _lambda.Function:
+        role = self._build_update_product_lambda_role(db)
+        lambda_function = _lambda.Function(
+            self,
+            constants.UPDATE_LAMBDA,
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            code=_lambda.Code.from_asset(constants.BUILD_FOLDER),
+            handler='product.crud.handlers.handle_update_product.lambda_handler',
+            environment={
+                constants.POWERTOOLS_SERVICE_NAME: constants.SERVICE_NAME,  # for logger, tracer and metrics
+                constants.POWER_TOOLS_LOG_LEVEL: 'DEBUG',  # for logger
+                'TABLE_NAME': db.table_name,
+            },
+            tracing=_lambda.Tracing.ACTIVE,
+            retry_attempts=0,
+            timeout=Duration.seconds(constants.API_HANDLER_LAMBDA_TIMEOUT),
+            memory_size=constants.API_HANDLER_LAMBDA_MEMORY_SIZE,
+            layers=[self.common_layer],
+            role=role,
+            log_retention=RetentionDays.ONE_DAY,
+            log_format=_lambda.LogFormat.JSON.value,
+            system_log_level=_lambda.SystemLogLevel.INFO.value,
+        )
+
+        # PATCH /api/product/{product}/
+        resource.add_method(
+            http_method='PATCH',
+            integration=aws_apigateway.LambdaIntegration(handler=lambda_function),
+            authorization_type=aws_apigateway.AuthorizationType.COGNITO,
+            authorizer=auth,
+        )
+        return lambda_function
+
     def _add_list_products_lambda_integration(
         self,
         api_resource: aws_apigateway.Resource,
         db: dynamodb.Table,
+        catalog_bucket: s3.Bucket,
         auth: aws_apigateway.CognitoUserPoolsAuthorizer,
     ) -> _lambda.Function:
-        role = self._build_list_products_lambda_role(db)
+        role = self._build_list_products_lambda_role(db, catalog_bucket)
         lambda_function = _lambda.Function(
             self,
             constants.LIST_LAMBDA,
@@ -280,6 +440,8 @@ class CrudApiConstruct(Construct):
                 constants.POWERTOOLS_SERVICE_NAME: constants.SERVICE_NAME,  # for logger, tracer and metrics
                 constants.POWER_TOOLS_LOG_LEVEL: 'DEBUG',  # for logger
                 'TABLE_NAME': db.table_name,
+                'CATALOG_SNAPSHOT_STORE': 's3',
+                'CATALOG_SNAPSHOT_BUCKET': catalog_bucket.bucket_name,
             },
             tracing=_lambda.Tracing.ACTIVE,
             retry_attempts=0,
@@ -301,3 +463,86 @@ class CrudApiConstruct(Construct):
         )
 
         return lambda_function
+
+    def _add_search_products_lambda_integration(
+        self,
+        api_resource: aws_apigateway.Resource,
+        db: dynamodb.Table,
+        catalog_bucket: s3.Bucket,
+        auth: aws_apigateway.CognitoUserPoolsAuthorizer,
+    ) -> _lambda.Function:
+        role = self._build_search_products_lambda_role(db, catalog_bucket)
+        lambda_function = _lambda.Function(
+            self,
+            constants.SEARCH_LAMBDA,
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            code=_lambda.Code.from_asset(constants.BUILD_FOLDER),
+            handler='product.crud.handlers.handle_search_products.lambda_handler',
+            environment={
+                constants.POWERTOOLS_SERVICE_NAME: constants.SERVICE_NAME,  # for logger, tracer and metrics
+                constants.POWER_TOOLS_LOG_LEVEL: 'DEBUG',  # for logger
+                'TABLE_NAME': db.table_name,
+                'CATALOG_SNAPSHOT_STORE': 's3',
+                'CATALOG_SNAPSHOT_BUCKET': catalog_bucket.bucket_name,
+            },
+            tracing=_lambda.Tracing.ACTIVE,
+            retry_attempts=0,
+            timeout=Duration.seconds(constants.API_HANDLER_LAMBDA_TIMEOUT),
+            memory_size=constants.SEARCH_LAMBDA_MEMORY_SIZE,
+            layers=[self.common_layer],
+            role=role,
+            log_retention=RetentionDays.ONE_DAY,
+            log_format=_lambda.LogFormat.JSON.value,
+            system_log_level=_lambda.SystemLogLevel.INFO.value,
+        )
+
+        # GET /api/products/search
+        api_resource.add_method(
+            http_method='GET',
+            integration=aws_apigateway.LambdaIntegration(handler=lambda_function),
+            authorization_type=aws_apigateway.AuthorizationType.COGNITO,
+            authorizer=auth,
+        )
+
+        return lambda_function
+
+    def _add_product_stats_lambda_integration(
+        self,
+        api_resource: aws_apigateway.Resource,
+        db: dynamodb.Table,
+        catalog_stats_table: dynamodb.Table,
+        auth: aws_apigateway.CognitoUserPoolsAuthorizer,
+    ) -> _lambda.Function:
+        role = self._build_product_stats_lambda_role(db, catalog_stats_table)
+        lambda_function = _lambda.Function(
+            self,
+            constants.STATS_LAMBDA,
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            code=_lambda.Code.from_asset(constants.BUILD_FOLDER),
+            handler='product.crud.handlers.handle_get_product_stats.lambda_handler',
+            environment={
+                constants.POWERTOOLS_SERVICE_NAME: constants.SERVICE_NAME,  # for logger, tracer and metrics
+                constants.POWER_TOOLS_LOG_LEVEL: 'DEBUG',  # for logger
+                'TABLE_NAME': db.table_name,
+                'CATALOG_STATS_TABLE_NAME': catalog_stats_table.table_name,
+            },
+            tracing=_lambda.Tracing.ACTIVE,
+            retry_attempts=0,
+            timeout=Duration.seconds(constants.API_HANDLER_LAMBDA_TIMEOUT),
+            memory_size=constants.API_HANDLER_LAMBDA_MEMORY_SIZE,
+            layers=[self.common_layer],
+            role=role,
+            log_retention=RetentionDays.ONE_DAY,
+            log_format=_lambda.LogFormat.JSON.value,
+            system_log_level=_lambda.SystemLogLevel.INFO.value,
+        )
+
+        # GET /api/products/stats
+        api_resource.add_method(
+            http_method='GET',
+            integration=aws_apigateway.LambdaIntegration(handler=lambda_function),
+            authorization_type=aws_apigateway.AuthorizationType.COGNITO,
+            authorizer=auth,
+        )
+
+        return lambda_function
@@ -1,5 +1,6 @@
 from aws_cdk import CfnOutput, RemovalPolicy
 from aws_cdk import aws_dynamodb as dynamodb
+from aws_cdk import aws_s3 as s3
 from constructs import Construct
 
 import infrastructure.product.constants as constants
@@ -11,6 +12,35 @@ class ApiDbConstruct(Construct):
 
         self.db: dynamodb.Table = self._build_db(id_)
         self.idempotency_db: dynamodb.Table = self._build_idempotency_table(id_)
+        self.catalog_bucket: s3.Bucket = self._build_catalog_bucket(id_)
+        self.catalog_stats_db: dynamodb.Table = self._build_catalog_stats_table(id_)
+
+    def _build_catalog_stats_table(self, id_: str) -> dynamodb.Table:
+        # a single item of aggregates the stream processor updates and the product stats handler reads, and the markers
+        # of the applied stream batches, expired by TTL
+        table_id = f'{id_}{constants.CATALOG_STATS_TABLE_NAME}'
+        return dynamodb.Table(
+            self,
+            table_id,
+            table_name=table_id,
+            partition_key=dynamodb.Attribute(name='id', type=dynamodb.AttributeType.STRING),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+            time_to_live_attribute='expiration',
+            point_in_time_recovery=True,
+        )
+
+    def _build_catalog_bucket(self, id_: str) -> s3.Bucket:
+        # holds the catalog snapshot the stream processor maintains and the list products handler serves
+        return s3.Bucket(
+            self,
+            f'{id_}{constants.CATALOG_BUCKET_NAME}',
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            enforce_ssl=True,
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True,
+        )
 
     def _build_idempotency_table(self, id_: str) -> dynamodb.Table:
         table_id = f'{id_}{constants.IDEMPOTENCY_TABLE_NAME}'
@@ -41,5 +71,23 @@ class ApiDbConstruct(Construct):
             removal_policy=RemovalPolicy.DESTROY,
             stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,  # Enable stream and set stream type,
         )
+        # all products share the catalog partition key, so price ranges and name prefixes can be queried instead of scanned.
+        # Each index is then a single partition, capped at ~1,000 writes/s and ~3,000 reads/s: every product write is
+        # also written to both indexes, and a throttled index throttles the table writes too. Shard the key past that.
+        # Products written before the indexes have no catalog and are in neither, run product.crud.cli.backfill_catalog.
+        # DynamoDB creates one index per stack update, adding both to an existing table takes two deploys: the price
+        # index first, then the name index.
+        table.add_global_secondary_index(
+            index_name=constants.PRICE_INDEX_NAME,
+            partition_key=dynamodb.Attribute(name=constants.CATALOG_INDEX_PARTITION_KEY, type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name='price', type=dynamodb.AttributeType.NUMBER),
+            projection_type=dynamodb.ProjectionType.ALL,
+        )
+        table.add_global_secondary_index(
+            index_name=constants.NAME_INDEX_NAME,
+            partition_key=dynamodb.Attribute(name=constants.CATALOG_INDEX_PARTITION_KEY, type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name='name', type=dynamodb.AttributeType.STRING),
+            projection_type=dynamodb.ProjectionType.ALL,
+        )
         CfnOutput(self, id=constants.TABLE_NAME_OUTPUT, value=table.table_name).override_logical_id(constants.TABLE_NAME_OUTPUT)
         return table
@@ -97,6 +97,14 @@ class CrudMonitoring(Construct):
             label='list products events',
             period=Duration.days(1),
         )
+        update_metric = metric_factory.create_metric(
+            metric_name='UpdateProductEvents',
+            namespace=constants.METRICS_NAMESPACE,
+            statistic=MetricStatistic.N,
+            dimensions_map={constants.METRICS_DIMENSION_KEY: constants.SERVICE_NAME},
+            label='update product events',
+            period=Duration.days(1),
+        )
         delete_metric = metric_factory.create_metric(
             metric_name='DeleteProductEvents',
             namespace=constants.METRICS_NAMESPACE,
@@ -106,7 +114,7 @@ class CrudMonitoring(Construct):
             period=Duration.days(1),
         )
 
-        group = CustomMetricGroup(metrics=[create_metric, get_metric, list_metric, delete_metric], title='Daily Product Requests')
+        group = CustomMetricGroup(metrics=[create_metric, get_metric, list_metric, update_metric, delete_metric], title='Daily Product Requests')
         high_level_facade.monitor_custom(metric_groups=[group], human_readable_name='Daily KPIs', alarm_friendly_name='KPIs')
 
     def _build_low_level_dashboard(self, db: dynamodb.Table, idempotency_table: dynamodb.Table, functions: list[_lambda.Function], topic: sns.Topic):
@@ -134,3 +142,48 @@ class CrudMonitoring(Construct):
 
         low_level_facade.monitor_dynamo_table(table=db, billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST)
         low_level_facade.monitor_dynamo_table(table=idempotency_table, billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST)
+        # requests answered by the create lambda idempotency local cache are not counted
+        idempotency_calls_metric = low_level_facade.create_metric_factory().create_metric(
+            metric_name='IdempotencyTableCalls',
+            namespace=constants.METRICS_NAMESPACE,
+            statistic=MetricStatistic.SUM,
+            dimensions_map={constants.METRICS_DIMENSION_KEY: constants.SERVICE_NAME},
+            label='idempotency table calls',
+            period=Duration.minutes(5),
+        )
+        low_level_facade.monitor_custom(
+            metric_groups=[CustomMetricGroup(metrics=[idempotency_calls_metric], title='Idempotency Table Round Trips')],
+            human_readable_name='Idempotency',
+            alarm_friendly_name='Idempotency',
+        )
+        self._add_route_latency_widgets(low_level_facade)
+
+    def _add_route_latency_widgets(self, facade: MonitoringFacade):
+        # one widget per route and percentile, to see which stage dominates the tail latency. DomainLogic includes DynamoDb
+        metric_factory = facade.create_metric_factory()
+        percentiles = [(MetricStatistic.P50, 'p50'), (MetricStatistic.P90, 'p90'), (MetricStatistic.P99, 'p99')]
+        routes = [
+            constants.CREATE_LAMBDA,
+            constants.GET_LAMBDA,
+            constants.LIST_LAMBDA,
+            constants.UPDATE_LAMBDA,
+            constants.DELETE_LAMBDA,
+            constants.SEARCH_LAMBDA,
+            constants.STATS_LAMBDA,
+        ]
+        for route in routes:
+            groups = []
+            for statistic, percentile in percentiles:
+                stage_metrics = [
+                    metric_factory.create_metric(
+                        metric_name=f'{route}{stage}Duration',
+                        namespace=constants.METRICS_NAMESPACE,
+                        statistic=statistic,
+                        dimensions_map={constants.METRICS_DIMENSION_KEY: constants.SERVICE_NAME},
+                        label=f'{stage} {percentile}',
+                        period=Duration.minutes(5),
+                    )
+                    for stage in constants.ROUTE_LATENCY_STAGES
+                ]
+                groups.append(CustomMetricGroup(metrics=stage_metrics, title=f'{route} {percentile} latency (ms)'))
+            facade.monitor_custom(metric_groups=groups, human_readable_name=f'{route} Latency', alarm_friendly_name=f'{route}Latency')
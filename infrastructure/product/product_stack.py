@@ -29,6 +29,8 @@ class ServiceStack(Stack):
             id_=get_construct_name(id, constants.STREAM_PROCESSOR_CONSTRUCT_NAME),
             lambda_layer=self.shared_layer,
             dynamodb_table=self.api.api_db.db,
+            catalog_bucket=self.api.api_db.catalog_bucket,
+            catalog_stats_table=self.api.api_db.catalog_stats_db,
         )
 
         # deploy testing construct only in non production accounts
@@ -70,5 +72,6 @@ class ServiceStack(Stack):
                 {'id': 'AwsSolutions-APIG3', 'reason': 'not mandatory in a sample template'},
                 {'id': 'AwsSolutions-APIG6', 'reason': 'not mandatory in a sample template'},
                 {'id': 'AwsSolutions-L1', 'reason': 'Python 3.12 not out yet'},
+                {'id': 'AwsSolutions-S1', 'reason': 'catalog snapshot bucket is only accessed by the service lambdas'},
             ],
         )
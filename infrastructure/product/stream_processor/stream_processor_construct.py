@@ -3,6 +3,7 @@ from aws_cdk import aws_dynamodb as dynamodb
 from aws_cdk import aws_events as events
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as _lambda
+from aws_cdk import aws_s3 as s3
 from aws_cdk.aws_lambda_event_sources import DynamoEventSource
 from aws_cdk.aws_lambda_python_alpha import PythonLayerVersion
 from aws_cdk.aws_logs import RetentionDays
@@ -13,20 +14,34 @@ import infrastructure.product.constants as constants
 
 
 class StreamProcessorConstruct(Construct):
-    def __init__(self, scope: Construct, id_: str, lambda_layer: PythonLayerVersion, dynamodb_table: dynamodb.Table) -> None:
+    def __init__(
+        self,
+        scope: Construct,
+        id_: str,
+        lambda_layer: PythonLayerVersion,
+        dynamodb_table: dynamodb.Table,
+        catalog_bucket: s3.Bucket,
+        catalog_stats_table: dynamodb.Table,
+    ) -> None:
         super().__init__(scope, id_)
         self.id_ = id_
         bus_name = f'{id_}{constants.STREAM_PROCESSOR_EVENT_BUS_NAME}'
         self.event_bus = events.EventBus(self, bus_name, event_bus_name=bus_name)
-        self.role = self._build_lambda_role(db=dynamodb_table, bus=self.event_bus)
-        self.lambda_function = self._build_stream_processor_lambda(self.role, lambda_layer, dynamodb_table, self.event_bus)
+        self.role = self._build_lambda_role(
+            db=dynamodb_table, bus=self.event_bus, catalog_bucket=catalog_bucket, catalog_stats_table=catalog_stats_table
+        )
+        self.lambda_function = self._build_stream_processor_lambda(
+            self.role, lambda_layer, dynamodb_table, self.event_bus, catalog_bucket, catalog_stats_table
+        )
         self._add_monitoring_dashboard(self.lambda_function)
 
         CfnOutput(self, id=constants.STREAM_PROCESSOR_TEST_EVENT_BUS_NAME_OUTPUT, value=self.event_bus.event_bus_name).override_logical_id(
             constants.STREAM_PROCESSOR_TEST_EVENT_BUS_NAME_OUTPUT
         )
 
-    def _build_lambda_role(self, db: dynamodb.Table, bus: events.EventBus) -> iam.Role:
+    def _build_lambda_role(
+        self, db: dynamodb.Table, bus: events.EventBus, catalog_bucket: s3.Bucket, catalog_stats_table: dynamodb.Table
+    ) -> iam.Role:
         return iam.Role(
             self,
             id=constants.STREAM_PROCESSOR_LAMBDA_SERVICE_ROLE_ARN,
@@ -50,6 +65,34 @@ class StreamProcessorConstruct(Construct):
                         )
                     ]
                 ),
+                'catalog_snapshot': iam.PolicyDocument(
+                    statements=[
+                        iam.PolicyStatement(
+                            actions=['s3:GetObject', 's3:PutObject'],
+                            resources=[
+                                catalog_bucket.arn_for_objects(constants.CATALOG_SNAPSHOT_KEY),
+                                catalog_bucket.arn_for_objects(constants.CATALOG_SEARCH_INDEX_KEY),
+                            ],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                        # without it, a snapshot that was not written yet is reported as access denied instead of missing
+                        iam.PolicyStatement(
+                            actions=['s3:ListBucket'],
+                            resources=[catalog_bucket.bucket_arn],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                    ]
+                ),
+                'catalog_stats': iam.PolicyDocument(
+                    statements=[
+                        iam.PolicyStatement(
+                            # the counters are updated in a transaction with a put of the batch marker item
+                            actions=['dynamodb:UpdateItem', 'dynamodb:PutItem', 'dynamodb:GetItem'],
+                            resources=[catalog_stats_table.table_arn],
+                            effect=iam.Effect.ALLOW,
+                        ),
+                    ]
+                ),
             },
             managed_policies=[
                 iam.ManagedPolicy.from_aws_managed_policy_name(managed_policy_name=(f'service-role/{constants.LAMBDA_BASIC_EXECUTION_ROLE}'))
@@ -57,7 +100,13 @@ class StreamProcessorConstruct(Construct):
         )
 
     def _build_stream_processor_lambda(
-        self, role: iam.Role, lambda_layer: PythonLayerVersion, dynamodb_table: dynamodb.Table, bus: events.EventBus
+        self,
+        role: iam.Role,
+        lambda_layer: PythonLayerVersion,
+        dynamodb_table: dynamodb.Table,
+        bus: events.EventBus,
+        catalog_bucket: s3.Bucket,
+        catalog_stats_table: dynamodb.Table,
     ) -> _lambda.Function:
         lambda_function = _lambda.Function(
             self,
@@ -70,6 +119,9 @@ class StreamProcessorConstruct(Construct):
                 constants.POWER_TOOLS_LOG_LEVEL: 'DEBUG',  # for logger
                 'EVENT_BUS': bus.event_bus_name,
                 'EVENT_SOURCE': constants.STREAM_PROCESSOR_EVENT_SOURCE_NAME,
+                'CATALOG_SNAPSHOT_STORE': 's3',
+                'CATALOG_SNAPSHOT_BUCKET': catalog_bucket.bucket_name,
+                'CATALOG_STATS_TABLE_NAME': catalog_stats_table.table_name,
             },
             tracing=_lambda.Tracing.ACTIVE,
             retry_attempts=0,
@@ -80,6 +132,7 @@ class StreamProcessorConstruct(Construct):
             log_retention=RetentionDays.FIVE_DAYS,
         )
         # Add DynamoDB Stream as an event source for the Lambda function
+        # failing batches are retried whole, not bisected, the catalog stats dedup retries by their first and last records
         lambda_function.add_event_source(DynamoEventSource(dynamodb_table, starting_position=_lambda.StartingPosition.LATEST))
         return lambda_function
 
@@ -0,0 +1,127 @@
+from typing import Annotated, Literal, Optional
+
+from pydantic import BaseModel, Field, NonNegativeFloat, NonNegativeInt, PositiveInt
+
+from product.models.products.product import ProductId
+
+# schemas here are shared between the stream processor, which maintains the catalog, and the CRUD API, which serves it
+
+
+class CatalogProduct(BaseModel):
+    """Listed representation of a product in the catalog snapshot.
+
+    Parameters
+    ----------
+    id : ProductId
+        Product ID (UUID string)
+    name : str
+        Product name
+    price : PositiveInt
+        Product price represented as a positive integer
+    version : PositiveInt
+        Product version, by default 1
+    """
+
+    id: ProductId
+    name: Annotated[str, Field(min_length=1)]
+    price: PositiveInt
+    version: PositiveInt = 1
+
+
+class CatalogSnapshot(BaseModel):
+    """Every product of the table, as of the last stream batch applied to it.
+
+    Parameters
+    ----------
+    version : NonNegativeInt
+        Incremented on every update of the snapshot, 0 for an empty catalog that was never written
+    updated_at : NonNegativeInt
+        Last update time (UNIX timestamp)
+    products : list[CatalogProduct]
+        Products, in insertion order
+    """
+
+    version: NonNegativeInt = 0
+    updated_at: NonNegativeInt = 0
+    products: list[CatalogProduct] = Field(default_factory=list)
+
+
+class CatalogChange(BaseModel):
+    """Change of one product, from a stream record.
+
+    Parameters
+    ----------
+    product_id : ProductId
+        Product ID (UUID string)
+    product : Optional[CatalogProduct]
+        New image of the product, None when it was removed
+    """
+
+    product_id: ProductId
+    product: Optional[CatalogProduct] = None
+
+
+class CatalogSnapshotVars(BaseModel):
+    # snapshots are disabled unless a store is set, 'filesystem' stands in for S3 offline
+    CATALOG_SNAPSHOT_STORE: Literal['none', 's3', 'filesystem'] = 'none'
+    CATALOG_SNAPSHOT_BUCKET: str = ''
+    CATALOG_SNAPSHOT_DIRECTORY: Annotated[str, Field(min_length=1)] = '/tmp/catalog'
+    CATALOG_SNAPSHOT_KEY: Annotated[str, Field(min_length=1)] = 'catalog/products.json.gz'
+    CATALOG_SEARCH_INDEX_KEY: Annotated[str, Field(min_length=1)] = 'catalog/search_index.bin.gz'
+    # readers check for a newer snapshot at most this often, the snapshot already lags the table by the stream delay
+    CATALOG_SNAPSHOT_REFRESH_SECONDS: NonNegativeFloat = 1.0
+
+
+class PriceChange(BaseModel):
+    """Price of one product before and after a stream record, for the catalog aggregates.
+
+    Parameters
+    ----------
+    old_price : Optional[PositiveInt]
+        Price before the change, None when the product was inserted
+    new_price : Optional[PositiveInt]
+        Price after the change, None when the product was removed
+    """
+
+    old_price: Optional[PositiveInt] = None
+    new_price: Optional[PositiveInt] = None
+
+
+class PriceBucket(BaseModel):
+    """Number of products priced within `[min_price, max_price]`, max_price is None for the last bucket."""
+
+    min_price: PositiveInt
+    max_price: Optional[PositiveInt] = None
+    count: NonNegativeInt = 0
+
+
+class CatalogStats(BaseModel):
+    """Aggregates of every product of the table, as of the last stream batch applied to them.
+
+    Parameters
+    ----------
+    product_count : NonNegativeInt
+        Number of products
+    price_sum : NonNegativeInt
+        Sum of the prices of every product
+    min_price : Optional[PositiveInt]
+        Lowest price, None when there are no products
+    max_price : Optional[PositiveInt]
+        Highest price, None when there are no products
+    price_histogram : list[PriceBucket]
+        Number of products per price bucket, in increasing price order
+    updated_at : NonNegativeInt
+        Last update time (UNIX timestamp), 0 when no change was applied yet
+    """
+
+    product_count: NonNegativeInt = 0
+    price_sum: NonNegativeInt = 0
+    min_price: Optional[PositiveInt] = None
+    max_price: Optional[PositiveInt] = None
+    price_histogram: list[PriceBucket] = Field(default_factory=list)
+    updated_at: NonNegativeInt = 0
+
+
+class CatalogStatsVars(BaseModel):
+    # aggregates are disabled unless their table is set
+    CATALOG_STATS_TABLE_NAME: str = ''
@@ -0,0 +1,21 @@
+from functools import lru_cache
+from typing import Optional
+
+from aws_lambda_env_modeler import get_environment_variables
+
+from product.catalog.models import CatalogSnapshotVars
+from product.catalog.object_store.base import ObjectStore
+from product.catalog.object_store.filesystem_object_store import FileSystemObjectStore
+from product.catalog.object_store.s3_object_store import S3ObjectStore
+
+
+# one store per container, the S3 client connection pool is reused across invocations
+@lru_cache(maxsize=1)
+def get_catalog_object_store() -> Optional[ObjectStore]:
+    """Object store of the catalog snapshot, None when snapshots are disabled."""
+    env_vars: CatalogSnapshotVars = get_environment_variables(model=CatalogSnapshotVars)
+    if env_vars.CATALOG_SNAPSHOT_STORE == 's3':
+        return S3ObjectStore(bucket_name=env_vars.CATALOG_SNAPSHOT_BUCKET)
+    if env_vars.CATALOG_SNAPSHOT_STORE == 'filesystem':
+        return FileSystemObjectStore(root_directory=env_vars.CATALOG_SNAPSHOT_DIRECTORY)
+    return None
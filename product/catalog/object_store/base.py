@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple, Optional
+
+
+class StoredObject(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class ObjectStore(ABC):
+    """ABC for an S3-like object store, with the conditional requests needed to update an object concurrently."""
+
+    @abstractmethod
+    def get_object(self, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        """Read an object.
+
+        Parameters
+        ----------
+        key : str
+            Object key
+        if_none_match : Optional[str], optional
+            ETag of a copy the caller already holds, by default None
+
+        Returns
+        -------
+        Optional[StoredObject]
+            The object and its ETag, None if its ETag is `if_none_match`
+
+        Raises
+        ------
+        ObjectNotFoundError
+            When there is no object under `key`
+        """
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def put_object(self, key: str, body: bytes, if_match: Optional[str] = None) -> str:
+        """Write an object, only if it wasn't changed since it was read when `if_match` is set.
+
+        Parameters
+        ----------
+        key : str
+            Object key
+        body : bytes
+            Object content
+        if_match : Optional[str], optional
+            ETag the current object must have, '' when the object must not exist yet, by default None (unconditional)
+
+        Returns
+        -------
+        str
+            ETag of the written object
+
+        Raises
+        ------
+        PreconditionFailedError
+            When the current object doesn't match `if_match`
+        """
+        ...  # pragma: no cover
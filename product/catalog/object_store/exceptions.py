@@ -0,0 +1,10 @@
+class ObjectStoreError(Exception):
+    """Raised when the object store can't be reached or fails a request."""
+
+
+class ObjectNotFoundError(ObjectStoreError):
+    """Raised when there is no object under the requested key."""
+
+
+class PreconditionFailedError(ObjectStoreError):
+    """Raised when a conditional write finds an object changed by a concurrent writer."""
@@ -0,0 +1,59 @@
+import fcntl
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from product.catalog.object_store.base import ObjectStore, StoredObject
+from product.catalog.object_store.exceptions import ObjectNotFoundError, PreconditionFailedError
+
+
+def _etag(body: bytes) -> str:
+    # same format as S3 for single part uploads
+    return f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+
+
+class FileSystemObjectStore(ObjectStore):
+    """Local directory standing in for S3, to maintain and serve snapshots offline.
+
+    Objects are files under `root_directory`, replaced atomically. Conditional writes hold an exclusive lock on the
+    object's lock file, so they are safe across the processes of one host, e.g. the workers of `benchmarks.local_server`.
+
+    Parameters
+    ----------
+    root_directory : str
+        Directory holding the objects, created if missing
+    """
+
+    def __init__(self, root_directory: str):
+        self.root_directory = Path(root_directory)
+
+    def _path(self, key: str) -> Path:
+        return self.root_directory / key
+
+    def get_object(self, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        try:
+            body = self._path(key).read_bytes()
+        except FileNotFoundError as exc:
+            raise ObjectNotFoundError(f'no object under {key}') from exc
+        etag = _etag(body)
+        if etag == if_none_match:
+            return None
+        return StoredObject(body=body, etag=etag)
+
+    def put_object(self, key: str, body: bytes, if_match: Optional[str] = None) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f'{path}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if if_match is not None:
+                current_etag = _etag(path.read_bytes()) if path.exists() else ''
+                if current_etag != if_match:
+                    raise PreconditionFailedError(f'object {key} was changed by another writer')
+            # readers never see a partially written object
+            file_descriptor, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+            with os.fdopen(file_descriptor, 'wb') as tmp_file:
+                tmp_file.write(body)
+            os.replace(tmp_path, path)
+        return _etag(body)
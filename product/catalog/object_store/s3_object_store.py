@@ -0,0 +1,61 @@
+from typing import TYPE_CHECKING, Any, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from product.catalog.object_store.base import ObjectStore, StoredObject
+from product.catalog.object_store.exceptions import ObjectNotFoundError, ObjectStoreError, PreconditionFailedError
+from product.observability import logger
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+
+_NOT_MODIFIED_CODES = {'304', 'NotModified'}
+_NOT_FOUND_CODES = {'404', 'NoSuchKey'}
+# a concurrent conditional write to the same key can also be rejected with a conflict, to be retried like a mismatch
+_PRECONDITION_FAILED_CODES = {'412', 'PreconditionFailed', 'ConditionalRequestConflict'}
+
+
+class S3ObjectStore(ObjectStore):
+    def __init__(self, bucket_name: str, client: Optional['S3Client'] = None):
+        """Amazon S3 object store, conditional writes use the If-Match and If-None-Match headers of PutObject.
+
+        Parameters
+        ----------
+        bucket_name : str
+            Bucket holding the objects
+        client : Optional[S3Client], optional
+            S3 boto3 client to use, by default None
+        """
+        self.bucket_name = bucket_name
+        self.client = client or boto3.client('s3')
+
+    def get_object(self, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        request: dict[str, Any] = {'Bucket': self.bucket_name, 'Key': key}
+        if if_none_match:
+            request['IfNoneMatch'] = if_none_match
+        try:
+            response = self.client.get_object(**request)
+            return StoredObject(body=response['Body'].read(), etag=response['ETag'])
+        except ClientError as exc:
+            error_code = exc.response['Error']['Code']
+            if error_code in _NOT_MODIFIED_CODES:
+                return None
+            if error_code in _NOT_FOUND_CODES:
+                raise ObjectNotFoundError(f'no object under {key}') from exc
+            logger.exception('failed to get object', key=key)
+            raise ObjectStoreError(str(exc)) from exc
+
+    def put_object(self, key: str, body: bytes, if_match: Optional[str] = None) -> str:
+        request: dict[str, Any] = {'Bucket': self.bucket_name, 'Key': key, 'Body': body}
+        if if_match == '':
+            request['IfNoneMatch'] = '*'
+        elif if_match is not None:
+            request['IfMatch'] = if_match
+        try:
+            return self.client.put_object(**request)['ETag']
+        except ClientError as exc:
+            if exc.response['Error']['Code'] in _PRECONDITION_FAILED_CODES:
+                raise PreconditionFailedError(f'object {key} was changed by another writer') from exc
+            logger.exception('failed to put object', key=key)
+            raise ObjectStoreError(str(exc)) from exc
@@ -0,0 +1,99 @@
+from typing import Callable, Generic, Optional, TypeVar
+
+from product.catalog.object_store.base import ObjectStore
+from product.catalog.object_store.exceptions import ObjectNotFoundError, PreconditionFailedError
+from product.observability import logger
+
+T = TypeVar('T')
+
+
+class VersionedObject(Generic[T]):
+    """One object of a store, decoded, with optimistic concurrency for writers and a local copy for everyone.
+
+    The decoded value is kept along with its ETag, so it is downloaded and decoded again only when another writer
+    changed it. Writers keep the value they wrote, a container processing consecutive batches never reads its own writes.
+    Not thread safe, callers serving concurrent requests hold a lock around it.
+
+    Parameters
+    ----------
+    object_store : ObjectStore
+        Store holding the object
+    key : str
+        Object key
+    decode : Callable[[bytes], T]
+        Object body to value
+    encode : Callable[[T], bytes]
+        Value to object body
+    empty : Callable[[], T]
+        Value of an object that was not written yet
+    """
+
+    def __init__(self, object_store: ObjectStore, key: str, decode: Callable[[bytes], T], encode: Callable[[T], bytes], empty: Callable[[], T]):
+        self.object_store = object_store
+        self.key = key
+        self.decode = decode
+        self.encode = encode
+        self.empty = empty
+        self._value: Optional[T] = None
+        self._etag: Optional[str] = None
+
+    def get(self) -> T:
+        """Current value of the object.
+
+        Raises
+        ------
+        ObjectNotFoundError
+            When the object was not written yet
+        ObjectStoreError
+            When the store fails
+        """
+        stored_object = self.object_store.get_object(self.key, if_none_match=self._etag)
+        if stored_object is not None:
+            self._value, self._etag = self.decode(stored_object.body), stored_object.etag
+        return self._value  # type: ignore[return-value] # not modified means a value is held
+
+    def update(self, apply: Callable[[T], T], max_attempts: int) -> T:
+        """Apply a change and write the result, only if no other writer changed the object in between.
+
+        A write losing the race starts over from the newer object, up to `max_attempts` times.
+
+        Parameters
+        ----------
+        apply : Callable[[T], T]
+            Returns the changed value, it may change its argument in place
+        max_attempts : int
+            Maximum number of read, apply and write attempts
+
+        Returns
+        -------
+        T
+            The written value
+
+        Raises
+        ------
+        PreconditionFailedError
+            When every attempt lost the race against another writer
+        ObjectStoreError
+            When the store fails
+        """
+        attempt = 1
+        while True:
+            try:
+                value, etag = self.get(), self._etag or ''
+            except ObjectNotFoundError:
+                value, etag = self.empty(), ''
+
+            # the held value may be changed in place, it only stands again once written
+            self._value, self._etag = None, None
+            updated_value = apply(value)
+            try:
+                self._etag = self.object_store.put_object(self.key, self.encode(updated_value), if_match=etag)
+            except PreconditionFailedError:
+                logger.info('object was updated concurrently', key=self.key, attempt=attempt)
+                if attempt == max_attempts:
+                    raise
+                attempt += 1
+                continue
+
+            self._value = updated_value
+            return updated_value
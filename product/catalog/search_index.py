@@ -0,0 +1,263 @@
+import bisect
+import gzip
+import heapq
+import itertools
+import json
+import math
+import re
+import sys
+import time
+from array import array
+
+from product.catalog.models import CatalogChange, CatalogProduct
+
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+# BM25 parameters, names only hold a few tokens so a matching term always has a frequency of 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+# a term that only starts with the query token scores half as much as a term matched exactly
+PREFIX_MATCH_WEIGHT = 0.5
+# a one letter prefix could expand to most of the vocabulary, only the first terms in lexical order are matched
+MAX_PREFIX_EXPANSIONS = 64
+# the index is rewritten on every stream batch, level 1 is ~4x faster than 6 for a ~10% bigger object at 1M products
+SEARCH_INDEX_COMPRESSION_LEVEL = 1
+# prices and versions are unsigned 64 bits, the API accepts any positive int. Indexes encoded before the typecodes
+# were in the header hold 32 bits columns
+COLUMN_TYPECODES = {'prices': 'Q', 'versions': 'Q', 'lengths': 'H'}
+LEGACY_COLUMN_TYPECODES = {'prices': 'I', 'versions': 'I', 'lengths': 'H'}
+
+
+def tokenize(text: str) -> list[str]:
+    """Unique lower case words of `text`, in order of appearance."""
+    return list(dict.fromkeys(_TOKEN_PATTERN.findall(text.casefold())))
+
+
+class SearchIndex:
+    """Inverted index over product names, for relevance ranked search with prefix matching.
+
+    Products are stored in columns, a product's position (slot) is its document number in the postings. Removing a
+    product moves the last product into its slot, so there are no holes. Postings are kept sorted, a new product has the
+    highest slot and is appended, other changes are a binary search and a move of the posting's tail.
+
+    Parameters
+    ----------
+    version : int
+        Incremented on every applied batch of changes, by default 0
+    updated_at : int
+        Last update time (UNIX timestamp), by default 0
+    """
+
+    def __init__(self, version: int = 0, updated_at: int = 0):
+        self.version = version
+        self.updated_at = updated_at
+        self.ids: list[str] = []
+        self.names: list[str] = []
+        self.prices = array(COLUMN_TYPECODES['prices'])
+        self.versions = array(COLUMN_TYPECODES['versions'])
+        self.lengths = array(COLUMN_TYPECODES['lengths'])  # tokens per name
+        self.slots: dict[str, int] = {}  # product id -> slot
+        self.postings: dict[str, array] = {}  # term -> sorted slots of the products whose name holds it
+        self.terms: list[str] = []  # sorted, prefixes are ranges of it
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _index_term(self, term: str, slot: int) -> None:
+        posting = self.postings.get(term)
+        if posting is None:
+            posting = self.postings[term] = array('I')
+            bisect.insort(self.terms, term)
+        posting.append(slot)
+
+    def _unindex_term(self, term: str, slot: int) -> None:
+        posting = self.postings[term]
+        del posting[bisect.bisect_left(posting, slot)]
+        if not posting:
+            del self.postings[term]
+            del self.terms[bisect.bisect_left(self.terms, term)]
+
+    def add(self, product: CatalogProduct) -> None:
+        """Add a product, or replace the product with the same id."""
+        slot = self.slots.get(product.id)
+        if slot is not None and self.names[slot] == product.name:
+            # price and version changes don't touch the postings
+            self.prices[slot], self.versions[slot] = product.price, product.version
+            return
+        if slot is not None:
+            self.remove(product.id)
+
+        slot = len(self.ids)
+        tokens = tokenize(product.name)
+        self.slots[product.id] = slot
+        self.ids.append(product.id)
+        self.names.append(product.name)
+        self.prices.append(product.price)
+        self.versions.append(product.version)
+        self.lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        for term in tokens:
+            self._index_term(term, slot)
+
+    def remove(self, product_id: str) -> None:
+        """Remove a product, ignored if it is not indexed."""
+        slot = self.slots.pop(product_id, None)
+        if slot is None:
+            return
+        for term in tokenize(self.names[slot]):
+            self._unindex_term(term, slot)
+        self.total_length -= self.lengths[slot]
+
+        last_slot = len(self.ids) - 1
+        if slot != last_slot:
+            for term in tokenize(self.names[last_slot]):
+                # the last slot is the highest, at the end of its postings
+                posting = self.postings[term]
+                posting.pop()
+                posting.insert(bisect.bisect_left(posting, slot), slot)
+            self.slots[self.ids[last_slot]] = slot
+            self.ids[slot], self.names[slot] = self.ids[last_slot], self.names[last_slot]
+            self.prices[slot], self.versions[slot], self.lengths[slot] = self.prices[last_slot], self.versions[last_slot], self.lengths[last_slot]
+        for column in (self.ids, self.names, self.prices, self.versions, self.lengths):
+            column.pop()
+
+    def apply_changes(self, changes: list[CatalogChange]) -> 'SearchIndex':
+        """Apply product changes in order, in place, and return the index with its next version.
+
+        Applying the same changes twice yields the same products, so a stream batch retried after a failure is harmless.
+        """
+        for change in changes:
+            if change.product is None:
+                self.remove(change.product_id)
+            else:
+                self.add(change.product)
+        self.version += 1
+        self.updated_at = int(time.time())
+        return self
+
+    def _expand(self, token: str) -> list[str]:
+        start = bisect.bisect_left(self.terms, token)
+        return list(itertools.takewhile(lambda term: term.startswith(token), itertools.islice(self.terms, start, start + MAX_PREFIX_EXPANSIONS)))
+
+    def _idf(self, document_frequency: int) -> float:
+        return math.log(1 + (len(self.ids) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _token_scores(self, token: str) -> dict[int, float]:
+        terms = self._expand(token)
+        # prefix matches are weighted like one term holding every expansion, so they never outrank an exact match
+        prefix_weight = self._idf(min(sum(len(self.postings[term]) for term in terms), len(self.ids))) * PREFIX_MATCH_WEIGHT
+        token_scores: dict[int, float] = {}
+        for term in terms:
+            if term != token:
+                token_scores.update(dict.fromkeys(self.postings[term], prefix_weight))
+        # a product matching several expansions of the token only scores its best one, an exact match is applied last
+        if terms and terms[0] == token:
+            token_scores.update(dict.fromkeys(self.postings[token], self._idf(len(self.postings[token]))))
+        return token_scores
+
+    def search(self, query: str, limit: int) -> list[CatalogProduct]:
+        """Products whose name holds every token of `query`, exactly or as a prefix, best BM25 score first.
+
+        Parameters
+        ----------
+        query : str
+            Search query, e.g. 'red ch' matches 'red chair' and 'cherry red'
+        limit : int
+            Maximum number of products to return
+
+        Returns
+        -------
+        list[CatalogProduct]
+            Matching products, most relevant first
+        """
+        tokens = tokenize(query)
+        if not tokens or not self.ids:
+            return []
+
+        scores = self._token_scores(tokens[0])
+        for token in tokens[1:]:
+            if not scores:
+                break
+            token_scores = self._token_scores(token)
+            scores = {slot: scores[slot] + token_scores[slot] for slot in scores.keys() & token_scores.keys()}
+        if not scores:
+            return []
+
+        # within products of the same term score, shorter names rank first and ties go to the lowest slot, so only the best
+        # `limit` of every score can make the results. Scores take a few values, one when only exact terms matched
+        if len(set(scores.values())) == 1:
+            groups = [list(scores)]
+        else:
+            slots_by_score: dict[float, list[int]] = {}
+            for slot, score in scores.items():
+                slots_by_score.setdefault(score, []).append(slot)
+            groups = list(slots_by_score.values())
+        candidates = [slot for group in groups for slot in heapq.nsmallest(limit, sorted(group), key=self.lengths.__getitem__)]
+
+        # the term frequency part of BM25 only depends on the name length
+        length_offset, length_weight = 1 + BM25_K1 * (1 - BM25_B), BM25_K1 * BM25_B * len(self.ids) / max(self.total_length, 1)
+        best_slots = heapq.nlargest(
+            limit, candidates, key=lambda slot: (scores[slot] * (BM25_K1 + 1) / (length_offset + length_weight * self.lengths[slot]), -slot)
+        )
+        return [CatalogProduct(id=self.ids[slot], name=self.names[slot], price=self.prices[slot], version=self.versions[slot]) for slot in best_slots]
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def encode_search_index(index: SearchIndex) -> bytes:
+    """Serialize the index into a JSON header line followed by its numeric columns and postings, gzipped.
+
+    Postings are delta encoded, so most of their bytes are zeros that compress well.
+    """
+    postings = [index.postings[term] for term in index.terms]
+    header = {
+        'version': index.version,
+        'updated_at': index.updated_at,
+        'ids': index.ids,
+        'names': index.names,
+        'terms': index.terms,
+        'posting_lengths': [len(posting) for posting in postings],
+        'typecodes': COLUMN_TYPECODES,
+    }
+    chunks = [json.dumps(header, separators=(',', ':')).encode(), b'\n']
+    chunks.extend(_to_little_endian(getattr(index, column)) for column in COLUMN_TYPECODES)
+    for posting in postings:
+        chunks.append(_to_little_endian(array('I', (current - previous for previous, current in itertools.pairwise([0, *posting])))))
+    # mtime is fixed so the same index always has the same bytes, and the same ETag
+    return gzip.compress(b''.join(chunks), compresslevel=SEARCH_INDEX_COMPRESSION_LEVEL, mtime=0)
+
+
+def decode_search_index(body: bytes) -> SearchIndex:
+    header_line, _, data = gzip.decompress(body).partition(b'\n')
+    header = json.loads(header_line)
+    index = SearchIndex(version=header['version'], updated_at=header['updated_at'])
+    index.ids, index.names, index.terms = header['ids'], header['names'], header['terms']
+    index.slots = {product_id: slot for slot, product_id in enumerate(index.ids)}
+
+    products = len(index.ids)
+    offset = 0
+    for column, typecode in header.get('typecodes', LEGACY_COLUMN_TYPECODES).items():
+        size = products * array(typecode).itemsize
+        # columns are kept in this version's typecodes, a legacy index is widened
+        setattr(index, column, array(COLUMN_TYPECODES[column], _from_little_endian(typecode, data[offset : offset + size])))
+        offset += size
+    index.total_length = sum(index.lengths)
+
+    for term, posting_length in zip(index.terms, header['posting_lengths'], strict=True):
+        size = posting_length * array('I').itemsize
+        index.postings[term] = array('I', itertools.accumulate(_from_little_endian('I', data[offset : offset + size])))
+        offset += size
+    return index
@@ -0,0 +1,30 @@
+import gzip
+import time
+
+from product.catalog.models import CatalogChange, CatalogSnapshot
+
+# gzip shrinks a snapshot more than 3 times, product names repeat a small vocabulary, see benchmarks.compression_benchmark
+SNAPSHOT_COMPRESSION_LEVEL = 6
+
+
+def encode_snapshot(snapshot: CatalogSnapshot) -> bytes:
+    # mtime is fixed so the same snapshot always has the same bytes, and the same ETag
+    return gzip.compress(snapshot.model_dump_json().encode(), compresslevel=SNAPSHOT_COMPRESSION_LEVEL, mtime=0)
+
+
+def decode_snapshot(body: bytes) -> CatalogSnapshot:
+    return CatalogSnapshot.model_validate_json(gzip.decompress(body))
+
+
+def apply_changes(snapshot: CatalogSnapshot, changes: list[CatalogChange]) -> CatalogSnapshot:
+    """Return the next version of `snapshot` with `changes` applied in order, the last change of a product wins.
+
+    Applying the same changes twice yields the same products, so a stream batch retried after a failure is harmless.
+    """
+    products = {product.id: product for product in snapshot.products}
+    for change in changes:
+        if change.product is None:
+            products.pop(change.product_id, None)
+        else:
+            products[change.product_id] = change.product
+    return CatalogSnapshot(version=snapshot.version + 1, updated_at=int(time.time()), products=list(products.values()))
@@ -0,0 +1,112 @@
+import bisect
+from typing import Iterable, Optional
+
+from product.catalog.models import CatalogStats, PriceBucket, PriceChange
+
+# exclusive upper bounds of the price histogram buckets, the last bucket has none. Counters are stored per bucket
+# position, changing the bounds requires rebuilding the aggregates
+PRICE_HISTOGRAM_BOUNDS = [5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000]
+PRICE_HISTOGRAM_BUCKETS = len(PRICE_HISTOGRAM_BOUNDS) + 1
+
+
+def get_price_bucket(price: int) -> int:
+    """Position of the histogram bucket holding `price`."""
+    return bisect.bisect_right(PRICE_HISTOGRAM_BOUNDS, price)
+
+
+def _bucket_min_price(bucket: int) -> int:
+    return PRICE_HISTOGRAM_BOUNDS[bucket - 1] if bucket else 1
+
+
+def _bucket_max_price(bucket: int) -> Optional[int]:
+    return PRICE_HISTOGRAM_BOUNDS[bucket] - 1 if bucket < len(PRICE_HISTOGRAM_BOUNDS) else None
+
+
+class CatalogStatsDelta:
+    """Change of the catalog aggregates made by a batch of price changes, stored with a single update.
+
+    Additive aggregates (count, sum, histogram) are exact. The lowest and highest prices can't be decremented, the delta
+    only holds the lowest and highest prices it added, which can widen the stored ones.
+    """
+
+    def __init__(self) -> None:
+        self.product_count = 0
+        self.price_sum = 0
+        self.bucket_counts: dict[int, int] = {}
+        self.min_price: Optional[int] = None
+        self.max_price: Optional[int] = None
+
+    def add(self, price: int) -> None:
+        self.product_count += 1
+        self.price_sum += price
+        bucket = get_price_bucket(price)
+        self.bucket_counts[bucket] = self.bucket_counts.get(bucket, 0) + 1
+        self.min_price = price if self.min_price is None else min(self.min_price, price)
+        self.max_price = price if self.max_price is None else max(self.max_price, price)
+
+    def remove(self, price: int) -> None:
+        self.product_count -= 1
+        self.price_sum -= price
+        bucket = get_price_bucket(price)
+        self.bucket_counts[bucket] = self.bucket_counts.get(bucket, 0) - 1
+
+    def counters(self) -> dict[str, int]:
+        """Non zero additive counters, by stored attribute name."""
+        counters = {'product_count': self.product_count, 'price_sum': self.price_sum}
+        counters.update((f'price_bucket_{bucket}', count) for bucket, count in sorted(self.bucket_counts.items()))
+        return {name: value for name, value in counters.items() if value}
+
+    def __bool__(self) -> bool:
+        return bool(self.counters()) or self.min_price is not None
+
+
+def compute_stats_delta(changes: Iterable[PriceChange]) -> CatalogStatsDelta:
+    """Coalesce the price changes of a stream batch into one delta, a product updated twice only counts once."""
+    delta = CatalogStatsDelta()
+    for change in changes:
+        if change.old_price is not None:
+            delta.remove(change.old_price)
+        if change.new_price is not None:
+            delta.add(change.new_price)
+    return delta
+
+
+def build_catalog_stats(
+    product_count: int, price_sum: int, bucket_counts: list[int], min_price: Optional[int], max_price: Optional[int], updated_at: int
+) -> CatalogStats:
+    """Build the catalog aggregates from stored counters.
+
+    Stored lowest and highest prices are only ever widened, they are stale once the cheapest or most expensive product
+    is removed or repriced. They are narrowed to the lowest and highest non-empty buckets of the histogram, so they are
+    always within the bucket of the actual lowest and highest prices, and exact while those products are unchanged.
+    """
+    histogram = [
+        PriceBucket(min_price=_bucket_min_price(bucket), max_price=_bucket_max_price(bucket), count=count)
+        for bucket, count in enumerate(bucket_counts)
+    ]
+    non_empty = [bucket for bucket in histogram if bucket.count]
+    if not product_count or not non_empty:
+        return CatalogStats(price_histogram=histogram, updated_at=updated_at)
+
+    lowest, highest = non_empty[0], non_empty[-1]
+    if min_price is None or min_price < lowest.min_price:
+        min_price = lowest.min_price
+    if max_price is None or (highest.max_price is not None and max_price > highest.max_price):
+        max_price = highest.max_price
+    return CatalogStats(
+        product_count=product_count,
+        price_sum=price_sum,
+        min_price=min_price,
+        max_price=max_price,
+        price_histogram=histogram,
+        updated_at=updated_at,
+    )
+
+
+def compute_catalog_stats(prices: Iterable[int], updated_at: int) -> CatalogStats:
+    """Compute the catalog aggregates from every price, when they are not maintained."""
+    delta = CatalogStatsDelta()
+    for price in prices:
+        delta.add(price)
+    bucket_counts = [delta.bucket_counts.get(bucket, 0) for bucket in range(PRICE_HISTOGRAM_BUCKETS)]
+    return build_catalog_stats(delta.product_count, delta.price_sum, bucket_counts, delta.min_price, delta.max_price, updated_at)
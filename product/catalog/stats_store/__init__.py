@@ -0,0 +1,18 @@
+from functools import lru_cache
+from typing import Optional
+
+from aws_lambda_env_modeler import get_environment_variables
+
+from product.catalog.models import CatalogStatsVars
+from product.catalog.stats_store.base import CatalogStatsStore
+from product.catalog.stats_store.dynamodb_stats_store import DynamoDbCatalogStatsStore
+
+
+# one store per container, the DynamoDB client connection pool is reused across invocations
+@lru_cache(maxsize=1)
+def get_catalog_stats_store() -> Optional[CatalogStatsStore]:
+    """Store of the catalog aggregates, None when they are disabled."""
+    env_vars: CatalogStatsVars = get_environment_variables(model=CatalogStatsVars)
+    if not env_vars.CATALOG_STATS_TABLE_NAME:
+        return None
+    return DynamoDbCatalogStatsStore(table_name=env_vars.CATALOG_STATS_TABLE_NAME)
@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+
+from product.catalog.models import CatalogStats
+from product.catalog.stats import CatalogStatsDelta
+
+
+class CatalogStatsStore(ABC):
+    """ABC for the store of the catalog aggregates, updated once per stream batch and read in constant time."""
+
+    @abstractmethod
+    def apply_delta(self, delta: CatalogStatsDelta, batch_id: str) -> bool:
+        """Add the aggregates of a stream batch to the stored ones, atomically.
+
+        Parameters
+        ----------
+        delta : CatalogStatsDelta
+            Coalesced changes of the batch
+        batch_id : str
+            Identifies the batch, a retried batch is not counted twice
+
+        Returns
+        -------
+        bool
+            False if the batch was already applied
+
+        Raises
+        ------
+        CatalogStatsStoreError
+            When the store fails
+        """
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def get_stats(self) -> CatalogStats:
+        """Read the aggregates, empty ones when no change was applied yet.
+
+        Raises
+        ------
+        CatalogStatsStoreError
+            When the store fails
+        """
+        ...  # pragma: no cover
@@ -0,0 +1,122 @@
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from product.catalog.models import CatalogStats
+from product.catalog.stats import PRICE_HISTOGRAM_BUCKETS, CatalogStatsDelta, build_catalog_stats
+from product.catalog.stats_store.base import CatalogStatsStore
+from product.catalog.stats_store.exceptions import CatalogStatsStoreError
+from product.observability import logger
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+# every aggregate is an attribute of a single item, so it is read with one GetItem and updated with one transaction
+STATS_ITEM_ID = 'catalog'
+# every applied batch leaves a marker item, expired by the table TTL once the stream can't retry the batch anymore
+APPLIED_BATCH_ITEM_PREFIX = 'batch#'
+APPLIED_BATCH_TTL_SECONDS = 2 * 24 * 60 * 60  # stream records are kept for 24 hours
+_CONDITIONAL_CHECK_FAILED = 'ConditionalCheckFailedException'
+_TRANSACTION_CANCELED = 'TransactionCanceledException'
+
+
+def _number(item: dict[str, Any], attribute: str) -> Optional[int]:
+    return int(item[attribute]['N']) if attribute in item else None
+
+
+class DynamoDbCatalogStatsStore(CatalogStatsStore):
+    def __init__(self, table_name: str, client: Optional['DynamoDBClient'] = None):
+        """Amazon DynamoDB store of the catalog aggregates, in a single item updated with atomic counters.
+
+        Batches are counted once, whatever ran in between: the counters are added in the same transaction as the
+        batch's marker item is created, which fails once it exists.
+
+        Parameters
+        ----------
+        table_name : str
+            Table holding the aggregates item and the applied batches markers, with an 'id' string partition key and
+            an 'expiration' TTL attribute
+        client : Optional[DynamoDBClient], optional
+            DynamoDB boto3 client to use, by default None
+        """
+        self.table_name = table_name
+        self.client = client or boto3.client('dynamodb')
+
+    def apply_delta(self, delta: CatalogStatsDelta, batch_id: str) -> bool:
+        counters = delta.counters()
+        now = int(time.time())
+        values: dict[str, Any] = {':now': {'N': str(now)}}
+        values.update((f':{name}', {'N': str(value)}) for name, value in counters.items())
+        update_expression = 'SET updated_at = :now'
+        if counters:
+            update_expression += ' ADD ' + ', '.join(f'{name} :{name}' for name in counters)
+        marker = {'id': {'S': f'{APPLIED_BATCH_ITEM_PREFIX}{batch_id}'}, 'expiration': {'N': str(now + APPLIED_BATCH_TTL_SECONDS)}}
+        try:
+            self.client.transact_write_items(
+                TransactItems=[
+                    # the stream retries a failed batch, the counters of its first attempt must not be added again
+                    {'Put': {'TableName': self.table_name, 'Item': marker, 'ConditionExpression': 'attribute_not_exists(id)'}},
+                    {
+                        'Update': {
+                            'TableName': self.table_name,
+                            'Key': {'id': {'S': STATS_ITEM_ID}},
+                            'UpdateExpression': update_expression,
+                            'ExpressionAttributeValues': values,
+                        }
+                    },
+                ]
+            )
+            applied = True
+        except ClientError as exc:
+            reasons = exc.response.get('CancellationReasons', [])
+            if exc.response['Error']['Code'] != _TRANSACTION_CANCELED or not reasons or reasons[0].get('Code') != 'ConditionalCheckFailed':
+                logger.exception('failed to update catalog stats', batch_id=batch_id)
+                raise CatalogStatsStoreError(str(exc)) from exc
+            logger.info('catalog stats batch was already applied', batch_id=batch_id)
+            applied = False
+
+        if delta.min_price is None and delta.max_price is None:
+            return applied
+        # the first attempt may have failed before widening the price range
+        item = self._get_item(ProjectionExpression='min_price, max_price', ConsistentRead=True)
+        stored_min_price, stored_max_price = _number(item, 'min_price'), _number(item, 'max_price')
+        if delta.min_price is not None and (stored_min_price is None or delta.min_price < stored_min_price):
+            self._widen_price_range('min_price', '>', delta.min_price)
+        if delta.max_price is not None and (stored_max_price is None or delta.max_price > stored_max_price):
+            self._widen_price_range('max_price', '<', delta.max_price)
+        return applied
+
+    def _widen_price_range(self, attribute: str, comparison: str, price: int) -> None:
+        # DynamoDB has no atomic min or max, the condition keeps a wider value written by a concurrent batch
+        try:
+            self.client.update_item(
+                TableName=self.table_name,
+                Key={'id': {'S': STATS_ITEM_ID}},
+                UpdateExpression=f'SET {attribute} = :price',
+                ConditionExpression=f'attribute_not_exists({attribute}) OR {attribute} {comparison} :price',
+                ExpressionAttributeValues={':price': {'N': str(price)}},
+            )
+        except ClientError as exc:
+            if exc.response['Error']['Code'] != _CONDITIONAL_CHECK_FAILED:
+                logger.exception('failed to update catalog price range', attribute=attribute)
+                raise CatalogStatsStoreError(str(exc)) from exc
+
+    def _get_item(self, **kwargs: Any) -> dict[str, Any]:
+        try:
+            return self.client.get_item(TableName=self.table_name, Key={'id': {'S': STATS_ITEM_ID}}, **kwargs).get('Item', {})
+        except ClientError as exc:
+            logger.exception('failed to get catalog stats')
+            raise CatalogStatsStoreError(str(exc)) from exc
+
+    def get_stats(self) -> CatalogStats:
+        item = self._get_item()
+        return build_catalog_stats(
+            product_count=_number(item, 'product_count') or 0,
+            price_sum=_number(item, 'price_sum') or 0,
+            bucket_counts=[_number(item, f'price_bucket_{bucket}') or 0 for bucket in range(PRICE_HISTOGRAM_BUCKETS)],
+            min_price=_number(item, 'min_price'),
+            max_price=_number(item, 'max_price'),
+            updated_at=_number(item, 'updated_at') or 0,
+        )
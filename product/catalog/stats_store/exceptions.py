@@ -0,0 +1,2 @@
+class CatalogStatsStoreError(Exception):
+    """Raised when the catalog aggregates can't be read or updated."""
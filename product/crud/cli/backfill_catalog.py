@@ -0,0 +1,167 @@
+"""Set the catalog attribute of the products written before the price and name indexes existed.
+
+Both secondary indexes are partitioned on `catalog`, a product without it is in neither, so price range queries and
+name prefix queries silently miss it. Run this once the deploy adding the indexes is done, and before the queries are
+relied on. Products written by the API since then already have it.
+
+The table is read with a parallel scan, one thread per segment, filtered on products without the attribute. Each one is
+updated with a condition on the attribute still missing, so a product written or deleted meanwhile is left as is. Updates
+are paced by an adaptive rate limiter like the import's. Only products without the attribute are scanned, an interrupted
+backfill is simply run again.
+
+Every update is a MODIFY record of the table stream, the stream processor sends an UPDATED notification for it.
+
+DynamoDB only, the sqlite and in-memory backends store the attribute in every row.
+
+Run with `python -m product.crud.cli.backfill_catalog --table-name products --rate 500`.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from mypy_boto3_dynamodb import DynamoDBClient
+
+from product.crud.cli.rate_limiter import AdaptiveRateLimiter
+from product.crud.cli.utils import positive_int, start_progress_reporter
+from product.crud.integration.circuit_breaker import THROTTLING_ERROR_CODES
+from product.crud.integration.dynamodb_client import get_dynamodb_client
+from product.models.products.product import PRODUCT_CATALOG
+from product.observability import logger
+
+DEFAULT_SEGMENTS = 4
+DEFAULT_RATE = 500.0  # products per second, every update is also written to both indexes
+DEFAULT_PROGRESS_SECONDS = 5.0
+
+
+class CatalogBackfill:
+    """Parallel backfill of the catalog attribute of a products table.
+
+    Parameters
+    ----------
+    client : DynamoDBClient
+        Client of the table, called from one thread per segment
+    table_name : str
+        Backfilled table
+    rate_limiter : AdaptiveRateLimiter
+        Paces the updates of all segments
+    total_segments : int
+        Segments of the parallel scan, by default `DEFAULT_SEGMENTS`
+    """
+
+    def __init__(self, client: DynamoDBClient, table_name: str, rate_limiter: AdaptiveRateLimiter, total_segments: int = DEFAULT_SEGMENTS):
+        self.client = client
+        self.table_name = table_name
+        self.rate_limiter = rate_limiter
+        self.total_segments = total_segments
+        self.updated = 0
+        self.skipped = 0  # written or deleted between the scan and the update
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def report(self) -> str:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return f'{self.updated} products backfilled, {self.skipped} skipped, {self.updated / elapsed:.0f} products/s in {elapsed:.1f} s'
+
+    def _update(self, product_id: str) -> bool:
+        while True:
+            self.rate_limiter.acquire(1)
+            try:
+                self.client.update_item(
+                    TableName=self.table_name,
+                    Key={'id': {'S': product_id}},
+                    UpdateExpression='SET catalog = :catalog',
+                    ConditionExpression='attribute_exists(id) AND attribute_not_exists(catalog)',
+                    ExpressionAttributeValues={':catalog': {'S': PRODUCT_CATALOG}},
+                )
+            except ClientError as exc:
+                error_code = exc.response['Error']['Code']
+                if error_code == 'ConditionalCheckFailedException':
+                    return False
+                if error_code not in THROTTLING_ERROR_CODES:
+                    raise
+                # throttled after the client's retries, the rate is lowered and the product tried again
+                self.rate_limiter.throttled()
+                continue
+            self.rate_limiter.succeeded()
+            return True
+
+    def _backfill_segment(self, segment: int) -> None:
+        last_key: Optional[Dict[str, Any]] = None
+        while not self._stopped.is_set():
+            scan_kwargs: Dict[str, Any] = {'ExclusiveStartKey': last_key} if last_key else {}
+            page = self.client.scan(
+                TableName=self.table_name,
+                Segment=segment,
+                TotalSegments=self.total_segments,
+                FilterExpression='attribute_not_exists(catalog)',
+                ProjectionExpression='id',
+                **scan_kwargs,
+            )
+            for item in page.get('Items', []):
+                updated = self._update(item['id']['S'])
+                with self._lock:
+                    self.updated += updated
+                    self.skipped += not updated
+            last_key = page.get('LastEvaluatedKey')
+            if last_key is None:
+                return
+
+    def run(self) -> int:
+        """Backfill every segment of the table.
+
+        Returns
+        -------
+        int
+            Number of updated products
+
+        Raises
+        ------
+        ClientError
+            When a scan or an update fails, the backfill is stopped and can be run again
+        """
+        with ThreadPoolExecutor(max_workers=self.total_segments, thread_name_prefix='backfill-segment') as executor:
+            futures = [executor.submit(self._backfill_segment, segment) for segment in range(self.total_segments)]
+            wait(futures, return_when=FIRST_EXCEPTION)
+            self._stopped.set()
+        for future in futures:
+            future.result()
+        logger.info('backfilled catalog', updated=self.updated, skipped=self.skipped)
+        return self.updated
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table-name', default=os.environ.get('TABLE_NAME'), help='backfilled table, by default TABLE_NAME')
+    parser.add_argument('--segments', type=positive_int, default=DEFAULT_SEGMENTS, help='parallel scan segments, one thread each')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='highest rate of updates, products per second')
+    parser.add_argument('--progress-seconds', type=float, default=DEFAULT_PROGRESS_SECONDS, help='progress report interval')
+    parser.add_argument('--log-level', default='WARNING', help='log level')
+    args = parser.parse_args(argv)
+    if not args.table_name:
+        parser.error('--table-name is required when TABLE_NAME is not set')
+
+    logger.setLevel(args.log_level)
+    # one connection per segment thread, unless configured otherwise
+    os.environ.setdefault('DYNAMODB_MAX_POOL_CONNECTIONS', str(args.segments))
+    backfill = CatalogBackfill(get_dynamodb_client(), args.table_name, AdaptiveRateLimiter(args.rate), total_segments=args.segments)
+    stopped = start_progress_reporter(backfill.report, args.progress_seconds)
+    try:
+        backfill.run()
+    except ClientError as exc:
+        print(f'backfill failed: {exc}, run the same command again to resume', file=sys.stderr)
+        return 1
+    finally:
+        stopped.set()
+    print(backfill.report(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""Export every product of a table to an NDJSON or CSV file, optionally gzipped.
+
+The table is read with a parallel scan, one thread per segment and a page at a time, so memory use doesn't depend on
+the table size. Every segment is written to its own part file next to the output, and its last evaluated key is saved
+to a checkpoint file once each page is on disk. When every segment is done, the parts are concatenated into the output
+and removed with the checkpoint. An interrupted export resumes from the checkpoint when run again with the same options.
+
+The backend is selected like the handlers', with DB_BACKEND ('dynamodb' by default, 'sqlite' exports SQLITE_DB_PATH).
+
+Run with `python -m product.crud.cli.export_products --table-name products --output products.ndjson.gz --gzip`.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import List, Optional
+
+from product.crud.cli.models import ExportCheckpoint, ProductFileFormat, SegmentCheckpoint
+from product.crud.cli.product_files import compress_chunk, encode_csv_header, encode_product_entries
+from product.crud.cli.utils import positive_int, start_progress_reporter
+from product.crud.integration import get_db_handler
+from product.crud.integration.db_handler import DbHandler
+from product.crud.models.exceptions import InternalServerException
+from product.observability import logger
+
+DEFAULT_SEGMENTS = 4
+# products are ~150 bytes, a page stays well under the 1 MB a DynamoDB scan page is capped at
+DEFAULT_PAGE_SIZE = 1_000
+DEFAULT_PROGRESS_SECONDS = 5.0
+
+
+def get_checkpoint_path(output_path: str) -> str:
+    return f'{output_path}.checkpoint.json'
+
+
+def get_part_path(output_path: str, segment: int) -> str:
+    return f'{output_path}.part{segment:04d}'
+
+
+def _write_durably(path: str, data: bytes) -> None:
+    # written aside then renamed, a crash leaves either the previous file or the new one
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'wb') as temporary_file:
+        temporary_file.write(data)
+        temporary_file.flush()
+        os.fsync(temporary_file.fileno())
+    os.replace(temporary_path, path)
+
+
+class ExportProgress:
+    """Products exported so far, updated by the segment threads and reported while the export runs.
+
+    Parameters
+    ----------
+    total_segments : int
+        Number of segments of the scan
+    exported : int
+        Products exported by previous runs of a resumed export, by default 0
+    done_segments : int
+        Segments exhausted by previous runs of a resumed export, by default 0
+    """
+
+    def __init__(self, total_segments: int, exported: int = 0, done_segments: int = 0):
+        self.total_segments = total_segments
+        self.exported = exported
+        self.done_segments = done_segments
+        self.started_at = time.monotonic()
+        self._resumed_from = exported  # throughput only counts the products of this run
+        self._lock = threading.Lock()
+
+    def add(self, exported: int, segment_done: bool) -> None:
+        with self._lock:
+            self.exported += exported
+            self.done_segments += segment_done
+
+    def report(self) -> str:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        throughput = (self.exported - self._resumed_from) / elapsed
+        return (
+            f'{self.exported} products exported, {throughput:.0f} products/s, '
+            f'{self.done_segments}/{self.total_segments} segments done in {elapsed:.1f} s'
+        )
+
+
+class ProductsExport:
+    """Parallel, resumable export of a products table to a single file.
+
+    Parameters
+    ----------
+    db_handler : DbHandler
+        Handler of the exported table, called from one thread per segment
+    table_name : str
+        Exported table, a checkpoint of another table is not resumed
+    output_path : str
+        Path of the exported file, part and checkpoint files are written next to it
+    file_format : ProductFileFormat
+        'ndjson' or 'csv', with a header row
+    compress : bool
+        Gzip the output, by default False
+    total_segments : int
+        Segments of the parallel scan, by default `DEFAULT_SEGMENTS`
+    page_size : int
+        Products per scan page, and per checkpoint, by default `DEFAULT_PAGE_SIZE`
+
+    Raises
+    ------
+    ValueError
+        When a checkpoint of the same output was saved by an export with other options
+    """
+
+    def __init__(
+        self,
+        db_handler: DbHandler,
+        table_name: str,
+        output_path: str,
+        file_format: ProductFileFormat,
+        compress: bool = False,
+        total_segments: int = DEFAULT_SEGMENTS,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        self.db_handler = db_handler
+        self.output_path = output_path
+        self.page_size = page_size
+        self.checkpoint_path = get_checkpoint_path(output_path)
+        self.checkpoint = self._load_checkpoint(
+            ExportCheckpoint(
+                table_name=table_name,
+                file_format=file_format,
+                compress=compress,
+                total_segments=total_segments,
+                segments=[SegmentCheckpoint() for _ in range(total_segments)],
+            )
+        )
+        self.progress = ExportProgress(
+            total_segments,
+            exported=sum(segment.exported for segment in self.checkpoint.segments),
+            done_segments=sum(segment.done for segment in self.checkpoint.segments),
+        )
+        self._checkpoint_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def _load_checkpoint(self, new_checkpoint: ExportCheckpoint) -> ExportCheckpoint:
+        if not os.path.exists(self.checkpoint_path):
+            return new_checkpoint
+        with open(self.checkpoint_path, 'rb') as checkpoint_file:
+            checkpoint = ExportCheckpoint.model_validate_json(checkpoint_file.read())
+        if checkpoint.model_dump(exclude={'segments'}) != new_checkpoint.model_dump(exclude={'segments'}):
+            raise ValueError(f'{self.checkpoint_path} was saved by an export with other options, remove it to start over')
+        logger.info('resuming export', exported=sum(segment.exported for segment in checkpoint.segments))
+        return checkpoint
+
+    def _save_segment(self, segment: int, segment_checkpoint: SegmentCheckpoint) -> None:
+        with self._checkpoint_lock:
+            self.checkpoint.segments[segment] = segment_checkpoint
+            _write_durably(self.checkpoint_path, self.checkpoint.model_dump_json().encode())
+
+    def _export_segment(self, segment: int) -> None:
+        segment_checkpoint = self.checkpoint.segments[segment]
+        if segment_checkpoint.done:
+            return
+        with open(get_part_path(self.output_path, segment), 'ab') as part_file:
+            # drops a page written after the last saved checkpoint, it is scanned again
+            part_file.truncate(segment_checkpoint.offset)
+            # truncating doesn't move the position, tell() would count the dropped bytes
+            part_file.seek(segment_checkpoint.offset)
+            while not segment_checkpoint.done and not self._stopped.is_set():
+                page = self.db_handler.scan_product_entries(
+                    segment, self.checkpoint.total_segments, exclusive_start_key=segment_checkpoint.last_key, limit=self.page_size
+                )
+                data = encode_product_entries(page.Items, self.checkpoint.file_format)
+                if data:
+                    part_file.write(compress_chunk(data) if self.checkpoint.compress else data)
+                    part_file.flush()
+                    os.fsync(part_file.fileno())
+                # the key is only saved once its page is on disk, a crash in between scans the page again
+                segment_checkpoint = SegmentCheckpoint(
+                    last_key=page.LastEvaluatedKey,
+                    offset=part_file.tell(),
+                    exported=segment_checkpoint.exported + len(page.Items),
+                    done=page.LastEvaluatedKey is None,
+                )
+                self._save_segment(segment, segment_checkpoint)
+                self.progress.add(len(page.Items), segment_done=segment_checkpoint.done)
+
+    def _concatenate_parts(self) -> None:
+        temporary_path = f'{self.output_path}.tmp'
+        with open(temporary_path, 'wb') as output_file:
+            if self.checkpoint.file_format == 'csv':
+                header = encode_csv_header()
+                output_file.write(compress_chunk(header) if self.checkpoint.compress else header)
+            # gzip members and lines can be concatenated as is, parts are copied a buffer at a time
+            for segment in range(self.checkpoint.total_segments):
+                with open(get_part_path(self.output_path, segment), 'rb') as part_file:
+                    shutil.copyfileobj(part_file, output_file)
+            output_file.flush()
+            os.fsync(output_file.fileno())
+        os.replace(temporary_path, self.output_path)
+        for segment in range(self.checkpoint.total_segments):
+            os.remove(get_part_path(self.output_path, segment))
+        os.remove(self.checkpoint_path)
+
+    def run(self) -> int:
+        """Export the segments that are not done yet, then assemble the output.
+
+        Returns
+        -------
+        int
+            Number of exported products, including those of previous runs
+
+        Raises
+        ------
+        InternalServerException
+            When a scan fails, the export is stopped and can be resumed
+        """
+        total_segments = self.checkpoint.total_segments
+        with ThreadPoolExecutor(max_workers=total_segments, thread_name_prefix='export-segment') as executor:
+            futures = [executor.submit(self._export_segment, segment) for segment in range(total_segments)]
+            wait(futures, return_when=FIRST_EXCEPTION)
+            # the other segments stop after their current page, so the checkpoint is as recent as possible
+            self._stopped.set()
+        for future in futures:
+            future.result()
+        self._concatenate_parts()
+        logger.info('exported products', exported=self.progress.exported, output_path=self.output_path)
+        return self.progress.exported
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table-name', default=os.environ.get('TABLE_NAME'), help='exported table, by default TABLE_NAME')
+    parser.add_argument('--output', required=True, help='path of the exported file')
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson', help='output format')
+    parser.add_argument('--gzip', action='store_true', help='gzip the output')
+    parser.add_argument('--segments', type=positive_int, default=DEFAULT_SEGMENTS, help='parallel scan segments, one thread each')
+    parser.add_argument('--page-size', type=positive_int, default=DEFAULT_PAGE_SIZE, help='products per scan page')
+    parser.add_argument('--progress-seconds', type=float, default=DEFAULT_PROGRESS_SECONDS, help='progress report interval')
+    parser.add_argument('--log-level', default='WARNING', help='log level of the data access layer')
+    args = parser.parse_args(argv)
+    if not args.table_name:
+        parser.error('--table-name is required when TABLE_NAME is not set')
+
+    logger.setLevel(args.log_level)
+    # one connection per segment thread, unless configured otherwise
+    os.environ.setdefault('DYNAMODB_MAX_POOL_CONNECTIONS', str(args.segments))
+    try:
+        export = ProductsExport(
+            get_db_handler(args.table_name),
+            args.table_name,
+            args.output,
+            file_format=args.format,
+            compress=args.gzip,
+            total_segments=args.segments,
+            page_size=args.page_size,
+        )
+    except ValueError as exc:
+        print(f'export failed: {exc}', file=sys.stderr)
+        return 2
+
+    stopped = start_progress_reporter(export.progress.report, args.progress_seconds)
+    try:
+        export.run()
+    except InternalServerException as exc:
+        print(f'export failed: {exc}, run the same command again to resume', file=sys.stderr)
+        return 1
+    finally:
+        stopped.set()
+    print(f'{export.progress.report()}, written to {args.output}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
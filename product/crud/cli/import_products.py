@@ -0,0 +1,319 @@
+"""Import products from an NDJSON or CSV file, gzipped or not, such as the output of `export_products`.
+
+The file is read as a stream and its rows validated in batches against `ProductEntry`, with names held to the API's
+limit. Valid products are written by a pool of workers with BatchWriteItem calls of up to 25 products, each fed through
+its own bounded queue, so reading, validation and writes overlap and memory use doesn't depend on the file size. A
+product id always goes to the same worker, so rows repeating a product are written in file order and the last one wins,
+like sequential puts. Writes are paced by an adaptive rate limiter that never goes above --rate products per second,
+halves its rate when writes are throttled and grows it back while they succeed.
+Unprocessed products are retried with exponential backoff and full jitter.
+
+Rows that are not valid products are written to a reject file, one JSON object per row with its line number and errors,
+and the import goes on. Puts replace existing products, so an interrupted import can be run again.
+
+The backend is selected like the handlers', with DB_BACKEND ('dynamodb' by default, 'sqlite' imports into SQLITE_DB_PATH).
+
+Run with `python -m product.crud.cli.import_products --table-name products --input products.ndjson.gz --rate 500`.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any, Dict, List, Optional, TextIO, Tuple
+
+from pydantic import Field, TypeAdapter, ValidationError
+
+from product.crud.cli.models import ProductFileFormat
+from product.crud.cli.product_files import ProductRow, open_product_file, read_product_rows
+from product.crud.cli.rate_limiter import AdaptiveRateLimiter
+from product.crud.cli.utils import positive_int, start_progress_reporter
+from product.crud.integration import get_db_handler
+from product.crud.integration.constants import BATCH_WRITE_MAX_ITEMS
+from product.crud.integration.db_handler import DbHandler
+from product.crud.models.exceptions import InternalServerException
+from product.models.products.product import ProductEntry
+from product.observability import logger
+
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 1_000.0  # products per second, a product under 1 KB consumes one write capacity unit
+DEFAULT_VALIDATION_BATCH_SIZE = 1_000
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_PROGRESS_SECONDS = 5.0
+BACKOFF_BASE_SECONDS = 0.05
+BACKOFF_MAX_SECONDS = 5.0
+
+
+class _ImportedProductEntry(ProductEntry):
+    # names are held to the API's limit, see CreateProductBody, a longer one would fail the output validation of its reads
+    name: Annotated[str, Field(min_length=1, max_length=20)]
+
+
+_ENTRIES_ADAPTER = TypeAdapter(List[_ImportedProductEntry])
+# product id -> (line, product), a BatchWriteItem can't hold two puts of the same key
+_WriteBatch = Dict[str, Tuple[int, ProductEntry]]
+
+
+def get_backoff_seconds(attempt: int) -> float:
+    """Full jitter exponential backoff before retrying the `attempt`-th failed write, from 0."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+class ImportProgress:
+    """Rows read, products imported and rows rejected so far, updated by the reader and the workers."""
+
+    def __init__(self) -> None:
+        self.read = 0
+        self.imported = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, read: int = 0, imported: int = 0, rejected: int = 0, throttled: int = 0) -> None:
+        with self._lock:
+            self.read += read
+            self.imported += imported
+            self.rejected += rejected
+            self.throttled += throttled
+
+    def report(self) -> str:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return (
+            f'{self.read} rows read, {self.imported} products imported, {self.imported / elapsed:.0f} products/s, '
+            f'{self.rejected} rejected, {self.throttled} throttled writes in {elapsed:.1f} s'
+        )
+
+
+class ProductsImport:
+    """Streaming import of a products file with pipelined, rate limited batch writes.
+
+    Parameters
+    ----------
+    db_handler : DbHandler
+        Handler of the table to import into, called from every worker
+    input_path : str
+        Products file, gzipped or not
+    file_format : ProductFileFormat
+        'ndjson' or 'csv', with a header row
+    reject_path : str
+        NDJSON file of the rows that are not valid products, only created if there is one
+    workers : int
+        Concurrent batch writes, by default `DEFAULT_WORKERS`
+    rate : float
+        Highest write rate, products per second, by default `DEFAULT_RATE`
+    validation_batch_size : int
+        Rows validated at once, by default `DEFAULT_VALIDATION_BATCH_SIZE`
+    max_attempts : int
+        Writes of a batch before the import fails, by default `DEFAULT_MAX_ATTEMPTS`
+    """
+
+    def __init__(
+        self,
+        db_handler: DbHandler,
+        input_path: str,
+        file_format: ProductFileFormat,
+        reject_path: str,
+        workers: int = DEFAULT_WORKERS,
+        rate: float = DEFAULT_RATE,
+        validation_batch_size: int = DEFAULT_VALIDATION_BATCH_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self.db_handler = db_handler
+        self.input_path = input_path
+        self.file_format = file_format
+        self.reject_path = reject_path
+        self.workers = workers
+        self.validation_batch_size = validation_batch_size
+        self.max_attempts = max_attempts
+        self.rate_limiter = AdaptiveRateLimiter(target_rate=rate)
+        self.progress = ImportProgress()
+        # two batches per worker keep them busy while the next rows are validated, without reading ahead
+        self._batches: List[queue.Queue[Optional[_WriteBatch]]] = [queue.Queue(maxsize=2) for _ in range(workers)]
+        self._failed = threading.Event()
+        self._errors: List[InternalServerException] = []
+        self._reject_file: Optional[TextIO] = None
+        self._reject_lock = threading.Lock()
+
+    def _reject(self, line: int, values: Any, errors: List[str]) -> None:
+        with self._reject_lock:
+            if self._reject_file is None:
+                self._reject_file = open(self.reject_path, 'w', encoding='utf-8')
+            self._reject_file.write(json.dumps({'line': line, 'row': values, 'errors': errors}, default=str) + '\n')
+        self.progress.add(rejected=1)
+
+    def _validate(self, rows: List[ProductRow]) -> List[Tuple[int, ProductEntry]]:
+        parsed = []
+        for row in rows:
+            if row.error is None:
+                parsed.append(row)
+            else:
+                self._reject(row.line, row.values, [row.error])
+        try:
+            entries = _ENTRIES_ADAPTER.validate_python([row.values for row in parsed])
+        except ValidationError as exc:
+            errors_by_row: defaultdict[int, List[str]] = defaultdict(list)
+            for error in exc.errors(include_url=False):
+                position, *field = error['loc']
+                errors_by_row[int(position)].append(f'{".".join(map(str, field)) or "row"}: {error["msg"]}')
+            for position, errors in errors_by_row.items():
+                self._reject(parsed[position].line, parsed[position].values, errors)
+            # the batch is validated again without the invalid rows, a batch of valid rows is validated once
+            parsed = [row for position, row in enumerate(parsed) if position not in errors_by_row]
+            entries = _ENTRIES_ADAPTER.validate_python([row.values for row in parsed])
+        # already validated, the entries are only rebuilt as plain ProductEntry
+        return [
+            (row.line, ProductEntry.model_construct(_fields_set=entry.model_fields_set, **dict(entry)))
+            for row, entry in zip(parsed, entries, strict=True)
+        ]
+
+    def _put_batch(self, worker: int, batch: _WriteBatch) -> None:
+        while not self._failed.is_set():
+            try:
+                self._batches[worker].put(batch, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _read_batches(self) -> None:
+        # one pending batch per worker, a batch only holds the products routed to its worker
+        batches: List[_WriteBatch] = [{} for _ in range(self.workers)]
+        with open_product_file(self.input_path) as product_file:
+            rows = read_product_rows(product_file, self.file_format)
+            while not self._failed.is_set():
+                chunk = list(itertools.islice(rows, self.validation_batch_size))
+                if not chunk:
+                    break
+                self.progress.add(read=len(chunk))
+                for line, entry in self._validate(chunk):
+                    # a product repeated within a batch is only put once, its last row wins like sequential puts
+                    worker = hash(entry.id) % self.workers
+                    batches[worker][entry.id] = (line, entry)
+                    if len(batches[worker]) == BATCH_WRITE_MAX_ITEMS:
+                        self._put_batch(worker, batches[worker])
+                        batches[worker] = {}
+        for worker, batch in enumerate(batches):
+            if batch:
+                self._put_batch(worker, batch)
+
+    def _write_batch(self, batch: _WriteBatch) -> None:
+        entries = [entry for _, entry in batch.values()]
+        for attempt in range(self.max_attempts):
+            self.rate_limiter.acquire(len(entries))
+            try:
+                unprocessed = self.db_handler.put_product_entries(entries)
+            except InternalServerException:
+                # the whole call failed once the client retries were exhausted, most likely throttled
+                unprocessed = entries
+            self.progress.add(imported=len(entries) - len(unprocessed))
+            if not unprocessed:
+                self.rate_limiter.succeeded()
+                return
+            self.progress.add(throttled=1)
+            self.rate_limiter.throttled()
+            entries = unprocessed
+            time.sleep(get_backoff_seconds(attempt))
+        error_msg = f'failed to import products, {len(entries)} products were not written after {self.max_attempts} attempts'
+        logger.error(error_msg, lines=[batch[entry.id][0] for entry in entries])
+        raise InternalServerException(error_msg)
+
+    def _write_batches(self, worker: int) -> None:
+        while (batch := self._batches[worker].get()) is not None:
+            # once an import failed, the reader stops and the queued batches are drained without being written
+            if self._failed.is_set():
+                continue
+            try:
+                self._write_batch(batch)
+            except InternalServerException as exc:
+                self._errors.append(exc)
+                self._failed.set()
+
+    def run(self) -> ImportProgress:
+        """Read, validate and write every row of the input file.
+
+        Returns
+        -------
+        ImportProgress
+            Rows read, products imported and rows rejected
+
+        Raises
+        ------
+        InternalServerException
+            When a batch is still not written after `max_attempts`, products already written are kept
+        """
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='import-writer') as executor:
+            futures = [executor.submit(self._write_batches, worker) for worker in range(self.workers)]
+            try:
+                self._read_batches()
+            finally:
+                for worker_batches in self._batches:
+                    worker_batches.put(None)
+        if self._reject_file is not None:
+            self._reject_file.close()
+        for future in futures:
+            future.result()
+        if self._errors:
+            raise self._errors[0]
+        logger.info('imported products', imported=self.progress.imported, rejected=self.progress.rejected)
+        return self.progress
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table-name', default=os.environ.get('TABLE_NAME'), help='table to import into, by default TABLE_NAME')
+    parser.add_argument('--input', required=True, help='path of the products file, gzipped or not')
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson', help='input format')
+    parser.add_argument('--reject-file', help='path of the rejected rows, by default the input path with a .rejected.ndjson suffix')
+    parser.add_argument('--workers', type=positive_int, default=DEFAULT_WORKERS, help='concurrent batch writes')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='highest write rate, products per second')
+    parser.add_argument('--max-attempts', type=positive_int, default=DEFAULT_MAX_ATTEMPTS, help='writes of a batch before giving up')
+    parser.add_argument('--progress-seconds', type=float, default=DEFAULT_PROGRESS_SECONDS, help='progress report interval')
+    parser.add_argument('--log-level', default='WARNING', help='log level of the data access layer')
+    args = parser.parse_args(argv)
+    if not args.table_name:
+        parser.error('--table-name is required when TABLE_NAME is not set')
+    if args.rate <= 0:
+        parser.error('--rate must be positive')
+
+    logger.setLevel(args.log_level)
+    # one connection per worker, unless configured otherwise
+    os.environ.setdefault('DYNAMODB_MAX_POOL_CONNECTIONS', str(args.workers))
+    reject_path = args.reject_file or f'{args.input}.rejected.ndjson'
+    products_import = ProductsImport(
+        get_db_handler(args.table_name),
+        args.input,
+        file_format=args.format,
+        reject_path=reject_path,
+        workers=args.workers,
+        rate=args.rate,
+        max_attempts=args.max_attempts,
+    )
+
+    stopped = start_progress_reporter(products_import.progress.report, args.progress_seconds)
+    try:
+        progress = products_import.run()
+    except InternalServerException as exc:
+        print(f'import failed: {exc}, written products are kept and the import can be run again', file=sys.stderr)
+        return 1
+    except (OSError, ValueError, csv.Error) as exc:
+        # the input can't be read, e.g. missing, not UTF-8 (a ValueError) or a corrupted gzip stream
+        print(f'import failed: {exc}', file=sys.stderr)
+        return 2
+    finally:
+        stopped.set()
+    print(progress.report(), file=sys.stderr)
+    if progress.rejected:
+        print(f'rejected rows are written to {reject_path}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
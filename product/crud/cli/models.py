@@ -0,0 +1,50 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, NonNegativeInt, PositiveInt
+
+ProductFileFormat = Literal['ndjson', 'csv']
+
+
+class SegmentCheckpoint(BaseModel):
+    """Export progress of one scan segment, saved after each page is written to the segment part file.
+
+    Parameters
+    ----------
+    last_key : Optional[str]
+        Last evaluated key of the segment scan, None before its first page
+    offset : NonNegativeInt
+        Size of the part file once the pages up to `last_key` are written, anything after it is dropped on resume
+    exported : NonNegativeInt
+        Products written to the part file
+    done : bool
+        The segment scan is exhausted
+    """
+
+    last_key: Optional[str] = None
+    offset: NonNegativeInt = 0
+    exported: NonNegativeInt = 0
+    done: bool = False
+
+
+class ExportCheckpoint(BaseModel):
+    """Progress of a products export, a crashed export resumes from it when run again with the same options.
+
+    Parameters
+    ----------
+    table_name : str
+        Exported table
+    file_format : ProductFileFormat
+        Output format, 'ndjson' or 'csv'
+    compress : bool
+        Output is gzipped
+    total_segments : PositiveInt
+        Number of segments of the parallel scan
+    segments : List[SegmentCheckpoint]
+        Progress of every segment
+    """
+
+    table_name: str
+    file_format: ProductFileFormat
+    compress: bool
+    total_segments: PositiveInt
+    segments: List[SegmentCheckpoint]
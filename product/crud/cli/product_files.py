@@ -0,0 +1,94 @@
+import csv
+import gzip
+import io
+import json
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+from product.crud.cli.models import ProductFileFormat
+from product.models.products.product import ProductEntry
+
+# column order of CSV files, every attribute of a stored product
+PRODUCT_FILE_FIELDS: List[str] = list(ProductEntry.model_fields)
+# every page is compressed on its own, level 6 is gzip's default ratio and far from the cost of a scan page
+PRODUCT_FILE_COMPRESSION_LEVEL = 6
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def encode_csv_header() -> bytes:
+    return (','.join(PRODUCT_FILE_FIELDS) + '\r\n').encode()
+
+
+def encode_product_entries(entries: Iterable[ProductEntry], file_format: ProductFileFormat) -> bytes:
+    """Encode products as NDJSON lines or CSV rows, without a header.
+
+    Parameters
+    ----------
+    entries : Iterable[ProductEntry]
+        Products to encode
+    file_format : ProductFileFormat
+        'ndjson' for one JSON object per line, 'csv' for one row per product in `PRODUCT_FILE_FIELDS` order
+
+    Returns
+    -------
+    bytes
+        UTF-8 encoded lines
+    """
+    if file_format == 'ndjson':
+        return b''.join(entry.model_dump_json().encode() + b'\n' for entry in entries)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([getattr(entry, field) for field in PRODUCT_FILE_FIELDS] for entry in entries)
+    return buffer.getvalue().encode()
+
+
+def compress_chunk(data: bytes) -> bytes:
+    """Compress `data` into a gzip member, a file of concatenated members is a valid gzip file.
+
+    Files written a chunk at a time can be cut after any chunk and still be decompressed.
+    """
+    return gzip.compress(data, compresslevel=PRODUCT_FILE_COMPRESSION_LEVEL, mtime=0)
+
+
+class ProductRow(NamedTuple):
+    line: int  # line number of the row in the file, from 1
+    values: Any  # a dict for CSV rows and valid JSON objects, the raw line when it isn't valid JSON
+    error: Optional[str] = None  # why the row could not be parsed
+
+
+def open_product_file(path: str) -> TextIO:
+    """Open a products file for reading as text, gzipped files are decompressed on the fly."""
+    with open(path, 'rb') as product_file:
+        compressed = product_file.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+    # csv handles the line endings itself
+    if compressed:
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def read_product_rows(product_file: TextIO, file_format: ProductFileFormat) -> Iterator[ProductRow]:
+    """Parse the rows of a products file one at a time, a row that isn't valid is returned with its error.
+
+    Parameters
+    ----------
+    product_file : TextIO
+        Products file open for reading, see `open_product_file`
+    file_format : ProductFileFormat
+        'ndjson' for one JSON object per line, blank lines are skipped, 'csv' for rows after a header of attribute names
+
+    Returns
+    -------
+    Iterator[ProductRow]
+        Rows in file order, values are validated by the caller
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(product_file)
+        for values in reader:
+            yield ProductRow(line=reader.line_num, values=values)
+        return
+    for line, text in enumerate(product_file, start=1):
+        if not text.strip():
+            continue
+        try:
+            yield ProductRow(line=line, values=json.loads(text))
+        except json.JSONDecodeError as exc:
+            yield ProductRow(line=line, values=text.rstrip('\r\n'), error=f'invalid JSON: {exc}')
@@ -0,0 +1,65 @@
+import threading
+import time
+from typing import Callable
+
+# halving the rate on throttling and growing it back a step per successful call, like TCP congestion control
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_FRACTION = 0.01  # of the target rate, per successful call
+# workers throttled by the same burst report it at about the same time, they only count as one decrease
+DECREASE_COOLDOWN_SECONDS = 1.0
+
+
+class AdaptiveRateLimiter:
+    """Paces the items written by concurrent workers under a target rate, which is lowered while writes are throttled.
+
+    Every call reserves the time its items take at the current rate and sleeps until then, so workers are spread evenly
+    instead of bursting. The rate is halved when a write is throttled and grows back linearly while writes succeed.
+
+    Parameters
+    ----------
+    target_rate : float
+        Items per second, never exceeded
+    min_rate : float
+        Lowest rate throttling can bring it down to, items per second
+    clock : Callable[[], float]
+        Monotonic clock in seconds, by default time.monotonic
+    sleep : Callable[[float], None]
+        Sleeps for some seconds, by default time.sleep
+    """
+
+    def __init__(
+        self,
+        target_rate: float,
+        min_rate: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.target_rate = target_rate
+        self.min_rate = min(min_rate, target_rate)
+        self.rate = target_rate
+        self._clock = clock
+        self._sleep = sleep
+        self._next_free_at = clock()
+        self._decreased_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def acquire(self, items: int) -> None:
+        """Wait for the turn of `items` items at the current rate."""
+        with self._lock:
+            now = self._clock()
+            start_at = max(now, self._next_free_at)
+            self._next_free_at = start_at + items / self.rate
+        if start_at > now:
+            self._sleep(start_at - now)
+
+    def throttled(self) -> None:
+        with self._lock:
+            now = self._clock()
+            if now - self._decreased_at < DECREASE_COOLDOWN_SECONDS:
+                return
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE_FACTOR)
+            self._decreased_at = now
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.rate = min(self.target_rate, self.rate + self.target_rate * RATE_INCREASE_FRACTION)
@@ -0,0 +1,24 @@
+import argparse
+import sys
+import threading
+from typing import Callable
+
+
+def positive_int(value: str) -> int:
+    """argparse type of options that must be a positive integer."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'{value} is not a positive integer')
+    return number
+
+
+def start_progress_reporter(report: Callable[[], str], interval_seconds: float) -> threading.Event:
+    """Print `report()` to stderr every `interval_seconds` from a daemon thread, until the returned event is set."""
+    stopped = threading.Event()
+
+    def _report_progress() -> None:
+        while not stopped.wait(interval_seconds):
+            print(report(), file=sys.stderr)
+
+    threading.Thread(target=_report_progress, name='progress-reporter', daemon=True).start()
+    return stopped
@@ -1,17 +1,22 @@
 from aws_lambda_env_modeler import get_environment_variables
-from aws_lambda_powertools.utilities.idempotency import DynamoDBPersistenceLayer, IdempotencyConfig, idempotent_function
+from aws_lambda_powertools.utilities.idempotency import IdempotencyConfig, idempotent_function
 from aws_lambda_powertools.utilities.idempotency.serialization.pydantic import PydanticSerializer
 
 from product.crud.handlers.models.env_vars import Idempotency
 from product.crud.integration import get_db_handler
 from product.crud.integration.db_handler import DbHandler
+from product.crud.integration.idempotency_layer import MeteredDynamoDBPersistenceLayer
 from product.crud.models.output import CreateProductOutput
 from product.crud.models.product import Product
 from product.observability import logger, tracer
 
-IDEMPOTENCY_LAYER = DynamoDBPersistenceLayer(table_name=get_environment_variables(model=Idempotency).IDEMPOTENCY_TABLE_NAME)
+IDEMPOTENCY_LAYER = MeteredDynamoDBPersistenceLayer(table_name=get_environment_variables(model=Idempotency).IDEMPOTENCY_TABLE_NAME)
 IDEMPOTENCY_CONFIG = IdempotencyConfig(
     expires_after_seconds=60,  # 1 minute
+    # completed records are kept in a bounded LRU cache per container until they expire,
+    # so retries landing on a warm container are answered without calling the idempotency table
+    use_local_cache=True,
+    local_cache_max_items=256,
 )
 
 
@@ -1,16 +1,24 @@
+from typing import List, Optional
+
 from product.crud.integration import get_db_handler
 from product.crud.integration.db_handler import DbHandler
-from product.crud.models.output import GetProductOutput
-from product.crud.models.product import Product
+from product.crud.models.output import GetPartialProductOutput, GetProductOutput
+from product.crud.models.product import PartialProduct, Product, ProductField
 from product.observability import logger, tracer
 
 
 @tracer.capture_method(capture_response=False)
-def get_product(product_id: str, table_name: str) -> GetProductOutput:
+def get_product(product_id: str, table_name: str, fields: Optional[List[ProductField]] = None) -> GetProductOutput | GetPartialProductOutput:
     logger.info('handling get product request')
 
     dal_handler: DbHandler = get_db_handler(table_name)
+    if fields:
+        # only fetch and return the requested fields
+        partial_product: PartialProduct = dal_handler.get_partial_product(product_id=product_id, fields=fields)
+        logger.info('got partial product successfully')
+        return GetPartialProductOutput.model_validate(partial_product.model_dump(exclude_none=True))
+
     product: Product = dal_handler.get_product(product_id=product_id)
     # convert from db entry to output, they won't always be the same
     logger.info('got product successfully')
-    return GetProductOutput(id=product.id, price=product.price, name=product.name)
+    return GetProductOutput(id=product.id, price=product.price, name=product.name, version=product.version)
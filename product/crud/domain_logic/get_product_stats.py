@@ -0,0 +1,33 @@
+import time
+
+from product.catalog.models import CatalogStats
+from product.catalog.stats import compute_catalog_stats
+from product.catalog.stats_store.exceptions import CatalogStatsStoreError
+from product.crud.integration import get_catalog_stats_store, get_db_handler
+from product.crud.models.output import ProductStatsOutput
+from product.observability import logger, tracer
+
+
+def _compute_from_table(table_name: str) -> CatalogStats:
+    # without the maintained aggregates, every price of the table is read
+    partial_products = get_db_handler(table_name).list_partial_products(fields=['price'])
+    return compute_catalog_stats((product.price for product in partial_products if product.price is not None), updated_at=int(time.time()))
+
+
+@tracer.capture_method(capture_response=False)
+def get_product_stats(table_name: str) -> ProductStatsOutput:
+    logger.info('handling product stats request')
+
+    stats_store = get_catalog_stats_store()
+    if stats_store is None:
+        stats = _compute_from_table(table_name)
+    else:
+        try:
+            stats = stats_store.get_stats()
+        except CatalogStatsStoreError:
+            logger.exception('failed to read the catalog stats, computing them from the table')
+            stats = _compute_from_table(table_name)
+
+    logger.info('got product stats successfully', product_count=stats.product_count)
+    average_price = stats.price_sum / stats.product_count if stats.product_count else None
+    return ProductStatsOutput(**stats.model_dump(), average_price=average_price)
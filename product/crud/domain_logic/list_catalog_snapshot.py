@@ -0,0 +1,29 @@
+from typing import List, Optional
+
+from product.catalog.object_store.exceptions import ObjectNotFoundError, ObjectStoreError
+from product.crud.integration import get_catalog_snapshot_reader
+from product.crud.integration.catalog_snapshot_reader import CatalogListing
+from product.crud.models.product import ProductField
+from product.observability import logger, tracer
+
+
+@tracer.capture_method(capture_response=False)
+def list_catalog_snapshot(fields: Optional[List[ProductField]] = None) -> Optional[CatalogListing]:
+    """Listing of the catalog snapshot maintained by the stream processor, None when products must be read from the table.
+
+    The snapshot trails the table by the stream delay, usually well under a second.
+    """
+    reader = get_catalog_snapshot_reader()
+    if reader is None:
+        return None
+    try:
+        listing = reader.get_listing(fields=fields)
+    except ObjectNotFoundError:
+        logger.info('catalog snapshot was not written yet, listing products from the table')
+        return None
+    except ObjectStoreError:
+        # the table still serves the listing, only slower
+        logger.exception('failed to read the catalog snapshot, listing products from the table')
+        return None
+    logger.info('listed products from the catalog snapshot')
+    return listing
@@ -1,18 +1,37 @@
-from typing import List
+from typing import List, Optional
 
 from product.crud.integration import get_db_handler
 from product.crud.integration.db_handler import DbHandler
-from product.crud.models.output import ListProductsOutput
-from product.crud.models.product import Product
+from product.crud.models.output import ListPartialProductsOutput, ListProductsOutput
+from product.crud.models.product import PartialProduct, Product, ProductField, ProductFilter
 from product.observability import logger, tracer
 
 
 @tracer.capture_method(capture_response=False)
-def list_products(table_name: str) -> ListProductsOutput:
+def list_products(
+    table_name: str, fields: Optional[List[ProductField]] = None, product_filter: Optional[ProductFilter] = None
+) -> ListProductsOutput | ListPartialProductsOutput:
     logger.info('handling list products request')
 
     dal_handler: DbHandler = get_db_handler(table_name)
-    products: List[Product] = dal_handler.list_products()
+    if product_filter is not None:
+        # query the secondary indexes instead of scanning the whole table
+        products: List[Product] = dal_handler.query_products(product_filter=product_filter)
+        if fields:
+            # secondary indexes project all attributes, only return the requested fields
+            included_fields: set[str] = set(fields)
+            partial_output = [product.model_dump(include=included_fields) for product in products]
+            logger.info('queried partial products successfully')
+            return ListPartialProductsOutput.model_validate({'products': partial_output})
+    elif fields:
+        # only fetch and return the requested fields
+        partial_products: List[PartialProduct] = dal_handler.list_partial_products(fields=fields)
+        partial_output = [product.model_dump(exclude_none=True) for product in partial_products]
+        logger.info('listed partial products successfully')
+        return ListPartialProductsOutput.model_validate({'products': partial_output})
+    else:
+        products = dal_handler.list_products()
+
     # convert from db entry to output, they won't always be the same
     list_output = [product.model_dump() for product in products]
     logger.info('listed products successfully')
@@ -0,0 +1,36 @@
+from typing import List
+
+from product.catalog.models import CatalogProduct
+from product.catalog.object_store.exceptions import ObjectNotFoundError, ObjectStoreError
+from product.crud.integration import get_db_handler, get_search_index_reader
+from product.crud.models.output import SearchProductsOutput
+from product.crud.models.product import Product, ProductFilter
+from product.observability import logger, tracer
+
+
+def _search_name_index(table_name: str, query: str, limit: int) -> List[Product]:
+    # without the search index, a case sensitive prefix of the whole name is the closest the table can do
+    products = get_db_handler(table_name).query_products(product_filter=ProductFilter(name_prefix=query[:50]))
+    return products[:limit]
+
+
+@tracer.capture_method(capture_response=False)
+def search_products(table_name: str, query: str, limit: int) -> SearchProductsOutput:
+    logger.info('handling search products request')
+
+    reader = get_search_index_reader()
+    products: List[CatalogProduct] | List[Product]
+    if reader is None:
+        products = _search_name_index(table_name, query, limit)
+    else:
+        try:
+            products = reader.search(query, limit)
+        except ObjectNotFoundError:
+            logger.info('search index was not written yet, querying the name index of the table')
+            products = _search_name_index(table_name, query, limit)
+        except ObjectStoreError:
+            logger.exception('failed to read the search index, querying the name index of the table')
+            products = _search_name_index(table_name, query, limit)
+
+    logger.info('searched products successfully', products=len(products))
+    return SearchProductsOutput.model_validate({'products': [product.model_dump() for product in products]})
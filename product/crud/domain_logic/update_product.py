@@ -0,0 +1,16 @@
+from product.crud.integration import get_db_handler
+from product.crud.integration.db_handler import DbHandler
+from product.crud.models.output import UpdateProductOutput
+from product.crud.models.product import PartialProduct, ProductUpdate
+from product.observability import logger, tracer
+
+
+@tracer.capture_method(capture_response=False)
+def update_product(product_id: str, product_update: ProductUpdate, table_name: str) -> UpdateProductOutput:
+    logger.info('handling update product request')
+
+    dal_handler: DbHandler = get_db_handler(table_name)
+    updated_product: PartialProduct = dal_handler.update_product(product_id=product_id, product_update=product_update)
+    # only the updated attributes are returned by the db, the id is not one of them
+    logger.info('updated product successfully')
+    return UpdateProductOutput.model_validate({**updated_product.model_dump(exclude_none=True), 'id': product_id})
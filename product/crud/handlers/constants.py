@@ -1,2 +1,4 @@
 PRODUCT_PATH = '/api/product/<product_id>'
 PRODUCTS_PATH = '/api/products'
+PRODUCTS_SEARCH_PATH = '/api/products/search'
+PRODUCTS_STATS_PATH = '/api/products/stats'
@@ -8,9 +8,11 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from product.crud.domain_logic.delete_product import delete_product
 from product.crud.handlers.constants import PRODUCT_PATH
 from product.crud.handlers.models.env_vars import DeleteVars
+from product.crud.handlers.utils.deadline import propagate_deadline
 from product.crud.handlers.utils.rest_api_resolver import app
+from product.crud.handlers.utils.route_latency import DOMAIN_LOGIC_STAGE, VALIDATION_STAGE, record_route_latency
 from product.crud.models.input import DeleteProductRequest
-from product.observability import logger, metrics, tracer
+from product.observability import logger, metrics, stage_timer, tracer
 
 
 @app.delete(PRODUCT_PATH)
@@ -18,13 +20,15 @@ def handle_delete_product(product_id: str) -> tuple[None, HTTPStatus]:
     env_vars: DeleteVars = get_environment_variables(model=DeleteVars)
     logger.debug('environment variables', env_vars=env_vars.model_dump())
 
-    DeleteProductRequest.model_validate(app.current_event.raw_event)
+    with stage_timer.stage(VALIDATION_STAGE):
+        DeleteProductRequest.model_validate(app.current_event.raw_event)
 
     logger.append_keys(product_id=product_id)
     logger.info('got a delete product request')
     metrics.add_metric(name='DeleteProductEvents', unit=MetricUnit.Count, value=1)
 
-    delete_product(product_id=product_id, table_name=env_vars.TABLE_NAME)
+    with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+        delete_product(product_id=product_id, table_name=env_vars.TABLE_NAME)
 
     logger.info('finished handling delete product request')
     return None, HTTPStatus.NO_CONTENT
@@ -33,6 +37,8 @@ def handle_delete_product(product_id: str) -> tuple[None, HTTPStatus]:
 @init_environment_variables(model=DeleteVars)
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
 @metrics.log_metrics
+@record_route_latency(route='DeleteProduct')
+@propagate_deadline
 @tracer.capture_lambda_handler(capture_response=False)
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     return app.resolve(event, context)
@@ -1,6 +1,5 @@
-from typing import Any
-
 from aws_lambda_env_modeler import get_environment_variables, init_environment_variables
+from aws_lambda_powertools.event_handler import Response
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.metrics import MetricUnit
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -8,32 +7,42 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from product.crud.domain_logic.get_product import get_product
 from product.crud.handlers.constants import PRODUCT_PATH
 from product.crud.handlers.models.env_vars import GetVars
+from product.crud.handlers.utils.deadline import propagate_deadline
+from product.crud.handlers.utils.etag import IF_NONE_MATCH_HEADER, build_conditional_response
 from product.crud.handlers.utils.rest_api_resolver import app
+from product.crud.handlers.utils.route_latency import DOMAIN_LOGIC_STAGE, SERIALIZATION_STAGE, VALIDATION_STAGE, record_route_latency
 from product.crud.models.input import GetProductRequest
-from product.crud.models.output import GetProductOutput
-from product.observability import logger, metrics, tracer
+from product.crud.models.output import GetPartialProductOutput, GetProductOutput
+from product.observability import logger, metrics, stage_timer, tracer
 
 
 @app.get(PRODUCT_PATH)
-def handle_get_product(product_id: str) -> dict[str, Any]:
+def handle_get_product(product_id: str) -> Response:
     env_vars: GetVars = get_environment_variables(model=GetVars)
     logger.debug('environment variables', env_vars=env_vars.model_dump())
 
-    GetProductRequest.model_validate(app.current_event.raw_event)
+    with stage_timer.stage(VALIDATION_STAGE):
+        get_input: GetProductRequest = GetProductRequest.model_validate(app.current_event.raw_event)
+    fields = get_input.queryStringParameters.fields if get_input.queryStringParameters else None
 
     logger.append_keys(product_id=product_id)
-    logger.info('got a get product request')
+    logger.info('got a get product request', fields=fields)
     metrics.add_metric(name='GetProductEvents', unit=MetricUnit.Count, value=1)
 
-    response: GetProductOutput = get_product(product_id=product_id, table_name=env_vars.TABLE_NAME)
+    with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+        response: GetProductOutput | GetPartialProductOutput = get_product(product_id=product_id, table_name=env_vars.TABLE_NAME, fields=fields)
 
     logger.info('finished handling get product request, product was not found')
-    return response.model_dump()
+    # clients that already hold the current representation get a 304 without a body
+    with stage_timer.stage(SERIALIZATION_STAGE):
+        return build_conditional_response(output=response, if_none_match=app.current_event.get_header_value(IF_NONE_MATCH_HEADER))
 
 
 @init_environment_variables(model=GetVars)
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
 @metrics.log_metrics
+@record_route_latency(route='GetProduct')
+@propagate_deadline
 @tracer.capture_lambda_handler(capture_response=False)
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     return app.resolve(event, context)
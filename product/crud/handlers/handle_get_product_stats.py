@@ -0,0 +1,42 @@
+from aws_lambda_env_modeler import get_environment_variables, init_environment_variables
+from aws_lambda_powertools.event_handler import Response
+from aws_lambda_powertools.logging import correlation_paths
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from product.crud.domain_logic.get_product_stats import get_product_stats
+from product.crud.handlers.constants import PRODUCTS_STATS_PATH
+from product.crud.handlers.models.env_vars import StatsVars
+from product.crud.handlers.utils.deadline import propagate_deadline
+from product.crud.handlers.utils.etag import IF_NONE_MATCH_HEADER, build_conditional_response
+from product.crud.handlers.utils.rest_api_resolver import app
+from product.crud.handlers.utils.route_latency import DOMAIN_LOGIC_STAGE, SERIALIZATION_STAGE, record_route_latency
+from product.crud.models.output import ProductStatsOutput
+from product.observability import logger, metrics, stage_timer, tracer
+
+
+@app.get(PRODUCTS_STATS_PATH)
+def handle_get_product_stats() -> Response:
+    env_vars: StatsVars = get_environment_variables(model=StatsVars)
+    logger.debug('environment variables', env_vars=env_vars.model_dump())
+
+    logger.info('got a product stats request')
+    metrics.add_metric(name='ProductStatsEvents', unit=MetricUnit.Count, value=1)
+
+    with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+        response: ProductStatsOutput = get_product_stats(table_name=env_vars.TABLE_NAME)
+
+    logger.info('finished handling product stats request')
+    # dashboards polling the stats get a 304 without a body until the next stream batch changes them
+    with stage_timer.stage(SERIALIZATION_STAGE):
+        return build_conditional_response(output=response, if_none_match=app.current_event.get_header_value(IF_NONE_MATCH_HEADER))
+
+
+@init_environment_variables(model=StatsVars)
+@logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
+@metrics.log_metrics
+@record_route_latency(route='ProductStats')
+@propagate_deadline
+@tracer.capture_lambda_handler(capture_response=False)
+def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    return app.resolve(event, context)
@@ -1,32 +1,62 @@
-from typing import Any
-
 from aws_lambda_env_modeler import get_environment_variables, init_environment_variables
+from aws_lambda_powertools.event_handler import Response
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.metrics import MetricUnit
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+from product.crud.domain_logic.list_catalog_snapshot import list_catalog_snapshot
 from product.crud.domain_logic.list_products import list_products
 from product.crud.handlers.constants import PRODUCTS_PATH
 from product.crud.handlers.models.env_vars import ListVars
+from product.crud.handlers.utils.deadline import propagate_deadline
+from product.crud.handlers.utils.etag import IF_NONE_MATCH_HEADER, build_conditional_body_response, build_conditional_response
 from product.crud.handlers.utils.rest_api_resolver import app
-from product.crud.models.output import ListProductsOutput
-from product.observability import logger, metrics, tracer
+from product.crud.handlers.utils.route_latency import DOMAIN_LOGIC_STAGE, SERIALIZATION_STAGE, VALIDATION_STAGE, record_route_latency
+from product.crud.models.input import ListProductsQueryParams, ListProductsRequest
+from product.crud.models.output import ListPartialProductsOutput, ListProductsOutput
+from product.observability import logger, metrics, stage_timer, tracer
 
 
 @app.get(PRODUCTS_PATH)
-def handle_list_products() -> dict[str, Any]:
+def handle_list_products() -> Response:
     env_vars: ListVars = get_environment_variables(model=ListVars)
     logger.debug('environment variables', env_vars=env_vars.model_dump())
+
+    with stage_timer.stage(VALIDATION_STAGE):
+        list_input: ListProductsRequest = ListProductsRequest.model_validate(app.current_event.raw_event)
+    query_params: ListProductsQueryParams = list_input.queryStringParameters or ListProductsQueryParams()
+    logger.info('got a list products request', query_params=query_params.model_dump(exclude_none=True))
     metrics.add_metric(name='ListProductsEvents', unit=MetricUnit.Count, value=1)
 
-    response: ListProductsOutput = list_products(table_name=env_vars.TABLE_NAME)
+    product_filter = query_params.to_filter()
+    if_none_match = app.current_event.get_header_value(IF_NONE_MATCH_HEADER)
+    # filtered listings query the secondary indexes, the others are served from the catalog snapshot when there is one
+    if product_filter is None:
+        with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+            listing = list_catalog_snapshot(fields=query_params.fields)
+        if listing is not None:
+            logger.info('finished handling list products request')
+            # the listing is serialized once per snapshot version, along with its ETag
+            with stage_timer.stage(SERIALIZATION_STAGE):
+                return build_conditional_body_response(body=listing.body, etag=listing.etag, if_none_match=if_none_match)
+
+    with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+        response: ListProductsOutput | ListPartialProductsOutput = list_products(
+            table_name=env_vars.TABLE_NAME,
+            fields=query_params.fields,
+            product_filter=product_filter,
+        )
     logger.info('finished handling list products request')
-    return response.model_dump()
+    # clients that already hold the current representation get a 304 without a body
+    with stage_timer.stage(SERIALIZATION_STAGE):
+        return build_conditional_response(output=response, if_none_match=if_none_match)
 
 
 @init_environment_variables(model=ListVars)
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
 @metrics.log_metrics
+@record_route_latency(route='ListProducts')
+@propagate_deadline
 @tracer.capture_lambda_handler(capture_response=False)
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     return app.resolve(event, context)
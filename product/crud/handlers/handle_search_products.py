@@ -0,0 +1,46 @@
+from aws_lambda_env_modeler import get_environment_variables, init_environment_variables
+from aws_lambda_powertools.event_handler import Response
+from aws_lambda_powertools.logging import correlation_paths
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from product.crud.domain_logic.search_products import search_products
+from product.crud.handlers.constants import PRODUCTS_SEARCH_PATH
+from product.crud.handlers.models.env_vars import SearchVars
+from product.crud.handlers.utils.deadline import propagate_deadline
+from product.crud.handlers.utils.etag import IF_NONE_MATCH_HEADER, build_conditional_response
+from product.crud.handlers.utils.rest_api_resolver import app
+from product.crud.handlers.utils.route_latency import DOMAIN_LOGIC_STAGE, SERIALIZATION_STAGE, VALIDATION_STAGE, record_route_latency
+from product.crud.models.input import SearchProductsRequest
+from product.crud.models.output import SearchProductsOutput
+from product.observability import logger, metrics, stage_timer, tracer
+
+
+@app.get(PRODUCTS_SEARCH_PATH)
+def handle_search_products() -> Response:
+    env_vars: SearchVars = get_environment_variables(model=SearchVars)
+    logger.debug('environment variables', env_vars=env_vars.model_dump())
+
+    with stage_timer.stage(VALIDATION_STAGE):
+        search_input: SearchProductsRequest = SearchProductsRequest.model_validate(app.current_event.raw_event)
+    query_params = search_input.queryStringParameters
+    logger.info('got a search products request', query=query_params.q, limit=query_params.limit)
+    metrics.add_metric(name='SearchProductsEvents', unit=MetricUnit.Count, value=1)
+
+    with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+        response: SearchProductsOutput = search_products(table_name=env_vars.TABLE_NAME, query=query_params.q, limit=query_params.limit)
+
+    logger.info('finished handling search products request')
+    # clients that already hold the current results get a 304 without a body
+    with stage_timer.stage(SERIALIZATION_STAGE):
+        return build_conditional_response(output=response, if_none_match=app.current_event.get_header_value(IF_NONE_MATCH_HEADER))
+
+
+@init_environment_variables(model=SearchVars)
+@logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
+@metrics.log_metrics
+@record_route_latency(route='SearchProducts')
+@propagate_deadline
+@tracer.capture_lambda_handler(capture_response=False)
+def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    return app.resolve(event, context)
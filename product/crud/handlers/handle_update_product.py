@@ -0,0 +1,56 @@
+from typing import Any
+
+from aws_lambda_env_modeler import get_environment_variables, init_environment_variables
+from aws_lambda_powertools.logging import correlation_paths
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from product.crud.domain_logic.update_product import update_product
+from product.crud.handlers.constants import PRODUCT_PATH
+from product.crud.handlers.models.env_vars import UpdateVars
+from product.crud.handlers.utils.deadline import propagate_deadline
+from product.crud.handlers.utils.rest_api_resolver import app
+from product.crud.handlers.utils.route_latency import DOMAIN_LOGIC_STAGE, SERIALIZATION_STAGE, VALIDATION_STAGE, record_route_latency
+from product.crud.models.input import UpdateProductInput
+from product.crud.models.output import UpdateProductOutput
+from product.crud.models.product import ProductUpdate
+from product.observability import logger, metrics, stage_timer, tracer
+
+
+@app.patch(PRODUCT_PATH)
+def handle_update_product(product_id: str) -> dict[str, Any]:
+    env_vars: UpdateVars = get_environment_variables(model=UpdateVars)
+    logger.debug('environment variables', env_vars=env_vars.model_dump())
+
+    # we want to extract and parse the HTTP body from the api gw envelope
+    with stage_timer.stage(VALIDATION_STAGE):
+        update_input: UpdateProductInput = UpdateProductInput.model_validate(app.current_event.raw_event)
+    logger.append_keys(product_id=product_id)
+
+    logger.info('got a valid update product request', product=update_input.body.model_dump(exclude_none=True))
+    metrics.add_metric(name='UpdateProductEvents', unit=MetricUnit.Count, value=1)
+
+    with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+        response: UpdateProductOutput = update_product(
+            product_id=product_id,
+            product_update=ProductUpdate(
+                name=update_input.body.name,
+                price=update_input.body.price,
+                version=update_input.body.version,
+            ),
+            table_name=env_vars.TABLE_NAME,
+        )
+
+    logger.info('finished handling update product request, product updated', version=response.version)
+    with stage_timer.stage(SERIALIZATION_STAGE):
+        return response.model_dump(exclude_none=True)
+
+
+@init_environment_variables(model=UpdateVars)
+@logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
+@metrics.log_metrics
+@record_route_latency(route='UpdateProduct')
+@propagate_deadline
+@tracer.capture_lambda_handler(capture_response=False)
+def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    return app.resolve(event, context)
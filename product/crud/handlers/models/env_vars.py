@@ -1,6 +1,8 @@
 from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, NonNegativeFloat, NonNegativeInt, PositiveFloat, PositiveInt
+
+from product.catalog.models import CatalogSnapshotVars, CatalogStatsVars
 
 
 class Observability(BaseModel):
@@ -24,5 +26,48 @@ class DeleteVars(Observability):
     TABLE_NAME: Annotated[str, Field(min_length=1)]
 
 
-class ListVars(Observability):
+class ListVars(Observability, CatalogSnapshotVars):
+    TABLE_NAME: Annotated[str, Field(min_length=1)]
+
+
+class SearchVars(Observability, CatalogSnapshotVars):
+    TABLE_NAME: Annotated[str, Field(min_length=1)]
+
+
+class StatsVars(Observability, CatalogStatsVars):
     TABLE_NAME: Annotated[str, Field(min_length=1)]
+
+
+class UpdateVars(Observability):
+    TABLE_NAME: Annotated[str, Field(min_length=1)]
+
+
+class DynamoDbClientVars(BaseModel):
+    # all optional, defaults suit a single threaded handler calling DynamoDB in the same region
+    DYNAMODB_MAX_POOL_CONNECTIONS: PositiveInt = 10
+    DYNAMODB_TCP_KEEPALIVE: bool = True
+    DYNAMODB_CONNECT_TIMEOUT_SECONDS: PositiveFloat = 1.0
+    DYNAMODB_READ_TIMEOUT_SECONDS: PositiveFloat = 2.0
+    DYNAMODB_MAX_ATTEMPTS: PositiveInt = 3
+    # reads slower than the p95 of the last ones get a second, eventually consistent, read and take the first answer
+    DYNAMODB_HEDGED_READS: bool = False
+    DYNAMODB_HEDGE_DELAY_MS: PositiveFloat = 20.0  # until enough read latencies are measured
+    # concurrent reads of the same product share one call, only hosts reading from several threads at once benefit
+    DYNAMODB_COALESCE_READS: bool = False
+    # calls fail fast with a 503 while most calls of the container are throttled or fail, see CircuitBreaker
+    DYNAMODB_CIRCUIT_BREAKER_FAILURE_RATE: Annotated[float, Field(gt=0, le=1)] = 0.5
+    DYNAMODB_CIRCUIT_BREAKER_MIN_CALLS: PositiveInt = 10
+    DYNAMODB_CIRCUIT_BREAKER_WINDOW_SECONDS: PositiveFloat = 10.0
+    DYNAMODB_CIRCUIT_BREAKER_OPEN_SECONDS: PositiveFloat = 5.0
+    DYNAMODB_CIRCUIT_BREAKER_HALF_OPEN_CALLS: PositiveInt = 3
+
+
+class DbHandlerVars(BaseModel):
+    # 'memory' and 'sqlite' serve the handlers locally, for offline load testing, benchmarking and local development
+    DB_BACKEND: Literal['dynamodb', 'memory', 'sqlite'] = 'dynamodb'
+    IN_MEMORY_DB_LATENCY_MS: NonNegativeFloat = 0
+    IN_MEMORY_DB_THROTTLE_EVERY: NonNegativeInt = 0
+    SQLITE_DB_PATH: Annotated[str, Field(min_length=1)] = '/tmp/products.db'
+    # handlers are kept per (backend, table), tenants idle for longer or beyond the maximum are evicted
+    DB_HANDLER_REGISTRY_MAX_SIZE: PositiveInt = 64
+    DB_HANDLER_MAX_IDLE_SECONDS: PositiveFloat = 900
@@ -0,0 +1,23 @@
+from typing import Callable
+
+from aws_lambda_powertools.middleware_factory import lambda_handler_decorator
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from product.crud.integration.deadline import deadline_scope
+
+# time kept to log, publish the metrics and return the error response once the deadline is exceeded
+DEADLINE_SAFETY_MARGIN_MS = 500
+
+
+@lambda_handler_decorator
+def propagate_deadline(handler: Callable[[dict, LambdaContext], dict], event: dict, context: LambdaContext) -> dict:
+    """Bound the data access layer calls of the invocation by the time left before the Lambda timeout.
+
+    Reads are abandoned and calls are not attempted past the deadline, the route answers with a 504 while there is still
+    time to, instead of the invocation being killed by the timeout. Local adapters and test contexts report no time
+    left, there is no deadline then.
+    """
+    remaining_ms = context.get_remaining_time_in_millis()
+    timeout_seconds = max(remaining_ms - DEADLINE_SAFETY_MARGIN_MS, 0) / 1000 if remaining_ms > 0 else None
+    with deadline_scope(timeout_seconds):
+        return handler(event, context)
@@ -0,0 +1,38 @@
+import hashlib
+from http import HTTPStatus
+from typing import Optional
+
+from aws_lambda_powertools.event_handler import Response, content_types
+from pydantic import BaseModel
+
+from product.observability import logger
+
+ETAG_HEADER = 'ETag'
+IF_NONE_MATCH_HEADER = 'If-None-Match'
+
+
+def compute_etag(body: str) -> str:
+    # strong validator, the same serialized body always yields the same ETag
+    return f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, W/ prefixes are ignored (RFC 9110 section 13.1.2)
+    candidates = [candidate.strip().removeprefix('W/') for candidate in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates
+
+
+def build_conditional_response(output: BaseModel, if_none_match: Optional[str]) -> Response:
+    # partial outputs don't serialize fields that were not requested
+    body = output.model_dump_json(exclude_none=True)
+    return build_conditional_body_response(body=body, etag=compute_etag(body), if_none_match=if_none_match)
+
+
+def build_conditional_body_response(body: str, etag: str, if_none_match: Optional[str]) -> Response:
+    # for bodies serialized ahead of the request, along with their ETag
+    if etag_matches(if_none_match, etag):
+        logger.info('resource was not modified, returning 304', etag=etag)
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={ETAG_HEADER: etag})
+    return Response(status_code=HTTPStatus.OK, content_type=content_types.APPLICATION_JSON, body=body, headers={ETAG_HEADER: etag})
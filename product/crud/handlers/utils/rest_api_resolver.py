@@ -1,13 +1,30 @@
 import json
 from http import HTTPStatus
+from typing import Any
 
 from aws_lambda_powertools.event_handler import APIGatewayRestResolver, Response, content_types
+from aws_lambda_powertools.shared.json_encoder import Encoder
 from pydantic import ValidationError
 
-from product.crud.models.exceptions import InternalServerException, ProductAlreadyExistsException, ProductNotFoundException
-from product.observability import logger
+from product.crud.handlers.utils.route_latency import SERIALIZATION_STAGE
+from product.crud.models.exceptions import (
+    DeadlineExceededException,
+    InternalServerException,
+    ProductAlreadyExistsException,
+    ProductNotFoundException,
+    ProductVersionConflictException,
+    ServiceUnavailableException,
+)
+from product.observability import logger, stage_timer
 
-app = APIGatewayRestResolver()
+
+def _serialize(response_body: Any) -> str:
+    # same as the resolver default serializer, timed as part of the route serialization stage
+    with stage_timer.stage(SERIALIZATION_STAGE):
+        return json.dumps(response_body, separators=(',', ':'), cls=Encoder)
+
+
+app = APIGatewayRestResolver(serializer=_serialize)
 
 
 @app.exception_handler(ProductNotFoundException)
@@ -48,3 +65,34 @@ def handle_product_already_exists_exception(ex: ProductAlreadyExistsException):
         content_type=content_types.APPLICATION_JSON,
         body=json.dumps({'error': 'product already exists'}),
     )
+
+
+@app.exception_handler(ProductVersionConflictException)
+def handle_product_version_conflict_exception(ex: ProductVersionConflictException):  # receives exception raised
+    logger.exception('finished handling request with an error, product version conflict')
+    return Response(
+        status_code=HTTPStatus.CONFLICT,
+        content_type=content_types.APPLICATION_JSON,
+        body=json.dumps({'error': 'product was modified, fetch the latest version and retry'}),
+    )
+
+
+@app.exception_handler(DeadlineExceededException)
+def handle_deadline_exceeded_exception(ex: DeadlineExceededException):  # receives exception raised
+    logger.exception('finished handling request with an error, deadline exceeded')
+    return Response(
+        status_code=HTTPStatus.GATEWAY_TIMEOUT,
+        content_type=content_types.APPLICATION_JSON,
+        body=json.dumps({'error': 'request timed out'}),
+    )
+
+
+@app.exception_handler(ServiceUnavailableException)
+def handle_service_unavailable_exception(ex: ServiceUnavailableException):  # receives exception raised
+    logger.warning('finished handling request with an error, service unavailable', retry_after_seconds=ex.retry_after_seconds)
+    return Response(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content_type=content_types.APPLICATION_JSON,
+        body=json.dumps({'error': 'service unavailable, retry later'}),
+        headers={'Retry-After': str(ex.retry_after_seconds)},
+    )
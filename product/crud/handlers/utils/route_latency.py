@@ -0,0 +1,25 @@
+from typing import Callable
+
+from aws_lambda_powertools.middleware_factory import lambda_handler_decorator
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from product.observability import stage_timer
+
+# stages of a CRUD route, DOMAIN_LOGIC_STAGE includes the DynamoDb stage, see register_call_timer
+TOTAL_STAGE = 'Total'
+VALIDATION_STAGE = 'Validation'
+DOMAIN_LOGIC_STAGE = 'DomainLogic'
+SERIALIZATION_STAGE = 'Serialization'
+
+
+@lambda_handler_decorator
+def record_route_latency(handler: Callable[[dict, LambdaContext], dict], event: dict, context: LambdaContext, route: str) -> dict:
+    """Publish the latency of the invocation and of its stages as `<route><Stage>Duration` metrics, in milliseconds.
+
+    Must be applied under `metrics.log_metrics`, which flushes them with the other metrics of the invocation.
+    """
+    try:
+        with stage_timer.stage(TOTAL_STAGE):
+            return handler(event, context)
+    finally:
+        stage_timer.add_metrics(prefix=route)
@@ -1,9 +1,73 @@
 from functools import lru_cache
+from typing import Optional
 
+from aws_lambda_env_modeler import get_environment_variables
+
+from product.catalog.models import CatalogSnapshotVars, CatalogStatsVars
+from product.catalog.object_store import get_catalog_object_store
+from product.catalog.stats_store.base import CatalogStatsStore
+from product.catalog.stats_store.dynamodb_stats_store import DynamoDbCatalogStatsStore
+from product.crud.handlers.models.env_vars import DbHandlerVars, DynamoDbClientVars
+from product.crud.integration.catalog_snapshot_reader import CatalogSnapshotReader
 from product.crud.integration.db_handler import DbHandler
+from product.crud.integration.db_handler_registry import DbHandlerRegistry
 from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.integration.dynamodb_client import get_dynamodb_client
+from product.crud.integration.in_memory_db_handler import InMemoryDbHandler
+from product.crud.integration.search_index_reader import SearchIndexReader
+from product.crud.integration.sqlite_db_handler import SqliteDbHandler
+
+
+def _create_db_handler(backend: str, table_name: str) -> DbHandler:
+    env_vars: DbHandlerVars = get_environment_variables(model=DbHandlerVars)
+    if backend == 'memory':
+        return InMemoryDbHandler(table_name, latency_ms=env_vars.IN_MEMORY_DB_LATENCY_MS, throttle_every=env_vars.IN_MEMORY_DB_THROTTLE_EVERY)
+    if backend == 'sqlite':
+        return SqliteDbHandler(table_name, db_path=env_vars.SQLITE_DB_PATH)
+    client_vars: DynamoDbClientVars = get_environment_variables(model=DynamoDbClientVars)
+    return DynamoDbHandler(table_name, coalesce_reads=client_vars.DYNAMODB_COALESCE_READS)
+
+
+# one registry per container, shared by all handlers like the dynamodb client
+@lru_cache(maxsize=1)
+def get_db_handler_registry() -> DbHandlerRegistry:
+    env_vars: DbHandlerVars = get_environment_variables(model=DbHandlerVars)
+    return DbHandlerRegistry(
+        factory=_create_db_handler,
+        max_size=env_vars.DB_HANDLER_REGISTRY_MAX_SIZE,
+        max_idle_seconds=env_vars.DB_HANDLER_MAX_IDLE_SECONDS,
+    )
 
 
-@lru_cache
 def get_db_handler(table_name: str) -> DbHandler:
-    return DynamoDbHandler(table_name)
+    env_vars: DbHandlerVars = get_environment_variables(model=DbHandlerVars)
+    return get_db_handler_registry().get(env_vars.DB_BACKEND, table_name)
+
+
+# one reader per container, its cached snapshot and listings outlive invocations
+@lru_cache(maxsize=1)
+def get_catalog_snapshot_reader() -> Optional[CatalogSnapshotReader]:
+    object_store = get_catalog_object_store()
+    if object_store is None:
+        return None
+    env_vars: CatalogSnapshotVars = get_environment_variables(model=CatalogSnapshotVars)
+    return CatalogSnapshotReader(object_store, key=env_vars.CATALOG_SNAPSHOT_KEY, refresh_seconds=env_vars.CATALOG_SNAPSHOT_REFRESH_SECONDS)
+
+
+# one reader per container, its cached index outlives invocations
+@lru_cache(maxsize=1)
+def get_search_index_reader() -> Optional[SearchIndexReader]:
+    object_store = get_catalog_object_store()
+    if object_store is None:
+        return None
+    env_vars: CatalogSnapshotVars = get_environment_variables(model=CatalogSnapshotVars)
+    return SearchIndexReader(object_store, key=env_vars.CATALOG_SEARCH_INDEX_KEY, refresh_seconds=env_vars.CATALOG_SNAPSHOT_REFRESH_SECONDS)
+
+
+# the aggregates are read with the shared dynamodb client, its calls are timed as the DynamoDb stage of the route
+@lru_cache(maxsize=1)
+def get_catalog_stats_store() -> Optional[CatalogStatsStore]:
+    env_vars: CatalogStatsVars = get_environment_variables(model=CatalogStatsVars)
+    if not env_vars.CATALOG_STATS_TABLE_NAME:
+        return None
+    return DynamoDbCatalogStatsStore(table_name=env_vars.CATALOG_STATS_TABLE_NAME, client=get_dynamodb_client())
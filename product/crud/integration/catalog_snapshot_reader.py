@@ -0,0 +1,84 @@
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from product.catalog.models import CatalogSnapshot
+from product.catalog.object_store.base import ObjectStore
+from product.catalog.object_store.versioned_object import VersionedObject
+from product.catalog.snapshot import decode_snapshot, encode_snapshot
+from product.crud.handlers.utils.etag import compute_etag
+from product.crud.models.output import ListPartialProductsOutput, ListProductsOutput
+from product.crud.models.product import ProductField
+from product.observability import logger
+
+
+class CatalogListing(NamedTuple):
+    body: str
+    etag: str
+
+
+class CatalogSnapshotReader:
+    """Serves product listings from the catalog snapshot instead of scanning the table.
+
+    The snapshot is fetched again only when it changed (conditional GET on its ETag), and at most every
+    `refresh_seconds`. Serialized listings are kept per requested fields until the snapshot changes, so a warm
+    container answers a listing without deserializing or serializing products.
+
+    Parameters
+    ----------
+    object_store : ObjectStore
+        Store holding the snapshot
+    key : str
+        Object key of the snapshot
+    refresh_seconds : float
+        Minimum time between two checks for a newer snapshot
+    """
+
+    def __init__(self, object_store: ObjectStore, key: str, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._snapshot_object = VersionedObject(object_store, key, decode=decode_snapshot, encode=encode_snapshot, empty=CatalogSnapshot)
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = float('-inf')
+        self._listings: dict[tuple[ProductField, ...], CatalogListing] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> CatalogSnapshot:
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._checked_at < self.refresh_seconds:
+            return self._snapshot
+        snapshot = self._snapshot_object.get()
+        self._checked_at = now
+        if snapshot is not self._snapshot:
+            self._snapshot = snapshot
+            self._listings.clear()
+            logger.info('loaded catalog snapshot', version=snapshot.version, products=len(snapshot.products))
+        return snapshot
+
+    def get_listing(self, fields: Optional[list[ProductField]] = None) -> CatalogListing:
+        """Serialized listing of every product, or of the requested fields only, with its ETag.
+
+        Raises
+        ------
+        ObjectNotFoundError
+            When the stream processor didn't write a snapshot yet
+        ObjectStoreError
+            When the store fails
+        """
+        with self._lock:
+            snapshot = self._refresh()
+            listing_key = tuple(fields or ())
+            listing = self._listings.get(listing_key)
+            if listing is None:
+                output: ListProductsOutput | ListPartialProductsOutput
+                if fields:
+                    included_fields: set[str] = set(fields)
+                    output = ListPartialProductsOutput.model_validate(
+                        {'products': [product.model_dump(include=included_fields) for product in snapshot.products]}
+                    )
+                else:
+                    output = ListProductsOutput.model_validate({'products': [product.model_dump() for product in snapshot.products]})
+                # same body as a listing read from the table, clients can't tell where it comes from
+                body = output.model_dump_json(exclude_none=True)
+                listing = CatalogListing(body=body, etag=compute_etag(body))
+                self._listings[listing_key] = listing
+            return listing
@@ -0,0 +1,172 @@
+import math
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable
+
+from aws_lambda_powertools.metrics import MetricUnit
+from botocore.exceptions import BotoCoreError
+from mypy_boto3_dynamodb import DynamoDBClient
+
+from product.crud.models.exceptions import ServiceUnavailableException
+from product.observability import logger, metrics
+
+# errors telling DynamoDB is overloaded, other 4xx errors are answers to the request and count as successes
+THROTTLING_ERROR_CODES = frozenset({'ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded'})
+
+
+class CircuitState(str, Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Fails calls fast while most recent calls were throttled or failed, to shed load instead of adding retries to it.
+
+    Closed, calls go through and their outcome is kept for `window_seconds`. Once at least `min_calls` were made in the
+    window and `failure_rate` of them failed, the circuit opens and calls are rejected with a
+    ServiceUnavailableException for `open_seconds`. It then turns half-open and lets `half_open_calls` probe calls
+    through: the circuit closes once they all succeed and opens again on the first failure.
+
+    Outcomes are those of whole calls, a call that succeeded after retries is a success.
+
+    Parameters
+    ----------
+    failure_rate : float
+        Share of failed calls in the window that opens the circuit, from 0 to 1
+    min_calls : int
+        Calls in the window before the failure rate is considered
+    window_seconds : float
+        How long call outcomes are kept
+    open_seconds : float
+        How long calls are rejected before probing
+    half_open_calls : int
+        Probe calls that must succeed to close the circuit
+    clock : Callable[[], float]
+        Monotonic clock in seconds, by default time.monotonic
+    """
+
+    def __init__(
+        self,
+        failure_rate: float,
+        min_calls: int,
+        window_seconds: float,
+        open_seconds: float,
+        half_open_calls: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        # (finished at, failed) of the calls in the window
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._state_changed_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._refresh_state(self._clock())
+            return self._state
+
+    def _refresh_state(self, now: float) -> None:
+        # probes that never recorded an outcome, e.g. abandoned at the deadline, are replaced after another open period
+        if self._state != CircuitState.CLOSED and now - self._state_changed_at >= self.open_seconds:
+            if self._state == CircuitState.OPEN:
+                logger.info('circuit breaker is half open, probing')
+            self._state = CircuitState.HALF_OPEN
+            self._state_changed_at = now
+            self._probes_started = self._probes_succeeded = 0
+
+    def _open(self, now: float) -> None:
+        logger.warning('circuit breaker opened', failures=self._failures, calls=len(self._outcomes))
+        metrics.add_metric(name='CircuitBreakerOpened', unit=MetricUnit.Count, value=1)
+        self._state = CircuitState.OPEN
+        self._state_changed_at = now
+        self._outcomes.clear()
+        self._failures = 0
+
+    def _get_retry_after_seconds(self, now: float) -> int:
+        # whole seconds until calls may be let through again, probes are a second away at most
+        if self._state != CircuitState.OPEN:
+            return 1
+        return max(1, math.ceil(self.open_seconds - (now - self._state_changed_at)))
+
+    def before_call(self) -> None:
+        """Let a call through, or raise ServiceUnavailableException while the circuit is open or enough probes run."""
+        with self._lock:
+            now = self._clock()
+            self._refresh_state(now)
+            if self._state == CircuitState.CLOSED:
+                return
+            if self._state == CircuitState.HALF_OPEN and self._probes_started < self.half_open_calls:
+                self._probes_started += 1
+                return
+            retry_after_seconds = self._get_retry_after_seconds(now)
+        metrics.add_metric(name='ShedCalls', unit=MetricUnit.Count, value=1)
+        raise ServiceUnavailableException('failed to call db, circuit breaker is open', retry_after_seconds=retry_after_seconds)
+
+    def record(self, failed: bool) -> None:
+        """Record the outcome of a call let through by `before_call`."""
+        with self._lock:
+            now = self._clock()
+            if self._state == CircuitState.HALF_OPEN:
+                if failed:
+                    self._open(now)
+                    return
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_calls:
+                    logger.info('circuit breaker closed')
+                    self._state = CircuitState.CLOSED
+                return
+            if self._state == CircuitState.OPEN:
+                # calls started before the circuit opened, the probes decide when it closes
+                return
+
+            self._outcomes.append((now, failed))
+            self._failures += failed
+            while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+                _, expired_failed = self._outcomes.popleft()
+                self._failures -= expired_failed
+            if len(self._outcomes) >= self.min_calls and self._failures >= self.failure_rate * len(self._outcomes):
+                self._open(now)
+
+
+def _is_failed_response(http_response: Any, parsed: dict[str, Any]) -> bool:
+    status_code = getattr(http_response, 'status_code', None) or parsed.get('ResponseMetadata', {}).get('HTTPStatusCode', 200)
+    return status_code >= 500 or parsed.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+
+
+def register_circuit_breaker(client: DynamoDBClient, circuit_breaker: CircuitBreaker) -> None:
+    """Let the calls of `client` through `circuit_breaker`, registering the same breaker again is a no-op.
+
+    Calls are rejected before anything else runs, botocore Stubber included. Throttled and 5xx responses, and calls failing without a
+    response (connection errors, timeouts), count as failures.
+    """
+
+    def before_call(**kwargs: Any) -> None:
+        circuit_breaker.before_call()
+
+    def after_call(http_response: Any, parsed: dict[str, Any], **kwargs: Any) -> None:
+        circuit_breaker.record(failed=_is_failed_response(http_response, parsed))
+
+    def after_call_error(exception: Exception, **kwargs: Any) -> None:
+        # errors raised by the event handlers, e.g. a deadline check, don't tell anything about DynamoDB
+        if isinstance(exception, BotoCoreError):
+            circuit_breaker.record(failed=True)
+
+    # unique per breaker, so handlers sharing the client and its breaker register it once, and another breaker is not ignored
+    breaker_id = id(circuit_breaker)
+    events = client.meta.events
+    events.register('provide-client-params.dynamodb', before_call, unique_id=f'circuit-breaker-before-call-{breaker_id}')
+    events.register('after-call.dynamodb', after_call, unique_id=f'circuit-breaker-after-call-{breaker_id}')
+    events.register('after-call-error.dynamodb', after_call_error, unique_id=f'circuit-breaker-after-call-error-{breaker_id}')
@@ -0,0 +1,6 @@
+# secondary indexes of the products table, must match the indexes defined in infrastructure/product/crud/crud_api_db_construct.py
+PRICE_INDEX_NAME = 'price_index'
+NAME_INDEX_NAME = 'name_index'
+
+# most items a single BatchWriteItem call accepts
+BATCH_WRITE_MAX_ITEMS = 25
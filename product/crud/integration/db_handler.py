@@ -1,19 +1,22 @@
-from abc import ABC, ABCMeta, abstractmethod
-from typing import List
+from abc import ABC, abstractmethod
+from typing import List, Optional
 
-from product.crud.models.product import Product
+from product.crud.integration.models.db import ProductEntriesPage
+from product.crud.models.product import PartialProduct, Product, ProductField, ProductFilter, ProductUpdate
+from product.models.products.product import ProductEntry
 
+# product ids are UUID strings, local backends split a scan into segments of contiguous id ranges of the same width
+_SEGMENT_KEY_SPACE = 16**8
 
-class _SingletonMeta(ABCMeta):
-    _instances: dict = {}
 
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(_SingletonMeta, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+def get_segment_bounds(segment: int, total_segments: int) -> tuple[str, Optional[str]]:
+    """Inclusive lower and exclusive upper product id bounds of a scan segment, the last segment has no upper bound."""
+    lower = f'{segment * _SEGMENT_KEY_SPACE // total_segments:08x}' if segment else ''
+    upper = f'{(segment + 1) * _SEGMENT_KEY_SPACE // total_segments:08x}' if segment + 1 < total_segments else None
+    return lower, upper
 
 
-class DbHandler(ABC, metaclass=_SingletonMeta):
+class DbHandler(ABC):
     @abstractmethod
     def create_product(self, product: Product) -> None:
         ...  # pragma: no cover
@@ -22,6 +25,10 @@ class DbHandler(ABC, metaclass=_SingletonMeta):
     def get_product(self, product_id: str) -> Product:
         ...  # pragma: no cover
 
+    @abstractmethod
+    def update_product(self, product_id: str, product_update: ProductUpdate) -> PartialProduct:
+        ...  # pragma: no cover
+
     @abstractmethod
     def delete_product(self, product_id: str) -> None:
         ...  # pragma: no cover
@@ -29,3 +36,23 @@ class DbHandler(ABC, metaclass=_SingletonMeta):
     @abstractmethod
     def list_products(self) -> List[Product]:
         ...  # pragma: no cover
+
+    @abstractmethod
+    def get_partial_product(self, product_id: str, fields: List[ProductField]) -> PartialProduct:
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def list_partial_products(self, fields: List[ProductField]) -> List[PartialProduct]:
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def query_products(self, product_filter: ProductFilter) -> List[Product]:
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def scan_product_entries(self, segment: int, total_segments: int, exclusive_start_key: Optional[str], limit: int) -> ProductEntriesPage:
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def put_product_entries(self, entries: List[ProductEntry]) -> List[ProductEntry]:
+        ...  # pragma: no cover
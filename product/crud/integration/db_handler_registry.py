@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from product.crud.integration.db_handler import DbHandler
+from product.observability import logger
+
+# backends whose handler holds the table's data, evicting one would lose it
+STATEFUL_BACKENDS = frozenset({'memory'})
+
+
+class _RegistryEntry(NamedTuple):
+    db_handler: DbHandler
+    last_used: float
+
+
+class DbHandlerRegistry:
+    """Bounded LRU registry of db handlers keyed by (backend, table name), for many tenant tables in one warm container.
+
+    Handlers are cheap to create since they share the backend client, see get_dynamodb_client, so evicting an idle
+    tenant only costs a handler instance when it comes back. Handlers of pinned backends are kept apart, they are never
+    evicted and don't count against `max_size`.
+
+    Parameters
+    ----------
+    factory : Callable[[str, str], DbHandler]
+        Creates the handler of a (backend, table name) pair that isn't registered
+    max_size : int
+        Maximum number of handlers, the least recently used one is evicted first
+    max_idle_seconds : float
+        Handlers unused for longer are evicted, whatever the registry size
+    pinned_backends : frozenset[str]
+        Backends whose handlers are never evicted, by default `STATEFUL_BACKENDS`
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str, str], DbHandler],
+        max_size: int,
+        max_idle_seconds: float,
+        pinned_backends: frozenset[str] = STATEFUL_BACKENDS,
+    ):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.pinned_backends = pinned_backends
+        self._entries: OrderedDict[tuple[str, str], _RegistryEntry] = OrderedDict()  # least recently used first
+        self._pinned: dict[tuple[str, str], DbHandler] = {}
+        self._lock = threading.Lock()
+
+    def get(self, backend: str, table_name: str) -> DbHandler:
+        key = (backend, table_name)
+        now = time.monotonic()
+        with self._lock:
+            if backend in self.pinned_backends:
+                db_handler = self._pinned.get(key)
+                if db_handler is None:
+                    logger.debug('creating db handler', backend=backend, table_name=table_name)
+                    db_handler = self._pinned[key] = self.factory(backend, table_name)
+                return db_handler
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                logger.debug('creating db handler', backend=backend, table_name=table_name)
+                entry = _RegistryEntry(db_handler=self.factory(backend, table_name), last_used=now)
+            self._entries[key] = entry._replace(last_used=now)
+            self._evict(now)
+        return entry.db_handler
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            key, oldest = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_size and now - oldest.last_used <= self.max_idle_seconds:
+                return
+            logger.info('evicting idle db handler', backend=key[0], table_name=key[1], idle_seconds=round(now - oldest.last_used, 1))
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._pinned)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._entries or key in self._pinned
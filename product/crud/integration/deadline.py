@@ -0,0 +1,50 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import Iterator, Optional, Tuple
+
+from product.crud.models.exceptions import DeadlineExceededException
+
+# time.monotonic() value the calls of the current invocation must finish by, None when there is no deadline.
+# Worker threads only see it when they run in a copy of the caller's context, see HedgedReader
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+# set once the caller stopped waiting for the read running in the context, see `copy_abandonable_context`
+_abandoned: ContextVar[Optional[threading.Event]] = ContextVar('abandoned', default=None)
+
+
+@contextmanager
+def deadline_scope(timeout_seconds: Optional[float]) -> Iterator[None]:
+    """Bound the data access layer calls made in the scope by `timeout_seconds` from now, None for no deadline."""
+    token = _deadline.set(None if timeout_seconds is None else time.monotonic() + timeout_seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining_seconds() -> Optional[float]:
+    """Seconds left until the deadline of the current scope, negative once exceeded, None when there is no deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline(operation: str) -> None:
+    """Raise DeadlineExceededException instead of starting `operation` once the deadline is exceeded."""
+    remaining_seconds = get_remaining_seconds()
+    if remaining_seconds is not None and remaining_seconds <= 0:
+        raise DeadlineExceededException(f'failed to {operation}, deadline exceeded')
+
+
+def copy_abandonable_context() -> Tuple[Context, threading.Event]:
+    """Copy the current context to run a read in another thread, `is_abandoned` is True in the copy once the event is set."""
+    context = copy_context()
+    abandoned = threading.Event()
+    context.run(_abandoned.set, abandoned)
+    return context, abandoned
+
+
+def is_abandoned() -> bool:
+    """Whether the caller gave up on the read running in the current context, its invocation may be over already."""
+    abandoned = _abandoned.get()
+    return abandoned is not None and abandoned.is_set()
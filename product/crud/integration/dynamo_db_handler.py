@@ -1,35 +1,127 @@
 from datetime import datetime
-from typing import List
+from typing import Any, Collection, List, Optional
 
-import boto3
+from boto3.dynamodb.conditions import Attr, ConditionBase, ConditionExpressionBuilder, Key
+from boto3.dynamodb.types import TypeSerializer
 from botocore.exceptions import ClientError
-from cachetools import TTLCache, cached
-from mypy_boto3_dynamodb import DynamoDBServiceResource
-from mypy_boto3_dynamodb.service_resource import Table
+from mypy_boto3_dynamodb import DynamoDBClient
 from pydantic import ValidationError
 
+from product.crud.integration.circuit_breaker import CircuitBreaker, register_circuit_breaker
+from product.crud.integration.constants import NAME_INDEX_NAME, PRICE_INDEX_NAME
 from product.crud.integration.db_handler import DbHandler
-from product.crud.integration.models.db import ProductEntries
-from product.crud.models.exceptions import InternalServerException, ProductAlreadyExistsException, ProductNotFoundException
-from product.crud.models.product import Product
-from product.models.products.product import ProductEntry
+from product.crud.integration.dynamodb_client import get_circuit_breaker, get_dynamodb_client, get_hedged_reader
+from product.crud.integration.hedged_reader import HedgedReader
+from product.crud.integration.models.db import PartialProductEntries, ProductEntries, ProductEntriesPage
+from product.crud.integration.product_codec import decode_product_item, encode_product_entry
+from product.crud.integration.single_flight import SingleFlight
+from product.crud.models.exceptions import (
+    InternalServerException,
+    ProductAlreadyExistsException,
+    ProductNotFoundException,
+    ProductVersionConflictException,
+)
+from product.crud.models.product import PartialProduct, Product, ProductField, ProductFilter, ProductUpdate
+from product.models.products.product import PRODUCT_CATALOG, ProductEntry
 from product.observability import logger, tracer
 
 
 class DynamoDbHandler(DbHandler):
-    def __init__(self, table_name: str):
+    def __init__(
+        self,
+        table_name: str,
+        client: Optional[DynamoDBClient] = None,
+        hedged_reader: Optional[HedgedReader] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        coalesce_reads: bool = False,
+    ):
         self.table_name = table_name
+        # the client is shared by all handlers in the container, see get_dynamodb_client
+        self.client: DynamoDBClient = client or get_dynamodb_client()
+        self.hedged_reader = hedged_reader or get_hedged_reader()
+        # while DynamoDB is throttling, calls are rejected with a ServiceUnavailableException instead of piling up retries
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+        register_circuit_breaker(self.client, self.circuit_breaker)
+        # concurrent reads of the same product share one get_item call. Only worth it in a host reading the same handler
+        # from several threads, e.g. a threaded batch job. A Lambda container or a local server worker resolves one
+        # request at a time, its reads never overlap, so it is off by default, see DYNAMODB_COALESCE_READS
+        self._reads_in_flight: Optional[SingleFlight] = SingleFlight() if coalesce_reads else None
+        self._serializer = TypeSerializer()
 
-    # cache dynamodb connection data for no longer than 5 minutes
-    @cached(cache=TTLCache(maxsize=1, ttl=300))
-    def _get_table(self, table_name: str) -> Table:
-        logger.debug('opening connection to dynamodb table', table_name=table_name)
-        dynamodb: DynamoDBServiceResource = boto3.resource('dynamodb')
-        return dynamodb.Table(table_name)
+    # generic serialization is only used for expression values, items go through the product codec
+    def _to_wire(self, values: dict[str, Any]) -> dict[str, Any]:
+        return {key: self._serializer.serialize(value) for key, value in values.items()}
 
     def _get_unix_time(self) -> int:
         return int(datetime.utcnow().timestamp())
 
+    def _build_projection(self, fields: List[ProductField]) -> dict[str, Any]:
+        # attribute names are aliased since 'name' is a DynamoDB reserved word
+        return {
+            'ProjectionExpression': ', '.join(f'#{field}' for field in fields),
+            'ExpressionAttributeNames': {f'#{field}': field for field in fields},
+        }
+
+    def _get_item(self, product_id: str, **projection: Any) -> dict[str, Any]:
+        def get_item(consistent_read: bool) -> dict[str, Any]:
+            response = self.client.get_item(TableName=self.table_name, Key={'id': {'S': product_id}}, ConsistentRead=consistent_read, **projection)
+            return dict(response)
+
+        def read() -> dict[str, Any]:
+            # the hedge is eventually consistent, it may not see a product created moments ago so only a found item counts
+            return self.hedged_reader.read(
+                primary=lambda: get_item(consistent_read=True),
+                hedge=lambda: get_item(consistent_read=False),
+                accept_hedge=lambda response: 'Item' in response,
+            )
+
+        if self._reads_in_flight is None:
+            return read()
+        return self._reads_in_flight.do((product_id, projection.get('ProjectionExpression')), read)
+
+    def _forget_reads(self, product_ids: Collection[str]) -> None:
+        # reads after a write don't join a read in flight since before it, see SingleFlight
+        if self._reads_in_flight is not None:
+            self._reads_in_flight.forget(lambda key: key[0] in product_ids)
+
+    def _build_price_condition(self, price: Key | Attr, product_filter: ProductFilter) -> Optional[ConditionBase]:
+        if product_filter.min_price is not None and product_filter.max_price is not None:
+            return price.between(product_filter.min_price, product_filter.max_price)
+        if product_filter.min_price is not None:
+            return price.gte(product_filter.min_price)
+        if product_filter.max_price is not None:
+            return price.lte(product_filter.max_price)
+        return None
+
+    def _build_query(self, product_filter: ProductFilter) -> dict[str, Any]:
+        # the same builder is used for all expressions of the query so placeholders don't collide
+        builder = ConditionExpressionBuilder()
+        catalog_condition = Key('catalog').eq(PRODUCT_CATALOG)
+        filter_condition: Optional[ConditionBase] = None
+        if product_filter.name_prefix:
+            # name prefix is the key condition, price range (if any) is filtered on the name index results
+            index_name = NAME_INDEX_NAME
+            key_condition = catalog_condition & Key('name').begins_with(product_filter.name_prefix)
+            filter_condition = self._build_price_condition(Attr('price'), product_filter)
+        else:
+            index_name = PRICE_INDEX_NAME
+            price_condition = self._build_price_condition(Key('price'), product_filter)
+            key_condition = catalog_condition if price_condition is None else catalog_condition & price_condition
+
+        built_key = builder.build_expression(key_condition, is_key_condition=True)
+        query: dict[str, Any] = {
+            'IndexName': index_name,
+            'KeyConditionExpression': built_key.condition_expression,
+            'ExpressionAttributeNames': dict(built_key.attribute_name_placeholders),
+            'ExpressionAttributeValues': self._to_wire(built_key.attribute_value_placeholders),
+        }
+        if filter_condition is not None:
+            built_filter = builder.build_expression(filter_condition)
+            query['FilterExpression'] = built_filter.condition_expression
+            query['ExpressionAttributeNames'].update(built_filter.attribute_name_placeholders)
+            query['ExpressionAttributeValues'].update(self._to_wire(built_filter.attribute_value_placeholders))
+        return query
+
     @tracer.capture_method(capture_response=False)
     def create_product(self, product: Product) -> None:
         logger.info('trying to create a product')
@@ -40,8 +132,7 @@ class DynamoDbHandler(DbHandler):
             created_at=self._get_unix_time(),
         )
         try:
-            table = self._get_table(self.table_name)
-            table.put_item(Item=entry.model_dump(), ConditionExpression='attribute_not_exists(id)')
+            self.client.put_item(TableName=self.table_name, Item=encode_product_entry(entry), ConditionExpression='attribute_not_exists(id)')
         except ValidationError as exc:  # pragma: no cover
             error_msg = 'failed to turn input into db entry'
             logger.exception(error_msg)
@@ -54,18 +145,38 @@ class DynamoDbHandler(DbHandler):
             error_msg = 'failed to create product'
             logger.exception(error_msg)
             raise InternalServerException(error_msg) from exc
+        finally:
+            self._forget_reads({product.id})
 
         logger.info('finished create product')
 
+    def _build_update(self, product_update: ProductUpdate) -> dict[str, Any]:
+        # attribute names are aliased since 'name' is a DynamoDB reserved word
+        names = {'#version': 'version'}
+        values: dict[str, Any] = {':expected_version': product_update.version, ':zero': 0, ':one': 1}
+        # items written before versioning was introduced have no version attribute and count as version 1
+        assignments = ['#version = if_not_exists(#version, :zero) + :one']
+        version_condition = '#version = :expected_version'
+        if product_update.version == 1:
+            version_condition = f'({version_condition} OR attribute_not_exists(#version))'
+        for field in ('name', 'price'):
+            value = getattr(product_update, field)
+            if value is not None:
+                names[f'#{field}'] = field
+                values[f':{field}'] = value
+                assignments.append(f'#{field} = :{field}')
+        return {
+            'UpdateExpression': f'SET {", ".join(assignments)}',
+            'ConditionExpression': f'attribute_exists(id) AND {version_condition}',
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': self._to_wire(values),
+        }
+
     @tracer.capture_method(capture_response=False)
     def get_product(self, product_id: str) -> Product:
         logger.info('trying to get a product')
         try:
-            table: Table = self._get_table(self.table_name)
-            response = table.get_item(
-                Key={'id': product_id},
-                ConsistentRead=True,
-            )
+            response = self._get_item(product_id)
             if response.get('Item') is None:  # pragma: no cover (covered in integration test)
                 error_str = 'product is not found in table'
                 logger.info(error_str, product_id=product_id)  # not a service error
@@ -77,9 +188,9 @@ class DynamoDbHandler(DbHandler):
 
         # parse to pydantic schema
         try:
-            db_entry = ProductEntry.model_validate(response.get('Item', {}))
+            db_entry = ProductEntry.model_validate(decode_product_item(response.get('Item', {})))
             logger.info('got item successfully')
-            ret_prod = Product(id=db_entry.id, name=db_entry.name, price=db_entry.price)
+            ret_prod = Product(id=db_entry.id, name=db_entry.name, price=db_entry.price, version=db_entry.version)
         except ValidationError as exc:  # pragma: no cover
             # rare use case where items in DB don't match the schema
             error_msg = 'failed to parse product'
@@ -88,16 +199,56 @@ class DynamoDbHandler(DbHandler):
 
         return ret_prod
 
+    @tracer.capture_method(capture_response=False)
+    def update_product(self, product_id: str, product_update: ProductUpdate) -> PartialProduct:
+        logger.info('trying to update a product', version=product_update.version)
+        try:
+            response = self.client.update_item(
+                TableName=self.table_name,
+                Key={'id': {'S': product_id}},
+                ReturnValues='UPDATED_NEW',
+                # return the current item on a failed condition to tell a missing product from a version conflict
+                ReturnValuesOnConditionCheckFailure='ALL_OLD',
+                **self._build_update(product_update),
+            )
+        except ClientError as exc:
+            if exc.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                if exc.response.get('Item') is None:
+                    error_str = 'product is not found in table'
+                    logger.info(error_str, product_id=product_id)  # not a service error
+                    raise ProductNotFoundException(error_str) from exc
+                error_str = f'failed to update product, product {product_id} is not at version {product_update.version}'
+                logger.info(error_str, product_id=product_id)  # not a service error
+                raise ProductVersionConflictException(error_str) from exc
+            error_msg = 'failed to update product'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+        finally:
+            self._forget_reads({product_id})
+
+        # parse to pydantic schema, only the updated attributes are returned
+        try:
+            updated_product = PartialProduct.model_validate(decode_product_item(response.get('Attributes', {})))
+        except ValidationError as exc:  # pragma: no cover
+            # rare use case where items in DB don't match the schema
+            error_msg = 'failed to parse product'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        logger.info('updated product successfully', version=updated_product.version)
+        return updated_product
+
     @tracer.capture_method(capture_response=False)
     def delete_product(self, product_id: str) -> None:
         logger.info('trying to delete a product')
         try:
-            table: Table = self._get_table(self.table_name)
-            table.delete_item(Key={'id': product_id})
+            self.client.delete_item(TableName=self.table_name, Key={'id': {'S': product_id}})
         except ClientError as exc:  # pragma: no cover (covered in integration test)
             error_msg = 'failed to delete product from db'
             logger.exception(error_msg)
             raise InternalServerException(error_msg) from exc
+        finally:
+            self._forget_reads({product_id})
 
         logger.info('deleted product successfully')
 
@@ -105,9 +256,8 @@ class DynamoDbHandler(DbHandler):
     def list_products(self) -> List[Product]:
         logger.info('trying to list all products')
         try:
-            table: Table = self._get_table(self.table_name)
             # production readiness : add pagination support
-            response = table.scan(ConsistentRead=True)
+            response = self.client.scan(TableName=self.table_name, ConsistentRead=True)
         except ClientError as exc:  # pragma: no cover (covered in integration test)
             error_msg = 'failed to get product from db'
             logger.exception(error_msg)
@@ -115,7 +265,7 @@ class DynamoDbHandler(DbHandler):
 
         # parse to pydantic schema
         try:
-            db_entries = ProductEntries.model_validate(response)
+            db_entries = ProductEntries.model_validate({'Items': [decode_product_item(item) for item in response.get('Items', [])]})
         except ValidationError as exc:  # pragma: no cover
             # rare use case where items in DB don't match the schema
             error_msg = 'failed to parse product'
@@ -126,5 +276,134 @@ class DynamoDbHandler(DbHandler):
         # convert from DB entry to product model
         entries = []
         for entry in db_entries.Items:
-            entries.append(Product(id=entry.id, name=entry.name, price=entry.price))
+            entries.append(Product(id=entry.id, name=entry.name, price=entry.price, version=entry.version))
         return entries
+
+    @tracer.capture_method(capture_response=False)
+    def get_partial_product(self, product_id: str, fields: List[ProductField]) -> PartialProduct:
+        logger.info('trying to get a partial product', fields=fields)
+        try:
+            response = self._get_item(product_id, **self._build_projection(fields))
+            if response.get('Item') is None:  # pragma: no cover (covered in integration test)
+                error_str = 'product is not found in table'
+                logger.info(error_str, product_id=product_id)  # not a service error
+                raise ProductNotFoundException(error_str)
+        except ClientError as exc:  # pragma: no cover (covered in integration test)
+            error_msg = 'failed to get product from db'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        # parse to pydantic schema
+        try:
+            partial_product = PartialProduct.model_validate(decode_product_item(response.get('Item', {})))
+        except ValidationError as exc:  # pragma: no cover
+            # rare use case where items in DB don't match the schema
+            error_msg = 'failed to parse product'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        logger.info('got partial item successfully')
+        return partial_product
+
+    @tracer.capture_method(capture_response=False)
+    def list_partial_products(self, fields: List[ProductField]) -> List[PartialProduct]:
+        logger.info('trying to list all partial products', fields=fields)
+        try:
+            # production readiness : add pagination support
+            response = self.client.scan(TableName=self.table_name, ConsistentRead=True, **self._build_projection(fields))
+        except ClientError as exc:  # pragma: no cover (covered in integration test)
+            error_msg = 'failed to get product from db'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        # parse to pydantic schema
+        try:
+            db_entries = PartialProductEntries.model_validate({'Items': [decode_product_item(item) for item in response.get('Items', [])]})
+        except ValidationError as exc:  # pragma: no cover
+            # rare use case where items in DB don't match the schema
+            error_msg = 'failed to parse product'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        logger.info('got partial products successfully')
+        return db_entries.Items
+
+    @tracer.capture_method(capture_response=False)
+    def query_products(self, product_filter: ProductFilter) -> List[Product]:
+        logger.info('trying to query products', product_filter=product_filter.model_dump(exclude_none=True))
+        query = self._build_query(product_filter)
+        items: List[dict[str, Any]] = []
+        try:
+            # secondary indexes don't support consistent reads, follow pages until the query is exhausted
+            while True:
+                response = self.client.query(TableName=self.table_name, **query)
+                items.extend(decode_product_item(item) for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as exc:  # pragma: no cover (covered in integration test)
+            error_msg = 'failed to query products from db'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        # parse to pydantic schema
+        try:
+            db_entries = ProductEntries.model_validate({'Items': items})
+        except ValidationError as exc:  # pragma: no cover
+            # rare use case where items in DB don't match the schema
+            error_msg = 'failed to parse product'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        logger.info('queried products successfully', count=len(db_entries.Items))
+        return [Product(id=entry.id, name=entry.name, price=entry.price, version=entry.version) for entry in db_entries.Items]
+
+    @tracer.capture_method(capture_response=False)
+    def scan_product_entries(self, segment: int, total_segments: int, exclusive_start_key: Optional[str], limit: int) -> ProductEntriesPage:
+        logger.info('trying to scan products', segment=segment, total_segments=total_segments)
+        # eventually consistent, a full table export reads every item for half the read capacity of list_products
+        scan: dict[str, Any] = {'TableName': self.table_name, 'Segment': segment, 'TotalSegments': total_segments, 'Limit': limit}
+        if exclusive_start_key is not None:
+            scan['ExclusiveStartKey'] = {'id': {'S': exclusive_start_key}}
+        try:
+            response = self.client.scan(**scan)
+        except ClientError as exc:
+            error_msg = 'failed to scan products from db'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        # parse to pydantic schema
+        try:
+            page = ProductEntriesPage.model_validate(
+                {
+                    'Items': [decode_product_item(item) for item in response.get('Items', [])],
+                    'LastEvaluatedKey': response.get('LastEvaluatedKey', {}).get('id', {}).get('S'),
+                }
+            )
+        except ValidationError as exc:  # pragma: no cover
+            # rare use case where items in DB don't match the schema
+            error_msg = 'failed to parse product'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+        logger.info('scanned products successfully', count=len(page.Items))
+        return page
+
+    @tracer.capture_method(capture_response=False)
+    def put_product_entries(self, entries: List[ProductEntry]) -> List[ProductEntry]:
+        logger.info('trying to put products', count=len(entries))
+        try:
+            response = self.client.batch_write_item(
+                RequestItems={self.table_name: [{'PutRequest': {'Item': encode_product_entry(entry)}} for entry in entries]}
+            )
+        except ClientError as exc:
+            error_msg = 'failed to put products'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+        finally:
+            self._forget_reads({entry.id for entry in entries})
+
+        # throttled or over capacity items are returned, not raised, the caller retries them
+        unprocessed_ids = {request['PutRequest']['Item']['id']['S'] for request in response.get('UnprocessedItems', {}).get(self.table_name, [])}
+        logger.info('put products successfully', count=len(entries) - len(unprocessed_ids))
+        return [entry for entry in entries if entry.id in unprocessed_ids]
@@ -0,0 +1,95 @@
+import time
+from functools import lru_cache
+from typing import Any
+
+import boto3
+from aws_lambda_env_modeler import get_environment_variables
+from botocore.config import Config
+from mypy_boto3_dynamodb import DynamoDBClient
+
+from product.crud.handlers.models.env_vars import DynamoDbClientVars
+from product.crud.integration.circuit_breaker import CircuitBreaker
+from product.crud.integration.deadline import check_deadline, is_abandoned
+from product.crud.integration.hedged_reader import HedgedReader
+from product.observability import logger, stage_timer
+
+
+def build_dynamodb_config(env_vars: DynamoDbClientVars) -> Config:
+    return Config(
+        max_pool_connections=env_vars.DYNAMODB_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=env_vars.DYNAMODB_TCP_KEEPALIVE,
+        connect_timeout=env_vars.DYNAMODB_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=env_vars.DYNAMODB_READ_TIMEOUT_SECONDS,
+        # adaptive mode adds client side rate limiting on top of the standard retry backoff when throttled
+        retries={'mode': 'adaptive', 'max_attempts': env_vars.DYNAMODB_MAX_ATTEMPTS},
+    )
+
+
+DYNAMODB_STAGE = 'DynamoDb'
+
+
+def _start_call_timer(context: dict[str, Any], **kwargs: Any) -> None:
+    context['started_at'] = time.perf_counter()
+
+
+def _record_call_time(context: dict[str, Any], **kwargs: Any) -> None:
+    # retries and their backoff are part of the call. An abandoned call may finish after its invocation, its time would
+    # be published with the next one's
+    if 'started_at' in context and not is_abandoned():
+        stage_timer.record(DYNAMODB_STAGE, (time.perf_counter() - context.pop('started_at')) * 1000)
+
+
+def register_call_timer(client: DynamoDBClient) -> None:
+    """Report the time spent in every call of `client`, successful or not, as the DynamoDb stage of the invocation.
+
+    Calls abandoned by a HedgedReader are not reported.
+    """
+    # before-call handlers can short-circuit each other (botocore Stubber), parameter building always runs
+    client.meta.events.register('before-parameter-build.dynamodb', _start_call_timer)
+    client.meta.events.register('after-call.dynamodb', _record_call_time)
+    client.meta.events.register('after-call-error.dynamodb', _record_call_time)
+
+
+def _check_deadline(**kwargs: Any) -> None:
+    # runs before every attempt, retries are not started once the deadline of the invocation is exceeded
+    check_deadline('call DynamoDB')
+
+
+def register_deadline_check(client: DynamoDBClient) -> None:
+    """Fail the calls of `client` with a DeadlineExceededException instead of attempting them past the deadline."""
+    client.meta.events.register('before-send.dynamodb', _check_deadline)
+
+
+# one client per container, its connection pool and TLS sessions are reused across invocations and handlers
+@lru_cache(maxsize=1)
+def get_dynamodb_client() -> DynamoDBClient:
+    env_vars: DynamoDbClientVars = get_environment_variables(model=DynamoDbClientVars)
+    logger.debug('creating dynamodb client', client_config=env_vars.model_dump())
+    client: DynamoDBClient = boto3.client('dynamodb', config=build_dynamodb_config(env_vars))
+    register_call_timer(client)
+    register_deadline_check(client)
+    return client
+
+
+# one reader per container, shared like the client, its latency window outlives invocations
+@lru_cache(maxsize=1)
+def get_hedged_reader() -> HedgedReader:
+    env_vars: DynamoDbClientVars = get_environment_variables(model=DynamoDbClientVars)
+    return HedgedReader(
+        hedge_reads=env_vars.DYNAMODB_HEDGED_READS,
+        hedge_delay_ms=env_vars.DYNAMODB_HEDGE_DELAY_MS,
+        max_workers=env_vars.DYNAMODB_MAX_POOL_CONNECTIONS,
+    )
+
+
+# one breaker per container, every table it calls is behind the same DynamoDB endpoint and account limits
+@lru_cache(maxsize=1)
+def get_circuit_breaker() -> CircuitBreaker:
+    env_vars: DynamoDbClientVars = get_environment_variables(model=DynamoDbClientVars)
+    return CircuitBreaker(
+        failure_rate=env_vars.DYNAMODB_CIRCUIT_BREAKER_FAILURE_RATE,
+        min_calls=env_vars.DYNAMODB_CIRCUIT_BREAKER_MIN_CALLS,
+        window_seconds=env_vars.DYNAMODB_CIRCUIT_BREAKER_WINDOW_SECONDS,
+        open_seconds=env_vars.DYNAMODB_CIRCUIT_BREAKER_OPEN_SECONDS,
+        half_open_calls=env_vars.DYNAMODB_CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+    )
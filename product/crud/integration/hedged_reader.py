@@ -0,0 +1,145 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, TypeVar
+
+from aws_lambda_powertools.metrics import MetricUnit
+
+from product.crud.integration.deadline import copy_abandonable_context, get_remaining_seconds
+from product.crud.models.exceptions import DeadlineExceededException
+from product.observability import logger, metrics
+
+T = TypeVar('T')
+
+# latencies of the last primary reads, the hedge delay is their p95
+LATENCY_WINDOW = 256
+# below this many samples the p95 isn't meaningful, the configured delay is used instead
+MIN_LATENCY_SAMPLES = 20
+HEDGE_DELAY_PERCENTILE = 0.95
+
+
+class ReadLatencyTracker:
+    """Sliding window of read latencies, in seconds."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(latency_seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, None until it holds `MIN_LATENCY_SAMPLES` latencies."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return latencies[max(1, math.ceil(fraction * len(latencies))) - 1]
+
+
+class HedgedReader:
+    """Runs reads, optionally hedged by a second read, within the deadline of the invocation.
+
+    Without a hedge, a read is a plain call, bounded by the client read timeout and the deadline check before every
+    attempt. A hedged read runs on worker threads, in copies of the caller's context so DynamoDB calls still see the
+    deadline, and is abandoned with a DeadlineExceededException once the deadline is exceeded. Abandoned calls finish in
+    the background, within the client read timeout, and are marked so their time isn't reported, see `is_abandoned`.
+
+    A hedged read fires the hedge once the primary read has been running for longer than the p95 latency of the last
+    primary reads, and returns whichever answers first. A hedge answer only counts when `accept_hedge` accepts it, e.g.
+    an eventually consistent read that didn't find the item may just be stale. Hedges add load to the slowest ~5% of
+    reads only, to cut the tail latency.
+
+    Parameters
+    ----------
+    hedge_reads : bool
+        Fire the hedges, otherwise reads are plain calls
+    hedge_delay_ms : float
+        Hedge delay until enough latencies are measured, in milliseconds
+    max_workers : int
+        Reads running at once, abandoned ones included
+    """
+
+    def __init__(self, hedge_reads: bool, hedge_delay_ms: float, max_workers: int):
+        self.hedge_reads = hedge_reads
+        self.default_hedge_delay_seconds = hedge_delay_ms / 1000
+        self.latency_tracker = ReadLatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedged-read')
+
+    def get_hedge_delay_seconds(self) -> float:
+        measured = self.latency_tracker.percentile(HEDGE_DELAY_PERCENTILE)
+        return self.default_hedge_delay_seconds if measured is None else measured
+
+    def _submit(self, read: Callable[[], T], abandoned: list[threading.Event]) -> 'Future[T]':
+        context, abandoned_event = copy_abandonable_context()
+        abandoned.append(abandoned_event)
+        return self._executor.submit(context.run, read)
+
+    def _submit_primary(self, read: Callable[[], T], abandoned: list[threading.Event]) -> 'Future[T]':
+        started_at = time.perf_counter()
+        future = self._submit(read, abandoned)
+        # abandoned primaries are recorded too, the slowest reads are what the delay is about
+        future.add_done_callback(lambda _: self.latency_tracker.record(time.perf_counter() - started_at))
+        return future
+
+    def read(self, primary: Callable[[], T], hedge: Optional[Callable[[], T]] = None, accept_hedge: Callable[[T], bool] = lambda _: True) -> T:
+        """Return the result of `primary`, or of `hedge` if it answers first with a result `accept_hedge` accepts.
+
+        Raises
+        ------
+        DeadlineExceededException
+            When no acceptable answer came before the deadline
+        """
+        if not self.hedge_reads or hedge is None:
+            return primary()
+
+        # the reads still running once the answer is returned, or the deadline exceeded, are abandoned
+        abandoned: list[threading.Event] = []
+        try:
+            return self._read_hedged(primary, hedge, accept_hedge, abandoned)
+        finally:
+            for abandoned_event in abandoned:
+                abandoned_event.set()
+
+    def _read_hedged(
+        self, primary: Callable[[], T], hedge: Callable[[], T], accept_hedge: Callable[[T], bool], abandoned: list[threading.Event]
+    ) -> T:
+        primary_future = self._submit_primary(primary, abandoned)
+        hedge_future: Optional[Future[T]] = None
+        hedge_at: Optional[float] = time.monotonic() + self.get_hedge_delay_seconds()
+        # futures leave `waiting` once done, so a hedge answer that isn't accepted is only looked at once
+        waiting: set[Future[T]] = {primary_future}
+        while True:
+            _, waiting = wait(waiting, timeout=self._get_wait_seconds(hedge_at), return_when=FIRST_COMPLETED)
+            if primary_future.done():
+                # a failed primary, e.g. a ClientError or a timeout of the client, waits for a pending hedge
+                primary_failed = primary_future.exception() is not None
+                if not primary_failed or hedge_future is None or (hedge_future.done() and not self._is_accepted(hedge_future, accept_hedge)):
+                    return primary_future.result()
+            if hedge_future is not None and self._is_accepted(hedge_future, accept_hedge):
+                logger.info('hedged read answered first')
+                return hedge_future.result()
+
+            remaining_seconds = get_remaining_seconds()
+            if remaining_seconds is not None and remaining_seconds <= 0:
+                raise DeadlineExceededException('failed to read from db, deadline exceeded')
+            if hedge_at is not None and time.monotonic() >= hedge_at:
+                logger.info('firing hedged read', hedge_delay_ms=round(self.get_hedge_delay_seconds() * 1000, 1))
+                metrics.add_metric(name='HedgedReads', unit=MetricUnit.Count, value=1)
+                hedge_future, hedge_at = self._submit(hedge, abandoned), None
+                waiting.add(hedge_future)
+
+    @staticmethod
+    def _is_accepted(future: 'Future[T]', accept_hedge: Callable[[T], bool]) -> bool:
+        return future.done() and future.exception() is None and accept_hedge(future.result())
+
+    @staticmethod
+    def _get_wait_seconds(hedge_at: Optional[float]) -> Optional[float]:
+        # until the deadline or the hedge is due, whichever comes first
+        now = time.monotonic()
+        remaining_seconds = get_remaining_seconds()
+        timeouts = [seconds for seconds in (remaining_seconds, None if hedge_at is None else hedge_at - now) if seconds is not None]
+        return max(min(timeouts), 0) if timeouts else None
@@ -0,0 +1,39 @@
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.idempotency import DynamoDBPersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.persistence.base import DataRecord
+
+from product.crud.integration.dynamodb_client import DYNAMODB_STAGE
+from product.observability import metrics, stage_timer
+
+IDEMPOTENCY_TABLE_CALLS_METRIC = 'IdempotencyTableCalls'
+
+
+class MeteredDynamoDBPersistenceLayer(DynamoDBPersistenceLayer):
+    """DynamoDB idempotency persistence layer that counts every round trip to the idempotency table.
+
+    Requests answered by the idempotency local cache don't reach these methods and are not counted. Round trips are
+    also timed as part of the DynamoDb stage of the route, like the calls to the products table.
+    """
+
+    def _count_table_call(self) -> None:
+        metrics.add_metric(name=IDEMPOTENCY_TABLE_CALLS_METRIC, unit=MetricUnit.Count, value=1)
+
+    def _get_record(self, idempotency_key) -> DataRecord:
+        self._count_table_call()
+        with stage_timer.stage(DYNAMODB_STAGE):
+            return super()._get_record(idempotency_key)
+
+    def _put_record(self, data_record: DataRecord) -> None:
+        self._count_table_call()
+        with stage_timer.stage(DYNAMODB_STAGE):
+            super()._put_record(data_record)
+
+    def _update_record(self, data_record: DataRecord) -> None:
+        self._count_table_call()
+        with stage_timer.stage(DYNAMODB_STAGE):
+            super()._update_record(data_record)
+
+    def _delete_record(self, data_record: DataRecord) -> None:
+        self._count_table_call()
+        with stage_timer.stage(DYNAMODB_STAGE):
+            super()._delete_record(data_record)
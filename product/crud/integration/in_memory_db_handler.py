@@ -0,0 +1,155 @@
+import heapq
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from product.crud.integration.db_handler import DbHandler, get_segment_bounds
+from product.crud.integration.models.db import ProductEntriesPage
+from product.crud.models.exceptions import (
+    InternalServerException,
+    ProductAlreadyExistsException,
+    ProductNotFoundException,
+    ProductVersionConflictException,
+)
+from product.crud.models.product import PartialProduct, Product, ProductField, ProductFilter, ProductUpdate
+from product.models.products.product import ProductEntry
+from product.observability import logger
+
+
+class InMemoryDbHandler(DbHandler):
+    """Process local DbHandler for offline load testing and profiling, with the same semantics as DynamoDbHandler.
+
+    Every operation sleeps `latency_ms` to stand in for the network round trip, and every `throttle_every`-th operation
+    fails like a throttled DynamoDB request would, so timings and error rates are deterministic.
+
+    Parameters
+    ----------
+    table_name : str
+        Name of the stand-in table, only used for logging
+    latency_ms : float
+        Latency injected before every operation, in milliseconds, by default 0
+    throttle_every : int
+        Fail every n-th operation with an internal server error, by default 0 (never)
+    """
+
+    def __init__(self, table_name: str, latency_ms: float = 0, throttle_every: int = 0):
+        self.table_name = table_name
+        self.latency_ms = latency_ms
+        self.throttle_every = throttle_every
+        self._items: Dict[str, ProductEntry] = {}
+        self._operations = 0
+        # handlers can be served by several threads, see the local HTTP adapter
+        self._lock = threading.Lock()
+
+    def _simulate_call(self, operation: str) -> None:
+        with self._lock:
+            self._operations += 1
+            throttled = self.throttle_every > 0 and self._operations % self.throttle_every == 0
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if throttled:
+            error_msg = f'failed to {operation}, request was throttled'
+            logger.error(error_msg, table_name=self.table_name)
+            raise InternalServerException(error_msg)
+
+    def _get_entry(self, product_id: str) -> ProductEntry:
+        entry = self._items.get(product_id)
+        if entry is None:
+            error_str = 'product is not found in table'
+            logger.info(error_str, product_id=product_id)  # not a service error
+            raise ProductNotFoundException(error_str)
+        return entry
+
+    def create_product(self, product: Product) -> None:
+        self._simulate_call('create product')
+        entry = ProductEntry(id=product.id, name=product.name, price=product.price, created_at=int(datetime.utcnow().timestamp()))
+        with self._lock:
+            if product.id in self._items:
+                error_msg = f'failed to create product, product {product.id} already exists'
+                logger.error(error_msg)
+                raise ProductAlreadyExistsException(error_msg)
+            self._items[product.id] = entry
+
+    def get_product(self, product_id: str) -> Product:
+        self._simulate_call('get product')
+        with self._lock:
+            entry = self._get_entry(product_id)
+        return Product(id=entry.id, name=entry.name, price=entry.price, version=entry.version)
+
+    def update_product(self, product_id: str, product_update: ProductUpdate) -> PartialProduct:
+        self._simulate_call('update product')
+        changes = product_update.model_dump(exclude_none=True, exclude={'version'})
+        with self._lock:
+            entry = self._get_entry(product_id)
+            if entry.version != product_update.version:
+                error_str = f'failed to update product, product {product_id} is not at version {product_update.version}'
+                logger.info(error_str, product_id=product_id)  # not a service error
+                raise ProductVersionConflictException(error_str)
+            self._items[product_id] = entry.model_copy(update={**changes, 'version': entry.version + 1})
+        return PartialProduct(**changes, version=entry.version + 1)
+
+    def delete_product(self, product_id: str) -> None:
+        self._simulate_call('delete product')
+        with self._lock:
+            self._items.pop(product_id, None)
+
+    def list_products(self) -> List[Product]:
+        self._simulate_call('list products')
+        with self._lock:
+            entries = list(self._items.values())
+        return [Product(id=entry.id, name=entry.name, price=entry.price, version=entry.version) for entry in entries]
+
+    def get_partial_product(self, product_id: str, fields: List[ProductField]) -> PartialProduct:
+        self._simulate_call('get product')
+        with self._lock:
+            entry = self._get_entry(product_id)
+        included_fields: set[str] = set(fields)
+        return PartialProduct.model_validate(entry.model_dump(include=included_fields))
+
+    def list_partial_products(self, fields: List[ProductField]) -> List[PartialProduct]:
+        self._simulate_call('list products')
+        with self._lock:
+            entries = list(self._items.values())
+        included_fields: set[str] = set(fields)
+        return [PartialProduct.model_validate(entry.model_dump(include=included_fields)) for entry in entries]
+
+    def query_products(self, product_filter: ProductFilter) -> List[Product]:
+        self._simulate_call('query products')
+        with self._lock:
+            entries = list(self._items.values())
+        matches = [
+            entry
+            for entry in entries
+            if (product_filter.min_price is None or entry.price >= product_filter.min_price)
+            and (product_filter.max_price is None or entry.price <= product_filter.max_price)
+            and (not product_filter.name_prefix or entry.name.startswith(product_filter.name_prefix))
+        ]
+        # same order as the secondary index that DynamoDbHandler would query
+        matches.sort(key=lambda entry: entry.name if product_filter.name_prefix else entry.price)
+        return [Product(id=entry.id, name=entry.name, price=entry.price, version=entry.version) for entry in matches]
+
+    def scan_product_entries(self, segment: int, total_segments: int, exclusive_start_key: Optional[str], limit: int) -> ProductEntriesPage:
+        self._simulate_call('scan products')
+        lower, upper = get_segment_bounds(segment, total_segments)
+        with self._lock:
+            # one extra product tells whether the segment goes on after this page
+            product_ids = heapq.nsmallest(
+                limit + 1,
+                (
+                    product_id
+                    for product_id in self._items
+                    if product_id >= lower
+                    and (upper is None or product_id < upper)
+                    and (exclusive_start_key is None or product_id > exclusive_start_key)
+                ),
+            )
+            entries = [self._items[product_id] for product_id in product_ids[:limit]]
+        return ProductEntriesPage(Items=entries, LastEvaluatedKey=entries[-1].id if len(product_ids) > limit else None)
+
+    def put_product_entries(self, entries: List[ProductEntry]) -> List[ProductEntry]:
+        self._simulate_call('put products')
+        with self._lock:
+            # puts replace existing products, like a BatchWriteItem
+            self._items.update((entry.id, entry) for entry in entries)
+        return []
@@ -1,9 +1,20 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
+from product.crud.models.product import PartialProduct
 from product.models.products.product import ProductEntry
 
 
 class ProductEntries(BaseModel):
     Items: List[ProductEntry]
+
+
+class PartialProductEntries(BaseModel):
+    Items: List[PartialProduct]
+
+
+class ProductEntriesPage(BaseModel):
+    Items: List[ProductEntry]
+    # id of the last evaluated product, the scan goes on after it. None once the segment is exhausted
+    LastEvaluatedKey: Optional[str] = None
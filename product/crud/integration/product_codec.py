@@ -0,0 +1,79 @@
+from decimal import Decimal
+from typing import Any, Callable
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from product.models.products.product import ProductEntry
+
+
+def _decode_integer(value: str) -> int | Decimal:
+    # a number that isn't an integer, e.g. written by another client, is left for the schema validation to reject
+    try:
+        return int(value)
+    except ValueError:
+        return Decimal(value)
+
+
+# attribute name -> (DynamoDB type, decoder) for every ProductEntry attribute
+_PRODUCT_ATTRIBUTES: dict[str, tuple[str, Callable[[str], Any]]] = {
+    'id': ('S', str),
+    'name': ('S', str),
+    'catalog': ('S', str),
+    'price': ('N', _decode_integer),
+    'created_at': ('N', _decode_integer),
+    'version': ('N', _decode_integer),
+}
+
+# fallback for attributes outside of the schema, or stored with an unexpected type
+_deserializer = TypeDeserializer()
+
+
+def encode_product_entry(entry: ProductEntry) -> dict[str, Any]:
+    """Encode a product entry straight into the DynamoDB wire format.
+
+    Equivalent to running boto3 `TypeSerializer` on `entry.model_dump()`, without inspecting the type of every value.
+
+    Parameters
+    ----------
+    entry : ProductEntry
+        Product entry to encode
+
+    Returns
+    -------
+    dict[str, Any]
+        DynamoDB item in the low level client format
+    """
+    return {
+        'id': {'S': entry.id},
+        'name': {'S': entry.name},
+        'price': {'N': str(entry.price)},
+        'created_at': {'N': str(entry.created_at)},
+        'catalog': {'S': entry.catalog},
+        'version': {'N': str(entry.version)},
+    }
+
+
+def decode_product_item(item: dict[str, Any]) -> dict[str, Any]:
+    """Decode a full or projected product item from the DynamoDB wire format.
+
+    Numbers are decoded to `int` directly, skipping the `Decimal` round trip of boto3 `TypeDeserializer`.
+    The output is still validated by the caller against `ProductEntry` or `PartialProduct`.
+
+    Parameters
+    ----------
+    item : dict[str, Any]
+        DynamoDB item in the low level client format, may only hold some of the product attributes
+
+    Returns
+    -------
+    dict[str, Any]
+        Attribute name to python value
+    """
+    decoded: dict[str, Any] = {}
+    for key, value in item.items():
+        attribute = _PRODUCT_ATTRIBUTES.get(key)
+        if attribute is not None and attribute[0] in value:
+            decoded[key] = attribute[1](value[attribute[0]])
+        else:
+            decoded[key] = _deserializer.deserialize(value)
+    return decoded
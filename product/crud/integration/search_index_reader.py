@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import Optional
+
+from product.catalog.models import CatalogProduct
+from product.catalog.object_store.base import ObjectStore
+from product.catalog.object_store.versioned_object import VersionedObject
+from product.catalog.search_index import SearchIndex, decode_search_index, encode_search_index
+from product.observability import logger
+
+
+class SearchIndexReader:
+    """Searches product names with the index maintained by the stream processor.
+
+    The index is fetched again only when it changed (conditional GET on its ETag), and at most every `refresh_seconds`.
+
+    Parameters
+    ----------
+    object_store : ObjectStore
+        Store holding the index
+    key : str
+        Object key of the index
+    refresh_seconds : float
+        Minimum time between two checks for a newer index
+    """
+
+    def __init__(self, object_store: ObjectStore, key: str, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._index_object = VersionedObject(object_store, key, decode=decode_search_index, encode=encode_search_index, empty=SearchIndex)
+        self._index: Optional[SearchIndex] = None
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> SearchIndex:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.refresh_seconds:
+            return self._index
+        index = self._index_object.get()
+        self._checked_at = now
+        if index is not self._index:
+            self._index = index
+            logger.info('loaded search index', version=index.version, products=len(index), terms=len(index.terms))
+        return index
+
+    def search(self, query: str, limit: int) -> list[CatalogProduct]:
+        """Products matching `query`, most relevant first.
+
+        Raises
+        ------
+        ObjectNotFoundError
+            When the stream processor didn't write an index yet
+        ObjectStoreError
+            When the store fails
+        """
+        with self._lock:
+            return self._refresh().search(query, limit)
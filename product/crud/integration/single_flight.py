@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Hashable, TypeVar
+
+from aws_lambda_powertools.metrics import MetricUnit
+
+from product.crud.integration.deadline import get_remaining_seconds
+from product.crud.models.exceptions import DeadlineExceededException
+from product.observability import metrics
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one, the callers share its result or exception.
+
+    The first caller of a key runs the call, the ones arriving while it is in flight wait for its outcome instead of
+    making their own, within their own deadline. A key is only in flight during the call, results are not cached.
+
+    A caller joining a flight gets an answer read at most one call earlier than its own would have been, writes made
+    through the same handler `forget` their keys so later reads don't join a flight started before the write.
+
+    Calls only overlap in multi-threaded hosts. A Lambda container serves one invocation at a time, and the local server
+    resolves one request at a time per worker process, so there reads never share a flight.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        """Return the result of `call`, or of the in-flight call of `key`.
+
+        Raises
+        ------
+        DeadlineExceededException
+            When the deadline is exceeded while waiting for the in-flight call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            metrics.add_metric(name='CoalescedReads', unit=MetricUnit.Count, value=1)
+            try:
+                return flight.result(timeout=get_remaining_seconds())
+            except FutureTimeoutError as exc:
+                raise DeadlineExceededException('failed to read from db, deadline exceeded') from exc
+
+        try:
+            result = call()
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def forget(self, matches: Callable[[Any], bool]) -> None:
+        """Let the next calls of the keys `matches` accepts start flights of their own, callers already waiting keep theirs."""
+        with self._lock:
+            for key in [key for key in self._flights if matches(key)]:
+                del self._flights[key]
@@ -0,0 +1,245 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic import ValidationError
+
+from product.crud.integration.constants import NAME_INDEX_NAME, PRICE_INDEX_NAME
+from product.crud.integration.db_handler import DbHandler, get_segment_bounds
+from product.crud.integration.models.db import ProductEntriesPage
+from product.crud.models.exceptions import (
+    InternalServerException,
+    ProductAlreadyExistsException,
+    ProductNotFoundException,
+    ProductVersionConflictException,
+)
+from product.crud.models.product import PartialProduct, Product, ProductField, ProductFilter, ProductUpdate
+from product.models.products.product import PRODUCT_CATALOG, ProductEntry
+from product.observability import logger
+
+
+class _ThreadConnections(threading.local):
+    # connections are per thread and database file, shared by the handlers of every table in that file
+    def __init__(self) -> None:
+        self.by_path: dict[str, sqlite3.Connection] = {}
+
+
+_connections = _ThreadConnections()
+
+
+class SqliteDbHandler(DbHandler):
+    """DbHandler on a local SQLite database in WAL mode, for offline benchmarking and local development.
+
+    The table mirrors the DynamoDB table, with the price and name secondary indexes as SQLite indexes, and keeps the
+    same semantics: already exists, not found and version conflicts. Each thread gets its own connection to the
+    database file, shared by the handlers of all tables, WAL mode lets readers run concurrently with a writer.
+
+    Parameters
+    ----------
+    table_name : str
+        SQLite table name, created if it doesn't exist
+    db_path : str
+        Path of the SQLite database file, by default '/tmp/products.db'
+    """
+
+    def __init__(self, table_name: str, db_path: str = '/tmp/products.db'):
+        self.table_name = table_name
+        self.db_path = db_path
+        self._create_table()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection = _connections.by_path.get(self.db_path)
+        if connection is None:
+            logger.debug('opening connection to sqlite database', db_path=self.db_path)
+            # autocommit, update_product opens its own transaction
+            connection = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            _connections.by_path[self.db_path] = connection
+        return connection
+
+    def _create_table(self) -> None:
+        connection = self._get_connection()
+        connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{self.table_name}" ('
+            'id TEXT PRIMARY KEY, name TEXT NOT NULL, price INTEGER NOT NULL, created_at INTEGER NOT NULL, '
+            'catalog TEXT NOT NULL, version INTEGER NOT NULL DEFAULT 1)'
+        )
+        connection.execute(f'CREATE INDEX IF NOT EXISTS "{self.table_name}_{PRICE_INDEX_NAME}" ON "{self.table_name}" (catalog, price)')
+        connection.execute(f'CREATE INDEX IF NOT EXISTS "{self.table_name}_{NAME_INDEX_NAME}" ON "{self.table_name}" (catalog, name)')
+
+    def _execute(self, operation: str, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        try:
+            return self._get_connection().execute(sql, parameters)
+        except sqlite3.Error as exc:
+            error_msg = f'failed to {operation}'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+    def _to_entry(self, row: sqlite3.Row) -> ProductEntry:
+        try:
+            return ProductEntry.model_validate(dict(row))
+        except ValidationError as exc:  # pragma: no cover
+            # rare use case where rows in DB don't match the schema
+            error_msg = 'failed to parse product'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+
+    def _to_product(self, row: sqlite3.Row) -> Product:
+        entry = self._to_entry(row)
+        return Product(id=entry.id, name=entry.name, price=entry.price, version=entry.version)
+
+    def _select_fields(self, fields: List[ProductField]) -> str:
+        # fields are validated literals, safe to use as column names
+        return ', '.join(fields)
+
+    def create_product(self, product: Product) -> None:
+        logger.info('trying to create a product')
+        entry = ProductEntry(id=product.id, name=product.name, price=product.price, created_at=int(datetime.utcnow().timestamp()))
+        try:
+            self._get_connection().execute(
+                f'INSERT INTO "{self.table_name}" (id, name, price, created_at, catalog, version) VALUES (?, ?, ?, ?, ?, ?)',
+                (entry.id, entry.name, entry.price, entry.created_at, entry.catalog, entry.version),
+            )
+        except sqlite3.IntegrityError as exc:  # primary key, like the attribute_not_exists condition
+            error_msg = f'failed to create product, product {product.id} already exists'
+            logger.exception(error_msg)
+            raise ProductAlreadyExistsException(error_msg) from exc
+        except sqlite3.Error as exc:
+            error_msg = 'failed to create product'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+        logger.info('finished create product')
+
+    def get_product(self, product_id: str) -> Product:
+        logger.info('trying to get a product')
+        row = self._execute('get product from db', f'SELECT * FROM "{self.table_name}" WHERE id = ?', (product_id,)).fetchone()
+        if row is None:
+            error_str = 'product is not found in table'
+            logger.info(error_str, product_id=product_id)  # not a service error
+            raise ProductNotFoundException(error_str)
+        logger.info('got item successfully')
+        return self._to_product(row)
+
+    def update_product(self, product_id: str, product_update: ProductUpdate) -> PartialProduct:
+        logger.info('trying to update a product', version=product_update.version)
+        changes = product_update.model_dump(exclude_none=True, exclude={'version'})
+        assignments = ', '.join(f'{field} = ?' for field in changes)
+        connection = self._get_connection()
+        # the version check and the write are one transaction, like the DynamoDB condition expression
+        self._execute('update product', 'BEGIN IMMEDIATE')
+        try:
+            cursor = self._execute(
+                'update product',
+                f'UPDATE "{self.table_name}" SET {assignments}, version = version + 1 WHERE id = ? AND version = ?',
+                (*changes.values(), product_id, product_update.version),
+            )
+            if cursor.rowcount == 0:
+                exists = self._execute('update product', f'SELECT 1 FROM "{self.table_name}" WHERE id = ?', (product_id,)).fetchone()
+                if exists is None:
+                    error_str = 'product is not found in table'
+                    logger.info(error_str, product_id=product_id)  # not a service error
+                    raise ProductNotFoundException(error_str)
+                error_str = f'failed to update product, product {product_id} is not at version {product_update.version}'
+                logger.info(error_str, product_id=product_id)  # not a service error
+                raise ProductVersionConflictException(error_str)
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+        logger.info('updated product successfully', version=product_update.version + 1)
+        return PartialProduct(**changes, version=product_update.version + 1)
+
+    def delete_product(self, product_id: str) -> None:
+        logger.info('trying to delete a product')
+        self._execute('delete product from db', f'DELETE FROM "{self.table_name}" WHERE id = ?', (product_id,))
+        logger.info('deleted product successfully')
+
+    def list_products(self) -> List[Product]:
+        logger.info('trying to list all products')
+        rows = self._execute('list products from db', f'SELECT * FROM "{self.table_name}"').fetchall()
+        logger.info('got products successfully')
+        return [self._to_product(row) for row in rows]
+
+    def get_partial_product(self, product_id: str, fields: List[ProductField]) -> PartialProduct:
+        logger.info('trying to get a partial product', fields=fields)
+        row = self._execute(
+            'get product from db', f'SELECT {self._select_fields(fields)} FROM "{self.table_name}" WHERE id = ?', (product_id,)
+        ).fetchone()
+        if row is None:
+            error_str = 'product is not found in table'
+            logger.info(error_str, product_id=product_id)  # not a service error
+            raise ProductNotFoundException(error_str)
+        logger.info('got partial item successfully')
+        return PartialProduct.model_validate(dict(row))
+
+    def list_partial_products(self, fields: List[ProductField]) -> List[PartialProduct]:
+        logger.info('trying to list all partial products', fields=fields)
+        rows = self._execute('list products from db', f'SELECT {self._select_fields(fields)} FROM "{self.table_name}"').fetchall()
+        logger.info('got partial products successfully')
+        return [PartialProduct.model_validate(dict(row)) for row in rows]
+
+    def query_products(self, product_filter: ProductFilter) -> List[Product]:
+        logger.info('trying to query products', product_filter=product_filter.model_dump(exclude_none=True))
+        conditions = ['catalog = ?']
+        parameters: List[Any] = [PRODUCT_CATALOG]
+        if product_filter.min_price is not None:
+            conditions.append('price >= ?')
+            parameters.append(product_filter.min_price)
+        if product_filter.max_price is not None:
+            conditions.append('price <= ?')
+            parameters.append(product_filter.max_price)
+        # same index and order as the secondary index that DynamoDbHandler would query
+        order_by = 'price'
+        if product_filter.name_prefix:
+            # prefix match as a range on the name index, the upper bound is the highest code point
+            conditions.append('name >= ? AND name < ?')
+            parameters.extend([product_filter.name_prefix, f'{product_filter.name_prefix}\U0010ffff'])
+            order_by = 'name'
+        rows = self._execute(
+            'query products from db', f'SELECT * FROM "{self.table_name}" WHERE {" AND ".join(conditions)} ORDER BY {order_by}', parameters
+        ).fetchall()
+        logger.info('queried products successfully', count=len(rows))
+        return [self._to_product(row) for row in rows]
+
+    def scan_product_entries(self, segment: int, total_segments: int, exclusive_start_key: Optional[str], limit: int) -> ProductEntriesPage:
+        logger.info('trying to scan products', segment=segment, total_segments=total_segments)
+        lower, upper = get_segment_bounds(segment, total_segments)
+        # a range of the primary key, like a DynamoDB scan segment, resumed after its last evaluated key
+        conditions, parameters = ['id >= ?'], [lower]
+        if upper is not None:
+            conditions.append('id < ?')
+            parameters.append(upper)
+        if exclusive_start_key is not None:
+            conditions.append('id > ?')
+            parameters.append(exclusive_start_key)
+        rows = self._execute(
+            'scan products from db',
+            f'SELECT * FROM "{self.table_name}" WHERE {" AND ".join(conditions)} ORDER BY id LIMIT ?',
+            (*parameters, limit + 1),  # one extra row tells whether the segment goes on after this page
+        ).fetchall()
+        entries = [self._to_entry(row) for row in rows[:limit]]
+        logger.info('scanned products successfully', count=len(entries))
+        return ProductEntriesPage(Items=entries, LastEvaluatedKey=entries[-1].id if len(rows) > limit else None)
+
+    def put_product_entries(self, entries: List[ProductEntry]) -> List[ProductEntry]:
+        logger.info('trying to put products', count=len(entries))
+        connection = self._get_connection()
+        # puts replace existing products, like a BatchWriteItem, all in one transaction
+        self._execute('put products', 'BEGIN IMMEDIATE')
+        try:
+            connection.executemany(
+                f'INSERT OR REPLACE INTO "{self.table_name}" (id, name, price, created_at, catalog, version) VALUES (?, ?, ?, ?, ?, ?)',
+                [(entry.id, entry.name, entry.price, entry.created_at, entry.catalog, entry.version) for entry in entries],
+            )
+            connection.execute('COMMIT')
+        except sqlite3.Error as exc:
+            connection.execute('ROLLBACK')
+            error_msg = 'failed to put products'
+            logger.exception(error_msg)
+            raise InternalServerException(error_msg) from exc
+        logger.info('put products successfully', count=len(entries))
+        return []
@@ -8,3 +8,17 @@ class ProductNotFoundException(Exception):
 
 class ProductAlreadyExistsException(Exception):
     pass
+
+
+class ProductVersionConflictException(Exception):
+    pass
+
+
+class DeadlineExceededException(InternalServerException):
+    pass
+
+
+class ServiceUnavailableException(InternalServerException):
+    def __init__(self, message: str, retry_after_seconds: int):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds  # when the client may try again
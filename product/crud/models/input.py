@@ -1,9 +1,14 @@
-from typing import Annotated
+from typing import Annotated, List, Optional
 
 from aws_lambda_powertools.utilities.parser.models import APIGatewayProxyEventModel
-from pydantic import BaseModel, Field, Json, PositiveInt
+from pydantic import BaseModel, BeforeValidator, Field, Json, PositiveInt, model_validator
 
+from product.crud.models.product import ProductField, ProductFilter
 from product.models.products.product import ProductId
+from product.models.products.validators import split_comma_separated
+
+ProductFields = Annotated[List[ProductField], BeforeValidator(split_comma_separated), Field(min_length=1)]
+"""Comma separated list of product fields to return, e.g. 'id,price'."""
 
 
 class CreateProductBody(BaseModel):
@@ -11,18 +16,59 @@ class CreateProductBody(BaseModel):
     price: PositiveInt
 
 
+class UpdateProductBody(BaseModel):
+    name: Optional[Annotated[str, Field(min_length=1, max_length=20)]] = None
+    price: Optional[PositiveInt] = None
+    version: PositiveInt
+
+    @model_validator(mode='after')
+    def validate_has_changes(self) -> 'UpdateProductBody':
+        if self.name is None and self.price is None:
+            raise ValueError('at least one of name or price must be updated')
+        return self
+
+
 class ProductPathParams(BaseModel):
     product: ProductId
 
 
+class ProductFieldsQueryParams(BaseModel):
+    fields: Optional[ProductFields] = None
+
+
+class ListProductsQueryParams(ProductFieldsQueryParams, ProductFilter):
+    def to_filter(self) -> Optional[ProductFilter]:
+        product_filter = ProductFilter.model_validate(self.model_dump(include=set(ProductFilter.model_fields), exclude_none=True))
+        return product_filter if product_filter.model_fields_set else None
+
+
+class SearchProductsQueryParams(BaseModel):
+    q: Annotated[str, Field(min_length=1, max_length=100)]
+    limit: Annotated[int, Field(ge=1, le=100)] = 10
+
+
 class CreateProductInput(APIGatewayProxyEventModel):
     pathParameters: ProductPathParams  # type: ignore
     body: Json[CreateProductBody]  # type: ignore
 
 
+class UpdateProductInput(APIGatewayProxyEventModel):
+    pathParameters: ProductPathParams  # type: ignore
+    body: Json[UpdateProductBody]  # type: ignore
+
+
 class GetProductRequest(APIGatewayProxyEventModel):
     pathParameters: ProductPathParams  # type: ignore
+    queryStringParameters: Optional[ProductFieldsQueryParams] = None  # type: ignore
 
 
 class DeleteProductRequest(APIGatewayProxyEventModel):
     pathParameters: ProductPathParams  # type: ignore
+
+
+class ListProductsRequest(APIGatewayProxyEventModel):
+    queryStringParameters: Optional[ListProductsQueryParams] = None  # type: ignore
+
+
+class SearchProductsRequest(APIGatewayProxyEventModel):
+    queryStringParameters: SearchProductsQueryParams  # type: ignore
@@ -1,7 +1,8 @@
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
 from pydantic import BaseModel, Field, PositiveInt
 
+from product.catalog.models import CatalogStats
 from product.models.products.product import ProductId
 
 
@@ -13,7 +14,38 @@ class GetProductOutput(BaseModel):
     id: ProductId
     name: Annotated[str, Field(min_length=1, max_length=20)]
     price: PositiveInt
+    version: PositiveInt = 1
 
 
 class ListProductsOutput(BaseModel):
     products: List[GetProductOutput]
+
+
+# most relevant products first
+class SearchProductsOutput(BaseModel):
+    products: List[GetProductOutput]
+
+
+# aggregates maintained by the stream processor, with the average price derived from them
+class ProductStatsOutput(CatalogStats):
+    average_price: Optional[float] = None
+
+
+# partial outputs are returned when the client asks for a subset of fields, unset fields are not serialized
+class GetPartialProductOutput(BaseModel):
+    id: Optional[ProductId] = None
+    name: Optional[Annotated[str, Field(min_length=1, max_length=20)]] = None
+    price: Optional[PositiveInt] = None
+    version: Optional[PositiveInt] = None
+
+
+class ListPartialProductsOutput(BaseModel):
+    products: List[GetPartialProductOutput]
+
+
+# only the updated attributes are returned, along with the new product version
+class UpdateProductOutput(BaseModel):
+    id: ProductId
+    name: Optional[Annotated[str, Field(min_length=1, max_length=20)]] = None
+    price: Optional[PositiveInt] = None
+    version: PositiveInt
@@ -1,6 +1,6 @@
-from typing import Annotated
+from typing import Annotated, Literal, Optional
 
-from pydantic import BaseModel, Field, PositiveInt
+from pydantic import BaseModel, Field, PositiveInt, model_validator
 from pydantic.functional_validators import AfterValidator
 
 from product.models.products.validators import validate_product_id
@@ -8,6 +8,9 @@ from product.models.products.validators import validate_product_id
 ProductId = Annotated[str, Field(min_length=36, max_length=36), AfterValidator(validate_product_id)]
 """Unique Product ID, represented and validated as a UUID string."""
 
+ProductField = Literal['id', 'name', 'price', 'version']
+"""Product attribute that can be requested in a field projection."""
+
 # schemas here are shared between both handler and domain layer of the crud module
 
 
@@ -22,8 +25,74 @@ class Product(BaseModel):
         Product ID (UUID string)
     price : PositiveInt
         Product price represented as a positive integer
+    version : PositiveInt
+        Product version, incremented on every update, by default 1
     """
 
     name: Annotated[str, Field(min_length=1, max_length=50)]
     id: ProductId
     price: PositiveInt
+    version: PositiveInt = 1
+
+
+class PartialProduct(BaseModel):
+    """Data representation for a product projection, only the requested fields are set.
+
+    Parameters
+    ----------
+    name : Optional[str]
+        Product name
+    id : Optional[ProductId]
+        Product ID (UUID string)
+    price : Optional[PositiveInt]
+        Product price represented as a positive integer
+    version : Optional[PositiveInt]
+        Product version
+    """
+
+    name: Optional[Annotated[str, Field(min_length=1, max_length=50)]] = None
+    id: Optional[ProductId] = None
+    price: Optional[PositiveInt] = None
+    version: Optional[PositiveInt] = None
+
+
+class ProductFilter(BaseModel):
+    """Criteria for listing products through the price and name secondary indexes.
+
+    Parameters
+    ----------
+    min_price : Optional[PositiveInt]
+        Minimum product price (inclusive)
+    max_price : Optional[PositiveInt]
+        Maximum product price (inclusive)
+    name_prefix : Optional[str]
+        Case sensitive prefix of the product name
+    """
+
+    min_price: Optional[PositiveInt] = None
+    max_price: Optional[PositiveInt] = None
+    name_prefix: Optional[Annotated[str, Field(min_length=1, max_length=50)]] = None
+
+    @model_validator(mode='after')
+    def validate_price_range(self) -> 'ProductFilter':
+        if self.min_price is not None and self.max_price is not None and self.min_price > self.max_price:
+            raise ValueError('min_price must be lower than or equal to max_price')
+        return self
+
+
+class ProductUpdate(BaseModel):
+    """Data representation for a partial product update, guarded by the product version.
+
+    Parameters
+    ----------
+    name : Optional[str]
+        New product name, unchanged if not set
+    price : Optional[PositiveInt]
+        New product price, unchanged if not set
+    version : PositiveInt
+        Product version the update is based on, the update fails if the stored version is different
+    """
+
+    name: Optional[Annotated[str, Field(min_length=1, max_length=50)]] = None
+    price: Optional[PositiveInt] = None
+    version: PositiveInt
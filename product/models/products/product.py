@@ -8,6 +8,9 @@ from product.models.products.validators import validate_product_id
 ProductId = Annotated[str, Field(min_length=36, max_length=36), AfterValidator(validate_product_id)]
 """Unique Product ID, represented and validated as a UUID string."""
 
+PRODUCT_CATALOG = 'products'
+"""Partition key value of the product catalog secondary indexes, shared by all products."""
+
 # schemas here are shared between both CRUD and Stream processor modules
 
 
@@ -23,9 +26,17 @@ class ProductEntry(BaseModel):
         Product ID (UUID string)
     price : PositiveInt
         Product price represented as a positive integer
+    created_at : PositiveInt
+        Product creation time (UNIX timestamp)
+    catalog : str
+        Partition key of the price and name secondary indexes, by default `PRODUCT_CATALOG`
+    version : PositiveInt
+        Product version, incremented on every update for optimistic locking, by default 1
     """
 
     name: Annotated[str, Field(min_length=1, max_length=50)]
     id: ProductId
     price: PositiveInt
     created_at: PositiveInt
+    catalog: str = PRODUCT_CATALOG
+    version: PositiveInt = 1
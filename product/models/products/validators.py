@@ -1,3 +1,4 @@
+from typing import Any
 from uuid import UUID
 
 
@@ -24,3 +25,21 @@ def validate_product_id(product_id: str) -> str:
     except Exception as exc:  # pragma: no cover
         raise ValueError(str(exc)) from exc
     return product_id
+
+
+def split_comma_separated(value: Any) -> Any:
+    """Splits a comma separated string, e.g. a query string parameter, into a list of unique and stripped values
+
+    Parameters
+    ----------
+    value : Any
+        Raw value, only strings are split
+
+    Returns
+    -------
+    Any
+        List of values in their original order when value is a string, otherwise value as is
+    """
+    if not isinstance(value, str):
+        return value
+    return list(dict.fromkeys(item.strip() for item in value.split(',') if item.strip()))
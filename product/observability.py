@@ -1,4 +1,9 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
 from aws_lambda_powertools.logging.logger import Logger
+from aws_lambda_powertools.metrics import MetricUnit
 from aws_lambda_powertools.metrics.metrics import Metrics
 from aws_lambda_powertools.tracing.tracer import Tracer
 
@@ -12,3 +17,41 @@ tracer: Tracer = Tracer()
 
 # namespace and service name can be set by environment variable "POWERTOOLS_METRICS_NAMESPACE" and "POWERTOOLS_SERVICE_NAME" accordingly
 metrics = Metrics(namespace=METRICS_NAMESPACE)
+
+
+class StageTimer:
+    """Accumulates the wall time of the processing stages of one invocation.
+
+    Stages are timed with `stage`, which also opens an X-Ray subsegment when tracing is enabled, or reported with `record`
+    when they are measured elsewhere. Entering the same stage several times adds up. `add_metrics` publishes one
+    `<prefix><Stage>Duration` metric per stage in milliseconds and starts over, so it's called once per invocation,
+    before the metrics are flushed.
+    """
+
+    def __init__(self) -> None:
+        self.durations_ms: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            if tracer.disabled:
+                yield
+            else:
+                with tracer.provider.in_subsegment(name=f'## {name}'):
+                    yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self.durations_ms[name] = self.durations_ms.get(name, 0) + duration_ms
+
+    def add_metrics(self, prefix: str = '') -> dict[str, float]:
+        durations_ms, self.durations_ms = self.durations_ms, {}
+        for name, duration_ms in durations_ms.items():
+            metrics.add_metric(name=f'{prefix}{name}Duration', unit=MetricUnit.Milliseconds, value=round(duration_ms, 3))
+        return durations_ms
+
+
+# stages of the current invocation, shared by the handler and the layers it calls like the other observability objects
+stage_timer = StageTimer()
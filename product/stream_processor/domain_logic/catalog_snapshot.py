@@ -0,0 +1,47 @@
+from functools import lru_cache
+
+from product.catalog.models import CatalogChange, CatalogSnapshot
+from product.catalog.object_store.base import ObjectStore
+from product.catalog.object_store.versioned_object import VersionedObject
+from product.catalog.snapshot import apply_changes, decode_snapshot, encode_snapshot
+from product.observability import logger
+
+MAX_UPDATE_ATTEMPTS = 5
+
+
+# kept across invocations, consecutive batches of a container don't download the snapshot they just wrote
+@lru_cache(maxsize=8)
+def _get_snapshot_object(object_store: ObjectStore, key: str) -> VersionedObject[CatalogSnapshot]:
+    return VersionedObject(object_store, key, decode=decode_snapshot, encode=encode_snapshot, empty=CatalogSnapshot)
+
+
+def update_catalog_snapshot(changes: list[CatalogChange], object_store: ObjectStore, key: str) -> CatalogSnapshot:
+    """Apply product changes to the catalog snapshot, creating it on the first batch.
+
+    The snapshot is read, changed and written back only if no other writer (another shard's batch) changed it in
+    between, otherwise the update starts over from the newer snapshot.
+
+    Parameters
+    ----------
+    changes : list[CatalogChange]
+        Product changes, in stream order
+    object_store : ObjectStore
+        Store holding the snapshot
+    key : str
+        Object key of the snapshot
+
+    Returns
+    -------
+    CatalogSnapshot
+        The written snapshot
+
+    Raises
+    ------
+    PreconditionFailedError
+        When every attempt lost the race against another writer, the batch is retried by the stream
+    ObjectStoreError
+        When the store fails, the batch is retried by the stream
+    """
+    snapshot = _get_snapshot_object(object_store, key).update(lambda current: apply_changes(current, changes), max_attempts=MAX_UPDATE_ATTEMPTS)
+    logger.info('updated catalog snapshot', version=snapshot.version, products=len(snapshot.products))
+    return snapshot
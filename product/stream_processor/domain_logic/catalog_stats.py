@@ -0,0 +1,35 @@
+from product.catalog.models import PriceChange
+from product.catalog.stats import CatalogStatsDelta, compute_stats_delta
+from product.catalog.stats_store.base import CatalogStatsStore
+from product.observability import logger
+
+
+def update_catalog_stats(changes: list[PriceChange], stats_store: CatalogStatsStore, batch_id: str) -> CatalogStatsDelta:
+    """Add the price changes of a stream batch to the catalog aggregates, with one update whatever the batch size.
+
+    Parameters
+    ----------
+    changes : list[PriceChange]
+        Price changes, in stream order
+    stats_store : CatalogStatsStore
+        Store holding the aggregates
+    batch_id : str
+        Identifies the batch, so its immediate retry is not counted twice
+
+    Returns
+    -------
+    CatalogStatsDelta
+        The coalesced changes of the batch
+
+    Raises
+    ------
+    CatalogStatsStoreError
+        When the store fails, the batch is retried by the stream
+    """
+    delta = compute_stats_delta(changes)
+    if not delta:
+        logger.info('no catalog stats changes in the batch')
+        return delta
+    applied = stats_store.apply_delta(delta, batch_id)
+    logger.info('updated catalog stats', applied=applied, product_count_delta=delta.product_count, price_sum_delta=delta.price_sum)
+    return delta
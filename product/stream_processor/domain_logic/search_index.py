@@ -0,0 +1,47 @@
+from functools import lru_cache
+
+from product.catalog.models import CatalogChange
+from product.catalog.object_store.base import ObjectStore
+from product.catalog.object_store.versioned_object import VersionedObject
+from product.catalog.search_index import SearchIndex, decode_search_index, encode_search_index
+from product.observability import logger
+
+MAX_UPDATE_ATTEMPTS = 5
+
+
+# kept across invocations, consecutive batches of a container only apply their changes to the index they just wrote
+@lru_cache(maxsize=8)
+def _get_search_index_object(object_store: ObjectStore, key: str) -> VersionedObject[SearchIndex]:
+    return VersionedObject(object_store, key, decode=decode_search_index, encode=encode_search_index, empty=SearchIndex)
+
+
+def update_search_index(changes: list[CatalogChange], object_store: ObjectStore, key: str) -> SearchIndex:
+    """Apply product changes to the name search index, creating it on the first batch.
+
+    Like the catalog snapshot, the index is written back only if no other writer changed it in between, otherwise the
+    update starts over from the newer index.
+
+    Parameters
+    ----------
+    changes : list[CatalogChange]
+        Product changes, in stream order
+    object_store : ObjectStore
+        Store holding the index
+    key : str
+        Object key of the index
+
+    Returns
+    -------
+    SearchIndex
+        The written index
+
+    Raises
+    ------
+    PreconditionFailedError
+        When every attempt lost the race against another writer, the batch is retried by the stream
+    ObjectStoreError
+        When the store fails, the batch is retried by the stream
+    """
+    index = _get_search_index_object(object_store, key).update(lambda current: current.apply_changes(changes), max_attempts=MAX_UPDATE_ATTEMPTS)
+    logger.info('updated search index', version=index.version, products=len(index), terms=len(index.terms))
+    return index
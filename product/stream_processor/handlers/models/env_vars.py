@@ -1,6 +1,11 @@
 from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from product.catalog.models import CatalogSnapshotVars, CatalogStatsVars
+
+# destination variable each EVENT_PROVIDER requires, the event bus is always set
+EVENT_PROVIDER_DESTINATIONS = {'sqs': 'EVENT_QUEUE_URL', 'sns': 'EVENT_TOPIC_ARN', 'kinesis': 'EVENT_STREAM_NAME'}
 
 
 class Observability(BaseModel):
@@ -8,6 +13,18 @@ class Observability(BaseModel):
     LOG_LEVEL: Literal['DEBUG', 'INFO', 'ERROR', 'CRITICAL', 'WARNING', 'EXCEPTION']
 
 
-class PrcStreamVars(Observability):
+class PrcStreamVars(Observability, CatalogSnapshotVars, CatalogStatsVars):
     EVENT_BUS: Annotated[str, Field(min_length=1)]
     EVENT_SOURCE: Annotated[str, Field(min_length=1)]
+    # product change notifications go to the event bus unless another provider is set, with its destination
+    EVENT_PROVIDER: Literal['eventbridge', 'sqs', 'sns', 'kinesis'] = 'eventbridge'
+    EVENT_QUEUE_URL: str = ''
+    EVENT_TOPIC_ARN: str = ''
+    EVENT_STREAM_NAME: str = ''
+
+    @model_validator(mode='after')
+    def validate_provider_destination(self) -> 'PrcStreamVars':
+        destination = EVENT_PROVIDER_DESTINATIONS.get(self.EVENT_PROVIDER)
+        if destination is not None and not getattr(self, destination):
+            raise ValueError(f'{destination} must be set when EVENT_PROVIDER is {self.EVENT_PROVIDER}')
+        return self
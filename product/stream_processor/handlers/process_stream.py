@@ -1,18 +1,53 @@
-from typing import Any
+from typing import Any, NamedTuple, Optional
 
 from aws_lambda_env_modeler import get_environment_variables, init_environment_variables
 from aws_lambda_powertools.metrics import MetricUnit
-from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import DynamoDBStreamEvent
+from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import DynamoDBRecordEventName, DynamoDBStreamEvent
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
-from product.observability import logger, metrics, tracer
+from product.catalog.models import CatalogChange, PriceChange
+from product.catalog.object_store import get_catalog_object_store
+from product.catalog.object_store.base import ObjectStore
+from product.catalog.stats_store import get_catalog_stats_store
+from product.catalog.stats_store.base import CatalogStatsStore
+from product.observability import logger, metrics, stage_timer, tracer
+from product.stream_processor.domain_logic.catalog_snapshot import update_catalog_snapshot
+from product.stream_processor.domain_logic.catalog_stats import update_catalog_stats
 from product.stream_processor.domain_logic.product_notification import notify_product_updates
+from product.stream_processor.domain_logic.search_index import update_search_index
 from product.stream_processor.handlers.models.env_vars import PrcStreamVars
 from product.stream_processor.integrations.events.base import BaseEventHandler
 from product.stream_processor.integrations.events.event_handler import EventHandler
+from product.stream_processor.integrations.events.providers import get_event_provider
 from product.stream_processor.models.product import ProductChangeNotification
 
 
+class _ParsedRecord(NamedTuple):
+    product_id: str
+    event_name: Optional[DynamoDBRecordEventName]
+    sequence_number: Optional[str]
+    new_image: Optional[dict[str, Any]]
+    old_image: Optional[dict[str, Any]]
+
+
+def _parse_records(event: dict[str, Any]) -> list[_ParsedRecord]:
+    # the stream record properties deserialize the DynamoDB attribute values on every access, each record is parsed once
+    parsed_records = []
+    for record in DynamoDBStreamEvent(event).records:
+        stream_record = record.dynamodb
+        keys = stream_record.keys or {}  # type: ignore[union-attr]
+        parsed_records.append(
+            _ParsedRecord(
+                product_id=keys.get('id', ''),
+                event_name=record.event_name,
+                sequence_number=stream_record.sequence_number,  # type: ignore[union-attr]
+                new_image=stream_record.new_image,  # type: ignore[union-attr]
+                old_image=stream_record.old_image,  # type: ignore[union-attr]
+            )
+        )
+    return parsed_records
+
+
 @init_environment_variables(model=PrcStreamVars)
 @logger.inject_lambda_context(log_event=True)
 @metrics.log_metrics
@@ -21,6 +56,8 @@ def process_stream(
     event: dict[str, Any],
     context: LambdaContext,
     event_handler: BaseEventHandler | None = None,
+    object_store: ObjectStore | None = None,
+    stats_store: CatalogStatsStore | None = None,
 ) -> dict:
     """Process batch of Amazon DynamoDB Stream containing product changes.
 
@@ -38,13 +75,20 @@ def process_stream(
 
         See [sample](https://docs.aws.amazon.com/lambda/latest/dg/python-context.html)
     event_handler : BaseEventHandler | None, optional
-        Event Handler to use to notify product changes, by default `EventHandler` with EventBridge as a provider
+        Event Handler to use to notify product changes, by default `EventHandler` with the provider selected by `EVENT_PROVIDER`
+    object_store : ObjectStore | None, optional
+        Store of the catalog snapshot, by default the one configured with `CATALOG_SNAPSHOT_STORE`, if any
+    stats_store : CatalogStatsStore | None, optional
+        Store of the catalog aggregates, by default the one configured with `CATALOG_STATS_TABLE_NAME`, if any
 
     Integrations
     ------------
 
     # Domain
 
+    * `update_catalog_snapshot` to apply `CatalogChange` changes to the catalog snapshot, when a store is configured
+    * `update_search_index` to apply the same changes to the name search index, when a store is configured
+    * `update_catalog_stats` to add `PriceChange` changes to the catalog aggregates, when a store is configured
     * `notify_product_updates` to notify `ProductChangeNotification` changes
 
     Returns
@@ -59,29 +103,67 @@ def process_stream(
 
         This means sending notifications are at least once.
     """
-    # Until we create our handler product stream change input
-    stream_records = DynamoDBStreamEvent(event)
-
     env_vars = get_environment_variables(model=PrcStreamVars)
     logger.debug('environment variables', env_vars=env_vars.model_dump())
 
-    metrics.add_metric(name='StreamRecords', unit=MetricUnit.Count, value=len(stream_records.keys()))
-
-    product_updates = []
-    for record in stream_records.records:
-        product_id = record.dynamodb.keys.get('id', '')  # type: ignore[union-attr]
-        logger.append_keys(product_id=product_id)
-        logger.info('handling record', event_name=record.event_name)
-
-        match record.event_name:
-            case record.event_name.INSERT:  # type: ignore[union-attr]
-                product_updates.append(ProductChangeNotification(product_id=product_id, status='ADDED'))
-            case record.event_name.REMOVE:  # type: ignore[union-attr]
-                product_updates.append(ProductChangeNotification(product_id=product_id, status='REMOVED'))
-
-    if event_handler is None:  # pragma: no cover
-        event_handler = EventHandler(event_source=env_vars.EVENT_SOURCE, event_bus=env_vars.EVENT_BUS)
-
-    receipt = notify_product_updates(update=product_updates, event_handler=event_handler)
+    try:
+        with stage_timer.stage('Parse'):
+            records = _parse_records(event)
+
+        metrics.add_metric(name='StreamRecords', unit=MetricUnit.Count, value=len(records))
+
+        # the snapshot, search index and aggregates are updated before notifying, so notified consumers find the change in them
+        object_store = object_store or get_catalog_object_store()
+        if object_store is not None and records:
+            with stage_timer.stage('CatalogSnapshot'):
+                catalog_changes = [
+                    CatalogChange.model_validate(
+                        {
+                            'product_id': record.product_id,
+                            # other attributes of the image, like created_at, are not listed
+                            'product': None if record.event_name == DynamoDBRecordEventName.REMOVE else record.new_image,
+                        }
+                    )
+                    for record in records
+                ]
+                update_catalog_snapshot(changes=catalog_changes, object_store=object_store, key=env_vars.CATALOG_SNAPSHOT_KEY)
+            with stage_timer.stage('SearchIndex'):
+                update_search_index(changes=catalog_changes, object_store=object_store, key=env_vars.CATALOG_SEARCH_INDEX_KEY)
+
+        stats_store = stats_store or get_catalog_stats_store()
+        if stats_store is not None and records:
+            with stage_timer.stage('CatalogStats'):
+                price_changes = [
+                    PriceChange(old_price=(record.old_image or {}).get('price'), new_price=(record.new_image or {}).get('price'))
+                    for record in records
+                ]
+                # the first and last sequence numbers identify the batch as retried whole. Bisecting a failing batch must
+                # stay off, a half has other sequence numbers and its changes would be counted again
+                batch_id = f'{records[0].sequence_number}-{records[-1].sequence_number}'
+                update_catalog_stats(changes=price_changes, stats_store=stats_store, batch_id=batch_id)
+
+        product_updates = []
+        with stage_timer.stage('Notifications'):
+            for record in records:
+                product_id, event_name = record.product_id, record.event_name
+                logger.append_keys(product_id=product_id)
+                logger.info('handling record', event_name=event_name)
+
+                match event_name:
+                    case event_name.INSERT:  # type: ignore[union-attr]
+                        product_updates.append(ProductChangeNotification(product_id=product_id, status='ADDED'))
+                    case event_name.MODIFY:  # type: ignore[union-attr]
+                        product_updates.append(ProductChangeNotification(product_id=product_id, status='UPDATED'))
+                    case event_name.REMOVE:  # type: ignore[union-attr]
+                        product_updates.append(ProductChangeNotification(product_id=product_id, status='REMOVED'))
+
+        if event_handler is None:  # pragma: no cover
+            event_handler = EventHandler(event_source=env_vars.EVENT_SOURCE, event_bus=env_vars.EVENT_BUS, provider=get_event_provider())
+
+        receipt = notify_product_updates(update=product_updates, event_handler=event_handler)
+    finally:
+        # published on failures too, a slow put_events is the most likely reason for them
+        stage_durations = stage_timer.add_metrics()
+        logger.debug('stage durations', stage_durations_ms=stage_durations)
 
     return receipt.model_dump()
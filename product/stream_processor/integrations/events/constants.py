@@ -1,3 +1,13 @@
 """Constants related to events integration (event handler and event providers)"""
 DEFAULT_EVENT_VERSION = 'v1'
 EVENTBRIDGE_PROVIDER_MAX_EVENTS_ENTRY = 10
+# batch limits of the other providers, sizes count every entry of a batch
+SQS_PROVIDER_MAX_ENTRIES = 10
+SQS_PROVIDER_MAX_BATCH_BYTES = 256 * 1024
+SNS_PROVIDER_MAX_ENTRIES = 10
+SNS_PROVIDER_MAX_BATCH_BYTES = 256 * 1024
+KINESIS_PROVIDER_MAX_RECORDS = 500
+KINESIS_PROVIDER_MAX_BATCH_BYTES = 5 * 1024 * 1024
+# sends of the failed entries of a batch, the first one included, before giving up
+BATCH_PROVIDER_MAX_ATTEMPTS = 3
+BATCH_PROVIDER_BACKOFF_BASE_SECONDS = 0.05
@@ -2,6 +2,7 @@ import re
 from typing import Any
 from uuid import uuid4
 
+from product.observability import stage_timer
 from product.stream_processor.integrations.events.base import BaseEventHandler, BaseEventProvider
 from product.stream_processor.integrations.events.constants import DEFAULT_EVENT_VERSION
 from product.stream_processor.integrations.events.models.input import AnyModel, Event, EventMetadata
@@ -49,12 +50,13 @@ class EventHandler(BaseEventHandler[AnyModel]):
         EventReceipt
             Receipts for unsuccessfully and successfully published events.
         """
-        event_payload = EventHandler.build_events_from_models(
-            models=payload,
-            metadata=metadata,
-            correlation_id=correlation_id,
-            event_source=self.event_source,
-        )
+        with stage_timer.stage('BuildEvents'):
+            event_payload = EventHandler.build_events_from_models(
+                models=payload,
+                metadata=metadata,
+                correlation_id=correlation_id,
+                event_source=self.event_source,
+            )
         return self.provider.send(payload=event_payload)
 
     @staticmethod
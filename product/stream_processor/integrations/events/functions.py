@@ -1,6 +1,6 @@
 """Standalone functions related to events integration. These are reused in more than one location, and tested separately"""
 
-from typing import Generator, TypeVar
+from typing import Callable, Generator, TypeVar
 
 T = TypeVar('T')
 """Generic type for a list of events"""
@@ -24,3 +24,37 @@ def chunk_from_list(events: list[T], max_items: int) -> Generator[list[T], None,
     for idx in range(0, len(events), max_items):  # start, stop, step
         # slice the first 10 items, then the next 10 items starting from the index
         yield from [events[idx : idx + max_items]]
+
+
+def chunk_by_size(items: list[T], max_items: int, max_bytes: int, size_of: Callable[[T], int]) -> Generator[list[T], None, None]:
+    """Packs a list of items into chunks, in order, respecting both the max number of items and their total size.
+
+    An item larger than `max_bytes` on its own gets a chunk of its own, the destination rejects it.
+
+    Parameters
+    ----------
+    items : list[T]
+        List of items to pack.
+    max_items : int
+        Maximum number of items per chunk.
+    max_bytes : int
+        Maximum total size of the items of a chunk.
+    size_of : Callable[[T], int]
+        Size of an item, as counted by the destination.
+
+    Yields
+    ------
+    Generator[list[T], None, None]
+        Generator containing batches of items within both limits.
+    """
+    chunk: list[T] = []
+    chunk_bytes = 0
+    for item in items:
+        item_bytes = size_of(item)
+        if chunk and (len(chunk) == max_items or chunk_bytes + item_bytes > max_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(item)
+        chunk_bytes += item_bytes
+    if chunk:
+        yield chunk
@@ -0,0 +1,27 @@
+from functools import lru_cache
+from typing import Callable
+
+from aws_lambda_env_modeler import get_environment_variables
+
+from product.stream_processor.handlers.models.env_vars import PrcStreamVars
+from product.stream_processor.integrations.events.base import BaseEventProvider
+from product.stream_processor.integrations.events.providers.eventbridge import EventBridge
+from product.stream_processor.integrations.events.providers.kinesis import Kinesis
+from product.stream_processor.integrations.events.providers.sns import Sns
+from product.stream_processor.integrations.events.providers.sqs import Sqs
+
+# EVENT_PROVIDER value to the provider it selects, built from the environment variables
+EVENT_PROVIDERS: dict[str, Callable[[PrcStreamVars], BaseEventProvider]] = {
+    'eventbridge': lambda env_vars: EventBridge(bus_name=env_vars.EVENT_BUS),
+    'sqs': lambda env_vars: Sqs(queue_url=env_vars.EVENT_QUEUE_URL),
+    'sns': lambda env_vars: Sns(topic_arn=env_vars.EVENT_TOPIC_ARN),
+    'kinesis': lambda env_vars: Kinesis(stream_name=env_vars.EVENT_STREAM_NAME),
+}
+
+
+# one provider per container, its client connection pool is reused across invocations
+@lru_cache(maxsize=1)
+def get_event_provider() -> BaseEventProvider:
+    """Event provider of the product change notifications, selected with `EVENT_PROVIDER`."""
+    env_vars: PrcStreamVars = get_environment_variables(model=PrcStreamVars)
+    return EVENT_PROVIDERS[env_vars.EVENT_PROVIDER](env_vars)
@@ -0,0 +1,119 @@
+import random
+import time
+from abc import abstractmethod
+from typing import Callable, Generic, NamedTuple, TypeVar
+
+import botocore.exceptions
+
+from product.observability import logger, stage_timer
+from product.stream_processor.integrations.events.base import BaseEventProvider
+from product.stream_processor.integrations.events.constants import BATCH_PROVIDER_BACKOFF_BASE_SECONDS, BATCH_PROVIDER_MAX_ATTEMPTS
+from product.stream_processor.integrations.events.exceptions import ProductChangeNotificationDeliveryError
+from product.stream_processor.integrations.events.functions import chunk_by_size
+from product.stream_processor.integrations.events.models.input import Event
+from product.stream_processor.integrations.events.models.output import EventReceipt, EventReceiptFail, EventReceiptSuccess
+
+EntryT = TypeVar('EntryT')
+
+
+class FailedEntry(NamedTuple, Generic[EntryT]):
+    entry: EntryT
+    receipt: EventReceiptFail
+    retryable: bool  # failed on the service side, e.g. throttled, sending it again may succeed
+
+
+class BatchResult(NamedTuple, Generic[EntryT]):
+    success: list[EventReceiptSuccess]
+    failed: list[FailedEntry[EntryT]]
+
+
+class BatchEventProvider(BaseEventProvider, Generic[EntryT]):
+    # batch limits of the service API, and the name of its stage in the stream processor metrics
+    max_entries: int
+    max_batch_bytes: int
+    api_name: str
+
+    def __init__(self, max_attempts: int = BATCH_PROVIDER_MAX_ATTEMPTS, sleep: Callable[[float], None] = time.sleep):
+        """Event provider sending events with a batch API, packed by count and size, retrying failed entries.
+
+        Subclasses build the entries of their service API, with their size as counted by the service, and send a batch.
+        A batch is packed up to `max_entries` entries and `max_batch_bytes`. Entries of a batch that failed on the
+        service side are sent again, without the ones delivered, after an exponential backoff with full jitter.
+
+        Parameters
+        ----------
+        max_attempts : int, optional
+            Sends of a failed entry, the first one included, by default `BATCH_PROVIDER_MAX_ATTEMPTS`
+        sleep : Callable[[float], None], optional
+            Sleeps for some seconds between attempts, by default time.sleep
+        """
+        self.max_attempts = max_attempts
+        self._sleep = sleep
+
+    @abstractmethod
+    def build_entry(self, event: Event, entry_id: str) -> EntryT:
+        """Converts an event into an entry of the batch API, `entry_id` is unique within a `send` call."""
+        ...
+
+    @abstractmethod
+    def get_entry_size(self, entry: EntryT) -> int:
+        """Size of an entry in bytes, as counted by the service against `max_batch_bytes`."""
+        ...
+
+    @abstractmethod
+    def send_batch(self, entries: list[EntryT]) -> BatchResult[EntryT]:
+        """Sends a batch of entries with one call, the entries that failed are returned with their receipt."""
+        ...
+
+    def send(self, payload: list[Event]) -> EventReceipt:
+        """Sends events in as few batches as the API limits allow.
+
+        Parameters
+        ----------
+        payload : list[Event]
+            List of events to publish
+
+        Returns
+        -------
+        EventReceipt
+            Receipts for successfully published events
+
+        Raises
+        ------
+        ProductChangeNotificationDeliveryError
+            When one or more events could not be delivered, after retries for the failures on the service side.
+        """
+        success: list[EventReceiptSuccess] = []
+        # serialized upfront so serialization and network time are measured apart
+        with stage_timer.stage('Serialization'):
+            entries = [self.build_entry(event, entry_id=str(index)) for index, event in enumerate(payload)]
+            batches = list(chunk_by_size(entries, max_items=self.max_entries, max_bytes=self.max_batch_bytes, size_of=self.get_entry_size))
+
+        with stage_timer.stage(self.api_name):
+            for batch in batches:
+                success.extend(self._send_with_retries(batch))
+
+        return EventReceipt(success=success)
+
+    def _send_with_retries(self, batch: list[EntryT]) -> list[EventReceiptSuccess]:
+        success: list[EventReceiptSuccess] = []
+        for attempt in range(self.max_attempts):
+            try:
+                result = self.send_batch(batch)
+            except botocore.exceptions.ClientError as exc:
+                error_message = exc.response['Error']['Message']
+                receipt = EventReceiptFail(receipt_id='', error=error_message, details=exc.response['ResponseMetadata'])
+                raise ProductChangeNotificationDeliveryError(f'Failed to deliver all events: {error_message}', receipts=[receipt]) from exc
+
+            success.extend(result.success)
+            if not result.failed:
+                return success
+            # entries rejected as invalid would fail again, the batch is not retried
+            if attempt + 1 == self.max_attempts or not all(failed.retryable for failed in result.failed):
+                receipts = [failed.receipt for failed in result.failed]
+                raise ProductChangeNotificationDeliveryError(f'Failed to deliver {len(receipts)} events', receipts=receipts)
+
+            logger.warning('retrying failed events', api_name=self.api_name, failed=len(result.failed), attempt=attempt + 1)
+            batch = [failed.entry for failed in result.failed]
+            self._sleep(random.uniform(0, BATCH_PROVIDER_BACKOFF_BASE_SECONDS * 2**attempt))
+        return success  # pragma: no cover (the last attempt returns or raises)
@@ -5,6 +5,7 @@ import boto3
 import botocore.exceptions
 
 from product.constants import XRAY_TRACE_ID_ENV
+from product.observability import stage_timer
 from product.stream_processor.integrations.events.base import BaseEventProvider
 from product.stream_processor.integrations.events.constants import EVENTBRIDGE_PROVIDER_MAX_EVENTS_ENTRY
 from product.stream_processor.integrations.events.exceptions import ProductChangeNotificationDeliveryError
@@ -53,19 +54,22 @@ class EventBridge(BaseEventProvider):
         """
         success: list[EventReceiptSuccess] = []
         failed: list[EventReceiptFail] = []
-        events = self.build_put_events_requests(payload)
-
-        for batch in events:
-            try:
-                result = self.client.put_events(Entries=batch)
-                ok, not_ok = self._collect_receipts(result)
-                success.extend(ok)
-                failed.extend(not_ok)
-            except botocore.exceptions.ClientError as exc:
-                error_message = exc.response['Error']['Message']
-
-                receipt = EventReceiptFail(receipt_id='', error='error_message', details=exc.response['ResponseMetadata'])
-                raise ProductChangeNotificationDeliveryError(f'Failed to deliver all events: {error_message}', receipts=[receipt]) from exc
+        # serialized upfront so serialization and network time are measured apart
+        with stage_timer.stage('Serialization'):
+            events = list(self.build_put_events_requests(payload))
+
+        with stage_timer.stage('PutEvents'):
+            for batch in events:
+                try:
+                    result = self.client.put_events(Entries=batch)
+                    ok, not_ok = self._collect_receipts(result)
+                    success.extend(ok)
+                    failed.extend(not_ok)
+                except botocore.exceptions.ClientError as exc:
+                    error_message = exc.response['Error']['Message']
+
+                    receipt = EventReceiptFail(receipt_id='', error='error_message', details=exc.response['ResponseMetadata'])
+                    raise ProductChangeNotificationDeliveryError(f'Failed to deliver all events: {error_message}', receipts=[receipt]) from exc
 
         return EventReceipt(success=success, failed=failed)
 
@@ -0,0 +1,68 @@
+from typing import TYPE_CHECKING, Any, Optional
+
+import boto3
+
+from product.stream_processor.integrations.events.constants import KINESIS_PROVIDER_MAX_BATCH_BYTES, KINESIS_PROVIDER_MAX_RECORDS
+from product.stream_processor.integrations.events.models.input import Event
+from product.stream_processor.integrations.events.models.output import EventReceiptFail, EventReceiptSuccess
+from product.stream_processor.integrations.events.providers.batch import BatchEventProvider, BatchResult, FailedEntry
+
+if TYPE_CHECKING:
+    from mypy_boto3_kinesis import KinesisClient
+    from mypy_boto3_kinesis.type_defs import PutRecordsRequestEntryTypeDef
+
+
+class Kinesis(BatchEventProvider['PutRecordsRequestEntryTypeDef']):
+    max_entries = KINESIS_PROVIDER_MAX_RECORDS
+    max_batch_bytes = KINESIS_PROVIDER_MAX_BATCH_BYTES
+    api_name = 'PutRecords'
+
+    def __init__(self, stream_name: str, client: Optional['KinesisClient'] = None, partition_key_field: str = 'product_id', **kwargs: Any):
+        """Amazon Kinesis Data Streams provider using PutRecords API.
+
+        Events are partitioned by the `partition_key_field` attribute of their data, so the events of a product land in
+        the same shard, in order. Failed records are retried after the ones that succeeded, a retried event can be
+        delivered after a later event of the same product.
+
+        See [PutRecords docs](https://docs.aws.amazon.com/kinesis/latest/APIReference/API_PutRecords.html).
+
+        Parameters
+        ----------
+        stream_name : str
+            Name of the stream to put events to
+        client : Optional[KinesisClient], optional
+            Kinesis boto3 client to use, by default None
+        partition_key_field : str, optional
+            Attribute of the event data used as partition key, by default 'product_id'.
+            Events without it are partitioned by correlation ID.
+        **kwargs
+            Retry settings, see `BatchEventProvider`
+        """
+        super().__init__(**kwargs)
+        self.stream_name = stream_name
+        self.client = client or boto3.client('kinesis')
+        self.partition_key_field = partition_key_field
+
+    def build_entry(self, event: Event, entry_id: str) -> 'PutRecordsRequestEntryTypeDef':
+        partition_key = getattr(event.data, self.partition_key_field, None) or event.metadata.correlation_id
+        return {'Data': event.model_dump_json().encode(), 'PartitionKey': str(partition_key)}
+
+    def get_entry_size(self, entry: 'PutRecordsRequestEntryTypeDef') -> int:
+        # the partition key counts against the limits too
+        return len(entry['Data']) + len(entry['PartitionKey'].encode())
+
+    def send_batch(self, entries: list['PutRecordsRequestEntryTypeDef']) -> BatchResult['PutRecordsRequestEntryTypeDef']:
+        result = self.client.put_records(StreamName=self.stream_name, Records=entries)
+
+        # results are in the order of the records, there are no entry IDs
+        success: list[EventReceiptSuccess] = []
+        failed: list[FailedEntry['PutRecordsRequestEntryTypeDef']] = []
+        for entry, receipt in zip(entries, result['Records'], strict=True):
+            error_code = receipt.get('ErrorCode')
+            if error_code is None:
+                success.append(EventReceiptSuccess(receipt_id=f'{receipt.get("ShardId", "")}:{receipt.get("SequenceNumber", "")}'))
+                continue
+            fail = EventReceiptFail(receipt_id=entry['PartitionKey'], error=receipt.get('ErrorMessage', ''), details={'error_code': error_code})
+            # throttled or internal failures, records are validated for the whole call
+            failed.append(FailedEntry(entry=entry, receipt=fail, retryable=True))
+        return BatchResult(success=success, failed=failed)
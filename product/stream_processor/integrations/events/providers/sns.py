@@ -0,0 +1,64 @@
+from typing import TYPE_CHECKING, Any, Optional
+
+import boto3
+
+from product.stream_processor.integrations.events.constants import SNS_PROVIDER_MAX_BATCH_BYTES, SNS_PROVIDER_MAX_ENTRIES
+from product.stream_processor.integrations.events.models.input import Event
+from product.stream_processor.integrations.events.models.output import EventReceiptFail, EventReceiptSuccess
+from product.stream_processor.integrations.events.providers.batch import BatchEventProvider, BatchResult, FailedEntry
+from product.stream_processor.integrations.events.providers.sqs import get_message_attributes_size
+
+if TYPE_CHECKING:
+    from mypy_boto3_sns import SNSClient
+    from mypy_boto3_sns.type_defs import PublishBatchRequestEntryTypeDef
+
+
+class Sns(BatchEventProvider['PublishBatchRequestEntryTypeDef']):
+    max_entries = SNS_PROVIDER_MAX_ENTRIES
+    max_batch_bytes = SNS_PROVIDER_MAX_BATCH_BYTES
+    api_name = 'PublishBatch'
+
+    def __init__(self, topic_arn: str, client: Optional['SNSClient'] = None, **kwargs: Any):
+        """Amazon SNS provider using PublishBatch API.
+
+        See [PublishBatch docs](https://docs.aws.amazon.com/sns/latest/api/API_PublishBatch.html).
+
+        Parameters
+        ----------
+        topic_arn : str
+            ARN of the topic to publish events to
+        client : Optional[SNSClient], optional
+            SNS boto3 client to use, by default None
+        **kwargs
+            Retry settings, see `BatchEventProvider`
+        """
+        super().__init__(**kwargs)
+        self.topic_arn = topic_arn
+        self.client = client or boto3.client('sns')
+
+    def build_entry(self, event: Event, entry_id: str) -> 'PublishBatchRequestEntryTypeDef':
+        # the event name is an attribute too, so subscriptions can filter on it
+        return {
+            'Id': entry_id,
+            'Message': event.model_dump_json(),
+            'MessageAttributes': {'event_name': {'DataType': 'String', 'StringValue': event.metadata.event_name}},
+        }
+
+    def get_entry_size(self, entry: 'PublishBatchRequestEntryTypeDef') -> int:
+        return len(entry['Message'].encode()) + get_message_attributes_size(dict(entry.get('MessageAttributes', {})))
+
+    def send_batch(self, entries: list['PublishBatchRequestEntryTypeDef']) -> BatchResult['PublishBatchRequestEntryTypeDef']:
+        result = self.client.publish_batch(TopicArn=self.topic_arn, PublishBatchRequestEntries=entries)
+        entries_by_id = {entry['Id']: entry for entry in entries}
+
+        success = [EventReceiptSuccess(receipt_id=receipt.get('MessageId', '')) for receipt in result.get('Successful', [])]
+        failed = [
+            FailedEntry(
+                entry=entries_by_id[receipt['Id']],
+                receipt=EventReceiptFail(receipt_id=receipt['Id'], error=receipt.get('Message', ''), details={'error_code': receipt['Code']}),
+                # sender faults, e.g. an invalid message, would fail again
+                retryable=not receipt['SenderFault'],
+            )
+            for receipt in result.get('Failed', [])
+        ]
+        return BatchResult(success=success, failed=failed)
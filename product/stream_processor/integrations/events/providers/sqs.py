@@ -0,0 +1,76 @@
+import os
+from typing import TYPE_CHECKING, Any, Optional
+
+import boto3
+
+from product.constants import XRAY_TRACE_ID_ENV
+from product.stream_processor.integrations.events.constants import SQS_PROVIDER_MAX_BATCH_BYTES, SQS_PROVIDER_MAX_ENTRIES
+from product.stream_processor.integrations.events.models.input import Event
+from product.stream_processor.integrations.events.models.output import EventReceiptFail, EventReceiptSuccess
+from product.stream_processor.integrations.events.providers.batch import BatchEventProvider, BatchResult, FailedEntry
+
+if TYPE_CHECKING:
+    from mypy_boto3_sqs import SQSClient
+    from mypy_boto3_sqs.type_defs import SendMessageBatchRequestEntryTypeDef
+
+
+def get_message_attributes_size(attributes: dict[str, Any]) -> int:
+    """Size of message attributes as counted by SQS and SNS, the name, type and value of every attribute."""
+    return sum(len(name.encode()) + len(value['DataType'].encode()) + len(value['StringValue'].encode()) for name, value in attributes.items())
+
+
+class Sqs(BatchEventProvider['SendMessageBatchRequestEntryTypeDef']):
+    max_entries = SQS_PROVIDER_MAX_ENTRIES
+    max_batch_bytes = SQS_PROVIDER_MAX_BATCH_BYTES
+    api_name = 'SendMessageBatch'
+
+    def __init__(self, queue_url: str, client: Optional['SQSClient'] = None, **kwargs: Any):
+        """Amazon SQS provider using SendMessageBatch API.
+
+        See [SendMessageBatch docs](https://docs.aws.amazon.com/AWSSimpleQueueService/latest/APIReference/API_SendMessageBatch.html).
+
+        Parameters
+        ----------
+        queue_url : str
+            URL of the queue to send events to
+        client : Optional[SQSClient], optional
+            SQS boto3 client to use, by default None
+        **kwargs
+            Retry settings, see `BatchEventProvider`
+        """
+        super().__init__(**kwargs)
+        self.queue_url = queue_url
+        self.client = client or boto3.client('sqs')
+
+    def build_entry(self, event: Event, entry_id: str) -> 'SendMessageBatchRequestEntryTypeDef':
+        # the event name is an attribute too, so consumers can route messages without parsing them
+        entry: 'SendMessageBatchRequestEntryTypeDef' = {
+            'Id': entry_id,
+            'MessageBody': event.model_dump_json(),
+            'MessageAttributes': {'event_name': {'DataType': 'String', 'StringValue': event.metadata.event_name}},
+        }
+
+        trace_id = os.environ.get(XRAY_TRACE_ID_ENV)
+        if trace_id:
+            entry['MessageSystemAttributes'] = {'AWSTraceHeader': {'DataType': 'String', 'StringValue': trace_id}}
+
+        return entry
+
+    def get_entry_size(self, entry: 'SendMessageBatchRequestEntryTypeDef') -> int:
+        return len(entry['MessageBody'].encode()) + get_message_attributes_size(dict(entry.get('MessageAttributes', {})))
+
+    def send_batch(self, entries: list['SendMessageBatchRequestEntryTypeDef']) -> BatchResult['SendMessageBatchRequestEntryTypeDef']:
+        result = self.client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+        entries_by_id = {entry['Id']: entry for entry in entries}
+
+        success = [EventReceiptSuccess(receipt_id=receipt['MessageId']) for receipt in result.get('Successful', [])]
+        failed = [
+            FailedEntry(
+                entry=entries_by_id[receipt['Id']],
+                receipt=EventReceiptFail(receipt_id=receipt['Id'], error=receipt.get('Message', ''), details={'error_code': receipt['Code']}),
+                # sender faults, e.g. an invalid message, would fail again
+                retryable=not receipt['SenderFault'],
+            )
+            for receipt in result.get('Failed', [])
+        ]
+        return BatchResult(success=success, failed=failed)
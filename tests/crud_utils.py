@@ -17,6 +17,7 @@ def generate_product_api_gw_event(
     body: Optional[Dict[str, Any]] = None,
     path_params: Optional[Dict[str, Any]] = None,
     path: Optional[str] = '/api/product/',
+    query_params: Optional[Dict[str, str]] = None,
 ) -> dict[str, Any]:
     return {
         'version': '1.0',
@@ -25,8 +26,10 @@ def generate_product_api_gw_event(
         'httpMethod': http_method.value,
         'headers': {'Header1': 'value1', 'Header2': 'value2'},
         'multiValueHeaders': {'Header1': ['value1'], 'Header2': ['value1', 'value2']},
-        'queryStringParameters': {'parameter1': 'value1', 'parameter2': 'value'},
-        'multiValueQueryStringParameters': {'parameter1': ['value1', 'value2'], 'parameter2': ['value']},
+        'queryStringParameters': {'parameter1': 'value1', 'parameter2': 'value'} if query_params is None else query_params,
+        'multiValueQueryStringParameters': {'parameter1': ['value1', 'value2'], 'parameter2': ['value']}
+        if query_params is None
+        else {key: [value] for key, value in query_params.items()},
         'requestContext': {
             'accountId': '123456789012',
             'apiId': 'id',
@@ -77,6 +80,7 @@ def generate_product_api_gw_event(
 def generate_api_gw_list_products_event(
     path_params: Optional[Dict[str, Any]] = None,
     path: Optional[str] = '/api/products/',
+    query_params: Optional[Dict[str, str]] = None,
 ) -> dict[str, Any]:
     return {
         'version': '1.0',
@@ -85,8 +89,10 @@ def generate_api_gw_list_products_event(
         'httpMethod': 'GET',
         'headers': {'Header1': 'value1', 'Header2': 'value2'},
         'multiValueHeaders': {'Header1': ['value1'], 'Header2': ['value1', 'value2']},
-        'queryStringParameters': {'parameter1': 'value1', 'parameter2': 'value'},
-        'multiValueQueryStringParameters': {'parameter1': ['value1', 'value2'], 'parameter2': ['value']},
+        'queryStringParameters': {'parameter1': 'value1', 'parameter2': 'value'} if query_params is None else query_params,
+        'multiValueQueryStringParameters': {'parameter1': ['value1', 'value2'], 'parameter2': ['value']}
+        if query_params is None
+        else {key: [value] for key, value in query_params.items()},
         'requestContext': {
             'accountId': '123456789012',
             'apiId': 'id',
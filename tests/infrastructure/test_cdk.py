@@ -13,5 +13,8 @@ def test_synthesizes_properly():
 
     # verify that we have one API GW, that is it not deleted by mistake
     template.resource_count_is('AWS::ApiGateway::RestApi', 1)
-    template.resource_count_is('AWS::DynamoDB::Table', 2)  # main db and one for idempotency
+    template.resource_count_is('AWS::DynamoDB::Table', 3)  # main db, idempotency and catalog stats
+    template.resource_count_is('AWS::S3::Bucket', 1)  # catalog snapshot and search index
     template.resource_count_is('AWS::Events::EventBus', 1)
+    # verify that API Gateway negotiates gzip for large responses
+    template.has_resource_properties('AWS::ApiGateway::RestApi', {'MinimumCompressionSize': 1024})
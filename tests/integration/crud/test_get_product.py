@@ -28,9 +28,8 @@ def test_handler_200_ok(add_product_entry_to_db: Product):
 def test_internal_server_error(table_name):
     # GIVEN a DynamoDB exception scenario
     db_handler: DynamoDbHandler = DynamoDbHandler(table_name)
-    table = db_handler._get_table(table_name)
 
-    with Stubber(table.meta.client) as stubber:
+    with Stubber(db_handler.client) as stubber:
         # WHEN attempting to get a product while the DynamoDB exception is triggered
         stubber.add_client_error(method='get_item', service_error_code='ValidationException')
         product_id = generate_product_id()
@@ -81,3 +80,66 @@ def test_handler_bad_request_invalid_product_id():
     assert response['statusCode'] == HTTPStatus.BAD_REQUEST
     body_dict = json.loads(response['body'])
     assert body_dict['error'] == 'invalid input'
+
+
+def test_handler_200_ok_with_fields(add_product_entry_to_db: Product):
+    # GIVEN a product entry in the database
+    product_id = add_product_entry_to_db.id
+
+    # WHEN requesting only the product price
+    event = generate_product_api_gw_event(
+        http_method=HTTPMethod.GET, product_id=product_id, path_params={'product': product_id}, query_params={'fields': 'price'}
+    )
+    response = lambda_handler(event, generate_context())
+
+    # THEN the response should return OK (HTTP 200) and contain only the requested field
+    assert response['statusCode'] == HTTPStatus.OK
+    body_dict = json.loads(response['body'])
+    assert body_dict == {'price': add_product_entry_to_db.price}
+
+
+def test_handler_bad_request_invalid_fields(add_product_entry_to_db: Product):
+    # GIVEN a product entry in the database
+    product_id = add_product_entry_to_db.id
+
+    # WHEN requesting a field that is not part of the product output
+    event = generate_product_api_gw_event(
+        http_method=HTTPMethod.GET, product_id=product_id, path_params={'product': product_id}, query_params={'fields': 'created_at'}
+    )
+    response = lambda_handler(event, generate_context())
+
+    # THEN the response should indicate bad request due to invalid input (HTTP 400 Bad Request)
+    assert response['statusCode'] == HTTPStatus.BAD_REQUEST
+    body_dict = json.loads(response['body'])
+    assert body_dict['error'] == 'invalid input'
+
+
+def test_handler_304_not_modified(add_product_entry_to_db: Product):
+    # GIVEN a product entry in the database and its current ETag
+    product_id = add_product_entry_to_db.id
+    event = generate_product_api_gw_event(http_method=HTTPMethod.GET, product_id=product_id, path_params={'product': product_id})
+    etag = lambda_handler(event, generate_context())['multiValueHeaders']['ETag'][0]
+
+    # WHEN requesting the product again with the ETag in If-None-Match
+    event['headers']['If-None-Match'] = etag
+    response = lambda_handler(event, generate_context())
+
+    # THEN the response should indicate the product was not modified (HTTP 304) without a body
+    assert response['statusCode'] == HTTPStatus.NOT_MODIFIED
+    assert not response['body']
+    assert response['multiValueHeaders']['ETag'] == [etag]
+
+
+def test_handler_200_ok_stale_etag(add_product_entry_to_db: Product):
+    # GIVEN a product entry in the database and a stale ETag
+    product_id = add_product_entry_to_db.id
+    event = generate_product_api_gw_event(http_method=HTTPMethod.GET, product_id=product_id, path_params={'product': product_id})
+    event['headers']['If-None-Match'] = '"stale"'
+
+    # WHEN requesting the product with the stale ETag
+    response = lambda_handler(event, generate_context())
+
+    # THEN the response should return OK (HTTP 200) with the product
+    assert response['statusCode'] == HTTPStatus.OK
+    response_entry = GetProductOutput.model_validate_json(response['body'])
+    assert response_entry.model_dump() == add_product_entry_to_db.model_dump()
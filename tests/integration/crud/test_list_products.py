@@ -1,3 +1,4 @@
+import json
 from http import HTTPStatus
 
 from botocore.stub import Stubber
@@ -26,6 +27,62 @@ def test_handler_200_ok(add_product_entry_to_db: Product):
     assert products[0].model_dump() == add_product_entry_to_db.model_dump()
 
 
+def test_handler_200_ok_with_fields(add_product_entry_to_db: Product):
+    # GIVEN a product entry in the database
+    event = generate_api_gw_list_products_event(query_params={'fields': 'id,price'})
+
+    # WHEN listing only the product ids and prices
+    response = lambda_handler(event, generate_context())
+
+    # THEN the response should return OK (HTTP 200)
+    # AND contain exactly one product with only the requested fields
+    assert response['statusCode'] == HTTPStatus.OK
+    body_dict = json.loads(response['body'])
+    assert body_dict['products'] == [{'id': add_product_entry_to_db.id, 'price': add_product_entry_to_db.price}]
+
+
+def test_handler_200_ok_with_price_and_name_filter(add_product_entry_to_db: Product):
+    # GIVEN a product entry in the database
+    event = generate_api_gw_list_products_event(
+        query_params={'min_price': str(add_product_entry_to_db.price), 'name_prefix': add_product_entry_to_db.name[:2]}
+    )
+
+    # WHEN listing products filtered by price range and name prefix
+    response = lambda_handler(event, generate_context())
+
+    # THEN the response should return OK (HTTP 200) and contain the matching product
+    assert response['statusCode'] == HTTPStatus.OK
+    response_entry = ListProductsOutput.model_validate_json(response['body'])
+    assert [product.model_dump() for product in response_entry.products] == [add_product_entry_to_db.model_dump()]
+
+
+def test_handler_200_ok_with_filter_no_match(add_product_entry_to_db: Product):
+    # GIVEN a product entry in the database
+    event = generate_api_gw_list_products_event(query_params={'min_price': str(add_product_entry_to_db.price + 1)})
+
+    # WHEN listing products above the product price
+    response = lambda_handler(event, generate_context())
+
+    # THEN the response should return OK (HTTP 200) and an empty product list
+    assert response['statusCode'] == HTTPStatus.OK
+    response_entry = ListProductsOutput.model_validate_json(response['body'])
+    assert not response_entry.products
+
+
+def test_handler_304_not_modified(add_product_entry_to_db: Product):
+    # GIVEN a product entry in the database and the current ETag of the product list
+    event = generate_api_gw_list_products_event()
+    etag = lambda_handler(event, generate_context())['multiValueHeaders']['ETag'][0]
+
+    # WHEN listing all products again with the ETag in If-None-Match
+    event['headers']['If-None-Match'] = etag
+    response = lambda_handler(event, generate_context())
+
+    # THEN the response should indicate the product list was not modified (HTTP 304) without a body
+    assert response['statusCode'] == HTTPStatus.NOT_MODIFIED
+    assert not response['body']
+
+
 def test_handler_empty_list(table_name: str):
     # GIVEN an empty product table
     clear_table(table_name)
@@ -45,9 +102,8 @@ def test_handler_empty_list(table_name: str):
 def test_internal_server_error(table_name):
     # GIVEN a DynamoDB exception scenario
     db_handler: DynamoDbHandler = DynamoDbHandler(table_name)
-    table = db_handler._get_table(table_name)
 
-    with Stubber(table.meta.client) as stubber:
+    with Stubber(db_handler.client) as stubber:
         # WHEN attempting to list products while the DynamoDB exception is triggered
         stubber.add_client_error(method='scan', service_error_code='ValidationException')
         event = generate_api_gw_list_products_event()
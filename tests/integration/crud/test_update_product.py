@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+from http import HTTPMethod, HTTPStatus
+from typing import Generator
+
+import boto3
+import pytest
+
+from product.crud.handlers.handle_update_product import lambda_handler
+from product.crud.models.output import UpdateProductOutput
+from product.models.products.product import ProductEntry
+from tests.crud_utils import generate_product_api_gw_event, generate_product_id
+from tests.utils import generate_context
+
+
+@pytest.fixture()
+def product_entry(table_name: str) -> Generator[ProductEntry, None, None]:
+    # each test updates the product, so it gets a fresh copy at version 1
+    product = ProductEntry(id=generate_product_id(), price=1, name='test', created_at=int(datetime.utcnow().timestamp()))
+    table = boto3.resource('dynamodb').Table(table_name)
+    table.put_item(Item=product.model_dump())
+    yield product
+    table.delete_item(Key={'id': product.id})
+
+
+def _update_event(product_id: str, body: dict) -> dict:
+    return generate_product_api_gw_event(http_method=HTTPMethod.PATCH, product_id=product_id, path_params={'product': product_id}, body=body)
+
+
+def test_handler_200_ok(product_entry: ProductEntry, table_name: str):
+    # GIVEN a product entry in the database at version 1
+
+    # WHEN updating the product price based on version 1
+    response = lambda_handler(_update_event(product_entry.id, {'price': 5, 'version': 1}), generate_context())
+
+    # THEN the response should return OK (HTTP 200) with only the updated attributes and the new version
+    assert response['statusCode'] == HTTPStatus.OK
+    output = UpdateProductOutput.model_validate_json(response['body'])
+    assert output.model_dump(exclude_none=True) == {'id': product_entry.id, 'price': 5, 'version': 2}
+
+    # AND the stored product is updated while the name is unchanged
+    item = boto3.resource('dynamodb').Table(table_name).get_item(Key={'id': product_entry.id}, ConsistentRead=True)['Item']
+    assert item['name'] == product_entry.name
+    assert item['price'] == 5
+    assert item['version'] == 2
+
+
+def test_handler_409_version_conflict(product_entry: ProductEntry):
+    # GIVEN a product that was already updated to version 2
+    lambda_handler(_update_event(product_entry.id, {'name': 'first', 'version': 1}), generate_context())
+
+    # WHEN updating the product based on the stale version 1
+    response = lambda_handler(_update_event(product_entry.id, {'name': 'second', 'version': 1}), generate_context())
+
+    # THEN the response should indicate a conflict (HTTP 409 Conflict)
+    assert response['statusCode'] == HTTPStatus.CONFLICT
+    body_dict = json.loads(response['body'])
+    assert body_dict['error'] == 'product was modified, fetch the latest version and retry'
+
+
+def test_handler_product_not_found():
+    # GIVEN a valid update request with a non existent product id
+    product_id = generate_product_id()
+
+    # WHEN updating the product
+    response = lambda_handler(_update_event(product_id, {'price': 5, 'version': 1}), generate_context())
+
+    # THEN the response should indicate product not found (HTTP 404 Not Found)
+    assert response['statusCode'] == HTTPStatus.NOT_FOUND
+    body_dict = json.loads(response['body'])
+    assert body_dict['error'] == 'product was not found'
+
+
+def test_handler_bad_request_no_changes():
+    # GIVEN an update request without any updated attributes
+    product_id = generate_product_id()
+
+    # WHEN updating the product
+    response = lambda_handler(_update_event(product_id, {'version': 1}), generate_context())
+
+    # THEN the response should indicate bad request due to invalid input (HTTP 400 Bad Request)
+    assert response['statusCode'] == HTTPStatus.BAD_REQUEST
+    body_dict = json.loads(response['body'])
+    assert body_dict['error'] == 'invalid input'
@@ -0,0 +1,65 @@
+import random
+from collections import Counter
+
+import pytest
+
+from benchmarks.load_generator import ApiRequest, KeySampler, generate_requests, parse_mix, run_open_loop, summarize
+from benchmarks.utils import percentile
+
+
+def test_zipf_sampler_prefers_hot_keys():
+    # GIVEN a Zipf sampler over 100 keys
+    keys = [f'key-{idx}' for idx in range(100)]
+    sampler = KeySampler(keys, 'zipf', zipf_exponent=1.1, rng=random.Random(1))
+
+    # WHEN sampling many keys
+    counts = Counter(sampler.sample() for _ in range(10_000))
+
+    # THEN the first key is the hottest, far above its uniform share
+    assert counts.most_common(1)[0][0] == 'key-0'
+    assert counts['key-0'] > 1_000
+    assert set(counts) <= set(keys)
+
+
+def test_generated_requests_follow_the_mix():
+    # GIVEN a mix without deletes
+    rng = random.Random(1)
+    sampler = KeySampler(['key'], 'uniform', zipf_exponent=1.1, rng=rng)
+
+    # WHEN generating requests
+    requests = generate_requests(1_000, parse_mix('create=1,get=3'), sampler, rng)
+
+    # THEN only the requested operations are generated, with create bodies and sampled keys
+    counts = Counter(request.operation for request in requests)
+    assert set(counts) == {'create', 'get'}
+    assert counts['get'] > counts['create']
+    assert all(request.body for request in requests if request.operation == 'create')
+    assert all(request.path == '/api/product/key' for request in requests if request.operation == 'get')
+
+
+def test_unknown_operation_in_mix():
+    # GIVEN a mix with an unsupported operation
+    # WHEN parsing it
+    # THEN it is rejected
+    with pytest.raises(ValueError):
+        parse_mix('get=1,patch=1')
+
+
+def test_open_loop_measures_every_request():
+    # GIVEN a target that fails deletes
+    requests = [ApiRequest('get', 'GET', '/api/product/key'), ApiRequest('delete', 'DELETE', '/api/product/key')] * 10
+
+    # WHEN running the requests open-loop
+    samples, duration_seconds = run_open_loop(requests, lambda request: 500 if request.operation == 'delete' else 200, rate=1_000, concurrency=2)
+    rows = summarize(samples, duration_seconds)
+
+    # THEN every request has a sample, and server errors are counted per operation
+    assert len(samples) == 20
+    assert [row[:4] for row in rows] == [['get', 10, 0, 0], ['delete', 10, 0, 10], ['all', 20, 0, 10]]
+
+
+def test_percentile_nearest_rank():
+    samples = [float(value) for value in range(1, 1001)]
+    assert percentile(samples, 0.5) == 500
+    assert percentile(samples, 0.999) == 999
+    assert percentile([], 0.99) == 0
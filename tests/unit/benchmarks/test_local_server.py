@@ -0,0 +1,57 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from benchmarks.local_server import build_lambda_context, build_rest_api_event, configure_environment, load_app
+from product.crud.integration import get_db_handler_registry
+from tests.crud_utils import generate_product_id
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # the adapter environment is applied through monkeypatch so it doesn't leak to other tests
+    environment = {
+        'POWERTOOLS_SERVICE_NAME': 'Product',
+        'LOG_LEVEL': 'INFO',
+        'POWERTOOLS_IDEMPOTENCY_DISABLED': 'true',
+        'LAMBDA_ENV_MODELER_DISABLE_CACHE': 'true',
+        'TABLE_NAME': 'products',
+        'IDEMPOTENCY_TABLE_NAME': 'idempotency',
+        'DB_BACKEND': 'memory',
+    }
+    for key, value in environment.items():
+        monkeypatch.setenv(key, value)
+    configure_environment('memory')
+    get_db_handler_registry.cache_clear()
+    yield load_app()
+    get_db_handler_registry.cache_clear()
+
+
+def _resolve(app, method: str, path: str, body: dict | None = None) -> dict:
+    event = build_rest_api_event(method, path, {'Content-Type': ['application/json']}, None if body is None else json.dumps(body))
+    return app.resolve(event, build_lambda_context())
+
+
+def test_http_requests_are_resolved_as_api_gateway_events(app):
+    # GIVEN a product id
+    product_id = generate_product_id()
+
+    # WHEN creating, updating and getting the product through adapter built events
+    created = _resolve(app, 'PUT', f'/api/product/{product_id}', {'name': 'apple', 'price': 3})
+    updated = _resolve(app, 'PATCH', f'/api/product/{product_id}/', {'price': 4, 'version': 1})
+    listed = _resolve(app, 'GET', '/api/products?fields=name,price&max_price=10')
+
+    # THEN path and query parameters reach the handlers like they do from API Gateway
+    assert created['statusCode'] == HTTPStatus.OK
+    assert json.loads(updated['body']) == {'id': product_id, 'price': 4, 'version': 2}
+    assert json.loads(listed['body']) == {'products': [{'name': 'apple', 'price': 4}]}
+
+
+def test_unknown_path_is_not_found(app):
+    # GIVEN a path outside of the API resources
+    # WHEN resolving it
+    response = _resolve(app, 'GET', '/api/unknown')
+
+    # THEN the resolver answers not found
+    assert response['statusCode'] == HTTPStatus.NOT_FOUND
@@ -0,0 +1,49 @@
+from collections import Counter
+
+from benchmarks.stream_simulator import OVERSIZED_ATTRIBUTE_BYTES, StreamSimulator
+
+
+def test_sequence_numbers_grow_across_batches():
+    # GIVEN a stream simulator
+    simulator = StreamSimulator(seed=1)
+
+    # WHEN generating consecutive batches
+    records = simulator.generate_batch(500)['Records'] + simulator.generate_batch(500)['Records']
+
+    # THEN sequence numbers are strictly increasing, like within a shard
+    sequence_numbers = [int(record['dynamodb']['SequenceNumber']) for record in records]
+    assert sequence_numbers == sorted(set(sequence_numbers))
+
+
+def test_records_follow_the_table_state():
+    # GIVEN a simulator that repeats keys within batches
+    simulator = StreamSimulator(duplicate_ratio=0.5, seed=1)
+
+    # WHEN generating a batch
+    records = simulator.generate_batch(2_000)['Records']
+
+    # THEN every event type is present, keys repeat, and only existing products are modified or removed
+    assert set(Counter(record['eventName'] for record in records)) == {'INSERT', 'MODIFY', 'REMOVE'}
+    assert len({record['dynamodb']['Keys']['id']['S'] for record in records}) < len(records)
+    existing: set[str] = set()
+    for record in records:
+        product_id = record['dynamodb']['Keys']['id']['S']
+        if record['eventName'] == 'INSERT':
+            assert product_id not in existing and 'OldImage' not in record['dynamodb']
+            existing.add(product_id)
+        else:
+            assert product_id in existing and 'OldImage' in record['dynamodb']
+            if record['eventName'] == 'REMOVE':
+                existing.remove(product_id)
+
+
+def test_oversized_images():
+    # GIVEN a simulator where every image is oversized
+    simulator = StreamSimulator(insert_weight=1, modify_weight=0, remove_weight=0, oversized_ratio=1, seed=1)
+
+    # WHEN generating a batch
+    records = simulator.generate_batch(3)['Records']
+
+    # THEN images carry a large attribute, reflected in the record size
+    assert all(len(record['dynamodb']['NewImage']['description']['S']) == OVERSIZED_ATTRIBUTE_BYTES for record in records)
+    assert all(record['dynamodb']['SizeBytes'] > OVERSIZED_ATTRIBUTE_BYTES for record in records)
@@ -0,0 +1,45 @@
+import boto3
+from botocore.stub import Stubber
+
+from product.crud.cli.backfill_catalog import CatalogBackfill
+from product.crud.cli.rate_limiter import AdaptiveRateLimiter
+from tests.crud_utils import generate_product_id
+
+TABLE_NAME = 'products'
+
+
+def _update_params(product_id: str) -> dict:
+    return {
+        'TableName': TABLE_NAME,
+        'Key': {'id': {'S': product_id}},
+        'UpdateExpression': 'SET catalog = :catalog',
+        'ConditionExpression': 'attribute_exists(id) AND attribute_not_exists(catalog)',
+        'ExpressionAttributeValues': {':catalog': {'S': 'products'}},
+    }
+
+
+def test_backfill_sets_the_catalog_of_products_without_it():
+    # GIVEN a table of two pages of products without catalog, the last one deleted before it is updated
+    client = boto3.client('dynamodb')
+    product_ids = [generate_product_id() for _ in range(3)]
+    scan_params = {
+        'TableName': TABLE_NAME,
+        'Segment': 0,
+        'TotalSegments': 1,
+        'FilterExpression': 'attribute_not_exists(catalog)',
+        'ProjectionExpression': 'id',
+    }
+
+    # WHEN backfilling it
+    with Stubber(client) as stubber:
+        first_page = {'Items': [{'id': {'S': product_id}} for product_id in product_ids[:2]], 'LastEvaluatedKey': {'id': {'S': product_ids[1]}}}
+        stubber.add_response('scan', first_page, scan_params)
+        stubber.add_response('update_item', {}, _update_params(product_ids[0]))
+        stubber.add_response('update_item', {}, _update_params(product_ids[1]))
+        stubber.add_response('scan', {'Items': [{'id': {'S': product_ids[2]}}]}, {**scan_params, 'ExclusiveStartKey': {'id': {'S': product_ids[1]}}})
+        stubber.add_client_error('update_item', 'ConditionalCheckFailedException', expected_params=_update_params(product_ids[2]))
+        updated = CatalogBackfill(client, TABLE_NAME, AdaptiveRateLimiter(target_rate=1_000), total_segments=1).run()
+        stubber.assert_no_pending_responses()
+
+    # THEN the products still without catalog are updated, and the deleted one is skipped
+    assert updated == 2
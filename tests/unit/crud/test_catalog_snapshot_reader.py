@@ -0,0 +1,119 @@
+import json
+from http import HTTPStatus
+from typing import Optional
+
+import pytest
+
+from product.catalog.models import CatalogProduct, CatalogSnapshot
+from product.catalog.object_store import get_catalog_object_store
+from product.catalog.object_store.base import StoredObject
+from product.catalog.object_store.filesystem_object_store import FileSystemObjectStore
+from product.catalog.snapshot import encode_snapshot
+from product.crud.handlers.handle_list_products import lambda_handler
+from product.crud.integration import get_catalog_snapshot_reader, get_db_handler_registry
+from product.crud.integration.catalog_snapshot_reader import CatalogSnapshotReader
+from tests.crud_utils import generate_api_gw_list_products_event, generate_product_id
+from tests.utils import generate_context
+
+SNAPSHOT_KEY = 'catalog/products.json.gz'
+
+
+class CountingStore(FileSystemObjectStore):
+    def __init__(self, root_directory: str):
+        super().__init__(root_directory)
+        self.downloads = 0
+
+    def get_object(self, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        stored_object = super().get_object(key, if_none_match)
+        self.downloads += stored_object is not None
+        return stored_object
+
+
+def _snapshot(*products: CatalogProduct) -> bytes:
+    return encode_snapshot(CatalogSnapshot(version=len(products), products=list(products)))
+
+
+@pytest.fixture
+def snapshot_store(monkeypatch, tmp_path):
+    environment = {
+        'POWERTOOLS_SERVICE_NAME': 'Product',
+        'LOG_LEVEL': 'INFO',
+        'LAMBDA_ENV_MODELER_DISABLE_CACHE': 'true',
+        'TABLE_NAME': 'products',
+        'DB_BACKEND': 'memory',
+        'CATALOG_SNAPSHOT_STORE': 'filesystem',
+        'CATALOG_SNAPSHOT_DIRECTORY': str(tmp_path),
+        'CATALOG_SNAPSHOT_REFRESH_SECONDS': '0',
+    }
+    for key, value in environment.items():
+        monkeypatch.setenv(key, value)
+    caches = [get_db_handler_registry, get_catalog_object_store, get_catalog_snapshot_reader]
+    for cache in caches:
+        cache.cache_clear()
+    yield FileSystemObjectStore(str(tmp_path))
+    for cache in caches:
+        cache.cache_clear()
+
+
+def test_reader_downloads_the_snapshot_only_when_it_changed(tmp_path):
+    # GIVEN a snapshot with one product
+    object_store = CountingStore(str(tmp_path))
+    product = CatalogProduct(id=generate_product_id(), name='apple', price=3)
+    object_store.put_object(SNAPSHOT_KEY, _snapshot(product))
+    reader = CatalogSnapshotReader(object_store, key=SNAPSHOT_KEY, refresh_seconds=0)
+
+    # WHEN listing twice, then again once the stream processor added a product
+    first_listing = reader.get_listing()
+    assert reader.get_listing() is first_listing
+    object_store.put_object(SNAPSHOT_KEY, _snapshot(product, CatalogProduct(id=generate_product_id(), name='pear', price=4)))
+    last_listing = reader.get_listing(fields=['name'])
+
+    # THEN an unchanged snapshot is neither downloaded nor serialized again
+    assert object_store.downloads == 2
+    assert json.loads(first_listing.body) == {'products': [{'id': product.id, 'name': 'apple', 'price': 3, 'version': 1}]}
+    assert json.loads(last_listing.body) == {'products': [{'name': 'apple'}, {'name': 'pear'}]}
+
+
+def test_reader_waits_refresh_seconds_before_checking_the_snapshot(tmp_path):
+    # GIVEN a reader that already read the snapshot
+    object_store = CountingStore(str(tmp_path))
+    object_store.put_object(SNAPSHOT_KEY, _snapshot())
+    reader = CatalogSnapshotReader(object_store, key=SNAPSHOT_KEY, refresh_seconds=60)
+    reader.get_listing()
+
+    # WHEN the snapshot changes within the refresh interval
+    object_store.put_object(SNAPSHOT_KEY, _snapshot(CatalogProduct(id=generate_product_id(), name='apple', price=3)))
+
+    # THEN the cached listing is still served
+    assert json.loads(reader.get_listing().body) == {'products': []}
+
+
+def test_handler_serves_the_snapshot_with_etag(snapshot_store):
+    # GIVEN a snapshot with a product the table doesn't have
+    product = CatalogProduct(id=generate_product_id(), name='apple', price=3)
+    event = generate_api_gw_list_products_event(query_params={})
+    assert json.loads(lambda_handler(event, generate_context())['body']) == {'products': []}
+    snapshot_store.put_object(SNAPSHOT_KEY, _snapshot(product))
+
+    # WHEN listing products, then again with the ETag of the listing
+    response = lambda_handler(event, generate_context())
+    event['headers']['If-None-Match'] = response['multiValueHeaders']['ETag'][0]
+    not_modified = lambda_handler(event, generate_context())
+
+    # THEN the listing comes from the snapshot, and clients holding it get a 304 without a body
+    assert response['statusCode'] == HTTPStatus.OK
+    assert json.loads(response['body']) == {'products': [product.model_dump()]}
+    assert not_modified['statusCode'] == HTTPStatus.NOT_MODIFIED
+    assert not not_modified['body']
+
+
+def test_handler_queries_the_table_for_filtered_listings(snapshot_store):
+    # GIVEN a snapshot with a product the table doesn't have
+    snapshot_store.put_object(SNAPSHOT_KEY, _snapshot(CatalogProduct(id=generate_product_id(), name='apple', price=3)))
+
+    # WHEN listing products filtered by price
+    response = lambda_handler(generate_api_gw_list_products_event(query_params={'max_price': '10'}), generate_context())
+
+    # THEN the table secondary indexes are queried instead
+    assert response['statusCode'] == HTTPStatus.OK
+    assert json.loads(response['body']) == {'products': []}
@@ -0,0 +1,175 @@
+import json
+from http import HTTPMethod, HTTPStatus
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from product.crud.handlers.handle_get_product import lambda_handler
+from product.crud.integration.circuit_breaker import CircuitBreaker, CircuitState
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.models.exceptions import InternalServerException, ServiceUnavailableException
+from tests.crud_utils import generate_product_api_gw_event
+from tests.utils import generate_context
+
+TABLE_NAME = 'products'
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _build_circuit_breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(failure_rate=0.5, min_calls=4, window_seconds=10, open_seconds=5, half_open_calls=2, clock=clock)
+
+
+def test_circuit_opens_on_the_failure_rate():
+    # GIVEN a closed circuit breaker
+    clock = FakeClock()
+    circuit_breaker = _build_circuit_breaker(clock)
+
+    # WHEN 2 calls out of 3 fail, then a 4th call fails
+    for failed in (True, False, True):
+        circuit_breaker.before_call()
+        circuit_breaker.record(failed=failed)
+    assert circuit_breaker.state == CircuitState.CLOSED
+    circuit_breaker.before_call()
+    circuit_breaker.record(failed=True)
+
+    # THEN the circuit only opens once enough calls were made, and calls fail fast until it probes again
+    assert circuit_breaker.state == CircuitState.OPEN
+    clock.now = 3.5
+    with pytest.raises(ServiceUnavailableException) as exc_info:
+        circuit_breaker.before_call()
+    assert exc_info.value.retry_after_seconds == 2
+
+
+def test_failures_out_of_the_window_are_forgotten():
+    # GIVEN a closed circuit breaker that saw 3 failures
+    clock = FakeClock()
+    circuit_breaker = _build_circuit_breaker(clock)
+    for _ in range(3):
+        circuit_breaker.record(failed=True)
+
+    # WHEN a 4th call fails after the window
+    clock.now = 11
+    circuit_breaker.record(failed=True)
+
+    # THEN the circuit stays closed
+    assert circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_circuit_probes_before_closing():
+    # GIVEN an open circuit breaker
+    clock = FakeClock()
+    circuit_breaker = _build_circuit_breaker(clock)
+    for _ in range(4):
+        circuit_breaker.record(failed=True)
+
+    # WHEN the open period is over and a probe fails
+    clock.now = 5
+    circuit_breaker.before_call()
+    circuit_breaker.record(failed=True)
+
+    # THEN the circuit opens again
+    assert circuit_breaker.state == CircuitState.OPEN
+
+    # WHEN the next open period is over
+    clock.now = 10
+    circuit_breaker.before_call()
+    circuit_breaker.before_call()
+
+    # THEN only 2 probes are let through at once, and the circuit closes once they succeed
+    with pytest.raises(ServiceUnavailableException):
+        circuit_breaker.before_call()
+    circuit_breaker.record(failed=False)
+    circuit_breaker.record(failed=False)
+    assert circuit_breaker.state == CircuitState.CLOSED
+    circuit_breaker.before_call()
+
+
+def test_throttled_calls_open_the_circuit(product_id):
+    # GIVEN a DynamoDB handler, and a table throttling every call
+    clock = FakeClock()
+    db_handler = DynamoDbHandler(TABLE_NAME, client=boto3.client('dynamodb'), circuit_breaker=_build_circuit_breaker(clock))
+
+    with Stubber(db_handler.client) as stubber:
+        for _ in range(4):
+            stubber.add_client_error('delete_item', service_error_code='ProvisionedThroughputExceededException', http_status_code=400)
+
+        # WHEN deleting products until the circuit opens
+        for _ in range(4):
+            with pytest.raises(InternalServerException):
+                db_handler.delete_product(product_id)
+
+        # THEN the next call fails fast, without calling DynamoDB
+        with pytest.raises(ServiceUnavailableException):
+            db_handler.delete_product(product_id)
+        stubber.assert_no_pending_responses()
+
+
+def test_every_breaker_of_a_client_records_its_calls_once(product_id):
+    # GIVEN two handlers sharing a client and a breaker, and a third handler of the client with a breaker of its own
+    client = boto3.client('dynamodb')
+    shared_breaker, own_breaker = _build_circuit_breaker(FakeClock()), _build_circuit_breaker(FakeClock())
+    db_handler = DynamoDbHandler(TABLE_NAME, client=client, circuit_breaker=shared_breaker)
+    DynamoDbHandler('other', client=client, circuit_breaker=shared_breaker)
+    DynamoDbHandler('another', client=client, circuit_breaker=own_breaker)
+
+    with Stubber(client) as stubber:
+        for _ in range(4):
+            stubber.add_client_error('delete_item', service_error_code='ProvisionedThroughputExceededException', http_status_code=400)
+
+        # WHEN half the calls the breakers need are throttled, then the other half
+        for _ in range(2):
+            with pytest.raises(InternalServerException):
+                db_handler.delete_product(product_id)
+        states = (shared_breaker.state, own_breaker.state)
+        for _ in range(2):
+            with pytest.raises(InternalServerException):
+                db_handler.delete_product(product_id)
+
+    # THEN each breaker recorded every call once, both open together
+    assert states == (CircuitState.CLOSED, CircuitState.CLOSED)
+    assert (shared_breaker.state, own_breaker.state) == (CircuitState.OPEN, CircuitState.OPEN)
+
+
+def test_not_found_products_dont_open_the_circuit(product_id):
+    # GIVEN a DynamoDB handler
+    db_handler = DynamoDbHandler(TABLE_NAME, client=boto3.client('dynamodb'), circuit_breaker=_build_circuit_breaker(FakeClock()))
+
+    with Stubber(db_handler.client) as stubber:
+        for _ in range(4):
+            stubber.add_client_error('update_item', service_error_code='ValidationException', http_status_code=400)
+
+        # WHEN calls fail with client errors
+        for _ in range(4):
+            with pytest.raises(ClientError):
+                db_handler.client.update_item(TableName=TABLE_NAME, Key={'id': {'S': product_id}})
+
+    # THEN they are answers from DynamoDB, the circuit stays closed
+    assert db_handler.circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_open_circuit_returns_a_503_with_retry_after(monkeypatch, product_id):
+    # GIVEN the get product handler, and an open circuit for 5 more seconds
+    for key, value in {'POWERTOOLS_SERVICE_NAME': 'Product', 'LOG_LEVEL': 'INFO', 'TABLE_NAME': TABLE_NAME}.items():
+        monkeypatch.setenv(key, value)
+    circuit_breaker = _build_circuit_breaker(FakeClock())
+    for _ in range(4):
+        circuit_breaker.record(failed=True)
+    db_handler = DynamoDbHandler(TABLE_NAME, client=boto3.client('dynamodb'), circuit_breaker=circuit_breaker)
+    monkeypatch.setattr('product.crud.domain_logic.get_product.get_db_handler', lambda table_name: db_handler)
+
+    # WHEN getting a product
+    response = lambda_handler(generate_product_api_gw_event(product_id, HTTPMethod.GET, path_params={'product': product_id}), generate_context())
+
+    # THEN the request is shed with a 503, telling when to retry
+    assert response['statusCode'] == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response['multiValueHeaders']['Retry-After'] == ['5']
+    assert json.loads(response['body']) == {'error': 'service unavailable, retry later'}
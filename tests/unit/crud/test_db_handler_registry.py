@@ -0,0 +1,89 @@
+import pytest
+
+from product.crud.integration import db_handler_registry
+from product.crud.integration.db_handler import DbHandler
+from product.crud.integration.db_handler_registry import DbHandlerRegistry
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.integration.in_memory_db_handler import InMemoryDbHandler
+from product.crud.models.product import Product
+from tests.crud_utils import generate_product_id
+
+
+def _create_in_memory_handler(backend: str, table_name: str) -> DbHandler:
+    return InMemoryDbHandler(table_name)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(db_handler_registry.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_handlers_are_kept_per_backend_and_table():
+    # GIVEN a registry
+    registry = DbHandlerRegistry(factory=_create_in_memory_handler, max_size=10, max_idle_seconds=60)
+
+    # WHEN getting handlers for several tables and backends
+    tenant_a = registry.get('memory', 'tenant-a')
+    tenant_b = registry.get('memory', 'tenant-b')
+
+    # THEN every table gets its own handler, reused on the next calls
+    assert tenant_a is not tenant_b
+    assert tenant_a.table_name == 'tenant-a'
+    assert registry.get('memory', 'tenant-a') is tenant_a
+    assert registry.get('sqlite', 'tenant-a') is not tenant_a
+    assert len(registry) == 3
+
+
+def test_least_recently_used_handler_is_evicted(clock):
+    # GIVEN a full registry where tenant-a was used after tenant-b
+    registry = DbHandlerRegistry(factory=_create_in_memory_handler, max_size=2, max_idle_seconds=60)
+    tenant_a = registry.get('dynamodb', 'tenant-a')
+    registry.get('dynamodb', 'tenant-b')
+    registry.get('dynamodb', 'tenant-a')
+
+    # WHEN a third tenant comes in
+    registry.get('dynamodb', 'tenant-c')
+
+    # THEN the least recently used tenant is evicted
+    assert ('dynamodb', 'tenant-b') not in registry
+    assert registry.get('dynamodb', 'tenant-a') is tenant_a
+
+
+def test_idle_handlers_are_evicted(clock):
+    # GIVEN a registry with a tenant that has been idle for too long
+    registry = DbHandlerRegistry(factory=_create_in_memory_handler, max_size=10, max_idle_seconds=60)
+    idle_tenant = registry.get('dynamodb', 'idle')
+    clock[0] += 30
+    registry.get('dynamodb', 'active')
+    clock[0] += 31
+
+    # WHEN another tenant is used
+    registry.get('dynamodb', 'active')
+
+    # THEN the idle tenant is evicted, and a new handler is created when it comes back
+    assert ('dynamodb', 'idle') not in registry
+    assert registry.get('dynamodb', 'idle') is not idle_tenant
+
+
+def test_in_memory_handlers_are_never_evicted(clock):
+    # GIVEN a full registry with an in-memory table holding a product, idle for too long
+    registry = DbHandlerRegistry(factory=_create_in_memory_handler, max_size=1, max_idle_seconds=60)
+    in_memory = registry.get('memory', 'tenant-a')
+    in_memory.create_product(Product(id=generate_product_id(), name='test', price=5))
+    clock[0] += 61
+
+    # WHEN another tenant comes in
+    registry.get('dynamodb', 'tenant-b')
+
+    # THEN the in-memory handler and its products are kept
+    assert registry.get('memory', 'tenant-a') is in_memory
+    assert ('dynamodb', 'tenant-b') in registry
+
+
+def test_dynamodb_handlers_share_one_client():
+    # GIVEN DynamoDB handlers of two tables
+    # WHEN comparing their clients
+    # THEN they share one client and its connection pool
+    assert DynamoDbHandler('tenant-a').client is DynamoDbHandler('tenant-b').client
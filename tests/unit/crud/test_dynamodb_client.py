@@ -0,0 +1,55 @@
+import boto3
+from botocore.stub import Stubber
+
+from product.crud.handlers.models.env_vars import DynamoDbClientVars
+from product.crud.integration.dynamodb_client import DYNAMODB_STAGE, build_dynamodb_config, get_dynamodb_client, register_call_timer
+from product.observability import stage_timer
+
+
+def test_dynamodb_config_from_env_vars():
+    # GIVEN client settings overriding the defaults
+    env_vars = DynamoDbClientVars(
+        DYNAMODB_MAX_POOL_CONNECTIONS=5,
+        DYNAMODB_TCP_KEEPALIVE=False,
+        DYNAMODB_CONNECT_TIMEOUT_SECONDS=0.5,
+        DYNAMODB_READ_TIMEOUT_SECONDS=1.5,
+        DYNAMODB_MAX_ATTEMPTS=4,
+    )
+
+    # WHEN building the botocore config
+    config = build_dynamodb_config(env_vars)
+
+    # THEN every setting is applied, with adaptive retries
+    assert config.max_pool_connections == 5
+    assert config.tcp_keepalive is False
+    assert config.connect_timeout == 0.5
+    assert config.read_timeout == 1.5
+    assert config.retries == {'mode': 'adaptive', 'max_attempts': 4}
+
+
+def test_dynamodb_client_is_shared():
+    # GIVEN the default client settings
+    # WHEN getting the dynamodb client twice
+    # THEN the same client, and with it the same connection pool, is returned
+    assert get_dynamodb_client() is get_dynamodb_client()
+
+
+def test_dynamodb_calls_are_timed():
+    # GIVEN a client with the call timer, answering one call and failing the next one
+    client = boto3.client('dynamodb')
+    register_call_timer(client)
+    stage_timer.durations_ms.clear()
+    with Stubber(client) as stubber:
+        stubber.add_response('delete_item', {}, {'TableName': 'products', 'Key': {'id': {'S': 'id'}}})
+        stubber.add_client_error('delete_item', service_error_code='ProvisionedThroughputExceededException', http_status_code=400)
+
+        # WHEN calling DynamoDB
+        client.delete_item(TableName='products', Key={'id': {'S': 'id'}})
+        first_call_ms = stage_timer.durations_ms[DYNAMODB_STAGE]
+        try:
+            client.delete_item(TableName='products', Key={'id': {'S': 'id'}})
+        except client.exceptions.ProvisionedThroughputExceededException:
+            pass
+
+    # THEN both calls are added to the DynamoDb stage of the invocation
+    assert stage_timer.durations_ms.pop(DYNAMODB_STAGE) > first_call_ms > 0
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+from product.crud.handlers.utils.etag import ETAG_HEADER, build_conditional_response, compute_etag, etag_matches
+from product.crud.models.output import GetPartialProductOutput, GetProductOutput
+
+
+def test_etag_is_stable_for_same_body():
+    # GIVEN the same serialized body twice
+    # WHEN computing its ETag
+    # THEN the ETag should be identical and quoted
+    etag = compute_etag('{"id":"1"}')
+    assert etag == compute_etag('{"id":"1"}')
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_etag_changes_with_body():
+    # GIVEN two different serialized bodies
+    # WHEN computing their ETags
+    # THEN the ETags should differ
+    assert compute_etag('{"price":1}') != compute_etag('{"price":2}')
+
+
+@pytest.mark.parametrize(
+    'if_none_match, expected',
+    [
+        (None, False),  # no conditional header
+        ('', False),  # empty conditional header
+        ('"abc"', True),  # exact match
+        ('W/"abc"', True),  # weak comparison
+        ('"other", "abc"', True),  # list of ETags
+        ('*', True),  # any representation
+        ('"other"', False),  # stale ETag
+    ],
+)
+def test_etag_matches(if_none_match, expected):
+    # GIVEN an If-None-Match header value
+    # WHEN comparing it with the current ETag
+    # THEN it should match according to weak comparison
+    assert etag_matches(if_none_match, '"abc"') == expected
+
+
+def test_conditional_response_returns_body_and_etag(product_id):
+    # GIVEN a product output and no conditional header
+    output = GetProductOutput(id=product_id, name='test', price=5)
+
+    # WHEN building the response
+    response = build_conditional_response(output=output, if_none_match=None)
+
+    # THEN the body and its ETag should be returned
+    assert response.status_code == HTTPStatus.OK
+    assert response.body == output.model_dump_json()
+    assert response.headers[ETAG_HEADER] == compute_etag(output.model_dump_json())
+
+
+def test_conditional_response_returns_not_modified(product_id):
+    # GIVEN a partial product output and a matching conditional header
+    output = GetPartialProductOutput(price=5)
+    etag = compute_etag(output.model_dump_json(exclude_none=True))
+
+    # WHEN building the response
+    response = build_conditional_response(output=output, if_none_match=etag)
+
+    # THEN a 304 without a body should be returned
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.body is None
+    assert response.headers[ETAG_HEADER] == etag
@@ -0,0 +1,178 @@
+import csv
+import gzip
+import io
+import json
+import os
+from typing import Optional
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from product.crud.cli.export_products import ProductsExport, get_checkpoint_path, get_part_path
+from product.crud.cli.product_files import PRODUCT_FILE_FIELDS
+from product.crud.integration.db_handler import DbHandler
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.integration.in_memory_db_handler import InMemoryDbHandler
+from product.crud.integration.models.db import ProductEntriesPage
+from product.crud.integration.sqlite_db_handler import SqliteDbHandler
+from product.crud.models.exceptions import InternalServerException
+from product.crud.models.product import Product
+from tests.crud_utils import generate_product_id
+
+TABLE_NAME = 'products'
+
+
+class FailingDbHandler(InMemoryDbHandler):
+    """Fails the scan once `fail_after` pages were returned, like a crash in the middle of an export."""
+
+    def __init__(self, fail_after: int):
+        super().__init__(TABLE_NAME)
+        self.fail_after = fail_after
+        self.pages = 0
+        # when set, the first page of every segment is empty, like a page whose products were deleted, then it fails
+        self.stalled_segments: Optional[set[int]] = None
+
+    def scan_product_entries(self, segment: int, total_segments: int, exclusive_start_key: Optional[str], limit: int) -> ProductEntriesPage:
+        if self.stalled_segments is not None:
+            if segment in self.stalled_segments:
+                raise InternalServerException('failed to scan products from db')
+            self.stalled_segments.add(segment)
+            return ProductEntriesPage(Items=[], LastEvaluatedKey=exclusive_start_key)
+        with self._lock:
+            self.pages += 1
+            failed = self.pages > self.fail_after
+        if failed:
+            raise InternalServerException('failed to scan products from db')
+        return super().scan_product_entries(segment, total_segments, exclusive_start_key, limit)
+
+
+def _create_products(db_handler: DbHandler, count: int) -> set[str]:
+    product_ids = {generate_product_id() for _ in range(count)}
+    for product_id in product_ids:
+        db_handler.create_product(Product(id=product_id, name='test', price=5))
+    return product_ids
+
+
+def test_sqlite_segments_cover_the_table_once(tmp_path):
+    # GIVEN a sqlite table of 30 products
+    db_handler = SqliteDbHandler(TABLE_NAME, db_path=str(tmp_path / 'products.db'))
+    product_ids = _create_products(db_handler, 30)
+
+    # WHEN scanning it in 3 segments, 4 products per page
+    scanned = []
+    for segment in range(3):
+        last_key = None
+        while True:
+            page = db_handler.scan_product_entries(segment, 3, exclusive_start_key=last_key, limit=4)
+            scanned.extend(entry.id for entry in page.Items)
+            last_key = page.LastEvaluatedKey
+            if last_key is None:
+                break
+
+    # THEN every product is scanned exactly once
+    assert sorted(scanned) == sorted(product_ids)
+
+
+def test_dynamodb_scan_resumes_after_the_last_evaluated_key():
+    # GIVEN a DynamoDB handler and the last evaluated key of a segment
+    db_handler = DynamoDbHandler(TABLE_NAME, client=boto3.client('dynamodb'))
+    last_key, next_key = generate_product_id(), generate_product_id()
+    item = {'id': {'S': next_key}, 'name': {'S': 'test'}, 'price': {'N': '5'}, 'created_at': {'N': '1700000000'}}
+    expected_params = {
+        'TableName': TABLE_NAME,
+        'Segment': 1,
+        'TotalSegments': 4,
+        'Limit': 1,
+        'ExclusiveStartKey': {'id': {'S': last_key}},
+    }
+
+    # WHEN scanning the next page of the segment
+    with Stubber(db_handler.client) as stubber:
+        stubber.add_response('scan', {'Items': [item], 'LastEvaluatedKey': {'id': {'S': next_key}}}, expected_params)
+        page = db_handler.scan_product_entries(1, 4, exclusive_start_key=last_key, limit=1)
+
+    # THEN the page holds the decoded products and the key to go on from
+    assert [entry.id for entry in page.Items] == [next_key]
+    assert page.LastEvaluatedKey == next_key
+
+
+def test_export_writes_a_gzipped_csv_and_cleans_up(tmp_path):
+    # GIVEN a table of 25 products
+    db_handler = InMemoryDbHandler(TABLE_NAME)
+    product_ids = _create_products(db_handler, 25)
+    output_path = str(tmp_path / 'products.csv.gz')
+
+    # WHEN exporting it gzipped as CSV, in 3 segments of 4 products per page
+    exported = ProductsExport(db_handler, TABLE_NAME, output_path, file_format='csv', compress=True, total_segments=3, page_size=4).run()
+
+    # THEN every product is exported once after a single header, and only the output is left
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(open(output_path, 'rb').read()).decode())))
+    assert exported == 25
+    assert sorted(row['id'] for row in rows) == sorted(product_ids)
+    assert list(rows[0]) == PRODUCT_FILE_FIELDS
+    assert os.listdir(tmp_path) == ['products.csv.gz']
+
+
+def test_interrupted_export_resumes_from_its_checkpoint(tmp_path):
+    # GIVEN an export of 40 products that failed after 5 pages
+    db_handler = FailingDbHandler(fail_after=5)
+    product_ids = _create_products(db_handler, 40)
+    output_path = str(tmp_path / 'products.ndjson')
+    with pytest.raises(InternalServerException):
+        ProductsExport(db_handler, TABLE_NAME, output_path, file_format='ndjson', total_segments=2, page_size=3).run()
+    assert os.path.exists(get_checkpoint_path(output_path))
+    # a page written after the last checkpoint, before the crash
+    with open(get_part_path(output_path, 0), 'ab') as part_file:
+        part_file.write(b'{"id": "half written')
+
+    # WHEN running the same export again
+    db_handler.fail_after = 1_000
+    export = ProductsExport(db_handler, TABLE_NAME, output_path, file_format='ndjson', total_segments=2, page_size=3)
+    resumed_from = export.progress.exported
+    exported = export.run()
+
+    # THEN it goes on from the saved keys, and every product is exported exactly once
+    with open(output_path) as output_file:
+        exported_ids = [json.loads(line)['id'] for line in output_file]
+    assert 0 < resumed_from < 40
+    assert exported == 40
+    assert sorted(exported_ids) == sorted(product_ids)
+
+
+def test_resumed_export_checkpoints_the_truncated_part_files(tmp_path):
+    # GIVEN an export of 40 products that failed after 5 pages, with a page written after its last checkpoint
+    db_handler = FailingDbHandler(fail_after=5)
+    product_ids = _create_products(db_handler, 40)
+    output_path = str(tmp_path / 'products.ndjson')
+    with pytest.raises(InternalServerException):
+        ProductsExport(db_handler, TABLE_NAME, output_path, file_format='ndjson', total_segments=2, page_size=3).run()
+    with open(get_part_path(output_path, 0), 'ab') as part_file:
+        part_file.write(b'{"id": "half written')
+
+    # WHEN it is resumed, gets an empty page of every segment and fails, then is resumed again
+    db_handler.stalled_segments = set()
+    with pytest.raises(InternalServerException):
+        ProductsExport(db_handler, TABLE_NAME, output_path, file_format='ndjson', total_segments=2, page_size=3).run()
+    db_handler.stalled_segments = None
+    db_handler.fail_after = 1_000
+    ProductsExport(db_handler, TABLE_NAME, output_path, file_format='ndjson', total_segments=2, page_size=3).run()
+
+    # THEN the empty pages saved the size of the truncated part files, and every product is exported once
+    with open(output_path) as output_file:
+        exported_ids = [json.loads(line)['id'] for line in output_file]
+    assert sorted(exported_ids) == sorted(product_ids)
+
+
+def test_checkpoint_of_other_options_is_not_resumed(tmp_path):
+    # GIVEN a checkpoint of an interrupted NDJSON export
+    db_handler = FailingDbHandler(fail_after=1)
+    _create_products(db_handler, 10)
+    output_path = str(tmp_path / 'products')
+    with pytest.raises(InternalServerException):
+        ProductsExport(db_handler, TABLE_NAME, output_path, file_format='ndjson', total_segments=2, page_size=2).run()
+
+    # WHEN exporting to the same output as CSV
+    # THEN the export refuses to mix both formats
+    with pytest.raises(ValueError):
+        ProductsExport(db_handler, TABLE_NAME, output_path, file_format='csv', total_segments=2, page_size=2)
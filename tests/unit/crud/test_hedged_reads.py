@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+from http import HTTPMethod, HTTPStatus
+
+import boto3
+import pytest
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from botocore.awsrequest import AWSResponse
+from botocore.stub import Stubber
+
+from product.crud.handlers.handle_get_product import lambda_handler
+from product.crud.integration.deadline import deadline_scope
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.integration.dynamodb_client import DYNAMODB_STAGE, register_call_timer, register_deadline_check
+from product.crud.integration.hedged_reader import HedgedReader
+from product.crud.models.exceptions import DeadlineExceededException
+from product.observability import stage_timer
+from tests.crud_utils import generate_product_api_gw_event
+from tests.utils import generate_context
+
+TABLE_NAME = 'products'
+
+
+class ShortLivedContext(LambdaContext):
+    def get_remaining_time_in_millis(self) -> int:  # type: ignore[override]
+        return 600  # a deadline of 100 ms after the safety margin
+
+
+@pytest.fixture
+def released():
+    # reads blocked on the event are released when the test ends, so no worker outlives it
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_hedge_answers_for_a_slow_primary(released):
+    # GIVEN a reader hedging after 10 ms, and a primary read stuck on a slow replica
+    reader = HedgedReader(hedge_reads=True, hedge_delay_ms=10, max_workers=4)
+
+    def slow_primary() -> str:
+        released.wait(5)
+        return 'primary'
+
+    # WHEN reading
+    started_at = time.perf_counter()
+    result = reader.read(primary=slow_primary, hedge=lambda: 'hedge')
+
+    # THEN the hedge's answer is returned right after the hedge delay
+    assert result == 'hedge'
+    assert time.perf_counter() - started_at < 1
+
+
+def test_stale_hedge_answer_waits_for_the_primary():
+    # GIVEN a primary read answering after the hedge delay, and a hedge that didn't find the item
+    reader = HedgedReader(hedge_reads=True, hedge_delay_ms=1, max_workers=4)
+
+    def primary() -> dict:
+        time.sleep(0.05)
+        return {'Item': 'found'}
+
+    # WHEN reading
+    result = reader.read(primary=primary, hedge=lambda: {}, accept_hedge=lambda response: 'Item' in response)
+
+    # THEN the primary's answer is returned
+    assert result == {'Item': 'found'}
+
+
+def test_hedge_answers_for_a_failed_primary(product_id):
+    # GIVEN a DynamoDB get_item failing on the primary after the hedge fired, and a hedge finding the product later
+    client = boto3.client('dynamodb')
+
+    def get_item(params: dict, **kwargs) -> tuple:
+        if json.loads(params['body'])['ConsistentRead']:
+            time.sleep(0.03)
+            error = {'Code': 'InternalServerError', 'Message': 'internal server error'}
+            return AWSResponse(None, 500, {}, None), {'Error': error, 'ResponseMetadata': {'HTTPStatusCode': 500}}
+        time.sleep(0.06)
+        item = {'id': {'S': product_id}, 'name': {'S': 'product'}, 'price': {'N': '10'}, 'created_at': {'N': '1700000000'}}
+        return AWSResponse(None, 200, {}, None), {'Item': item, 'ResponseMetadata': {'HTTPStatusCode': 200}}
+
+    client.meta.events.register('before-call.dynamodb.GetItem', get_item)
+    db_handler = DynamoDbHandler(TABLE_NAME, client=client, hedged_reader=HedgedReader(hedge_reads=True, hedge_delay_ms=10, max_workers=4))
+
+    # WHEN getting the product
+    product = db_handler.get_product(product_id)
+
+    # THEN the hedge's answer is returned instead of the primary's error
+    assert product.id == product_id
+
+
+def test_hedge_delay_follows_the_primary_p95():
+    # GIVEN a reader that measured enough primary reads, the slowest 5% taking 30 ms
+    reader = HedgedReader(hedge_reads=True, hedge_delay_ms=100, max_workers=1)
+    for index in range(100):
+        reader.latency_tracker.record(0.030 if index >= 95 else 0.005)
+
+    # WHEN getting the hedge delay
+    # THEN it is the measured p95 instead of the configured delay, which only applies to the first reads
+    assert reader.get_hedge_delay_seconds() == 0.005
+    assert HedgedReader(hedge_reads=True, hedge_delay_ms=100, max_workers=1).get_hedge_delay_seconds() == 0.1
+
+
+def test_read_without_hedge_is_a_plain_call():
+    # GIVEN a reader without hedging
+    reader = HedgedReader(hedge_reads=False, hedge_delay_ms=10, max_workers=1)
+
+    # WHEN reading within a deadline
+    with deadline_scope(1):
+        thread = reader.read(primary=threading.current_thread, hedge=threading.current_thread)
+
+    # THEN the primary read runs on the caller's thread
+    assert thread is threading.current_thread()
+
+
+def test_hedged_read_is_abandoned_at_the_deadline(released):
+    # GIVEN a timed client, and a hedged read stuck for longer than the deadline
+    client = boto3.client('dynamodb')
+    register_call_timer(client)
+    client.meta.events.register('before-parameter-build.dynamodb.GetItem', lambda **kwargs: released.wait(5))
+    reader = HedgedReader(hedge_reads=True, hedge_delay_ms=1_000, max_workers=1)
+    stage_timer.durations_ms.clear()
+
+    # WHEN reading with 50 ms left
+    started_at = time.perf_counter()
+    with Stubber(client) as stubber:
+        stubber.add_response('get_item', {})
+        with deadline_scope(0.05), pytest.raises(DeadlineExceededException):
+            reader.read(primary=lambda: client.get_item(TableName=TABLE_NAME, Key={'id': {'S': 'id'}}), hedge=dict)
+        abandoned_ms = (time.perf_counter() - started_at) * 1000
+        # the abandoned call finishes in the background, e.g. after the invocation
+        released.set()
+        reader._executor.shutdown(wait=True)
+
+    # THEN the read is abandoned at the deadline, and the time of its call isn't reported
+    assert abandoned_ms < 1_000
+    assert DYNAMODB_STAGE not in stage_timer.durations_ms
+
+
+def test_calls_are_not_attempted_past_the_deadline():
+    # GIVEN a client with the deadline check
+    client = boto3.client('dynamodb')
+    register_deadline_check(client)
+
+    # WHEN calling it once the deadline is exceeded
+    # THEN the call fails without being sent
+    with deadline_scope(0), pytest.raises(DeadlineExceededException):
+        client.get_item(TableName=TABLE_NAME, Key={'id': {'S': 'id'}})
+
+
+def test_get_product_times_out_with_a_504(monkeypatch, product_id):
+    # GIVEN an invocation with 600 ms left, and a DynamoDB get_item taking 300 ms before it is sent
+    for key, value in {'POWERTOOLS_SERVICE_NAME': 'Product', 'LOG_LEVEL': 'INFO', 'TABLE_NAME': TABLE_NAME}.items():
+        monkeypatch.setenv(key, value)
+    client = boto3.client('dynamodb')
+    client.meta.events.register('before-parameter-build.dynamodb.GetItem', lambda **kwargs: time.sleep(0.3))
+    register_deadline_check(client)
+    db_handler = DynamoDbHandler(TABLE_NAME, client=client, hedged_reader=HedgedReader(hedge_reads=False, hedge_delay_ms=10, max_workers=1))
+    monkeypatch.setattr('product.crud.domain_logic.get_product.get_db_handler', lambda table_name: db_handler)
+    context = ShortLivedContext()
+    context.__dict__.update(generate_context().__dict__)
+
+    # WHEN getting the product
+    response = lambda_handler(generate_product_api_gw_event(product_id, HTTPMethod.GET, path_params={'product': product_id}), context)
+
+    # THEN the call isn't sent past the deadline, and fails before the Lambda timeout with a gateway timeout
+    assert response['statusCode'] == HTTPStatus.GATEWAY_TIMEOUT
+    assert json.loads(response['body']) == {'error': 'request timed out'}
@@ -0,0 +1,41 @@
+import boto3
+from aws_lambda_powertools.utilities.idempotency import IdempotencyConfig, idempotent_function
+from botocore.stub import Stubber
+
+from product.crud.integration.idempotency_layer import IDEMPOTENCY_TABLE_CALLS_METRIC, MeteredDynamoDBPersistenceLayer
+from product.observability import metrics
+
+
+def _count_table_calls(add_metric_spy) -> int:
+    return sum(1 for call in add_metric_spy.call_args_list if call.kwargs['name'] == IDEMPOTENCY_TABLE_CALLS_METRIC)
+
+
+def test_repeated_request_is_answered_from_local_cache(mocker):
+    # GIVEN an idempotent function using the metered persistence layer with a local cache,
+    # and a stubbed idempotency table that only expects the first request's in progress and completed writes
+    client = boto3.client('dynamodb')
+    layer = MeteredDynamoDBPersistenceLayer(table_name='idempotency', boto3_client=client)
+    config = IdempotencyConfig(expires_after_seconds=60, use_local_cache=True, local_cache_max_items=8)
+    add_metric_spy = mocker.spy(metrics, 'add_metric')
+    calls = []
+
+    @idempotent_function(data_keyword_argument='record', config=config, persistence_store=layer)
+    def handle(record: dict) -> dict:
+        calls.append(record)
+        return {'id': record['id']}
+
+    with Stubber(client) as stubber:
+        stubber.add_response(method='put_item', service_response={})
+        stubber.add_response(method='update_item', service_response={})
+
+        # WHEN the same request is handled twice in the same container
+        first = handle(record={'id': '1'})
+        second = handle(record={'id': '1'})
+
+        # THEN the idempotency table is only called for the first request
+        stubber.assert_no_pending_responses()
+
+    assert first == second == {'id': '1'}
+    assert len(calls) == 1
+    # AND every idempotency table round trip is counted
+    assert _count_table_calls(add_metric_spy) == 2
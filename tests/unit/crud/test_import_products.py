@@ -0,0 +1,177 @@
+import json
+import time
+from typing import List
+
+import boto3
+from botocore.stub import Stubber
+
+from product.crud.cli.export_products import ProductsExport
+from product.crud.cli.import_products import ProductsImport, main
+from product.crud.cli.rate_limiter import AdaptiveRateLimiter
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.integration.in_memory_db_handler import InMemoryDbHandler
+from product.crud.integration.product_codec import encode_product_entry
+from product.models.products.product import ProductEntry
+from tests.crud_utils import generate_product_id
+
+TABLE_NAME = 'products'
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class SlowFirstRowsDbHandler(InMemoryDbHandler):
+    """Writes products priced under 1000 after a delay, as if their batches hit a slow partition."""
+
+    def put_product_entries(self, entries: List[ProductEntry]) -> List[ProductEntry]:
+        if any(entry.price < 1000 for entry in entries):
+            time.sleep(0.05)
+        return super().put_product_entries(entries)
+
+
+def _generate_entries(count: int) -> List[ProductEntry]:
+    return [ProductEntry(id=generate_product_id(), name=f'product {index}', price=index + 1, created_at=1700000000) for index in range(count)]
+
+
+def test_import_writes_valid_rows_and_rejects_the_others(tmp_path):
+    # GIVEN an NDJSON file of 60 products, a product without price, a negative price and a line that isn't JSON
+    entries = _generate_entries(60)
+    lines = [entry.model_dump_json() for entry in entries]
+    lines[10:10] = [
+        json.dumps({'id': generate_product_id(), 'name': 'no price', 'created_at': 1}),
+        json.dumps({'id': generate_product_id(), 'name': 'negative', 'price': -1, 'created_at': 1}),
+        '{"id": ',
+    ]
+    input_path = tmp_path / 'products.ndjson'
+    input_path.write_text('\n'.join(lines) + '\n')
+    reject_path = tmp_path / 'rejected.ndjson'
+    db_handler = InMemoryDbHandler(TABLE_NAME)
+
+    # WHEN importing it, validating 7 rows at a time
+    progress = ProductsImport(
+        db_handler, str(input_path), file_format='ndjson', reject_path=str(reject_path), workers=3, rate=100_000, validation_batch_size=7
+    ).run()
+
+    # THEN every valid product is written, and the invalid rows are rejected with their line and errors
+    assert (progress.read, progress.imported, progress.rejected) == (63, 60, 3)
+    assert sorted(db_handler._items.values(), key=lambda entry: entry.id) == sorted(entries, key=lambda entry: entry.id)
+    rejected = [json.loads(line) for line in reject_path.read_text().splitlines()]
+    assert sorted(rejected_row['line'] for rejected_row in rejected) == [11, 12, 13]
+    assert any('price' in error for rejected_row in rejected for error in rejected_row['errors'])
+
+
+def test_names_longer_than_the_api_allows_are_rejected(tmp_path):
+    # GIVEN an NDJSON file of a product named with 20 characters and one with 21, which the API would not return
+    entries = [entry.model_copy(update={'name': name}) for entry, name in zip(_generate_entries(2), ['a' * 20, 'b' * 21], strict=True)]
+    input_path = tmp_path / 'products.ndjson'
+    input_path.write_text(''.join(f'{entry.model_dump_json()}\n' for entry in entries))
+    reject_path = tmp_path / 'rejected.ndjson'
+    db_handler = InMemoryDbHandler(TABLE_NAME)
+
+    # WHEN importing it
+    progress = ProductsImport(db_handler, str(input_path), file_format='ndjson', reject_path=str(reject_path), rate=100_000).run()
+
+    # THEN the longer name is rejected on its line
+    assert (progress.imported, progress.rejected) == (1, 1)
+    assert list(db_handler._items.values()) == entries[:1]
+    rejected = json.loads(reject_path.read_text())
+    assert rejected['line'] == 2
+    assert rejected['errors'][0].startswith('name: ')
+
+
+def test_gzipped_csv_export_imports_back(tmp_path):
+    # GIVEN a gzipped CSV export of a table
+    source = InMemoryDbHandler(TABLE_NAME)
+    entries = _generate_entries(30)
+    source.put_product_entries(entries)
+    export_path = str(tmp_path / 'products.csv.gz')
+    ProductsExport(source, TABLE_NAME, export_path, file_format='csv', compress=True, total_segments=2, page_size=8).run()
+
+    # WHEN importing it into another table that throttles every other write
+    target = InMemoryDbHandler('target', throttle_every=2)
+    progress = ProductsImport(target, export_path, file_format='csv', reject_path=str(tmp_path / 'rejected'), workers=2, rate=100_000).run()
+
+    # THEN throttled batches are retried and the tables are the same
+    assert progress.imported == 30
+    assert progress.throttled > 0
+    assert target._items == source._items
+    assert not (tmp_path / 'rejected').exists()
+
+
+def test_repeated_products_are_imported_in_file_order(tmp_path):
+    # GIVEN an NDJSON file of 100 products, written three times with a new price, so repeats fall in different batches
+    entries = _generate_entries(100)
+    passes = [[entry.model_copy(update={'price': entry.price + 1000 * index}) for entry in entries] for index in range(3)]
+    input_path = tmp_path / 'products.ndjson'
+    input_path.write_text(''.join(f'{entry.model_dump_json()}\n' for entries_pass in passes for entry in entries_pass))
+    db_handler = SlowFirstRowsDbHandler(TABLE_NAME)
+
+    # WHEN importing it with more workers than batches of the first rows, which are written slower than the others
+    ProductsImport(db_handler, str(input_path), file_format='ndjson', reject_path=str(tmp_path / 'rejected'), workers=8, rate=100_000).run()
+
+    # THEN every product holds its last row, like sequential puts
+    assert {entry.id: entry.price for entry in db_handler._items.values()} == {entry.id: entry.price for entry in passes[-1]}
+
+
+def test_unreadable_input_fails_the_import(tmp_path, monkeypatch, capsys):
+    # GIVEN an input file that isn't UTF-8, and an input that doesn't exist
+    input_path = tmp_path / 'products.ndjson'
+    input_path.write_bytes(b'{"name": "\xff"}\n')
+    monkeypatch.setattr('product.crud.cli.import_products.get_db_handler', lambda table_name: InMemoryDbHandler(table_name))
+    monkeypatch.setenv('DYNAMODB_MAX_POOL_CONNECTIONS', '1')  # set by main otherwise, for the tests that follow
+
+    # WHEN importing them
+    for path in (input_path, tmp_path / 'missing.ndjson'):
+        exit_code = main(['--table-name', TABLE_NAME, '--input', str(path), '--progress-seconds', '60'])
+
+        # THEN the import fails with a usage exit code and tells why
+        assert exit_code == 2
+        assert 'import failed' in capsys.readouterr().err
+
+
+def test_unprocessed_items_are_returned_for_retry():
+    # GIVEN a DynamoDB handler and two products, one of them unprocessed by BatchWriteItem
+    db_handler = DynamoDbHandler(TABLE_NAME, client=boto3.client('dynamodb'))
+    entries = _generate_entries(2)
+    requests = [{'PutRequest': {'Item': encode_product_entry(entry)}} for entry in entries]
+
+    # WHEN writing them
+    with Stubber(db_handler.client) as stubber:
+        stubber.add_response('batch_write_item', {'UnprocessedItems': {TABLE_NAME: requests[1:]}}, {'RequestItems': {TABLE_NAME: requests}})
+        unprocessed = db_handler.put_product_entries(entries)
+
+    # THEN both are put with a single call and the unprocessed one is returned
+    assert unprocessed == entries[1:]
+
+
+def test_rate_limiter_backs_off_and_recovers():
+    # GIVEN a limiter of 100 items per second
+    clock = FakeClock()
+    rate_limiter = AdaptiveRateLimiter(target_rate=100, clock=clock, sleep=clock.sleep)
+
+    # WHEN two batches of 50 items are written, then writes are throttled twice at once
+    rate_limiter.acquire(50)
+    rate_limiter.acquire(50)
+    rate_limiter.throttled()
+    rate_limiter.throttled()
+
+    # THEN the second batch waited for its turn, and the concurrent throttling halved the rate once
+    assert clock.sleeps == [0.5]
+    assert rate_limiter.rate == 50
+
+    # WHEN writes succeed again
+    for _ in range(100):
+        rate_limiter.succeeded()
+
+    # THEN the rate grows back up to the target, and no further
+    assert rate_limiter.rate == 100
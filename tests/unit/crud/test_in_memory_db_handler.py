@@ -0,0 +1,95 @@
+import time
+from typing import Generator
+
+import pytest
+
+from product.crud.integration import get_db_handler, get_db_handler_registry
+from product.crud.integration.in_memory_db_handler import InMemoryDbHandler
+from product.crud.models.exceptions import (
+    InternalServerException,
+    ProductAlreadyExistsException,
+    ProductNotFoundException,
+    ProductVersionConflictException,
+)
+from product.crud.models.product import Product, ProductFilter, ProductUpdate
+from tests.crud_utils import generate_product_id
+
+TABLE_NAME = 'products'
+
+
+@pytest.fixture
+def reset_in_memory_handler() -> Generator[None, None, None]:
+    # handlers are kept per table in the registry, every test gets a fresh store and settings
+    get_db_handler_registry.cache_clear()
+    yield
+    get_db_handler_registry.cache_clear()
+
+
+def test_create_get_update_delete(reset_in_memory_handler):
+    # GIVEN an empty in memory handler
+    db_handler = InMemoryDbHandler(TABLE_NAME)
+    product = Product(id=generate_product_id(), name='test', price=5)
+
+    # WHEN creating, updating and deleting a product
+    db_handler.create_product(product)
+    with pytest.raises(ProductAlreadyExistsException):
+        db_handler.create_product(product)
+    updated = db_handler.update_product(product.id, ProductUpdate(price=7, version=1))
+    with pytest.raises(ProductVersionConflictException):
+        db_handler.update_product(product.id, ProductUpdate(price=8, version=1))
+    stored = db_handler.get_product(product.id)
+    db_handler.delete_product(product.id)
+
+    # THEN it behaves like the DynamoDB handler
+    assert updated.model_dump(exclude_none=True) == {'price': 7, 'version': 2}
+    assert stored == Product(id=product.id, name='test', price=7, version=2)
+    with pytest.raises(ProductNotFoundException):
+        db_handler.get_product(product.id)
+    with pytest.raises(ProductNotFoundException):
+        db_handler.update_product(product.id, ProductUpdate(price=8, version=2))
+
+
+def test_query_and_projection(reset_in_memory_handler):
+    # GIVEN an in memory handler with three products
+    db_handler = InMemoryDbHandler(TABLE_NAME)
+    for name, price in [('banana', 5), ('apple', 3), ('avocado', 9)]:
+        db_handler.create_product(Product(id=generate_product_id(), name=name, price=price))
+
+    # WHEN querying by price range and by name prefix, and listing a projection
+    by_price = db_handler.query_products(ProductFilter(min_price=3, max_price=5))
+    by_name = db_handler.query_products(ProductFilter(name_prefix='a', max_price=5))
+    names = db_handler.list_partial_products(fields=['name'])
+
+    # THEN results are filtered and ordered like the secondary indexes
+    assert [product.name for product in by_price] == ['apple', 'banana']
+    assert [product.name for product in by_name] == ['apple']
+    assert sorted(product.model_dump(exclude_none=True)['name'] for product in names) == ['apple', 'avocado', 'banana']
+
+
+def test_injected_latency_and_throttling(reset_in_memory_handler):
+    # GIVEN an in memory handler with 20ms latency that throttles every second operation
+    db_handler = InMemoryDbHandler(TABLE_NAME, latency_ms=20, throttle_every=2)
+
+    # WHEN running two operations
+    start = time.perf_counter()
+    db_handler.list_products()
+    # THEN the second one is throttled
+    with pytest.raises(InternalServerException):
+        db_handler.list_products()
+
+    # AND every operation waited for the injected latency
+    assert time.perf_counter() - start >= 0.04
+
+
+def test_get_db_handler_selects_backend_by_env_var(reset_in_memory_handler, monkeypatch):
+    # GIVEN the in memory backend selected by environment variables
+    monkeypatch.setenv('LAMBDA_ENV_MODELER_DISABLE_CACHE', 'true')
+    monkeypatch.setenv('DB_BACKEND', 'memory')
+    monkeypatch.setenv('IN_MEMORY_DB_LATENCY_MS', '5')
+
+    # WHEN getting the db handler
+    db_handler = get_db_handler(TABLE_NAME)
+
+    # THEN the configured in memory handler is returned
+    assert isinstance(db_handler, InMemoryDbHandler)
+    assert db_handler.latency_ms == 5
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from pydantic import ValidationError
+
+from product.crud.integration.product_codec import decode_product_item, encode_product_entry
+from product.models.products.product import ProductEntry
+
+
+def test_encode_matches_generic_serializer(product_id):
+    # GIVEN a product entry
+    entry = ProductEntry(id=product_id, name='test', price=5, created_at=1700000000, version=3)
+
+    # WHEN encoding it with the product codec
+    item = encode_product_entry(entry)
+
+    # THEN the item is the same as the one produced by the boto3 generic serializer
+    serializer = TypeSerializer()
+    assert item == {key: serializer.serialize(value) for key, value in entry.model_dump().items()}
+
+
+def test_decode_round_trip(product_id):
+    # GIVEN an encoded product entry
+    entry = ProductEntry(id=product_id, name='test', price=5, created_at=1700000000)
+
+    # WHEN decoding it
+    decoded = decode_product_item(encode_product_entry(entry))
+
+    # THEN the original entry is restored with integer numbers
+    assert ProductEntry.model_validate(decoded) == entry
+    assert isinstance(decoded['price'], int)
+
+
+def test_decode_projected_item():
+    # GIVEN a projected item holding some of the product attributes
+    item = {'name': {'S': 'test'}, 'version': {'N': '2'}}
+
+    # WHEN decoding it
+    # THEN only the projected attributes are returned
+    assert decode_product_item(item) == {'name': 'test', 'version': 2}
+
+
+def test_decode_falls_back_to_generic_deserializer():
+    # GIVEN an item with an attribute outside of the schema and an attribute stored with an unexpected type
+    item = {'price': {'S': 'free'}, 'tags': {'SS': ['a']}, 'rating': {'N': '4.5'}}
+
+    # WHEN decoding it
+    decoded = decode_product_item(item)
+
+    # THEN those attributes are decoded like the boto3 generic deserializer does
+    deserializer = TypeDeserializer()
+    assert decoded == {key: deserializer.deserialize(value) for key, value in item.items()}
+    assert decoded['rating'] == Decimal('4.5')
+
+
+def test_decode_leaves_non_integer_numbers_to_validation(product_id):
+    # GIVEN a product item whose price isn't an integer
+    item = {'id': {'S': product_id}, 'name': {'S': 'test'}, 'price': {'N': '10.5'}, 'created_at': {'N': '1700000000'}}
+
+    # WHEN decoding it
+    decoded = decode_product_item(item)
+
+    # THEN the price is decoded as a Decimal, which the schema rejects
+    assert decoded['price'] == Decimal('10.5')
+    with pytest.raises(ValidationError):
+        ProductEntry.model_validate(decoded)
@@ -0,0 +1,64 @@
+from http import HTTPMethod
+
+import pytest
+from aws_lambda_powertools.utilities.parser import ValidationError
+
+from product.crud.models.input import GetProductRequest, ProductFieldsQueryParams
+from product.crud.models.output import GetPartialProductOutput
+from tests.crud_utils import generate_product_api_gw_event
+
+
+def test_fields_are_split_and_deduplicated():
+    # GIVEN a comma separated fields query parameter with spaces and duplicates
+    # WHEN parsing the query parameters
+    query_params = ProductFieldsQueryParams.model_validate({'fields': 'id, price,id'})
+
+    # THEN the fields should be split, stripped and deduplicated while keeping their order
+    assert query_params.fields == ['id', 'price']
+
+
+def test_fields_are_optional():
+    # GIVEN query parameters without fields
+    # WHEN parsing the query parameters
+    query_params = ProductFieldsQueryParams.model_validate({'parameter1': 'value1'})
+
+    # THEN no fields projection should be requested
+    assert query_params.fields is None
+
+
+@pytest.mark.parametrize(
+    'fields',
+    [
+        'id,created_at',  # unknown field
+        '',  # empty projection
+        ',',  # empty projection after split
+    ],
+)
+def test_invalid_fields(fields):
+    # GIVEN an invalid fields query parameter
+    # WHEN parsing the query parameters
+    # THEN a validation error should be raised
+    with pytest.raises(ValidationError):
+        ProductFieldsQueryParams.model_validate({'fields': fields})
+
+
+def test_get_product_request_with_fields(product_id):
+    # GIVEN an API GW get product event with a fields query parameter
+    event = generate_product_api_gw_event(
+        product_id=product_id, http_method=HTTPMethod.GET, path_params={'product': product_id}, query_params={'fields': 'price'}
+    )
+
+    # WHEN parsing the event
+    request = GetProductRequest.model_validate(event)
+
+    # THEN the requested fields should be available
+    assert request.queryStringParameters.fields == ['price']
+
+
+def test_partial_output_serializes_requested_fields_only(product_id):
+    # GIVEN a partial product output with only the id set
+    output = GetPartialProductOutput(id=product_id)
+
+    # WHEN serializing it without unset fields
+    # THEN only the id should be returned
+    assert output.model_dump(exclude_none=True) == {'id': product_id}
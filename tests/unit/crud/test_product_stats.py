@@ -0,0 +1,79 @@
+import json
+from http import HTTPStatus
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from product.catalog.stats import get_price_bucket
+from product.catalog.stats_store.dynamodb_stats_store import DynamoDbCatalogStatsStore
+from product.crud.handlers.handle_get_product_stats import lambda_handler
+from product.crud.integration import get_catalog_stats_store, get_db_handler, get_db_handler_registry
+from product.crud.models.product import Product
+from tests.crud_utils import generate_api_gw_list_products_event, generate_product_id
+from tests.utils import generate_context
+
+
+@pytest.fixture
+def stats_env(monkeypatch):
+    environment = {
+        'POWERTOOLS_SERVICE_NAME': 'Product',
+        'LOG_LEVEL': 'INFO',
+        'LAMBDA_ENV_MODELER_DISABLE_CACHE': 'true',
+        'TABLE_NAME': 'products',
+        'DB_BACKEND': 'memory',
+    }
+    for key, value in environment.items():
+        monkeypatch.setenv(key, value)
+    caches = [get_db_handler_registry, get_catalog_stats_store]
+    for cache in caches:
+        cache.cache_clear()
+    yield monkeypatch
+    for cache in caches:
+        cache.cache_clear()
+
+
+def _stats_event() -> dict:
+    return generate_api_gw_list_products_event(path='/api/products/stats')
+
+
+def test_handler_returns_the_stored_aggregates(stats_env):
+    # GIVEN aggregates of two products, one of the stored price bounds is stale
+    store = DynamoDbCatalogStatsStore('stats', client=boto3.client('dynamodb'))
+    stats_env.setattr('product.crud.domain_logic.get_product_stats.get_catalog_stats_store', lambda: store)
+    item = {
+        'id': {'S': 'catalog'},
+        'product_count': {'N': '2'},
+        'price_sum': {'N': '30'},
+        f'price_bucket_{get_price_bucket(10)}': {'N': '1'},
+        f'price_bucket_{get_price_bucket(20)}': {'N': '1'},
+        'min_price': {'N': '2'},
+        'max_price': {'N': '20'},
+        'updated_at': {'N': '1700000000'},
+    }
+
+    # WHEN getting the product stats
+    with Stubber(store.client) as stubber:
+        stubber.add_response('get_item', {'Item': item}, {'TableName': 'stats', 'Key': {'id': {'S': 'catalog'}}})
+        response = lambda_handler(_stats_event(), generate_context())
+
+    # THEN they are read with a single GetItem, with the average price and an ETag
+    body = json.loads(response['body'])
+    assert response['statusCode'] == HTTPStatus.OK
+    assert (body['product_count'], body['average_price'], body['min_price'], body['max_price']) == (2, 15.0, 10, 20)
+    assert [(bucket['min_price'], bucket['count']) for bucket in body['price_histogram'] if bucket['count']] == [(10, 1), (20, 1)]
+    assert response['multiValueHeaders']['ETag']
+
+
+def test_handler_computes_the_aggregates_from_the_table_without_a_store(stats_env):
+    # GIVEN products in the table and no aggregates table
+    for price in [3, 700]:
+        get_db_handler('products').create_product(Product(id=generate_product_id(), name='chair', price=price))
+
+    # WHEN getting the product stats
+    response = lambda_handler(_stats_event(), generate_context())
+
+    # THEN they are computed from every price of the table
+    body = json.loads(response['body'])
+    assert response['statusCode'] == HTTPStatus.OK
+    assert (body['product_count'], body['price_sum'], body['min_price'], body['max_price']) == (2, 703, 3, 700)
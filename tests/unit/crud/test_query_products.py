@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pytest
+from aws_lambda_powertools.utilities.parser import ValidationError
+from botocore.stub import ANY, Stubber
+
+from product.crud.integration.constants import NAME_INDEX_NAME, PRICE_INDEX_NAME
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.models.input import ListProductsQueryParams
+from product.crud.models.product import ProductFilter
+from product.models.products.product import PRODUCT_CATALOG
+
+TABLE_NAME = 'products'
+
+
+def _generate_query_item(product_id: str, name: str, price: int) -> dict:
+    return {
+        'id': {'S': product_id},
+        'name': {'S': name},
+        'price': {'N': str(price)},
+        'created_at': {'N': str(int(datetime.utcnow().timestamp()))},
+        'catalog': {'S': PRODUCT_CATALOG},
+    }
+
+
+def _expected_query(index_name: str, with_filter: bool = False) -> dict:
+    expected = {
+        'TableName': TABLE_NAME,
+        'IndexName': index_name,
+        'KeyConditionExpression': ANY,
+        'ExpressionAttributeNames': ANY,
+        'ExpressionAttributeValues': ANY,
+    }
+    if with_filter:
+        expected['FilterExpression'] = ANY
+    return expected
+
+
+def test_query_products_by_price_range_uses_price_index(product_id):
+    # GIVEN a price range filter and a stubbed DynamoDB table that only expects a query on the price index
+    db_handler = DynamoDbHandler(TABLE_NAME)
+
+    with Stubber(db_handler.client) as stubber:
+        stubber.add_response(
+            method='query',
+            expected_params=_expected_query(PRICE_INDEX_NAME),
+            service_response={'Items': [_generate_query_item(product_id, 'test', 5)]},
+        )
+
+        # WHEN querying products
+        products = db_handler.query_products(ProductFilter(min_price=1, max_price=10))
+
+        # THEN the price index should be queried once, with no table scan
+        stubber.assert_no_pending_responses()
+
+    assert [product.id for product in products] == [product_id]
+
+
+def test_query_products_by_name_prefix_uses_name_index_and_follows_pages(product_id):
+    # GIVEN a name prefix and price filter, and a stubbed DynamoDB table returning two pages from the name index
+    db_handler = DynamoDbHandler(TABLE_NAME)
+    last_key = {'id': {'S': product_id}, 'catalog': {'S': PRODUCT_CATALOG}, 'name': {'S': 'test'}}
+
+    with Stubber(db_handler.client) as stubber:
+        stubber.add_response(
+            method='query',
+            expected_params=_expected_query(NAME_INDEX_NAME, with_filter=True),
+            service_response={'Items': [_generate_query_item(product_id, 'test', 5)], 'LastEvaluatedKey': last_key},
+        )
+        stubber.add_response(
+            method='query',
+            expected_params={**_expected_query(NAME_INDEX_NAME, with_filter=True), 'ExclusiveStartKey': ANY},
+            service_response={'Items': []},
+        )
+
+        # WHEN querying products
+        products = db_handler.query_products(ProductFilter(name_prefix='te', max_price=10))
+
+        # THEN the name index should be queried until the last page
+        stubber.assert_no_pending_responses()
+
+    assert len(products) == 1
+
+
+def test_list_query_params_without_filter():
+    # GIVEN list products query parameters without filter criteria
+    # WHEN converting them to a product filter
+    # THEN no filter should be returned so products are listed with a scan
+    assert ListProductsQueryParams.model_validate({'fields': 'id'}).to_filter() is None
+
+
+def test_list_query_params_with_filter():
+    # GIVEN list products query parameters with a price range
+    # WHEN converting them to a product filter
+    product_filter = ListProductsQueryParams.model_validate({'min_price': '3', 'max_price': '9'}).to_filter()
+
+    # THEN the filter should contain the price range
+    assert product_filter == ProductFilter(min_price=3, max_price=9)
+
+
+@pytest.mark.parametrize(
+    'query_params',
+    [
+        {'min_price': '10', 'max_price': '1'},  # inverted range
+        {'min_price': '0'},  # non positive price
+        {'max_price': 'a'},  # non numeric price
+        {'name_prefix': ''},  # empty prefix
+    ],
+)
+def test_list_query_params_invalid_filter(query_params):
+    # GIVEN invalid filter query parameters
+    # WHEN parsing them
+    # THEN a validation error should be raised
+    with pytest.raises(ValidationError):
+        ListProductsQueryParams.model_validate(query_params)
@@ -0,0 +1,49 @@
+import pytest
+
+from product.crud.handlers.utils.route_latency import DOMAIN_LOGIC_STAGE, VALIDATION_STAGE, record_route_latency
+from product.observability import metrics, stage_timer
+from tests.utils import generate_context
+
+
+@pytest.fixture
+def published_metrics():
+    # other tests call the handlers' routes without flushing metrics
+    metrics.clear_metrics()
+    stage_timer.durations_ms.clear()
+    yield metrics.metric_set
+    metrics.clear_metrics()
+
+
+def test_route_stages_are_published_with_the_route_name(published_metrics):
+    # GIVEN a handler timing its validation and domain logic stages
+    @record_route_latency(route='GetProduct')
+    def lambda_handler(event: dict, context) -> dict:
+        with stage_timer.stage(VALIDATION_STAGE):
+            pass
+        with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+            pass
+        return {'statusCode': 200}
+
+    # WHEN the handler is invoked
+    lambda_handler({}, generate_context())
+
+    # THEN every stage and the total invocation time are published in milliseconds, prefixed by the route
+    assert {'GetProductTotalDuration', 'GetProductValidationDuration', 'GetProductDomainLogicDuration'} == set(published_metrics)
+    assert all(metric['Unit'] == 'Milliseconds' for metric in published_metrics.values())
+    assert published_metrics['GetProductTotalDuration']['Value'][0] >= published_metrics['GetProductDomainLogicDuration']['Value'][0]
+
+
+def test_route_stages_are_published_on_errors(published_metrics):
+    # GIVEN a handler failing in its domain logic
+    @record_route_latency(route='DeleteProduct')
+    def lambda_handler(event: dict, context) -> dict:
+        with stage_timer.stage(DOMAIN_LOGIC_STAGE):
+            raise RuntimeError('failed')
+
+    # WHEN the handler is invoked
+    with pytest.raises(RuntimeError):
+        lambda_handler({}, generate_context())
+
+    # THEN the stages are still published, and the next invocation starts over
+    assert {'DeleteProductTotalDuration', 'DeleteProductDomainLogicDuration'} == set(published_metrics)
+    assert stage_timer.durations_ms == {}
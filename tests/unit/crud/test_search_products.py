@@ -0,0 +1,81 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from product.catalog.models import CatalogChange, CatalogProduct
+from product.catalog.object_store import get_catalog_object_store
+from product.catalog.object_store.filesystem_object_store import FileSystemObjectStore
+from product.catalog.search_index import SearchIndex, encode_search_index
+from product.crud.handlers.handle_search_products import lambda_handler
+from product.crud.integration import get_db_handler, get_db_handler_registry, get_search_index_reader
+from product.crud.models.product import Product
+from tests.crud_utils import generate_api_gw_list_products_event, generate_product_id
+from tests.utils import generate_context
+
+SEARCH_INDEX_KEY = 'catalog/search_index.bin.gz'
+
+
+@pytest.fixture
+def search_store(monkeypatch, tmp_path):
+    environment = {
+        'POWERTOOLS_SERVICE_NAME': 'Product',
+        'LOG_LEVEL': 'INFO',
+        'LAMBDA_ENV_MODELER_DISABLE_CACHE': 'true',
+        'TABLE_NAME': 'products',
+        'DB_BACKEND': 'memory',
+        'CATALOG_SNAPSHOT_STORE': 'filesystem',
+        'CATALOG_SNAPSHOT_DIRECTORY': str(tmp_path),
+        'CATALOG_SNAPSHOT_REFRESH_SECONDS': '0',
+    }
+    for key, value in environment.items():
+        monkeypatch.setenv(key, value)
+    caches = [get_db_handler_registry, get_catalog_object_store, get_search_index_reader]
+    for cache in caches:
+        cache.cache_clear()
+    yield FileSystemObjectStore(str(tmp_path))
+    for cache in caches:
+        cache.cache_clear()
+
+
+def _search_event(query_params: dict[str, str]) -> dict:
+    return generate_api_gw_list_products_event(path='/api/products/search', query_params=query_params)
+
+
+def test_handler_returns_the_most_relevant_products(search_store):
+    # GIVEN a search index with three products
+    products = [CatalogProduct(id=generate_product_id(), name=name, price=3) for name in ['red chair', 'red chair pro', 'blue chair']]
+    index = SearchIndex().apply_changes([CatalogChange(product_id=product.id, product=product) for product in products])
+    search_store.put_object(SEARCH_INDEX_KEY, encode_search_index(index))
+
+    # WHEN searching a name prefix with a limit
+    response = lambda_handler(_search_event({'q': 'Red ch', 'limit': '1'}), generate_context())
+
+    # THEN the best match is returned, with an ETag
+    assert response['statusCode'] == HTTPStatus.OK
+    assert json.loads(response['body']) == {'products': [products[0].model_dump()]}
+    assert response['multiValueHeaders']['ETag']
+
+
+def test_handler_queries_the_name_index_without_a_search_index(search_store):
+    # GIVEN a product in the table and no search index yet
+    product = Product(id=generate_product_id(), name='red chair', price=3)
+    get_db_handler('products').create_product(product)
+
+    # WHEN searching a name prefix
+    response = lambda_handler(_search_event({'q': 'red'}), generate_context())
+
+    # THEN the products are found with the name index of the table
+    assert response['statusCode'] == HTTPStatus.OK
+    assert json.loads(response['body']) == {'products': [product.model_dump()]}
+
+
+def test_handler_400_without_query(search_store):
+    # GIVEN a search request without a query
+    event = _search_event({'limit': '5'})
+
+    # WHEN searching
+    response = lambda_handler(event, generate_context())
+
+    # THEN the request is rejected
+    assert response['statusCode'] == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.integration.single_flight import SingleFlight
+from product.crud.models.exceptions import InternalServerException
+
+TABLE_NAME = 'products'
+CALLERS = 8
+
+
+def _call_concurrently(func, callers: int = CALLERS) -> list:
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(func) for _ in range(callers)]
+        return [future.result() for future in futures]
+
+
+def test_concurrent_calls_share_one_call():
+    # GIVEN a slow call
+    single_flight = SingleFlight()
+    calls = []
+
+    def call() -> int:
+        calls.append(1)
+        time.sleep(0.2)
+        return 42
+
+    # WHEN 8 callers make it at the same time with the same key
+    results = _call_concurrently(lambda: single_flight.do('key', call))
+
+    # THEN it is only made once and every caller gets its result
+    assert results == [42] * CALLERS
+    assert len(calls) == 1
+
+
+def test_callers_share_the_exception():
+    # GIVEN a slow call failing
+    single_flight = SingleFlight()
+
+    def call() -> int:
+        time.sleep(0.2)
+        raise InternalServerException('failed')
+
+    # WHEN 2 callers make it at the same time
+    def do() -> Exception:
+        with pytest.raises(InternalServerException) as exc_info:
+            single_flight.do('key', call)
+        return exc_info.value
+
+    errors = _call_concurrently(do, callers=2)
+
+    # THEN both get the exception of the one call
+    assert errors[0] is errors[1]
+
+
+def test_forgotten_key_starts_a_new_call():
+    # GIVEN a call in flight
+    single_flight = SingleFlight()
+    started, released = threading.Event(), threading.Event()
+
+    def slow_call() -> str:
+        started.set()
+        released.wait(5)
+        return 'before write'
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        in_flight = executor.submit(single_flight.do, ('id', None), slow_call)
+        started.wait(5)
+
+        # WHEN its key is forgotten, e.g. after a write, and the key is called again
+        single_flight.forget(lambda key: key[0] == 'id')
+        result = single_flight.do(('id', None), lambda: 'after write')
+        released.set()
+
+    # THEN the new caller doesn't join the call in flight
+    assert result == 'after write'
+    assert in_flight.result() == 'before write'
+
+
+def test_concurrent_gets_of_a_product_make_one_get_item(product_id):
+    # GIVEN a DynamoDB handler coalescing reads, and a table answering a single get_item after 200 ms
+    client = boto3.client('dynamodb')
+    client.meta.events.register('before-parameter-build.dynamodb.GetItem', lambda **kwargs: time.sleep(0.2))
+    db_handler = DynamoDbHandler(TABLE_NAME, client=client, coalesce_reads=True)
+
+    with Stubber(client) as stubber:
+        item = {'id': {'S': product_id}, 'name': {'S': 'mug'}, 'price': {'N': '5'}, 'created_at': {'N': '1700000000'}}
+        stubber.add_response('get_item', {'Item': item})
+
+        # WHEN 8 requests get the product at the same time
+        products = _call_concurrently(lambda: db_handler.get_product(product_id))
+
+        # THEN they share one get_item call
+        stubber.assert_no_pending_responses()
+    assert {product.id for product in products} == {product_id}
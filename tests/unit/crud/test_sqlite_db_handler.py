@@ -0,0 +1,96 @@
+import threading
+from typing import Generator
+
+import pytest
+
+from product.crud.integration.sqlite_db_handler import SqliteDbHandler
+from product.crud.models.exceptions import ProductAlreadyExistsException, ProductNotFoundException, ProductVersionConflictException
+from product.crud.models.product import Product, ProductFilter, ProductUpdate
+from product.models.products.product import ProductEntry
+from tests.crud_utils import generate_product_id
+
+TABLE_NAME = 'products'
+
+
+@pytest.fixture
+def db_handler(tmp_path) -> Generator[SqliteDbHandler, None, None]:
+    # every test gets its own database file
+    yield SqliteDbHandler(TABLE_NAME, db_path=str(tmp_path / 'products.db'))
+
+
+def test_wal_mode(db_handler: SqliteDbHandler):
+    # GIVEN a sqlite db handler
+    # WHEN checking the journal mode of its connection
+    # THEN write ahead logging is enabled
+    assert db_handler._get_connection().execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_create_get_update_delete(db_handler: SqliteDbHandler):
+    # GIVEN a product
+    product = Product(id=generate_product_id(), name='test', price=5)
+
+    # WHEN creating, updating and deleting it
+    db_handler.create_product(product)
+    with pytest.raises(ProductAlreadyExistsException):
+        db_handler.create_product(product)
+    updated = db_handler.update_product(product.id, ProductUpdate(name='new', version=1))
+    with pytest.raises(ProductVersionConflictException):
+        db_handler.update_product(product.id, ProductUpdate(price=8, version=1))
+    stored = db_handler.get_product(product.id)
+    db_handler.delete_product(product.id)
+
+    # THEN it behaves like the DynamoDB handler
+    assert updated.model_dump(exclude_none=True) == {'name': 'new', 'version': 2}
+    assert stored == Product(id=product.id, name='new', price=5, version=2)
+    with pytest.raises(ProductNotFoundException):
+        db_handler.get_product(product.id)
+    with pytest.raises(ProductNotFoundException):
+        db_handler.update_product(product.id, ProductUpdate(price=8, version=2))
+
+
+def test_query_and_projection(db_handler: SqliteDbHandler):
+    # GIVEN three products
+    for name, price in [('banana', 5), ('apple', 3), ('avocado', 9)]:
+        db_handler.create_product(Product(id=generate_product_id(), name=name, price=price))
+
+    # WHEN querying by price range and by name prefix, and getting a projection
+    by_price = db_handler.query_products(ProductFilter(min_price=3, max_price=5))
+    by_name = db_handler.query_products(ProductFilter(name_prefix='a'))
+    partial = db_handler.get_partial_product(by_price[0].id, fields=['name', 'version'])
+
+    # THEN results are filtered and ordered like the secondary indexes
+    assert [product.name for product in by_price] == ['apple', 'banana']
+    assert [product.name for product in by_name] == ['apple', 'avocado']
+    assert partial.model_dump(exclude_none=True) == {'name': 'apple', 'version': 1}
+    assert len(db_handler.list_partial_products(fields=['id'])) == 3
+
+
+def test_concurrent_writers(db_handler: SqliteDbHandler):
+    # GIVEN several threads creating products, each on its own connection
+    products = [Product(id=generate_product_id(), name='test', price=index + 1) for index in range(40)]
+    threads = [threading.Thread(target=db_handler.create_product, args=(product,)) for product in products]
+
+    # WHEN they run concurrently
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # THEN every product is stored
+    assert len(db_handler.list_products()) == len(products)
+
+
+def test_put_product_entries_replaces_existing_products(db_handler: SqliteDbHandler):
+    # GIVEN a stored product
+    entry = ProductEntry(id=generate_product_id(), name='test', price=5, created_at=1700000000)
+    db_handler.put_product_entries([entry])
+
+    # WHEN putting it again with another price, along with a new product
+    repriced = entry.model_copy(update={'price': 8, 'version': 2})
+    new_entry = ProductEntry(id=generate_product_id(), name='new', price=3, created_at=1700000000)
+    unprocessed = db_handler.put_product_entries([repriced, new_entry])
+
+    # THEN both are written in full, like a BatchWriteItem
+    assert unprocessed == []
+    assert db_handler.get_product(entry.id) == Product(id=entry.id, name='test', price=8, version=2)
+    assert db_handler.get_product(new_entry.id).name == 'new'
@@ -0,0 +1,126 @@
+import pytest
+from aws_lambda_powertools.utilities.parser import ValidationError
+from botocore.stub import ANY, Stubber
+
+from product.crud.integration.dynamo_db_handler import DynamoDbHandler
+from product.crud.models.exceptions import InternalServerException, ProductNotFoundException, ProductVersionConflictException
+from product.crud.models.input import UpdateProductBody
+from product.crud.models.product import ProductUpdate
+
+TABLE_NAME = 'products'
+
+
+def _expected_update(product_id: str, condition_expression: str = ANY) -> dict:
+    return {
+        'TableName': TABLE_NAME,
+        'Key': {'id': {'S': product_id}},
+        'UpdateExpression': ANY,
+        'ConditionExpression': condition_expression,
+        'ExpressionAttributeNames': ANY,
+        'ExpressionAttributeValues': ANY,
+        'ReturnValues': 'UPDATED_NEW',
+        'ReturnValuesOnConditionCheckFailure': 'ALL_OLD',
+    }
+
+
+def test_update_product_returns_updated_attributes(product_id):
+    # GIVEN a stubbed DynamoDB table that accepts a conditional update at version 2
+    db_handler = DynamoDbHandler(TABLE_NAME)
+
+    with Stubber(db_handler.client) as stubber:
+        stubber.add_response(
+            method='update_item',
+            expected_params=_expected_update(product_id, condition_expression='attribute_exists(id) AND #version = :expected_version'),
+            service_response={'Attributes': {'price': {'N': '7'}, 'version': {'N': '3'}}},
+        )
+
+        # WHEN updating the product price
+        updated = db_handler.update_product(product_id, ProductUpdate(price=7, version=2))
+
+        # THEN a single update call is made and only the updated attributes are returned
+        stubber.assert_no_pending_responses()
+
+    assert updated.model_dump(exclude_none=True) == {'price': 7, 'version': 3}
+
+
+def test_update_product_first_version_accepts_unversioned_items():
+    # GIVEN an update based on version 1
+    update = ProductUpdate(name='new', version=1)
+
+    # WHEN building the update request
+    request = DynamoDbHandler(TABLE_NAME)._build_update(update)
+
+    # THEN items written before versioning are accepted as version 1, and only the set fields are updated
+    assert request['ConditionExpression'] == 'attribute_exists(id) AND (#version = :expected_version OR attribute_not_exists(#version))'
+    assert request['UpdateExpression'] == 'SET #version = if_not_exists(#version, :zero) + :one, #name = :name'
+    assert request['ExpressionAttributeValues'][':expected_version'] == {'N': str(update.version)}
+
+
+def test_update_product_version_conflict(product_id):
+    # GIVEN a stubbed DynamoDB table where the stored product is at another version
+    db_handler = DynamoDbHandler(TABLE_NAME)
+
+    with Stubber(db_handler.client) as stubber:
+        stubber.add_client_error(
+            method='update_item',
+            service_error_code='ConditionalCheckFailedException',
+            modeled_fields={'Item': {'id': {'S': product_id}, 'version': {'N': '5'}}},
+            expected_params=_expected_update(product_id),
+        )
+
+        # WHEN updating the product based on a stale version
+        # THEN a version conflict is raised
+        with pytest.raises(ProductVersionConflictException):
+            db_handler.update_product(product_id, ProductUpdate(price=7, version=2))
+
+
+def test_update_product_not_found(product_id):
+    # GIVEN a stubbed DynamoDB table where the product does not exist
+    db_handler = DynamoDbHandler(TABLE_NAME)
+
+    with Stubber(db_handler.client) as stubber:
+        stubber.add_client_error(
+            method='update_item', service_error_code='ConditionalCheckFailedException', expected_params=_expected_update(product_id)
+        )
+
+        # WHEN updating the product
+        # THEN a product not found error is raised
+        with pytest.raises(ProductNotFoundException):
+            db_handler.update_product(product_id, ProductUpdate(price=7, version=2))
+
+
+def test_update_product_internal_error(product_id):
+    # GIVEN a stubbed DynamoDB table that fails with a service error
+    db_handler = DynamoDbHandler(TABLE_NAME)
+
+    with Stubber(db_handler.client) as stubber:
+        stubber.add_client_error(method='update_item', service_error_code='InternalServerError', expected_params=_expected_update(product_id))
+
+        # WHEN updating the product
+        # THEN an internal server error is raised
+        with pytest.raises(InternalServerException):
+            db_handler.update_product(product_id, ProductUpdate(price=7, version=2))
+
+
+def test_update_body_requires_changes():
+    # GIVEN an update body with a version but no updated attributes
+    # WHEN creating the update input
+    # THEN a validation error should be raised
+    with pytest.raises(ValidationError):
+        UpdateProductBody(version=1)
+
+
+def test_update_body_requires_version():
+    # GIVEN an update body without the version it is based on
+    # WHEN creating the update input
+    # THEN a validation error should be raised
+    with pytest.raises(ValidationError):
+        UpdateProductBody(name='a', price=4)
+
+
+def test_update_body_invalid_version():
+    # GIVEN an update body with a non positive version
+    # WHEN creating the update input
+    # THEN a validation error should be raised
+    with pytest.raises(ValidationError):
+        UpdateProductBody(price=4, version=0)
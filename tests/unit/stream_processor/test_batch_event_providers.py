@@ -0,0 +1,162 @@
+import json
+
+import boto3
+import pytest
+from botocore import stub
+
+from product.stream_processor.handlers.models.env_vars import EVENT_PROVIDER_DESTINATIONS
+from product.stream_processor.integrations.events.constants import KINESIS_PROVIDER_MAX_RECORDS, SQS_PROVIDER_MAX_BATCH_BYTES
+from product.stream_processor.integrations.events.event_handler import EventHandler
+from product.stream_processor.integrations.events.exceptions import ProductChangeNotificationDeliveryError
+from product.stream_processor.integrations.events.providers import get_event_provider
+from product.stream_processor.integrations.events.providers.kinesis import Kinesis
+from product.stream_processor.integrations.events.providers.sns import Sns
+from product.stream_processor.integrations.events.providers.sqs import Sqs
+from product.stream_processor.models.product import ProductChangeNotification
+
+QUEUE_URL = 'https://sqs.us-east-1.amazonaws.com/123456789012/product-notifications'
+TOPIC_ARN = 'arn:aws:sns:us-east-1:123456789012:product-notifications'
+STREAM_NAME = 'product-notifications'
+
+
+def _build_events(count: int, product_ids: list[str] | None = None):
+    product_ids = product_ids or [f'8c18c85a-0f10-4b73-b54a-07ab0d3810{index:02}' for index in range(count)]
+    notifications = [ProductChangeNotification(product_id=product_id, status='ADDED') for product_id in product_ids]
+    return EventHandler.build_events_from_models(models=notifications, event_source='test')
+
+
+def test_sqs_batches_are_packed_by_size():
+    # GIVEN 10 events of about 100 KB once serialized, SQS batches being limited to 256 KB
+    events = _build_events(10)
+    for event in events:
+        event.metadata.padding = 'x' * 100_000
+
+    # WHEN building the SQS entries and packing them
+    provider = Sqs(queue_url=QUEUE_URL, client=boto3.client('sqs'))
+    entries = [provider.build_entry(event, entry_id=str(index)) for index, event in enumerate(events)]
+    client = provider.client
+    with stub.Stubber(client) as stubber:
+        for batch_start in range(0, 10, 2):
+            batch = entries[batch_start : batch_start + 2]
+            stubber.add_response(
+                'send_message_batch',
+                {'Successful': [{'Id': entry['Id'], 'MessageId': entry['Id'], 'MD5OfMessageBody': 'md5'} for entry in batch], 'Failed': []},
+                {'QueueUrl': QUEUE_URL, 'Entries': batch},
+            )
+        receipt = provider.send(payload=events)
+        stubber.assert_no_pending_responses()
+
+    # THEN 2 events fit in a batch, and every event is sent
+    assert 2 * provider.get_entry_size(entries[0]) < SQS_PROVIDER_MAX_BATCH_BYTES < 3 * provider.get_entry_size(entries[0])
+    assert len(receipt.success) == 10
+
+
+def test_sqs_failed_entries_are_retried():
+    # GIVEN 3 events, SQS failing one of them with an internal error once
+    events = _build_events(3)
+    provider = Sqs(queue_url=QUEUE_URL, client=boto3.client('sqs'), sleep=lambda seconds: None)
+    entries = [provider.build_entry(event, entry_id=str(index)) for index, event in enumerate(events)]
+
+    with stub.Stubber(provider.client) as stubber:
+        stubber.add_response(
+            'send_message_batch',
+            {
+                'Successful': [{'Id': '0', 'MessageId': 'm0', 'MD5OfMessageBody': 'md5'}, {'Id': '2', 'MessageId': 'm2', 'MD5OfMessageBody': 'md5'}],
+                'Failed': [{'Id': '1', 'SenderFault': False, 'Code': 'InternalError', 'Message': 'try again'}],
+            },
+            {'QueueUrl': QUEUE_URL, 'Entries': entries},
+        )
+        stubber.add_response(
+            'send_message_batch',
+            {'Successful': [{'Id': '1', 'MessageId': 'm1', 'MD5OfMessageBody': 'md5'}], 'Failed': []},
+            {'QueueUrl': QUEUE_URL, 'Entries': [entries[1]]},
+        )
+
+        # WHEN sending them
+        receipt = provider.send(payload=events)
+        stubber.assert_no_pending_responses()
+
+    # THEN only the failed event is sent again, and every event is delivered
+    assert sorted(success.receipt_id for success in receipt.success) == ['m0', 'm1', 'm2']
+    assert json.loads(entries[1]['MessageBody'])['data']['product_id'] == events[1].data.product_id
+
+
+def test_sns_sender_faults_are_not_retried():
+    # GIVEN 2 events, SNS rejecting one of them as invalid
+    events = _build_events(2)
+    provider = Sns(topic_arn=TOPIC_ARN, client=boto3.client('sns'), sleep=lambda seconds: None)
+
+    with stub.Stubber(provider.client) as stubber:
+        stubber.add_response(
+            'publish_batch',
+            {
+                'Successful': [{'Id': '0', 'MessageId': 'm0'}],
+                'Failed': [{'Id': '1', 'SenderFault': True, 'Code': 'InvalidParameter', 'Message': 'bad'}],
+            },
+        )
+
+        # WHEN publishing them
+        with pytest.raises(ProductChangeNotificationDeliveryError) as exc:
+            provider.send(payload=events)
+
+        # THEN the invalid event fails the delivery without being published again
+        stubber.assert_no_pending_responses()
+    assert [fail.receipt_id for fail in exc.value.receipts] == ['1']
+
+
+def test_kinesis_records_are_partitioned_by_product_and_retried():
+    # GIVEN 501 events, Kinesis throttling the last record of the first call until it gives up
+    events = _build_events(KINESIS_PROVIDER_MAX_RECORDS + 1, product_ids=[f'8c18c85a-0f10-4b73-b54a-07ab0d38{index:04}' for index in range(501)])
+    provider = Kinesis(stream_name=STREAM_NAME, client=boto3.client('kinesis'), max_attempts=2, sleep=lambda seconds: None)
+    throttled = {'ErrorCode': 'ProvisionedThroughputExceededException', 'ErrorMessage': 'slow down'}
+
+    with stub.Stubber(provider.client) as stubber:
+        first_call = [{'SequenceNumber': str(index), 'ShardId': 'shardId-0'} for index in range(499)] + [throttled]
+        stubber.add_response('put_records', {'FailedRecordCount': 1, 'Records': first_call})
+        stubber.add_response('put_records', {'FailedRecordCount': 1, 'Records': [throttled]})
+
+        # WHEN putting them
+        with pytest.raises(ProductChangeNotificationDeliveryError) as exc:
+            provider.send(payload=events)
+
+        # THEN the first call holds 500 records, the throttled record is put again and fails the delivery after 2 attempts
+        stubber.assert_no_pending_responses()
+    assert [fail.receipt_id for fail in exc.value.receipts] == [events[499].data.product_id]
+    assert provider.build_entry(events[0], entry_id='0')['PartitionKey'] == events[0].data.product_id
+
+
+@pytest.mark.parametrize(
+    'env_vars, provider_class',
+    [
+        ({}, 'EventBridge'),
+        ({'EVENT_PROVIDER': 'sqs', 'EVENT_QUEUE_URL': QUEUE_URL}, 'Sqs'),
+        ({'EVENT_PROVIDER': 'sns', 'EVENT_TOPIC_ARN': TOPIC_ARN}, 'Sns'),
+        ({'EVENT_PROVIDER': 'kinesis', 'EVENT_STREAM_NAME': STREAM_NAME}, 'Kinesis'),
+    ],
+)
+def test_provider_is_selected_with_env_vars(monkeypatch: pytest.MonkeyPatch, env_vars: dict[str, str], provider_class: str):
+    # GIVEN the provider settings of the stream processor
+    monkeypatch.setenv('LAMBDA_ENV_MODELER_DISABLE_CACHE', 'true')
+    for key, value in env_vars.items():
+        monkeypatch.setenv(key, value)
+    get_event_provider.cache_clear()
+
+    # WHEN getting the event provider
+    provider = get_event_provider()
+    get_event_provider.cache_clear()
+
+    # THEN it is the selected one
+    assert type(provider).__name__ == provider_class
+
+
+@pytest.mark.parametrize('provider', ['sqs', 'sns', 'kinesis'])
+def test_provider_without_its_destination_is_rejected(monkeypatch: pytest.MonkeyPatch, provider: str):
+    # GIVEN a provider selected without its destination
+    monkeypatch.setenv('LAMBDA_ENV_MODELER_DISABLE_CACHE', 'true')
+    monkeypatch.setenv('EVENT_PROVIDER', provider)
+    get_event_provider.cache_clear()
+
+    # WHEN getting the event provider
+    # THEN the environment variables fail validation
+    with pytest.raises(ValueError, match=EVENT_PROVIDER_DESTINATIONS[provider]):
+        get_event_provider()
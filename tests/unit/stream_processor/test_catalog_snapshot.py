@@ -0,0 +1,119 @@
+from typing import Optional
+
+import pytest
+from botocore.stub import Stubber
+
+from product.catalog.models import CatalogChange, CatalogProduct, CatalogSnapshot
+from product.catalog.object_store.base import StoredObject
+from product.catalog.object_store.exceptions import ObjectNotFoundError, PreconditionFailedError
+from product.catalog.object_store.filesystem_object_store import FileSystemObjectStore
+from product.catalog.object_store.s3_object_store import S3ObjectStore
+from product.catalog.snapshot import decode_snapshot, encode_snapshot
+from product.stream_processor.domain_logic.catalog_snapshot import MAX_UPDATE_ATTEMPTS, update_catalog_snapshot
+from product.stream_processor.handlers.process_stream import process_stream
+from tests.unit.stream_processor.conftest import FakeEventHandler
+from tests.unit.stream_processor.data_builder import generate_dynamodb_stream_events
+from tests.utils import generate_context
+
+SNAPSHOT_KEY = 'catalog/products.json.gz'
+PRODUCT = CatalogProduct(id='8c18c85a-0f10-4b73-b54a-07ab0d381018', name='test', price=1)
+OTHER_PRODUCT = CatalogProduct(id='d5a43e57-0d4b-4d3b-9c9b-a6ba2a4b5b86', name='other', price=2)
+
+
+class ConcurrentlyUpdatedStore(FileSystemObjectStore):
+    """Another writer adds `OTHER_PRODUCT` between the read and the write of the next `conflicts` updates."""
+
+    def __init__(self, root_directory: str, conflicts: int):
+        super().__init__(root_directory)
+        self.conflicts = conflicts
+
+    def get_object(self, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        stored_object = super().get_object(key, if_none_match)
+        if self.conflicts:
+            self.conflicts -= 1
+            # a new version every time, rewriting identical bytes wouldn't change the ETag
+            super().put_object(key, encode_snapshot(CatalogSnapshot(version=10 + self.conflicts, products=[OTHER_PRODUCT])))
+        return stored_object
+
+
+def _read_snapshot(object_store: FileSystemObjectStore) -> CatalogSnapshot:
+    stored_object = object_store.get_object(SNAPSHOT_KEY)
+    assert stored_object is not None
+    return decode_snapshot(stored_object.body)
+
+
+def test_update_creates_then_versions_the_snapshot(tmp_path):
+    # GIVEN an empty object store
+    object_store = FileSystemObjectStore(str(tmp_path))
+
+    # WHEN a product is added, then removed in a later batch
+    update_catalog_snapshot([CatalogChange(product_id=PRODUCT.id, product=PRODUCT)], object_store, SNAPSHOT_KEY)
+    first_snapshot = _read_snapshot(object_store)
+    update_catalog_snapshot([CatalogChange(product_id=PRODUCT.id)], object_store, SNAPSHOT_KEY)
+
+    # THEN every batch writes the next version of the snapshot
+    assert (first_snapshot.version, first_snapshot.products) == (1, [PRODUCT])
+    assert (_read_snapshot(object_store).version, _read_snapshot(object_store).products) == (2, [])
+
+
+def test_update_starts_over_when_another_writer_changed_the_snapshot(tmp_path):
+    # GIVEN a snapshot that another writer changes while the update is applied
+    object_store = ConcurrentlyUpdatedStore(str(tmp_path), conflicts=0)
+    object_store.put_object(SNAPSHOT_KEY, encode_snapshot(CatalogSnapshot()))
+    object_store.conflicts = 1
+
+    # WHEN the snapshot is updated
+    snapshot = update_catalog_snapshot([CatalogChange(product_id=PRODUCT.id, product=PRODUCT)], object_store, SNAPSHOT_KEY)
+
+    # THEN the change is applied on top of the other writer's snapshot instead of overwriting it
+    assert snapshot.version == 11
+    assert snapshot.products == [OTHER_PRODUCT, PRODUCT]
+    assert _read_snapshot(object_store) == snapshot
+
+
+def test_update_gives_up_after_max_attempts(tmp_path):
+    # GIVEN a snapshot changed by another writer on every attempt
+    object_store = ConcurrentlyUpdatedStore(str(tmp_path), conflicts=0)
+    object_store.put_object(SNAPSHOT_KEY, encode_snapshot(CatalogSnapshot()))
+    object_store.conflicts = MAX_UPDATE_ATTEMPTS
+
+    # WHEN the snapshot is updated
+    # THEN the update fails, so the stream retries the batch
+    with pytest.raises(PreconditionFailedError):
+        update_catalog_snapshot([CatalogChange(product_id=PRODUCT.id, product=PRODUCT)], object_store, SNAPSHOT_KEY)
+
+
+def test_process_stream_updates_the_catalog_snapshot(tmp_path):
+    # GIVEN a stream batch inserting a product and a stream batch removing it
+    inserted, removed = generate_dynamodb_stream_events()['Records']
+    object_store = FileSystemObjectStore(str(tmp_path))
+
+    # WHEN each batch is processed with a catalog store
+    process_stream(event={'Records': [inserted]}, context=generate_context(), event_handler=FakeEventHandler(), object_store=object_store)
+    inserted_snapshot = _read_snapshot(object_store)
+    process_stream(event={'Records': [removed]}, context=generate_context(), event_handler=FakeEventHandler(), object_store=object_store)
+
+    # THEN the snapshot lists the product from its new image, then drops it
+    assert inserted_snapshot.products == [PRODUCT]
+    assert _read_snapshot(object_store).products == []
+
+
+def test_s3_object_store_conditional_requests():
+    # GIVEN an S3 object store with a stubbed client
+    object_store = S3ObjectStore(bucket_name='catalog')
+
+    with Stubber(object_store.client) as stubber:
+        stubber.add_client_error('get_object', service_error_code='NoSuchKey', http_status_code=404)
+        stubber.add_client_error('get_object', service_error_code='304', http_status_code=304)
+        stubber.add_response('put_object', {'ETag': '"new"'}, {'Bucket': 'catalog', 'Key': SNAPSHOT_KEY, 'Body': b'{}', 'IfNoneMatch': '*'})
+        stubber.add_client_error('put_object', service_error_code='PreconditionFailed', http_status_code=412)
+
+        # WHEN reading a missing object, reading an unchanged object, creating an object and overwriting a changed one
+        # THEN a missing object raises, an unchanged one is not returned, and a lost race raises to be retried
+        with pytest.raises(ObjectNotFoundError):
+            object_store.get_object(SNAPSHOT_KEY)
+        assert object_store.get_object(SNAPSHOT_KEY, if_none_match='"current"') is None
+        assert object_store.put_object(SNAPSHOT_KEY, b'{}', if_match='') == '"new"'
+        with pytest.raises(PreconditionFailedError):
+            object_store.put_object(SNAPSHOT_KEY, b'{}', if_match='"stale"')
+        stubber.assert_no_pending_responses()
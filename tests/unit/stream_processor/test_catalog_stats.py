@@ -0,0 +1,190 @@
+from typing import Any
+
+import boto3
+from botocore.stub import ANY, Stubber
+
+from product.catalog.models import CatalogStats, PriceChange
+from product.catalog.stats import PRICE_HISTOGRAM_BUCKETS, CatalogStatsDelta, build_catalog_stats, compute_stats_delta, get_price_bucket
+from product.catalog.stats_store.base import CatalogStatsStore
+from product.catalog.stats_store.dynamodb_stats_store import APPLIED_BATCH_ITEM_PREFIX, STATS_ITEM_ID, DynamoDbCatalogStatsStore
+from product.stream_processor.handlers.process_stream import process_stream
+from tests.unit.stream_processor.conftest import FakeEventHandler
+from tests.unit.stream_processor.data_builder import generate_dynamodb_stream_events
+from tests.utils import generate_context
+
+STATS_TABLE = 'stats'
+
+
+class FakeCatalogStatsStore(CatalogStatsStore):
+    def __init__(self) -> None:
+        self.applied: list[tuple[CatalogStatsDelta, str]] = []
+
+    def apply_delta(self, delta: CatalogStatsDelta, batch_id: str) -> bool:
+        self.applied.append((delta, batch_id))
+        return True
+
+    def get_stats(self) -> CatalogStats:
+        return CatalogStats()  # pragma: no cover
+
+
+def _stubbed_store() -> tuple[DynamoDbCatalogStatsStore, Stubber]:
+    store = DynamoDbCatalogStatsStore(STATS_TABLE, client=boto3.client('dynamodb'))
+    return store, Stubber(store.client)
+
+
+def test_batch_changes_are_coalesced_into_one_delta():
+    # GIVEN a batch inserting two products, repricing one of them and removing another product
+    changes = [
+        PriceChange(new_price=10),
+        PriceChange(new_price=700),
+        PriceChange(old_price=700, new_price=3),
+        PriceChange(old_price=40),
+    ]
+
+    # WHEN the changes are coalesced
+    delta = compute_stats_delta(changes)
+
+    # THEN only the net change of every counter is kept, the repriced product's old bucket is back to zero
+    assert delta.counters() == {
+        'product_count': 1,
+        'price_sum': -27,
+        f'price_bucket_{get_price_bucket(3)}': 1,
+        f'price_bucket_{get_price_bucket(10)}': 1,
+        f'price_bucket_{get_price_bucket(40)}': -1,
+    }
+    assert (delta.min_price, delta.max_price) == (3, 700)
+
+
+def test_stale_price_range_is_narrowed_to_the_histogram():
+    # GIVEN stored aggregates whose cheapest and most expensive products were removed since
+    bucket_counts = [0] * PRICE_HISTOGRAM_BUCKETS
+    bucket_counts[get_price_bucket(60)] = 2
+
+    # WHEN building the catalog stats
+    stats = build_catalog_stats(product_count=2, price_sum=130, bucket_counts=bucket_counts, min_price=1, max_price=900, updated_at=1)
+
+    # THEN the price range is within the only non-empty bucket
+    assert (stats.min_price, stats.max_price) == (50, 99)
+    assert [bucket.count for bucket in stats.price_histogram if bucket.count] == [2]
+
+
+def _transaction_params(batch_id: str, update_expression: Any = ANY) -> dict:
+    return {
+        'TransactItems': [
+            {
+                'Put': {
+                    'TableName': STATS_TABLE,
+                    'Item': {'id': {'S': f'{APPLIED_BATCH_ITEM_PREFIX}{batch_id}'}, 'expiration': ANY},
+                    'ConditionExpression': 'attribute_not_exists(id)',
+                }
+            },
+            {
+                'Update': {
+                    'TableName': STATS_TABLE,
+                    'Key': {'id': {'S': STATS_ITEM_ID}},
+                    'UpdateExpression': update_expression,
+                    'ExpressionAttributeValues': ANY,
+                }
+            },
+        ]
+    }
+
+
+def _add_price_range_read(stubber: Stubber, min_price: int, max_price: int) -> None:
+    stubber.add_response(
+        'get_item',
+        {'Item': {'min_price': {'N': str(min_price)}, 'max_price': {'N': str(max_price)}}},
+        {'TableName': STATS_TABLE, 'Key': {'id': {'S': STATS_ITEM_ID}}, 'ProjectionExpression': 'min_price, max_price', 'ConsistentRead': True},
+    )
+
+
+def _add_applied_batch_error(stubber: Stubber, batch_id: str) -> None:
+    stubber.add_client_error(
+        'transact_write_items',
+        service_error_code='TransactionCanceledException',
+        modeled_fields={'CancellationReasons': [{'Code': 'ConditionalCheckFailed'}, {'Code': 'None'}]},
+        expected_params=_transaction_params(batch_id),
+    )
+
+
+def test_delta_is_stored_with_one_transaction_and_widens_the_price_range():
+    # GIVEN stored aggregates with a price range of 5 to 50
+    store, stubber = _stubbed_store()
+    delta = compute_stats_delta([PriceChange(new_price=2), PriceChange(new_price=20)])
+    update_expression = (
+        'SET updated_at = :now ADD product_count :product_count, price_sum :price_sum, '
+        f'price_bucket_0 :price_bucket_0, price_bucket_{get_price_bucket(20)} :price_bucket_{get_price_bucket(20)}'
+    )
+    stubber.add_response('transact_write_items', {}, _transaction_params('1-2', update_expression))
+    _add_price_range_read(stubber, min_price=5, max_price=50)
+    # only the lowest price is outside of the stored range
+    stubber.add_response(
+        'update_item',
+        {},
+        {
+            'TableName': STATS_TABLE,
+            'Key': {'id': {'S': STATS_ITEM_ID}},
+            'UpdateExpression': 'SET min_price = :price',
+            'ConditionExpression': 'attribute_not_exists(min_price) OR min_price > :price',
+            'ExpressionAttributeValues': {':price': {'N': '2'}},
+        },
+    )
+
+    # WHEN the delta of a batch is applied
+    with stubber:
+        applied = store.apply_delta(delta, batch_id='1-2')
+
+        # THEN the counters are added atomically with the batch marker, then the lowest price is widened
+        stubber.assert_no_pending_responses()
+    assert applied
+
+
+def test_retried_batch_is_not_counted_twice():
+    # GIVEN a batch that was already applied
+    store, stubber = _stubbed_store()
+    _add_applied_batch_error(stubber, '1-2')
+    _add_price_range_read(stubber, min_price=1, max_price=50)
+
+    # WHEN it is applied again
+    with stubber:
+        applied = store.apply_delta(compute_stats_delta([PriceChange(new_price=20)]), batch_id='1-2')
+
+        # THEN nothing else is updated, its prices are within the stored range
+        stubber.assert_no_pending_responses()
+    assert not applied
+
+
+def test_batch_retried_after_another_batch_is_not_counted_twice():
+    # GIVEN a batch applied, then a batch of another shard
+    store, stubber = _stubbed_store()
+    delta = compute_stats_delta([PriceChange(new_price=20)])
+    stubber.add_response('transact_write_items', {}, _transaction_params('1-2'))
+    _add_price_range_read(stubber, min_price=1, max_price=50)
+    stubber.add_response('transact_write_items', {}, _transaction_params('7-9'))
+    _add_price_range_read(stubber, min_price=1, max_price=50)
+    # the marker of the first batch is still there
+    _add_applied_batch_error(stubber, '1-2')
+    _add_price_range_read(stubber, min_price=1, max_price=50)
+
+    # WHEN the first batch is retried
+    with stubber:
+        applied = [store.apply_delta(delta, batch_id) for batch_id in ('1-2', '7-9', '1-2')]
+        stubber.assert_no_pending_responses()
+
+    # THEN its retry is recognized by its own marker, whatever batch was applied in between
+    assert applied == [True, True, False]
+
+
+def test_process_stream_updates_the_stats_once_per_batch():
+    # GIVEN a stream batch inserting then removing a product, and a stats store
+    stats_store = FakeCatalogStatsStore()
+    event = generate_dynamodb_stream_events()
+
+    # WHEN the batch is processed
+    process_stream(event, generate_context(), event_handler=FakeEventHandler(), stats_store=stats_store)
+
+    # THEN a single delta is applied, identified by the batch sequence numbers, and the product is not counted
+    ((delta, batch_id),) = stats_store.applied
+    records = event['Records']
+    assert batch_id == f'{records[0]["dynamodb"]["SequenceNumber"]}-{records[-1]["dynamodb"]["SequenceNumber"]}'
+    assert delta.counters() == {}
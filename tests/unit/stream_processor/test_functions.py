@@ -1,4 +1,4 @@
-from product.stream_processor.integrations.events.functions import chunk_from_list
+from product.stream_processor.integrations.events.functions import chunk_by_size, chunk_from_list
 
 
 def test_chunk_from_list_returns_empty_list_when_list_is_empty():
@@ -40,3 +40,14 @@ def test_chunk_from_list_returns_multiple_chunks_when_list_size_is_greater_than_
 
     # THEN we get a chunk of the same size as the list
     assert actual_chunks == expected_chunks
+
+
+def test_chunk_by_size_respects_both_limits():
+    # GIVEN items of various sizes, at most 3 items and 10 bytes per chunk
+    list_of_items = ['aaaa', 'bbbb', 'cc', 'd', 'e', 'f', 'g', 'hhhhhhhhhhhh', 'i']
+
+    # WHEN we call chunk_by_size
+    actual_chunks = list(chunk_by_size(list_of_items, max_items=3, max_bytes=10, size_of=len))
+
+    # THEN chunks are packed in order up to either limit, and an item over the size limit is alone in its chunk
+    assert actual_chunks == [['aaaa', 'bbbb', 'cc'], ['d', 'e', 'f'], ['g'], ['hhhhhhhhhhhh'], ['i']]
@@ -1,3 +1,6 @@
+import json
+
+from benchmarks.stream_simulator import StreamSimulator
 from product.stream_processor.handlers.process_stream import process_stream
 from tests.unit.stream_processor.conftest import FakeEventHandler
 from tests.unit.stream_processor.data_builder import generate_dynamodb_stream_events
@@ -29,3 +32,31 @@ def test_process_stream_with_empty_records():
     # THEN the fake event handler should emit these product notifications
     # and no errors should have been raised
     assert len(event_store) == 0
+
+
+def test_process_stream_with_large_batch():
+    # GIVEN a simulated stream batch with repeated keys
+    dynamodb_stream_events = StreamSimulator(duplicate_ratio=0.2, seed=1).generate_batch(1_000)
+    event_store = FakeEventHandler()
+
+    # WHEN process_stream is called with a custom event handler
+    process_stream(event=dynamodb_stream_events, context=generate_context(), event_handler=event_store)
+
+    # THEN every record is notified, including repeated changes of the same product
+    assert len(event_store) == 1_000
+
+
+def test_process_stream_publishes_stage_durations(capsys):
+    # GIVEN a DynamoDB stream event and a fake event handler
+    dynamodb_stream_events = generate_dynamodb_stream_events()
+    event_store = FakeEventHandler()
+
+    # WHEN process_stream is called
+    capsys.readouterr()
+    process_stream(event=dynamodb_stream_events, context=generate_context(), event_handler=event_store)
+
+    # THEN the EMF metrics of the invocation hold the record count and the duration of the handler stages
+    # the fake event handler doesn't time the event handler and provider stages
+    emf_blob = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert emf_blob['StreamRecords'] == [2.0]
+    assert {'ParseDuration', 'NotificationsDuration'} <= set(emf_blob)
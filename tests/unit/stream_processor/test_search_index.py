@@ -0,0 +1,165 @@
+import gzip
+import json
+import random
+from array import array
+
+from product.catalog.models import CatalogChange, CatalogProduct
+from product.catalog.object_store.filesystem_object_store import FileSystemObjectStore
+from product.catalog.search_index import SearchIndex, decode_search_index, encode_search_index, tokenize
+from product.stream_processor.handlers.process_stream import process_stream
+from tests.crud_utils import generate_product_id
+from tests.unit.stream_processor.conftest import FakeEventHandler
+from tests.unit.stream_processor.data_builder import generate_dynamodb_stream_events
+from tests.utils import generate_context
+
+SEARCH_INDEX_KEY = 'catalog/search_index.bin.gz'
+
+
+def _build_index(*names: str) -> tuple[SearchIndex, list[CatalogProduct]]:
+    products = [CatalogProduct(id=generate_product_id(), name=name, price=idx + 1) for idx, name in enumerate(names)]
+    index = SearchIndex().apply_changes([CatalogChange(product_id=product.id, product=product) for product in products])
+    return index, products
+
+
+def _names(products: list[CatalogProduct]) -> list[str]:
+    return [product.name for product in products]
+
+
+def test_tokenize_keeps_unique_lower_case_words():
+    assert tokenize('Red-Chair red_chair, Café 2000') == ['red', 'chair', 'café', '2000']
+
+
+def test_search_matches_every_token_as_a_prefix():
+    # GIVEN indexed products
+    index, _ = _build_index('red chair', 'blue chair', 'Cherry Red', 'red desk lamp')
+
+    # WHEN searching with a complete and a partial token
+    # THEN only products holding both tokens match, in any order and case
+    assert sorted(_names(index.search('RED ch', limit=10))) == ['Cherry Red', 'red chair']
+    assert index.search('green', limit=10) == []
+
+
+def test_search_ranks_exact_terms_and_short_names_first():
+    # GIVEN products matching a query exactly, as a prefix, and with longer names
+    index, _ = _build_index('chairman', 'chair', 'chair pro max')
+
+    # WHEN searching
+    # THEN exact matches rank above prefix matches, and shorter names above longer ones
+    assert _names(index.search('chair', limit=10)) == ['chair', 'chair pro max', 'chairman']
+    assert _names(index.search('chair', limit=1)) == ['chair']
+
+
+def test_limited_search_returns_the_best_of_every_match():
+    # GIVEN many products whose names share words and prefixes
+    rng = random.Random(7)
+    words = ['red', 'redwood', 'reds', 'chair', 'chairs', 'table', 'lamp', 'lampshade']
+    index, _ = _build_index(*(' '.join(rng.choices(words, k=rng.randint(1, 4))) for _ in range(500)))
+
+    for query in ['red', 're', 'chair lamp', 'chairs', 'la ta', 'red chair table']:
+        # WHEN searching with and without a limit
+        every_match = index.search(query, limit=len(index))
+
+        # THEN the limited results are the best ones, and every product holding all tokens is a match
+        assert index.search(query, limit=5) == every_match[:5]
+        expected_ids = {
+            product_id
+            for product_id, name in zip(index.ids, index.names, strict=True)
+            if all(any(term.startswith(token) for term in tokenize(name)) for token in tokenize(query))
+        }
+        assert {product.id for product in every_match} == expected_ids
+
+
+def test_changes_update_the_postings_incrementally():
+    # GIVEN an index of three products
+    index, (lamp, mug, desk) = _build_index('steel lamp', 'eco mug', 'steel desk')
+
+    # WHEN the first product is removed, and the last one renamed and repriced
+    index.apply_changes(
+        [
+            CatalogChange(product_id=lamp.id),
+            CatalogChange(product_id=desk.id, product=CatalogProduct(id=desk.id, name='oak desk', price=9, version=2)),
+        ]
+    )
+
+    # THEN the removed product and old name are no longer found, and the moved products are still searchable
+    assert index.version == 2
+    assert index.search('steel', limit=10) == []
+    assert 'steel' not in index.terms
+    assert index.search('oak', limit=10) == [CatalogProduct(id=desk.id, name='oak desk', price=9, version=2)]
+    assert index.search('mug', limit=10) == [mug]
+    assert all(list(posting) == sorted(posting) for posting in index.postings.values())
+
+
+def test_applying_a_batch_twice_is_harmless():
+    # GIVEN a batch of changes already applied to the index
+    index, products = _build_index('red chair', 'blue chair')
+    changes = [CatalogChange(product_id=products[0].id), CatalogChange(product_id=products[1].id, product=products[1])]
+    index.apply_changes(changes)
+
+    # WHEN the stream retries the batch
+    index.apply_changes(changes)
+
+    # THEN the index holds the same products
+    assert len(index) == 1
+    assert index.search('chair', limit=10) == [products[1]]
+
+
+def test_encoded_index_is_searched_like_the_original():
+    # GIVEN an index with removals, so its postings are not sorted
+    index, products = _build_index('red chair', 'blue chair', 'red lamp', 'blue lamp')
+    index.apply_changes([CatalogChange(product_id=products[0].id)])
+
+    # WHEN it is encoded and decoded
+    body = encode_search_index(index)
+    decoded = decode_search_index(body)
+
+    # THEN the decoded index returns the same results and encodes to the same bytes
+    for query in ['red', 'bl', 'lamp', 'chair blue']:
+        assert decoded.search(query, limit=10) == index.search(query, limit=10)
+    assert (decoded.version, len(decoded), decoded.terms) == (index.version, len(index), index.terms)
+    assert encode_search_index(decoded) == body
+
+
+def test_prices_above_32_bits_are_indexed():
+    # GIVEN a product priced above the 32 bits range, which the API accepts
+    product = CatalogProduct(id=generate_product_id(), name='gold chair', price=2**32, version=2**32 + 1)
+
+    # WHEN it is indexed, encoded and decoded
+    index = SearchIndex().apply_changes([CatalogChange(product_id=product.id, product=product)])
+    decoded = decode_search_index(encode_search_index(index))
+
+    # THEN its price and version are kept
+    assert index.search('gold', limit=10) == [product]
+    assert decoded.search('gold', limit=10) == [product]
+
+
+def test_index_encoded_with_32_bits_columns_is_decoded():
+    # GIVEN an index encoded before prices and versions were 64 bits, without typecodes in its header
+    index, products = _build_index('red chair', 'blue lamp')
+    header_line, _, data = gzip.decompress(encode_search_index(index)).partition(b'\n')
+    header = json.loads(header_line)
+    del header['typecodes']
+    prices, versions = array('I', index.prices).tobytes(), array('I', index.versions).tobytes()
+    legacy_data = prices + versions + data[2 * len(products) * 8 :]
+    body = gzip.compress(json.dumps(header).encode() + b'\n' + legacy_data)
+
+    # WHEN it is decoded
+    decoded = decode_search_index(body)
+
+    # THEN it is searched like the original
+    assert decoded.search('chair', limit=10) == [products[0]]
+    assert decoded.search('lamp', limit=10) == [products[1]]
+
+
+def test_process_stream_updates_the_search_index(tmp_path):
+    # GIVEN a stream batch inserting a product named 'test'
+    inserted, _ = generate_dynamodb_stream_events()['Records']
+    object_store = FileSystemObjectStore(str(tmp_path))
+
+    # WHEN the batch is processed with a catalog store
+    process_stream(event={'Records': [inserted]}, context=generate_context(), event_handler=FakeEventHandler(), object_store=object_store)
+
+    # THEN the product can be searched by name
+    stored_object = object_store.get_object(SEARCH_INDEX_KEY)
+    assert stored_object is not None
+    assert _names(decode_search_index(stored_object.body).search('te', limit=10)) == ['test']
@@ -0,0 +1,37 @@
+import pytest
+
+from product.observability import StageTimer, metrics
+
+
+def test_stage_durations_add_up():
+    # GIVEN a stage timer
+    stage_timer = StageTimer()
+
+    # WHEN a stage is entered twice, the second time failing
+    with stage_timer.stage('Serialization'):
+        pass
+    with pytest.raises(ValueError), stage_timer.stage('Serialization'):
+        raise ValueError('failed')
+
+    # THEN both durations are accumulated, the failed one included
+    assert list(stage_timer.durations_ms) == ['Serialization']
+    assert stage_timer.durations_ms['Serialization'] > 0
+
+
+def test_stage_durations_are_published_once():
+    # GIVEN a stage timer with a timed stage
+    stage_timer = StageTimer()
+    with stage_timer.stage('PutEvents'):
+        pass
+
+    # WHEN adding its metrics
+    durations_ms = stage_timer.add_metrics()
+
+    # THEN a duration metric is added in milliseconds, and the timer starts over for the next invocation
+    try:
+        metric = metrics.metric_set['PutEventsDuration']
+        assert metric['Unit'] == 'Milliseconds'
+        assert metric['Value'] == [round(durations_ms['PutEvents'], 3)]
+        assert stage_timer.durations_ms == {}
+    finally:
+        metrics.clear_metrics()